@@ -0,0 +1,75 @@
+"""add property_area_stats rollup
+
+Revision ID: a7d2e4f9c3b5
+Revises: f3a8c2d6b1e9
+Create Date: 2026-10-17 16:48:13.902554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e4f9c3b5'
+down_revision: Union[str, None] = 'f3a8c2d6b1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'property_area_stats',
+        sa.Column('state_code', sa.String(length=2), nullable=False),
+        sa.Column('county_key', sa.String(length=100), nullable=False),
+        sa.Column('volume', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('rating_a', sa.Integer(), nullable=False),
+        sa.Column('rating_b', sa.Integer(), nullable=False),
+        sa.Column('rating_c', sa.Integer(), nullable=False),
+        sa.Column('rating_d', sa.Integer(), nullable=False),
+        sa.Column('rating_f', sa.Integer(), nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False),
+        sa.Column('arv_sum', sa.Float(), nullable=False),
+        sa.Column('improvement_sum', sa.Float(), nullable=False),
+        sa.Column('improvement_count', sa.Integer(), nullable=False),
+        sa.Column('tax_due_sum', sa.Float(), nullable=False),
+        sa.Column('tax_due_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('state_code', 'county_key')
+    )
+
+    # Backfill from existing properties and scores
+    op.execute("""
+        INSERT INTO property_area_stats (
+            state_code, county_key, volume, score_sum, rating_a, rating_b, rating_c, rating_d, rating_f,
+            sample_size, arv_sum, improvement_sum, improvement_count, tax_due_sum, tax_due_count, updated_at
+        )
+        SELECT
+            p.state_code,
+            COALESCE(p.county_key, ''),
+            COUNT(*),
+            COALESCE(SUM(s.deal_score), 0),
+            SUM(CASE WHEN s.rating LIKE 'A%' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.rating = 'B' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.rating = 'C' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.rating = 'D' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN s.rating = 'F' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN p.assessed_value > 0 THEN 1 ELSE 0 END),
+            COALESCE(SUM(CASE WHEN p.assessed_value > 0 THEN p.assessed_value END), 0),
+            COALESCE(SUM(CASE WHEN p.assessed_value > 0 AND p.improvement_value <> 0 THEN p.improvement_value END), 0),
+            SUM(CASE WHEN p.assessed_value > 0 AND p.improvement_value <> 0 THEN 1 ELSE 0 END),
+            COALESCE(SUM(CASE WHEN p.assessed_value > 0 AND p.amount_due <> 0 THEN p.amount_due END), 0),
+            SUM(CASE WHEN p.assessed_value > 0 AND p.amount_due <> 0 THEN 1 ELSE 0 END),
+            NOW()
+        FROM property_details p
+        LEFT JOIN property_scores s ON s.parcel_id = p.parcel_id
+        WHERE p.availability = 'available'
+          AND p.state_code IS NOT NULL
+        GROUP BY p.state_code, COALESCE(p.county_key, '')
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('property_area_stats')
@@ -0,0 +1,34 @@
+"""add metering flush batches for idempotent usage flushes
+
+Revision ID: a9c4e7b2d6f1
+Revises: f3b6d8a1c5e9
+Create Date: 2026-10-17 23:52:18.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e7b2d6f1'
+down_revision: Union[str, None] = 'f3b6d8a1c5e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'metering_flush_batches',
+        sa.Column('batch_id', sa.String(length=32), nullable=False),
+        sa.Column('meter', sa.String(length=50), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('batch_id'),
+    )
+    op.create_index('ix_metering_flush_batches_applied_at', 'metering_flush_batches', ['applied_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_metering_flush_batches_applied_at', table_name='metering_flush_batches')
+    op.drop_table('metering_flush_batches')
@@ -0,0 +1,57 @@
+"""add property_current_auction projection
+
+Revision ID: b1c4e2a7d901
+Revises: ffa41ad5e5f6
+Create Date: 2026-10-17 09:12:41.318022
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c4e2a7d901'
+down_revision: Union[str, None] = 'ffa41ad5e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'property_current_auction',
+        sa.Column('property_id', sa.String(length=36), nullable=False),
+        sa.Column('auction_id', sa.Integer(), nullable=True),
+        sa.Column('auction_name', sa.String(length=255), nullable=True),
+        sa.Column('auction_date', sa.Date(), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('listed_as', sa.String(length=255), nullable=True),
+        sa.Column('taxes_due', sa.Float(), nullable=True),
+        sa.Column('info_link', sa.String(length=2048), nullable=True),
+        sa.Column('list_link', sa.String(length=2048), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['auction_id'], ['auction_events.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('property_id')
+    )
+    op.create_index(op.f('ix_property_current_auction_auction_id'), 'property_current_auction', ['auction_id'], unique=False)
+    op.create_index(op.f('ix_property_current_auction_auction_date'), 'property_current_auction', ['auction_date'], unique=False)
+
+    # Backfill from existing history
+    op.execute("""
+        INSERT INTO property_current_auction (
+            property_id, auction_id, auction_name, auction_date, location,
+            listed_as, taxes_due, info_link, list_link, updated_at
+        )
+        SELECT DISTINCT ON (property_id)
+            property_id, auction_id, auction_name, auction_date, location,
+            listed_as, taxes_due, info_link, list_link, NOW()
+        FROM property_auction_history
+        ORDER BY property_id, auction_date DESC NULLS LAST, id DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_property_current_auction_auction_date'), table_name='property_current_auction')
+    op.drop_index(op.f('ix_property_current_auction_auction_id'), table_name='property_current_auction')
+    op.drop_table('property_current_auction')
@@ -0,0 +1,46 @@
+"""add client list summary counters
+
+Revision ID: b8e3f1a6d2c4
+Revises: a7d2e4f9c3b5
+Create Date: 2026-10-17 18:05:41.317206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f1a6d2c4'
+down_revision: Union[str, None] = 'a7d2e4f9c3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('client_lists', sa.Column('property_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('client_lists', sa.Column('upcoming_auctions_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from current memberships
+    op.execute("""
+        UPDATE client_lists SET
+            property_count = (
+                SELECT COUNT(*) FROM client_list_property clp
+                WHERE clp.list_id = client_lists.id
+            ),
+            upcoming_auctions_count = (
+                SELECT COUNT(*)
+                FROM client_list_property clp
+                JOIN property_details p ON p.id = clp.property_id
+                WHERE clp.list_id = client_lists.id AND EXISTS (
+                    SELECT 1 FROM property_auction_history pah
+                    WHERE pah.property_id = p.property_id AND pah.auction_date >= CURRENT_DATE
+                )
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('client_lists', 'upcoming_auctions_count')
+    op.drop_column('client_lists', 'property_count')
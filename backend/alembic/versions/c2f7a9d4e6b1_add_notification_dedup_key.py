@@ -0,0 +1,40 @@
+"""add notification dedup key
+
+Revision ID: c2f7a9d4e6b1
+Revises: b8e3f1a6d2c4
+Create Date: 2026-10-17 18:52:09.641830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f7a9d4e6b1'
+down_revision: Union[str, None] = 'b8e3f1a6d2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('dedup_date', sa.Date(), nullable=True))
+
+    # Existing watchlist alerts keep today's dedup working; only the first of any
+    # same-day duplicates gets the key so the unique index can be built.
+    op.execute("""
+        UPDATE notifications SET dedup_date = CAST(created_at AS DATE)
+        WHERE id IN (
+            SELECT MIN(id) FROM notifications
+            WHERE type IN ('auction_starting_soon', 'auction_approaching')
+              AND created_at IS NOT NULL
+            GROUP BY user_id, property_id, type, CAST(created_at AS DATE)
+        )
+    """)
+    op.create_index('uq_notifications_dedup', 'notifications', ['user_id', 'property_id', 'type', 'dedup_date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_notifications_dedup', table_name='notifications')
+    op.drop_column('notifications', 'dedup_date')
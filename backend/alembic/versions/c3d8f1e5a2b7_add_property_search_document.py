@@ -0,0 +1,53 @@
+"""add property search_document and parcel_key with trigram indexes
+
+Revision ID: c3d8f1e5a2b7
+Revises: b1c4e2a7d901
+Create Date: 2026-10-17 10:04:27.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f1e5a2b7'
+down_revision: Union[str, None] = 'b1c4e2a7d901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('property_details', sa.Column('search_document', sa.Text(), nullable=True))
+    op.add_column('property_details', sa.Column('parcel_key', sa.String(length=400), nullable=True))
+
+    # Backfill; mirrors PropertySearchService._refresh_sql
+    op.execute(r"""
+        UPDATE property_details p SET
+            search_document = NULLIF(LOWER(REGEXP_REPLACE(CONCAT_WS(' ',
+                p.address, p.county, p.state, p.owner_address, p.description,
+                p.legal_description, p.parcel_id, p.cs_number,
+                (SELECT pca.auction_name FROM property_current_auction pca WHERE pca.property_id = p.property_id)
+            ), '\s+', ' ', 'g')), ''),
+            parcel_key = NULLIF(UPPER(CONCAT_WS(' ',
+                REPLACE(p.parcel_id, '-', ''), REPLACE(p.pin_ppin, '-', ''), REPLACE(p.raw_parcel_number, '-', '')
+            )), '')
+    """)
+
+    op.create_index('ix_property_details_search_document_trgm', 'property_details', ['search_document'],
+                    postgresql_using='gin', postgresql_ops={'search_document': 'gin_trgm_ops'})
+    op.create_index('ix_property_details_parcel_key_trgm', 'property_details', ['parcel_key'],
+                    postgresql_using='gin', postgresql_ops={'parcel_key': 'gin_trgm_ops'})
+    op.create_index('ix_property_details_address_trgm', 'property_details', ['address'],
+                    postgresql_using='gin', postgresql_ops={'address': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_details_address_trgm', table_name='property_details')
+    op.drop_index('ix_property_details_parcel_key_trgm', table_name='property_details')
+    op.drop_index('ix_property_details_search_document_trgm', table_name='property_details')
+    op.drop_column('property_details', 'parcel_key')
+    op.drop_column('property_details', 'search_document')
@@ -0,0 +1,68 @@
+"""add canonical state_code/county_key/availability columns and composite indexes
+
+Revision ID: d4a9b3c6e8f2
+Revises: c3d8f1e5a2b7
+Create Date: 2026-10-17 11:22:09.731845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.state_mapper import canonical_state_code, make_county_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a9b3c6e8f2'
+down_revision: Union[str, None] = 'c3d8f1e5a2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill(conn, table: str) -> None:
+    # Distinct raw spellings are few (hundreds of states, a few thousand counties),
+    # so map them in Python and update by value rather than row by row.
+    states = [r[0] for r in conn.execute(sa.text(f"SELECT DISTINCT state FROM {table} WHERE state IS NOT NULL"))]
+    state_updates = [{"raw": s, "code": canonical_state_code(s)} for s in states]
+    state_updates = [u for u in state_updates if u["code"]]
+    if state_updates:
+        conn.execute(sa.text(f"UPDATE {table} SET state_code = :code WHERE state = :raw"), state_updates)
+
+    counties = [r[0] for r in conn.execute(sa.text(f"SELECT DISTINCT county FROM {table} WHERE county IS NOT NULL"))]
+    county_updates = [{"raw": c, "key": make_county_key(c)} for c in counties]
+    county_updates = [u for u in county_updates if u["key"]]
+    if county_updates:
+        conn.execute(sa.text(f"UPDATE {table} SET county_key = :key WHERE county = :raw"), county_updates)
+
+
+def upgrade() -> None:
+    op.add_column('property_details', sa.Column('state_code', sa.String(length=2), nullable=True))
+    op.add_column('property_details', sa.Column('county_key', sa.String(length=100), nullable=True))
+    op.add_column('property_details', sa.Column(
+        'availability', sa.String(length=50),
+        sa.Computed("LOWER(TRIM(availability_status))", persisted=True), nullable=True
+    ))
+    op.add_column('auction_events', sa.Column('state_code', sa.String(length=2), nullable=True))
+    op.add_column('auction_events', sa.Column('county_key', sa.String(length=100), nullable=True))
+
+    conn = op.get_bind()
+    _backfill(conn, 'property_details')
+    _backfill(conn, 'auction_events')
+
+    op.create_index('ix_property_details_state_county_availability', 'property_details',
+                    ['state_code', 'county_key', 'availability'], unique=False)
+    op.create_index(op.f('ix_property_details_availability'), 'property_details', ['availability'], unique=False)
+    op.create_index('ix_auction_events_state_county_date', 'auction_events',
+                    ['state_code', 'county_key', 'auction_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_auction_events_state_county_date', table_name='auction_events')
+    op.drop_index(op.f('ix_property_details_availability'), table_name='property_details')
+    op.drop_index('ix_property_details_state_county_availability', table_name='property_details')
+    op.drop_column('auction_events', 'county_key')
+    op.drop_column('auction_events', 'state_code')
+    op.drop_column('property_details', 'availability')
+    op.drop_column('property_details', 'county_key')
+    op.drop_column('property_details', 'state_code')
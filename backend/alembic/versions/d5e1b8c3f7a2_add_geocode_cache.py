@@ -0,0 +1,42 @@
+"""add geocode cache
+
+Revision ID: d5e1b8c3f7a2
+Revises: c2f7a9d4e6b1
+Create Date: 2026-10-17 21:14:37.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e1b8c3f7a2'
+down_revision: Union[str, None] = 'c2f7a9d4e6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'geocode_cache',
+        sa.Column('query_key', sa.String(length=40), nullable=False),
+        sa.Column('query', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('display_name', sa.Text(), nullable=True),
+        sa.Column('state', sa.String(length=100), nullable=True),
+        sa.Column('county', sa.String(length=100), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('zip_code', sa.String(length=20), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('query_key'),
+    )
+    op.add_column('property_details', sa.Column('geocode_attempted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('property_details', 'geocode_attempted_at')
+    op.drop_table('geocode_cache')
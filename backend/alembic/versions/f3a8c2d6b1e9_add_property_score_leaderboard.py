@@ -0,0 +1,49 @@
+"""add property_score_leaderboard projection
+
+Revision ID: f3a8c2d6b1e9
+Revises: d4a9b3c6e8f2
+Create Date: 2026-10-17 15:22:08.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c2d6b1e9'
+down_revision: Union[str, None] = 'd4a9b3c6e8f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'property_score_leaderboard',
+        sa.Column('parcel_id', sa.String(length=100), nullable=False),
+        sa.Column('state_code', sa.String(length=2), nullable=True),
+        sa.Column('tier', sa.SmallInteger(), nullable=False),
+        sa.Column('deal_score', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('parcel_id')
+    )
+    op.create_index('ix_property_score_leaderboard_state_rank', 'property_score_leaderboard', ['state_code', 'tier', 'deal_score'], unique=False)
+    op.create_index('ix_property_score_leaderboard_rank', 'property_score_leaderboard', ['tier', 'deal_score'], unique=False)
+
+    # Backfill from existing scores
+    op.execute("""
+        INSERT INTO property_score_leaderboard (parcel_id, state_code, tier, deal_score, updated_at)
+        SELECT s.parcel_id, p.state_code,
+               CASE WHEN s.rating LIKE 'A%' THEN 3 WHEN s.rating = 'B' THEN 2 WHEN s.rating = 'C' THEN 1 ELSE 0 END,
+               s.deal_score, NOW()
+        FROM property_scores s
+        JOIN property_details p ON p.parcel_id = s.parcel_id
+        WHERE LOWER(TRIM(COALESCE(s.status, p.availability_status))) = 'available'
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_property_score_leaderboard_rank', table_name='property_score_leaderboard')
+    op.drop_index('ix_property_score_leaderboard_state_rank', table_name='property_score_leaderboard')
+    op.drop_table('property_score_leaderboard')
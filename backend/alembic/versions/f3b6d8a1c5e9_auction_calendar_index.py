@@ -0,0 +1,32 @@
+"""add (auction_date, state_code, county_key) index for the bounded auction calendar
+
+Revision ID: f3b6d8a1c5e9
+Revises: d5e1b8c3f7a2
+Create Date: 2026-10-17 22:41:09.513274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b6d8a1c5e9'
+down_revision: Union[str, None] = 'd5e1b8c3f7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Leads with auction_date, so it also replaces the single-column date index
+    op.create_index(
+        'ix_auction_events_date_state_county', 'auction_events',
+        ['auction_date', 'state_code', 'county_key'], unique=False,
+        postgresql_include=['tax_status', 'parcels_count', 'available_count'],
+    )
+    op.drop_index('ix_auction_events_auction_date', table_name='auction_events')
+
+
+def downgrade() -> None:
+    op.create_index('ix_auction_events_auction_date', 'auction_events', ['auction_date'], unique=False)
+    op.drop_index('ix_auction_events_date_state_county', table_name='auction_events')
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, File, UploadFile, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
 from typing import Any
 import uuid
 import os
-from app.services.import_service import import_service
+from app.services.upload_storage import upload_storage_service
 from app.api import deps
 from app.api.deps import get_current_active_user
 from app.models.user import User
@@ -12,24 +12,47 @@ redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
 import redis
 redis_client = redis.Redis.from_url(redis_url)
 
+# Redis status key prefix per import kind
+IMPORT_STATUS_KEYS = {
+    "properties": "import_status",
+    "auctions": "import_auctions_status",
+    "history": "import_history_status",
+}
+
+async def _accept_upload(file: UploadFile, kind: str, force: bool):
+    """
+    Streams the upload to the shared volume and registers a new job for it.
+    Returns (job_id, file_path, duplicate_of); duplicate_of is set when the same
+    file is already imported or in flight, in which case nothing is queued.
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Must be a CSV file")
+
+    job_id = str(uuid.uuid4())
+    stored = await upload_storage_service.save(file, f"{job_id}_{kind}.csv")
+
+    earlier_job = upload_storage_service.claim(kind, stored.sha256, job_id)
+    if earlier_job:
+        earlier_status = redis_client.get(f"{IMPORT_STATUS_KEYS[kind]}:{earlier_job}")
+        # Expired or crashed jobs do not block a new import of the same file
+        stale = earlier_status is None or b"Critical Error" in earlier_status
+        if not force and not stale:
+            upload_storage_service.discard(stored)
+            return earlier_job, None, earlier_job
+        upload_storage_service.reassign(kind, stored.sha256, job_id)
+
+    redis_client.set(f"{IMPORT_STATUS_KEYS[kind]}:{job_id}", "pending", ex=3600)
+    return job_id, stored.path, None
+
 @router.post("/import/properties")
 async def import_properties(
     file: UploadFile = File(...),
+    force: bool = False,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Must be a CSV file")
-        
-    job_id = str(uuid.uuid4())
-    temp_dir = "/app/data/temp_imports"
-    os.makedirs(temp_dir, exist_ok=True)
-    file_path = f"{temp_dir}/{job_id}.csv"
-    
-    # Save file to shared volume for worker access
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-    
-    redis_client.set(f"import_status:{job_id}", "pending", ex=3600)
+    job_id, file_path, duplicate_of = await _accept_upload(file, "properties", force)
+    if duplicate_of:
+        return {"message": "File already imported", "job_id": duplicate_of, "duplicate": True}
     
     # IMPORT TASK: Move to Celery instead of FastAPI BackgroundTasks
     from app.tasks import import_properties_celery_task
@@ -39,35 +62,31 @@ async def import_properties(
 
 @router.post("/import/auctions")
 async def import_auctions(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    force: bool = False,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Must be a CSV file")
-        
-    job_id = str(uuid.uuid4())
-    content = await file.read()
-    
-    redis_client.set(f"import_auctions_status:{job_id}", "pending", ex=3600)
-    background_tasks.add_task(import_service.process_auctions_csv, content, job_id)
+    job_id, file_path, duplicate_of = await _accept_upload(file, "auctions", force)
+    if duplicate_of:
+        return {"message": "File already imported", "job_id": duplicate_of, "duplicate": True}
+
+    from app.tasks import import_auctions_celery_task
+    import_auctions_celery_task.delay(file_path, job_id)
     
     return {"message": "Import started", "job_id": job_id}
 
 @router.post("/import/history")
 async def import_history(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
+    force: bool = False,
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Must be a CSV file")
-        
-    job_id = str(uuid.uuid4())
-    content = await file.read()
-    
-    redis_client.set(f"import_history_status:{job_id}", "pending", ex=3600)
-    background_tasks.add_task(import_service.process_history_mapping_csv, content, job_id)
+    job_id, file_path, duplicate_of = await _accept_upload(file, "history", force)
+    if duplicate_of:
+        return {"message": "File already imported", "job_id": duplicate_of, "duplicate": True}
+
+    from app.tasks import import_history_celery_task
+    import_history_celery_task.delay(file_path, job_id)
     
     return {"message": "Import started", "job_id": job_id}
 
@@ -85,8 +104,32 @@ async def get_import_status(
         
     if status is None:
         raise HTTPException(status_code=404, detail="Job not found")
-        
-    return {"job_id": job_id, "status": status.decode('utf-8')}
+
+    # Property imports also report structured progress (rows done, rows/sec, ETA, error counts)
+    from app.services.import_jobs import import_job_service
+    return {
+        "job_id": job_id,
+        "status": status.decode('utf-8'),
+        "progress": import_job_service.get_progress(job_id),
+        "errors": import_job_service.get_errors(job_id),
+    }
+
+@router.post("/import/{job_id}/resume")
+async def resume_import(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Resumes a property import job: unfinished partitions and chunks that failed
+    to commit are re-run, already committed chunks are skipped.
+    """
+    from app.services.import_jobs import import_job_service
+    if import_job_service.get_meta(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    from app.tasks import resume_import_job_task
+    resume_import_job_task.delay(job_id)
+    return {"message": "Import resumed", "job_id": job_id}
 
 @router.post("/trigger-auto-transition")
 async def trigger_auto_transition(
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.system_announcement import SystemAnnouncement
+from app.services.response_cache import cached_response, response_cache, ANNOUNCEMENTS
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -42,9 +43,11 @@ def create_announcement(
     db.add(announcement)
     db.commit()
     db.refresh(announcement)
+    response_cache.invalidate(ANNOUNCEMENTS)
     return announcement
 
 @router.get("/", response_model=List[AnnouncementResponse])
+@cached_response("announcements", tags=[ANNOUNCEMENTS], response_model=List[AnnouncementResponse])
 def get_active_announcements(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
@@ -73,4 +76,5 @@ def delete_announcement(
     
     db.delete(announcement)
     db.commit()
+    response_cache.invalidate(ANNOUNCEMENTS)
     return {"ok": True}
@@ -3,13 +3,16 @@ from datetime import date
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from app.api import deps
-from app.schemas.auction_event import AuctionEvent as AuctionEventSchema, AuctionEventCreate, AuctionEventUpdate, PaginatedAuctionResponse
+from app.core.config import settings
+from app.schemas.auction_event import AuctionEvent as AuctionEventSchema, AuctionEventCreate, AuctionEventUpdate, PaginatedAuctionResponse, AuctionCalendarResponse
 from app.db.repositories.auction_repository import auction_repo
 from app.models.user import User
+from app.services.response_cache import cached_response, auction_list_tags
 
 router = APIRouter()
 
 @router.get("/", response_model=PaginatedAuctionResponse)
+@cached_response("auctions", tags=auction_list_tags, response_model=PaginatedAuctionResponse)
 def read_auctions(
     db: Session = Depends(deps.get_db),
     name: Optional[str] = Query(None, description="Filtro por nome"),
@@ -44,26 +47,43 @@ def read_auctions(
     )
     return {"items": items, "total": total}
 
-@router.get("/calendar")
+@router.get("/calendar", response_model=AuctionCalendarResponse)
+@cached_response("auctions-calendar", tags=auction_list_tags, response_model=AuctionCalendarResponse)
 def get_auction_calendar(
     db: Session = Depends(deps.get_db),
+    start_date: date = Query(..., description="Data inicial da janela"),
+    end_date: date = Query(..., description="Data final da janela"),
+    granularity: str = Query("day", pattern="^(day|month)$", description="Agrupamento: day ou month"),
     name: Optional[str] = Query(None, description="Filtro por nome"),
     state: Optional[str] = Query(None, description="Filtro por estado"),
     county: Optional[str] = Query(None, description="Filtro por condado (county_name)"),
     is_presential: Optional[bool] = Query(None, description="True para presencial, False para online"),
-    start_date: Optional[date] = Query(None, description="Data inicial"),
-    end_date: Optional[date] = Query(None, description="Data final"),
     q: Optional[str] = Query(None, description="Busca textual genérica avançada"),
+    tax_status: Optional[str] = Query(None, description="Filtro por status de impostos/leilão"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=0, le=500, description="Eventos detalhados por página (0 = só agregados)"),
 ) -> Any:
-    return auction_repo.get_calendar_events(
+    """
+    Per-day or per-month auction counts for a bounded date window, with one
+    page of event detail.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (end_date - start_date).days + 1 > settings.CALENDAR_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Calendar window is limited to {settings.CALENDAR_MAX_DAYS} days")
+    return auction_repo.get_calendar(
         db,
+        start_date=start_date,
+        end_date=end_date,
+        granularity=granularity,
         name=name,
         state=state,
         county=county,
         is_presential=is_presential,
-        start_date=start_date,
-        end_date=end_date,
-        q=q
+        q=q,
+        tax_status=tax_status,
+        skip=skip,
+        limit=limit,
     )
 
 @router.post("/", response_model=AuctionEventSchema)
@@ -1,5 +1,5 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import os
@@ -8,11 +8,15 @@ from datetime import datetime
 from uuid import uuid4
 
 from app.api import deps
-from app.models.client_data import ClientList, ClientNote, ClientAttachment, client_list_property
+from app.models.client_data import ClientList, ClientNote, ClientAttachment
 from app.models.property import PropertyDetails
 from pydantic import BaseModel
 from app.models.activity_log import ActivityLog
 from app.models.user import User
+from app.services.client_lists import MAX_LIST_PAGE_SIZE, client_list_service
+from app.services.geo_directory import geo_directory
+from app.services.property_search import property_search_service
+from app.utils.state_mapper import canonical_state_code, make_county_key
 
 router = APIRouter()
 
@@ -175,50 +179,23 @@ def get_client_lists(
         else:
             query = query.filter(ClientList.user_id == current_user.id).filter(ClientList.company_id == None)
             
-    lists = query.all()
-
-    # Auto-migration for legacy standard folders using acronyms (e.g., "TX" -> "Texas")
-    standard_lists = [l for l in lists if l.tags == "STANDARD"]
-    for lst in standard_lists:
-        normalized_name = lst.name.strip().upper()
-        if normalized_name in STATE_MAPPING:
-            full_name = STATE_MAPPING[normalized_name]
-            existing_full = next((l for l in standard_lists if l.name == full_name and l.id != lst.id), None)
-            if existing_full:
-                for prop in lst.properties:
-                    if prop not in existing_full.properties:
-                        existing_full.properties.append(prop)
-                db.delete(lst)
-                db.commit()
-                lists.remove(lst)
-            else:
-                lst.name = full_name
-                db.commit()
-
-    results = []
-    for lst in lists:
-        count = db.query(client_list_property).filter(client_list_property.c.list_id == lst.id).count()
-        auction_q = text("""
-            SELECT COUNT(DISTINCT pah.property_id)
-            FROM client_list_property clp
-            JOIN property_details p ON p.id = clp.property_id
-            JOIN property_auction_history pah ON pah.property_id = p.property_id
-            WHERE clp.list_id = :list_id AND pah.auction_date >= CURRENT_DATE
-        """)
-        upcoming_count = db.execute(auction_q, {"list_id": lst.id}).scalar() or 0
-        results.append({
+    # Counts are the maintained summary columns (app.services.client_lists), so this is one query.
+    # Legacy acronym-named standard folders are migrated by scripts/migrate_standard_folders.py.
+    return [
+        {
             "id": lst.id,
             "name": lst.name,
-            "property_count": count,
+            "property_count": lst.property_count,
             "is_favorite_list": lst.is_favorite_list,
             "is_broadcasted": lst.is_broadcasted,
             "tags": lst.tags,
             "company_id": lst.company_id,
-            "has_upcoming_auction": upcoming_count > 0,
-            "upcoming_auctions_count": upcoming_count,
+            "has_upcoming_auction": lst.upcoming_auctions_count > 0,
+            "upcoming_auctions_count": lst.upcoming_auctions_count,
             "notes": lst.notes
-        })
-    return results
+        }
+        for lst in query.all()
+    ]
 
 
 @router.get("/custom-properties")
@@ -290,6 +267,8 @@ def create_custom_property(
         address=full_address.strip(),
         state=property_in.state,
         county=property_in.county,
+        state_code=canonical_state_code(property_in.state),
+        county_key=make_county_key(property_in.county),
         description=property_in.description,
         bedrooms=property_in.bedrooms,
         bathrooms=property_in.bathrooms,
@@ -312,6 +291,9 @@ def create_custom_property(
     )
 
     db.add(new_prop)
+    db.flush()
+    # Keyword search reads search_document/parcel_key only
+    property_search_service.refresh_documents(db, [prop_id])
     db.commit()
     db.refresh(new_prop)
 
@@ -343,6 +325,8 @@ def create_custom_property(
     # Link Property to List
     if new_prop not in lst.properties:
         lst.properties.append(new_prop)
+        db.flush()
+        client_list_service.refresh_summaries(db, [lst.id])
         db.commit()
 
     user_identifier = current_user.full_name or current_user.email
@@ -400,29 +384,17 @@ def get_broadcasted_lists(
     # Logic: Only admins can broadcast, so we fetch lists where is_broadcasted=True
     # and they belong to an admin user (though currently any admin is fine).
     broadcasted = db.query(ClientList).filter(ClientList.is_broadcasted == True).all()
-    results = []
-    for lst in broadcasted:
-        count = db.query(client_list_property).filter(client_list_property.c.list_id == lst.id).count()
-        
-        # Calculate upcoming auctions flag
-        auction_q = text("""
-            SELECT COUNT(DISTINCT pah.property_id)
-            FROM client_list_property clp
-            JOIN property_details p ON p.id = clp.property_id
-            JOIN property_auction_history pah ON pah.property_id = p.property_id
-            WHERE clp.list_id = :list_id AND pah.auction_date >= CURRENT_DATE
-        """)
-        upcoming_count = db.execute(auction_q, {"list_id": lst.id}).scalar() or 0
-
-        results.append({
-            "id": lst.id, 
-            "name": lst.name, 
-            "property_count": count, 
+    return [
+        {
+            "id": lst.id,
+            "name": lst.name,
+            "property_count": lst.property_count,
             "is_broadcasted": True,
-            "has_upcoming_auction": upcoming_count > 0,
-            "upcoming_auctions_count": upcoming_count
-        })
-    return results
+            "has_upcoming_auction": lst.upcoming_auctions_count > 0,
+            "upcoming_auctions_count": lst.upcoming_auctions_count
+        }
+        for lst in broadcasted
+    ]
 
 @router.post("/broadcasted/{list_id}/import")
 def import_broadcasted_list(
@@ -445,6 +417,8 @@ def import_broadcasted_list(
     # Copy relations
     for prop in source_list.properties:
         new_list.properties.append(prop)
+    db.flush()
+    client_list_service.refresh_summaries(db, [new_list.id])
     db.commit()
     
     return {"id": new_list.id, "name": new_list.name}
@@ -478,27 +452,16 @@ def update_client_list(
         log_activity(db, current_user, "update", "folder", f"User {user_identifier} renamed the folder to '{list_in.name}'")
 
     db.commit()
-    count = db.query(client_list_property).filter(client_list_property.c.list_id == lst.id).count()
-    
-    # Calculate upcoming auctions flag
-    auction_q = text("""
-        SELECT COUNT(DISTINCT pah.property_id)
-        FROM client_list_property clp
-        JOIN property_details p ON p.id = clp.property_id
-        JOIN property_auction_history pah ON pah.property_id = p.property_id
-        WHERE clp.list_id = :list_id AND pah.auction_date >= CURRENT_DATE
-    """)
-    upcoming_count = db.execute(auction_q, {"list_id": lst.id}).scalar() or 0
 
     return {
         "id": lst.id, 
         "name": lst.name, 
-        "property_count": count, 
+        "property_count": lst.property_count, 
         "is_favorite_list": lst.is_favorite_list, 
         "is_broadcasted": lst.is_broadcasted, 
         "tags": lst.tags,
-        "has_upcoming_auction": upcoming_count > 0,
-        "upcoming_auctions_count": upcoming_count,
+        "has_upcoming_auction": lst.upcoming_auctions_count > 0,
+        "upcoming_auctions_count": lst.upcoming_auctions_count,
         "notes": lst.notes
     }
 
@@ -558,24 +521,13 @@ def add_property_to_list(
     
     if prop not in lst.properties:
         lst.properties.append(prop)
+        db.flush()
+        client_list_service.refresh_summaries(db, [lst.id])
         db.commit()
         user_identifier = current_user.full_name or current_user.email
         log_activity(db, current_user, "create", "list_property", f"User {user_identifier} added the property '{prop.address or prop.parcel_id}' to folder '{lst.name}'")
     return {"ok": True}
 
-STATE_MAPPING = {
-    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
-    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia",
-    "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
-    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
-    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi", "MO": "Missouri",
-    "MT": "Montana", "NE": "Nebraska", "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey",
-    "NM": "New Mexico", "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
-    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
-    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
-    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
-}
-
 @router.post("/lists/standard/add/{property_id}")
 def add_property_to_standard_list(
     *,
@@ -590,9 +542,8 @@ def add_property_to_standard_list(
         raise HTTPException(status_code=404, detail="Property not found")
     
     raw_state = prop.state or "Unknown State"
-    # Normalize state string: attempt abbreviation translation, fallback to capitalized string
-    normalized_state = raw_state.strip().upper()
-    list_name = STATE_MAPPING.get(normalized_state, raw_state.strip().title())
+    # Normalize state string: full state name from the directory, fallback to capitalized string
+    list_name = geo_directory.state_name(raw_state) or raw_state.strip().title()
 
     # Always ensure the property goes into its specific State parent list
     lst = db.query(ClientList).filter(
@@ -617,20 +568,28 @@ def add_property_to_standard_list(
 
     if prop not in lst.properties:
         lst.properties.append(prop)
+        db.flush()
+        client_list_service.refresh_summaries(db, [lst.id])
         db.commit()
     
     # Return the new list info so frontend can react if needed
-    count = db.query(client_list_property).filter(client_list_property.c.list_id == lst.id).count()
-    return {"ok": True, "list": {"id": lst.id, "name": lst.name, "property_count": count, "tags": lst.tags}}
+    return {"ok": True, "list": {"id": lst.id, "name": lst.name, "property_count": lst.property_count, "tags": lst.tags}}
 
 @router.get("/lists/{list_id}/properties")
 def get_list_properties(
     *,
     db: Session = Depends(deps.get_db),
     list_id: int,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIST_PAGE_SIZE),
+    fields: Optional[str] = None,
     current_user = Depends(deps.get_current_active_user)
 ) -> Any:
-    """Get all properties in a specific list, including auction proximity alert."""
+    """
+    Get the properties in a specific list, including auction proximity alert.
+    Upcoming auctions come first. Supports paging (skip/limit) and a
+    comma-separated `fields` projection for very large lists.
+    """
     lst = db.query(ClientList).filter(ClientList.id == list_id).first()
     if not lst:
         raise HTTPException(status_code=404, detail="List not found")
@@ -644,88 +603,12 @@ def get_list_properties(
             if not co:
                 raise HTTPException(status_code=403, detail="Not authorized to view this list")
 
-    results = []
-    for p in lst.properties:
-        try:
-            # Get NEAREST auction and include links from the auction_events table
-            # Using LEFT JOIN and correct column name 'auction_id' to prevent crashes
-            auction = db.execute(text("""
-                SELECT 
-                    pah.auction_date,
-                    COALESCE(pah.list_link, ae.list_link) as auction_url,
-                    COALESCE(pah.info_link, ae.register_link) as register_link,
-                    ae.status as auction_status,
-                    ae.name as case_number
-                FROM property_auction_history pah
-                LEFT JOIN auction_events ae ON pah.auction_id = ae.id
-                WHERE pah.property_id = :parcel_id OR pah.property_id = :prop_id_str
-                ORDER BY pah.auction_date ASC
-                LIMIT 1
-            """), {"parcel_id": p.parcel_id or "", "prop_id_str": str(p.id)}).fetchone()
-            
-            # Fetch Property Notes
-            note = db.query(ClientNote).filter(
-                ClientNote.property_id == p.id,
-                ClientNote.user_id == current_user.id
-            ).first()
-
-            # Calculate days until auction
-            days_until_auction = None
-            is_auction_upcoming = False
-            if auction and auction.auction_date:
-                try:
-                    from datetime import date, datetime
-                    auction_dt = auction.auction_date if isinstance(auction.auction_date, date) else datetime.strptime(str(auction.auction_date), "%Y-%m-%d").date()
-                    days_until_auction = (auction_dt - date.today()).days
-                    is_auction_upcoming = 0 <= days_until_auction <= 30  # Alert within 30 days
-                except Exception:
-                    pass
-
-            prop_dict = {
-                "id": p.id,
-                "parcel_id": p.parcel_id,
-                "address": p.address,
-                "owner_address": p.owner_address,
-                "county": p.county,
-                "state": p.state,
-                "state_code": p.state,
-                "description": p.description or p.legal_description,
-                "lot_acres": p.lot_acres,
-                "improvement_value": p.improvement_value,
-                "availability_status": p.availability_status,
-                "property_type": p.property_type,
-                "auction_name": auction.case_number if auction else None,
-                "auction_date": str(auction.auction_date) if auction and auction.auction_date else None,
-                "auction_info_link": getattr(auction, "register_link", None) if auction else None,
-                "auction_list_link": auction.auction_url if auction else None,
-                "is_auction_upcoming": is_auction_upcoming,
-                "days_until_auction": days_until_auction,
-                "note_content": note.notes if getattr(note, 'notes', None) else "",
-                "amount_due": p.amount_due,
-                "assessed_value": p.assessed_value,
-                "occupancy": p.occupancy,
-                "latitude": p.latitude,
-                "longitude": p.longitude
-            }
-            results.append(prop_dict)
-        except Exception as e:
-            db.rollback()
-            print(f"Error processing property {p.id}: {str(e)}")
-            # Fallback basics to ensure it shows up even if auction logic fails
-            results.append({
-                "id": p.id,
-                "parcel_id": p.parcel_id,
-                "address": p.address,
-                "state": p.state,
-                "availability_status": p.availability_status
-            })
-
-    # Sort: upcoming auctions first, then by days_until
-    results.sort(key=lambda x: (
-        0 if x.get("is_auction_upcoming") else 1,
-        x.get("days_until_auction") if x.get("days_until_auction") is not None else 9999
-    ))
-    return results
+    return client_list_service.list_properties(
+        db, list_id, current_user.id,
+        skip=skip,
+        limit=limit,
+        fields=[f.strip() for f in fields.split(",")] if fields else None,
+    )
 
 @router.post("/lists/{list_id}/move/{property_id}")
 def move_property_between_lists(
@@ -750,6 +633,8 @@ def move_property_between_lists(
     if prop not in target_list.properties:
         target_list.properties.append(prop)
     
+    db.flush()
+    client_list_service.refresh_summaries(db, [source_list.id, target_list.id])
     db.commit()
     return {"ok": True}
 
@@ -779,6 +664,8 @@ def remove_property_from_list(
     if prop in lst.properties:
         lst.properties.remove(prop)
         user_identifier = current_user.full_name or current_user.email
+        db.flush()
+        client_list_service.refresh_summaries(db, [lst.id])
         log_activity(db, current_user, "delete", "list_property", f"User {user_identifier} removed the property '{prop.address or prop.parcel_id}' from folder '{lst.name}'")
         db.commit()
     return {"ok": True}
@@ -815,6 +702,8 @@ def toggle_favorite(
         fav_list.properties.append(prop)
         is_favorite = True
 
+    db.flush()
+    client_list_service.refresh_summaries(db, [fav_list.id])
     db.commit()
     return {"is_favorite": is_favorite}
 
@@ -1,18 +1,61 @@
-from typing import List, Any, Optional
+from typing import List, Any, Literal, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, Form
+from fastapi import APIRouter, Depends, Form, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-import re
+import base64
+import json
 from app.api import deps
 from app.schemas.property import PropertyDashboardSchema, PaginatedPropertyResponse
 from app.models.user import User
 from app.services.reconciliation_service import reconciliation_service
-from app.utils.state_mapper import normalize_state
+from app.utils.state_mapper import normalize_state, canonical_state_code, make_county_key
+from app.services.property_search import build_keyword_filter, property_search_service
+from app.services.rescore_queue import rescore_queue_service
+from app.services.score_leaderboard import score_leaderboard_service
+from app.services.area_stats import area_stats_service
+from app.services.property_detail import property_detail_service
+from app.services.metering import metering_service
 import uuid
 
 router = APIRouter()
 
+
+def _encode_cursor(sort_key: str, sort_dir: str, last_value: Any, last_id: int) -> str:
+    """Packs the last row's sort position into an opaque, URL-safe token."""
+    if isinstance(last_value, date):
+        value = {"t": "date", "v": last_value.isoformat()}
+    else:
+        value = {"t": "raw", "v": last_value}
+    payload = {"s": sort_key, "d": sort_dir, "k": value, "i": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["k"]
+        if value["t"] == "date":
+            payload["k"] = date.fromisoformat(value["v"])
+        else:
+            payload["k"] = value["v"]
+        return payload
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _estimate_row_count(db: Session, from_where_sql: str, params: dict) -> Optional[int]:
+    """Planner row estimate for a FROM/WHERE fragment (PostgreSQL only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_where_sql}"), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 @router.get("/", response_model=PaginatedPropertyResponse)
 def read_properties(
     db: Session = Depends(deps.get_db),
@@ -47,6 +90,10 @@ def read_properties(
     added_since: Optional[str] = None,
     is_unavailable: Optional[bool] = None,
     min_score: Optional[float] = None,
+    # Keyset pagination: pass back `next_cursor` from the previous page instead of `skip`.
+    cursor: Optional[str] = None,
+    # "exact" runs count(*), "estimate" uses the planner's row estimate, "none" skips it.
+    total_mode: Literal["exact", "estimate", "none"] = "exact",
 ) -> Any:
     
     # 1. Build Base Filter Query
@@ -59,12 +106,17 @@ def read_properties(
         params["cid"] = current_user.company_id or current_user.active_company_id
 
     if county:
-        where_clauses.append("p.county ILIKE :county")
-        params["county"] = f"%{county}%"
+        where_clauses.append("p.county_key = :county_key")
+        params["county_key"] = make_county_key(county)
     if state:
-        state = normalize_state(state)
-        where_clauses.append("p.state ILIKE :state")
-        params["state"] = f"%{state}%"
+        state_code = canonical_state_code(state)
+        if state_code:
+            where_clauses.append("p.state_code = :state_code")
+            params["state_code"] = state_code
+        else:
+            # Unrecognized state text: fall back to a pattern match on the raw column
+            where_clauses.append("p.state ILIKE :state")
+            params["state"] = f"%{normalize_state(state)}%"
     if auction_id:
         where_clauses.append("pah.auction_id = :auction_id")
         params["auction_id"] = auction_id
@@ -104,9 +156,9 @@ def read_properties(
         where_clauses.append("p.improvement_value <= :max_improvements")
         params["max_improvements"] = max_improvements
     if availability:
-        # Exact match — ILIKE with % would match 'unavailable' when searching 'available'
-        where_clauses.append("LOWER(p.availability_status) = LOWER(:availability)")
-        params["availability"] = availability
+        # Exact match on the normalized column — ILIKE with % would match 'unavailable' when searching 'available'
+        where_clauses.append("p.availability = :availability")
+        params["availability"] = availability.strip().lower()
     if min_county_appraisal is not None:
         where_clauses.append("p.assessed_value >= :min_county_appraisal")
         params["min_county_appraisal"] = min_county_appraisal
@@ -124,54 +176,14 @@ def read_properties(
         params["owner_location"] = f"%{owner_location}%"
     
     # Phase 36: Intelligent Search & Fuzzy Matching
-    if keyword:
-        k = keyword.strip()
-        
-        # 1. Detect 5-digit ZIP Codes
-        if re.fullmatch(r'\d{5}', k):
-            where_clauses.append("p.address ILIKE :zip_keyword")
-            params["zip_keyword"] = f"%{k}%"
-            
-        # 2. Detect Parcel IDs (digits and dashes, typical formats)
-        elif re.match(r'^[\d\-A-Z]+$', k.upper()) and len(k) > 4:
-            # Strip dashes for a "clean" search if the user included them
-            clean_k = k.replace('-', '')
-            
-            where_clauses.append('''
-                (
-                    REPLACE(p.parcel_id, '-', '') ILIKE :clean_k OR 
-                    REPLACE(p.pin_ppin, '-', '') ILIKE :clean_k OR
-                    REPLACE(p.raw_parcel_number, '-', '') ILIKE :clean_k OR
-                    p.parcel_id ILIKE :keyword OR
-                    p.pin_ppin ILIKE :keyword
-                )
-            ''')
-            params["clean_k"] = f"%{clean_k}%"
-            params["keyword"] = f"%{k}%"
-            
-        # 3. Default "Fuzzy" / Broad Match (Addresses, Counties, etc.)
-        else:
-            # Replace spaces with wildcards to handle slight typos (e.g., "123Main" -> "123%Main")
-            fuzzy_k = "%".join(k.split()) 
-            
-            where_clauses.append('''
-                (
-                    p.address ILIKE :fuzzy_k OR 
-                    p.county ILIKE :fuzzy_k OR
-                    p.state ILIKE :fuzzy_k OR
-                    p.owner_address ILIKE :fuzzy_k OR
-                    p.description ILIKE :fuzzy_k OR
-                    p.legal_description ILIKE :fuzzy_k OR
-                    p.parcel_id ILIKE :keyword OR
-                    p.cs_number ILIKE :fuzzy_k OR
-                    pah.auction_name ILIKE :fuzzy_k
-                )
-            ''')
-            params["fuzzy_k"] = f"%{fuzzy_k}%"
-            params["keyword"] = f"%{k}%"
+    # Served from the trigram-indexed search_document / parcel_key columns (see property_search).
+    keyword_filter = build_keyword_filter(keyword, db.get_bind().dialect.name) if keyword else None
+    if keyword_filter:
+        where_clauses.append(keyword_filter.clause)
+        params.update(keyword_filter.params)
 
     if is_unavailable is True:
-        where_clauses.append("p.availability_status = 'unavailable'")
+        where_clauses.append("p.availability = 'unavailable'")
 
     if min_score is not None:
         where_clauses.append("ps.deal_score >= :min_score")
@@ -184,11 +196,11 @@ def read_properties(
 
     # 2. Join structure for Auction Lookup
     # If filtering by a specific auction (name or id), we join against the full history. 
-    # Otherwise, we use DISTINCT ON to ensure 1 property = 1 row for general dashboard.
+    # Otherwise, we join the maintained latest-auction projection so 1 property = 1 row for general dashboard.
     if auction_name or auction_id:
         history_table = "property_auction_history"
     else:
-        history_table = "(SELECT DISTINCT ON (property_id) * FROM property_auction_history ORDER BY property_id, auction_date DESC)"
+        history_table = "property_current_auction"
     
     # Smart Auction Lookup Join (ae_lookup)
     # This matches properties that have a next_auction_date imported from CSV 
@@ -196,12 +208,18 @@ def read_properties(
     ae_join = """
         LEFT JOIN auction_events ae_lookup ON 
             ae_lookup.auction_date = p.next_auction_date AND 
-            ae_lookup.state ILIKE p.state AND 
-            ae_lookup.county ILIKE p.county
+            ae_lookup.state_code = p.state_code AND 
+            ae_lookup.county_key = p.county_key
     """
 
-    count_query = f"SELECT count(*) FROM property_details p LEFT JOIN {history_table} pah ON pah.property_id = p.property_id {ae_join} {score_join} WHERE {where_str}"
-    total = db.execute(text(count_query), params).scalar()
+    from_where = f"FROM property_details p LEFT JOIN {history_table} pah ON pah.property_id = p.property_id {ae_join} {score_join} WHERE {where_str}"
+    total = None
+    total_is_estimate = False
+    if total_mode == "estimate":
+        total = _estimate_row_count(db, from_where, params)
+        total_is_estimate = total is not None
+    if total_mode == "exact" or (total_mode == "estimate" and total is None):
+        total = db.execute(text(f"SELECT count(*) {from_where}"), params).scalar()
 
     # 3. Get Items
     items_query = f"""
@@ -249,14 +267,16 @@ def read_properties(
             p.property_category,
             p.market_land_value,
             p.market_improvement_value,
-            p.owner_occupied
+            p.owner_occupied,
+            {"{sort_col}"} as sort_key,
+            p.id as row_id
         FROM property_details p
         LEFT JOIN {history_table} pah ON pah.property_id = p.property_id
         {ae_join}
         {score_join}
-        WHERE {where_str}
+        WHERE {where_str} {"{keyset_clause}"}
         ORDER BY {"{order_by_clause}"}
-        OFFSET :skip LIMIT :limit
+        OFFSET :skip LIMIT :limit_plus_one
     """
     
     # Ensure safe ordering
@@ -282,16 +302,55 @@ def read_properties(
         "occupancy": "p.occupancy"
     }
 
-    order_by_clause = "pah.auction_date ASC NULLS LAST, p.parcel_id ASC"
+    sort_key = "auction_date"
+    safe_col = "pah.auction_date"
+    safe_dir = "ASC"
+    # Keyword searches are ranked by relevance unless the caller picks a column
+    if keyword_filter and keyword_filter.rank_expr:
+        sort_map["relevance"] = keyword_filter.rank_expr
+        if not sort_field:
+            sort_field = "relevance"
+            sort_order = "desc"
     if sort_field and sort_field in sort_map:
+        sort_key = sort_field
         safe_col = sort_map[sort_field]
         safe_dir = "DESC" if sort_order and sort_order.lower() == "desc" else "ASC"
-        order_by_clause = f"{safe_col} {safe_dir} NULLS LAST, p.parcel_id ASC"
+    # The non-null primary key breaks ties, so every row has exactly one position
+    order_by_clause = f"{safe_col} {safe_dir} NULLS LAST, p.id ASC"
+
+    # Keyset (seek) predicate: resume strictly after the last row of the previous page.
+    # Mirrors the ORDER BY above, including NULLS LAST and the id tiebreaker.
+    keyset_clause = ""
+    if cursor:
+        position = _decode_cursor(cursor)
+        if position["s"] != sort_key or position["d"] != safe_dir:
+            raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+        params["cursor_id"] = position["i"]
+        if position["k"] is None:
+            keyset_clause = f"AND ({safe_col} IS NULL AND p.id > :cursor_id)"
+        else:
+            op = "<" if safe_dir == "DESC" else ">"
+            params["cursor_value"] = position["k"]
+            keyset_clause = f"""AND (
+                {safe_col} {op} :cursor_value
+                OR ({safe_col} = :cursor_value AND p.id > :cursor_id)
+                OR {safe_col} IS NULL
+            )"""
+        params["skip"] = 0
+
+    # Fetch one extra row to learn whether another page exists without counting.
+    params["limit_plus_one"] = limit + 1
 
     # Format the query with the safe order_by_clause
-    items_query = items_query.format(order_by_clause=order_by_clause)
+    items_query = items_query.format(order_by_clause=order_by_clause, sort_col=safe_col, keyset_clause=keyset_clause)
 
     result = db.execute(text(items_query), params).fetchall()
+
+    next_cursor = None
+    if len(result) > limit:
+        result = result[:limit]
+        last = result[-1]
+        next_cursor = _encode_cursor(sort_key, safe_dir, last._mapping["sort_key"], last._mapping["row_id"])
     
     items = [
         {
@@ -343,7 +402,7 @@ def read_properties(
         for r in result
     ]
 
-    return {"items": items, "total": total}
+    return {"items": items, "total": total, "total_is_estimate": total_is_estimate, "next_cursor": next_cursor}
 
 from fastapi import HTTPException
 from pydantic import BaseModel
@@ -410,6 +469,8 @@ def create_property(
     
     if "availability_status" not in create_data:
         create_data["availability_status"] = "available"
+    create_data["state_code"] = canonical_state_code(create_data.get("state"))
+    create_data["county_key"] = make_county_key(create_data.get("county"))
         
     create_data["created_by_user_id"] = current_user.id
     if create_data.get("visibility") == "private":
@@ -432,12 +493,14 @@ def create_property(
             text("INSERT INTO property_availability_history (property_id, previous_status, new_status, change_source) VALUES (:prop_id, 'new_entry', :status, 'manual_creation')"),
             {"prop_id": prop_id, "status": create_data["availability_status"]}
         )
+        property_search_service.refresh_documents(db, [prop_id])
         
         db.commit()
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
         
+    rescore_queue_service.mark_dirty([property_in.parcel_id])
     return {"message": "Property created successfully", "parcel_id": property_in.parcel_id}
 
 @router.put("/{parcel_id}", response_model=dict)
@@ -469,6 +532,11 @@ def update_property(
                 {"prop_id": old_prop[0], "prev": old_status, "new": new_status}
             )
 
+    if "state" in update_data:
+        update_data["state_code"] = canonical_state_code(update_data["state"])
+    if "county" in update_data:
+        update_data["county_key"] = make_county_key(update_data["county"])
+
     set_clause = ", ".join([f"{k} = :{k}" for k in update_data.keys()])
     query = text(f"UPDATE property_details SET {set_clause} WHERE parcel_id = :parcel_id RETURNING property_id")
     params = {**update_data, "parcel_id": parcel_id}
@@ -476,8 +544,13 @@ def update_property(
     result = db.execute(query, params).fetchone()
     if not result:
         raise HTTPException(status_code=404, detail="Property not found")
+
+    property_search_service.refresh_documents(db, [result[0]])
+    if "availability_status" in update_data or "state" in update_data:
+        score_leaderboard_service.refresh_parcels(db, [parcel_id])
         
     db.commit()
+    rescore_queue_service.mark_dirty([parcel_id])
     return {"message": "Property updated successfully", "parcel_id": parcel_id}
 
 @router.delete("/{parcel_id}", response_model=dict)
@@ -492,10 +565,14 @@ def delete_property(
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
         
+    area_stats_service.mark_parcels(db, [parcel_id])
+
     # Delete Auction History entries first
     db.execute(text("DELETE FROM property_auction_history WHERE property_id = :property_id"), {"property_id": prop[0]})
+    db.execute(text("DELETE FROM property_current_auction WHERE property_id = :property_id"), {"property_id": prop[0]})
     # Delete from Property Details
     db.execute(text("DELETE FROM property_details WHERE parcel_id = :parcel_id"), {"parcel_id": parcel_id})
+    score_leaderboard_service.refresh_parcels(db, [parcel_id])
     db.commit()
     
     return {"message": "Property deleted successfully", "parcel_id": parcel_id}
@@ -548,6 +625,8 @@ def purchase_property_action(
                 "VALUES (:prop_id, :prev, :new, 'purchase_transaction')"
             )
             db.execute(audit_q, {"prop_id": prop_id, "prev": current_status, "new": new_status})
+            score_leaderboard_service.refresh_parcels(db, [parcel_id])
+            area_stats_service.mark_parcels(db, [parcel_id])
             
         # Commit the transaction block completely
         db.commit()
@@ -607,6 +686,7 @@ def purchase_property_media(
         VALUES (:prop_uuid, :uid, :amount)
     """), {"prop_uuid": prop_uuid, "uid": current_user.id, "amount": cost_usd})
     db.commit()
+    metering_service.consume(db, "media_purchases", current_user)
     
     return {"message": f"Media unlocked for ${cost_usd:.2f}", "unlocked": True, "cost_usd": cost_usd}
 
@@ -649,27 +729,17 @@ def get_valuation_metrics(
     Business rule: Values below $1000 are returned as null to prevent distortions.
     Only 'available' properties are used as comps.
     """
-    # Build city filter if provided
-    city_clause = "AND LOWER(address) LIKE LOWER(:city_pattern)" if city else ""
-    params: dict = {"county": county, "state": state}
-    if city:
-        params["city_pattern"] = f"%{city}%"
-
-    query = text(f"""
-        SELECT
-            AVG(NULLIF(assessed_value, 0))    AS avg_arv,
-            AVG(NULLIF(improvement_value, 0)) AS avg_improvement,
-            AVG(NULLIF(amount_due, 0))        AS avg_tax_due,
-            COUNT(id)                         AS sample_size
-        FROM property_details
-        WHERE LOWER(county) = LOWER(:county)
-          AND LOWER(state)  = LOWER(:state)
-          AND LOWER(availability_status) = 'available'
-          AND assessed_value > 0
-          {city_clause}
-    """)
+    state_code = canonical_state_code(state) or normalize_state(state)
+    county_key = make_county_key(county)
 
-    res = db.execute(query, params).fetchone()
+    if city:
+        res = _city_valuation(db, state_code, county_key, city)
+    elif not county_key:
+        res = None
+    else:
+        # County-wide comps come from the maintained rollup (app.services.area_stats)
+        stats = area_stats_service.county_valuation(db, state_code, county_key)
+        res = (stats["avg_arv"], stats["avg_improvement"], stats["avg_tax_due"], stats["sample_size"]) if stats else None
 
     if not res or res[0] is None:
         return {"arv": None, "rent": None, "confidence": 0, "sample_size": 0}
@@ -701,116 +771,55 @@ def get_valuation_metrics(
     }
 
 
+def _city_valuation(db: Session, state_code: str, county_key: Optional[str], city: str):
+    """City-filtered comps match on the address text, so they are aggregated live."""
+    params: dict = {"county_key": county_key, "state_code": state_code, "city_pattern": f"%{city}%"}
+
+    query = text("""
+        SELECT
+            AVG(NULLIF(assessed_value, 0))    AS avg_arv,
+            AVG(NULLIF(improvement_value, 0)) AS avg_improvement,
+            AVG(NULLIF(amount_due, 0))        AS avg_tax_due,
+            COUNT(id)                         AS sample_size
+        FROM property_details
+        WHERE state_code = :state_code
+          AND county_key = :county_key
+          AND availability = 'available'
+          AND assessed_value > 0
+          AND LOWER(address) LIKE LOWER(:city_pattern)
+    """)
+
+    return db.execute(query, params).fetchone()
+
+
+VIEW_LIMIT_MESSAGES = {
+    "trial": "Trial limit reached (5 searches). Please upgrade to Pro to view more properties.",
+    "pro": "Pro limit reached (5000 searches). Please upgrade to Enterprise.",
+}
+
 @router.get("/{parcel_id}")
 def get_property(
     parcel_id: str,
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user)
 ) -> Any:
-    # 1. Rate Limiting Check
+    # 1. Rate Limiting Check (metered in Redis, flushed to users in batches)
     if current_user and current_user.role == "client" and current_user.email != "gustavot.gomes7@gmail.com":
-        sub = db.execute(text("SELECT subscription_tier, property_searches_used FROM users WHERE id = :uid"), {"uid": current_user.id}).fetchone()
-        if sub:
-            if sub.subscription_tier == 'trial' and sub.property_searches_used >= 5:
-                raise HTTPException(status_code=402, detail="Trial limit reached (5 searches). Please upgrade to Pro to view more properties.")
-            elif sub.subscription_tier == 'pro' and sub.property_searches_used >= 5000:
-                raise HTTPException(status_code=402, detail="Pro limit reached (5000 searches). Please upgrade to Enterprise.")
-            # Increment usage
-            db.execute(text("UPDATE users SET property_searches_used = property_searches_used + 1 WHERE id = :uid"), {"uid": current_user.id})
-            db.commit()
-
-    # Use explicit columns to avoid ambiguity and facilitate dict conversion
-    query = text("""
-        SELECT 
-            p.*,
-            pah.auction_name as current_auction_name, 
-            pah.auction_date as current_auction_date,
-            COALESCE(pah.info_link, ae.register_link) as auction_info_link,
-            COALESCE(pah.list_link, ae.list_link) as auction_list_link
-        FROM property_details p
-        LEFT JOIN property_auction_history pah ON pah.property_id = p.property_id
-        LEFT JOIN auction_events ae ON pah.auction_id = ae.id
-        WHERE p.parcel_id = :parcel_id OR p.id::text = :parcel_id
-        ORDER BY pah.auction_date DESC
-        LIMIT 1
-    """)
-    result = db.execute(query, {"parcel_id": parcel_id}).fetchone()
-    if not result:
+        usage = metering_service.consume(db, "property_views", current_user)
+        if not usage.allowed:
+            raise HTTPException(
+                status_code=402,
+                detail=VIEW_LIMIT_MESSAGES.get(current_user.subscription_tier, "Property view limit reached.")
+            )
+
+    data = property_detail_service.load(
+        db, parcel_id,
+        user_id=current_user.id if current_user else None,
+        is_superuser=bool(current_user and current_user.is_superuser),
+    )
+    if data is None:
         raise HTTPException(status_code=404, detail="Property not found")
     
-    # Use mapping for safe access
-    row_map = result._mapping
-    data = dict(row_map)
-    prop_id_int = row_map.get('id')
-    
-    # Fetch History
-    history_query = text("""
-        SELECT *
-        FROM property_auction_history
-        WHERE property_id = :property_id
-        ORDER BY auction_date DESC
-    """)
-    history_results = db.execute(history_query, {"property_id": data.get('property_id')}).fetchall()
-    data["auction_history"] = [dict(h._mapping) for h in history_results]
-    
-    # Initialize defaults for resilience
-    data["notes"] = ""
-    data["attachments"] = []
-
-    # Fetch Notes and Attachments only if we have a valid int ID and user
-    if prop_id_int and current_user:
-        try:
-            # Fetch Notes (Latest/Single per user)
-            notes_query = text("""
-                SELECT note_text FROM client_notes 
-                WHERE user_id = :user_id AND property_id = :prop_id 
-                ORDER BY created_at DESC LIMIT 1
-            """)
-            note_row = db.execute(notes_query, {"user_id": current_user.id, "prop_id": prop_id_int}).fetchone()
-            if note_row:
-                data["notes"] = note_row[0]
-            
-            # Check Media Monetization (Paywall)
-            has_access = False
-            if current_user.is_superuser:
-                has_access = True
-            else:
-                # Check if user purchased media
-                purchase = db.execute(text("""
-                    SELECT 1 FROM property_media_purchases 
-                    WHERE property_id = (SELECT property_id FROM property_details WHERE parcel_id = :parcel_id) 
-                    AND user_id = :uid
-                """), {"parcel_id": parcel_id, "uid": current_user.id}).fetchone()
-                
-                if purchase:
-                    has_access = True
-                else:
-                    # Check if user is the one who created the task
-                    task = db.execute(text("""
-                        SELECT 1 FROM consultant_tasks 
-                        WHERE property_id = :prop_id AND investor_user_id = :uid AND status = 'approved'
-                    """), {"prop_id": prop_id_int, "uid": current_user.id}).fetchone()
-                    if task:
-                        has_access = True
-
-            if has_access:
-                # Fetch Attachments (Consultant submissions or client uploads)
-                att_query = text("""
-                    SELECT filename, file_path FROM client_attachments 
-                    WHERE property_id = :prop_id
-                """)
-                att_rows = db.execute(att_query, {"prop_id": prop_id_int}).fetchall()
-                data["attachments"] = [dict(a._mapping) for a in att_rows]
-                data["media_unlocked"] = True
-            else:
-                # Stub out attachments and flag as locked
-                data["attachments"] = []
-                data["media_unlocked"] = False
-                
-        except Exception as e:
-            # Log error but don't fail the whole request
-            print(f"Error fetching notes/attachments: {e}")
-    
     # Calculate Recommended Next Steps
     next_steps = []
     if data.get("availability_status") == "available":
@@ -822,25 +831,6 @@ def get_property(
     
     data["recommended_next_steps"] = next_steps
 
-    # Fetch persisted ML score if available
-    import json as _json
-    score_row = db.execute(
-        text("SELECT deal_score, rating, score_factors, model_version, updated_at FROM property_scores WHERE parcel_id = :parcel_id"),
-        {"parcel_id": parcel_id}
-    ).fetchone()
-    if score_row:
-        data["deal_score"] = score_row[0]
-        data["deal_rating"] = score_row[1]
-        data["score_factors"] = _json.loads(score_row[2]) if score_row[2] else []
-        data["score_model_version"] = score_row[3]
-        data["score_updated_at"] = score_row[4].isoformat() if score_row[4] else None
-    else:
-        data["deal_score"] = None
-        data["deal_rating"] = None
-        data["score_factors"] = []
-        data["score_model_version"] = None
-        data["score_updated_at"] = None
-
     return data
 
 @router.get("/{parcel_id}/redirect/auction")
@@ -930,6 +920,39 @@ def enrich_property_endpoint(
         logger.error(f"Erro no endpoint de enriquecimento para {property_id}: {e}")
         return {"status": "error", "message": str(e), "property_id": property_id}
 
+
+class BatchEnrichRequest(BaseModel):
+    auction_id: Optional[int] = None
+    parcel_ids: Optional[List[str]] = None
+
+@router.post("/enrich/batch", response_model=dict)
+def enrich_properties_batch(
+    request: BatchEnrichRequest,
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    Queues ATTOM enrichment for every property of an auction or for a list of
+    parcels (concurrent, rate-limited; see app.services.attom_batch).
+    """
+    if request.auction_id is None and not request.parcel_ids:
+        raise HTTPException(status_code=400, detail="Provide auction_id or parcel_ids")
+
+    from app.tasks import enrich_properties_batch_task
+    task = enrich_properties_batch_task.delay(request.auction_id, request.parcel_ids)
+    return {"status": "queued", "task_id": task.id}
+
+
+@router.get("/enrich/cache-stats", response_model=dict)
+def enrich_cache_stats(
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> Any:
+    """
+    ATTOM response cache counters (hits per tier, misses, bytes, ATTOM calls
+    and spend avoided) for sizing Redis; see app.services.attom_cache.
+    """
+    from app.services.attom_cache import attom_cache
+    return attom_cache.stats()
+
 from app.services.status_updater import transition_past_auctions
 
 @router.post("/force-status-update", response_model=dict)
@@ -7,9 +7,17 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.api import deps
+from app.models.user import User
+from app.services.area_stats import area_stats_service
+from app.services.score_leaderboard import score_leaderboard_service
+from app.services.scoring_engine import MODEL_VERSION, scoring_service
+from app.services.response_cache import cached_response, AREA_STATS
+from app.utils.state_mapper import canonical_state_code
 
 router = APIRouter()
 
+MAX_COMPUTE_PARCELS = 1000
+
 
 # ─── Schemas ────────────────────────────────────────────────────────────────
 
@@ -37,6 +45,10 @@ class ScoreResponse(BaseModel):
     updated_at: Optional[datetime]
 
 
+class ScoreComputeRequest(BaseModel):
+    parcel_ids: List[str]
+
+
 # ─── Endpoints ───────────────────────────────────────────────────────────────
 
 @router.post("/", response_model=dict)
@@ -106,6 +118,7 @@ def upsert_score(
                     "updated_at": now,
                 }
             )
+        score_leaderboard_service.refresh_parcels(db, [payload.parcel_id])
         db.commit()
     except Exception as e:
         db.rollback()
@@ -120,6 +133,46 @@ def upsert_score(
     }
 
 
+@router.post("/compute", response_model=List[dict])
+def compute_scores(
+    payload: ScoreComputeRequest,
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Scores the given parcels server-side with the shared scoring engine
+    (app.services.scoring_engine) and persists the results.
+    """
+    if len(payload.parcel_ids) > MAX_COMPUTE_PARCELS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_COMPUTE_PARCELS} parcel_ids per request")
+
+    scored = scoring_service.score_parcels(db, payload.parcel_ids)
+    db.commit()
+    return [
+        {
+            "parcel_id": r.parcel_id,
+            "deal_score": r.deal_score,
+            "rating": r.rating,
+            "score_factors": json.loads(r.score_factors),
+            "model_version": MODEL_VERSION,
+        }
+        for r in scored.itertuples()
+    ]
+
+
+@router.post("/recompute", response_model=dict)
+def recompute_scores(
+    force: bool = False,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Queues a batch scoring run (only unscored properties unless `force`)."""
+    if current_user.role not in ("admin", "superuser"):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from app.tasks import batch_score_properties_task
+    batch_score_properties_task.delay(force)
+    return {"message": "Scoring queued", "force": force}
+
+
 @router.get("/top", response_model=List[dict])
 def get_top_scores(
     db: Session = Depends(deps.get_db),
@@ -133,56 +186,16 @@ def get_top_scores(
     Optionally filter by state or minimum score.
     
     Strictly filters for 'available' status to ensure suggested 
-    deals are actionable for the user.
+    deals are actionable for the user. Reads the maintained
+    property_score_leaderboard (app.services.score_leaderboard).
     """
-    # Prefer status stored in property_scores, but fallback to property_details if null
-    # This aligns the dashboard with the user requirement to only show available deals.
-    where_clauses = ["1=1", "LOWER(TRIM(COALESCE(s.status, p.availability_status))) = 'available'"]
-    params: dict = {"limit": limit}
-
-    if min_score is not None:
-        where_clauses.append("s.deal_score >= :min_score")
-        params["min_score"] = min_score
+    state_code = None
     if state:
-        # Prefer the direct state property if possible
-        where_clauses.append("(s.state ILIKE :state OR p.state ILIKE :state)")
-        params["state"] = f"%{state}%"
-
-    where_str = " AND ".join(where_clauses)
-
-    query = text(f"""
-        SELECT
-            s.parcel_id,
-            s.deal_score,
-            s.rating,
-            s.score_factors,
-            s.model_version,
-            s.updated_at,
-            p.address,
-            COALESCE(s.county, p.county) as county,
-            COALESCE(s.state, p.state) as state,
-            p.amount_due,
-            p.assessed_value,
-            COALESCE(s.status, p.availability_status) as availability_status,
-            p.property_type,
-            p.lot_acres,
-            p.improvement_value,
-            p.owner_address
-        FROM property_scores s
-        JOIN property_details p ON p.parcel_id = s.parcel_id
-        WHERE {where_str}
-        ORDER BY 
-            CASE 
-                WHEN s.rating LIKE 'A%' THEN 1 
-                WHEN s.rating = 'B' THEN 2 
-                WHEN s.rating = 'C' THEN 3 
-                ELSE 4 
-            END ASC,
-            s.deal_score DESC
-        LIMIT :limit
-    """)
-
-    results = db.execute(query, params).fetchall()
+        state_code = canonical_state_code(state)
+        if not state_code:
+            return []
+
+    results = score_leaderboard_service.top(db, limit, state_code=state_code, min_score=min_score)
 
     return [
         {
@@ -223,7 +236,19 @@ def get_score(
     ).fetchone()
 
     if not result:
-        raise HTTPException(status_code=404, detail="No score found for this property. It will be computed on next detail page view.")
+        # Not scored yet: compute it now with the shared engine
+        scored = scoring_service.score_parcels(db, [parcel_id])
+        if scored.empty:
+            raise HTTPException(status_code=404, detail="Property not found")
+        db.commit()
+        result = db.execute(
+            text("""
+                SELECT parcel_id, deal_score, rating, score_factors, model_version, computed_at, updated_at
+                FROM property_scores
+                WHERE parcel_id = :parcel_id
+            """),
+            {"parcel_id": parcel_id}
+        ).fetchone()
 
     return {
         "parcel_id": result[0],
@@ -237,44 +262,16 @@ def get_score(
 
 
 @router.get("/stats/state", response_model=List[dict])
+@cached_response("area-stats", tags=[AREA_STATS])
 def get_state_stats(
     db: Session = Depends(deps.get_db),
 ) -> Any:
     """
     Returns aggregated deal quality and volume statistics per state.
     This replaces the expensive client-side looping logic for the Heatmap.
+    Served from the per-county rollup maintained by app.services.area_stats.
     """
-    query = text("""
-        SELECT 
-            p.state as state_code,
-            COUNT(*) as volume,
-            AVG(COALESCE(s.deal_score, 0)) as avg_score,
-            JSONB_BUILD_OBJECT(
-                'A', COUNT(*) FILTER (WHERE s.rating LIKE 'A%'),
-                'B', COUNT(*) FILTER (WHERE s.rating = 'B'),
-                'C', COUNT(*) FILTER (WHERE s.rating = 'C'),
-                'D', COUNT(*) FILTER (WHERE s.rating = 'D'),
-                'F', COUNT(*) FILTER (WHERE s.rating = 'F')
-            ) as distribution
-        FROM property_details p
-        LEFT JOIN property_scores s ON p.parcel_id = s.parcel_id
-        WHERE LOWER(TRIM(p.availability_status)) = 'available'
-          AND p.state IS NOT NULL
-        GROUP BY 1
-        ORDER BY volume DESC
-    """)
-
-    results = db.execute(query).fetchall()
-
-    return [
-        {
-            "state_code": r[0].upper() if r[0] else "Unknown",
-            "volume": r[1],
-            "average_score": float(r[2]) if r[2] is not None else 0.0,
-            "distribution": r[3] if r[3] else {"A": 0, "B": 0, "C": 0, "D": 0, "F": 0}
-        }
-        for r in results
-    ]
+    return area_stats_service.state_rollup(db)
 
 
 @router.get("/", response_model=List[dict])
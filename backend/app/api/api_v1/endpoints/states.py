@@ -1,22 +1,14 @@
 from typing import Any, List, Dict
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.api import deps
-from app.models.state_contact import StateContact
+from fastapi import APIRouter
+from app.services.geo_directory import geo_directory
+from app.services.response_cache import cached_response, STATE_CONTACTS
 
 router = APIRouter()
 
 @router.get("/contacts", response_model=List[Dict[str, str]])
-def get_state_contacts(db: Session = Depends(deps.get_db)) -> Any:
+@cached_response("state-contacts", tags=[STATE_CONTACTS], expire=24 * 3600)
+def get_state_contacts() -> Any:
     """
-    Retrieve contact information/urls for all states from the database.
+    Retrieve contact information/urls for all states from the geographic directory.
     """
-    contacts = db.query(StateContact).all()
-    results = [
-        {
-            "state": c.state,
-            "url": c.url or ""
-        }
-        for c in contacts
-    ]
-    return results
+    return geo_directory.state_contacts()
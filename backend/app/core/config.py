@@ -40,6 +40,37 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://redis:6379"
     ZENROWS_API_KEY: Optional[str] = None
     ATTOM_API_KEY: Optional[str] = None
+    # Point at a local stub server for tests and load runs
+    ATTOM_BASE_URL: str = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
+    # Batch enrichment: ATTOM calls per second (shared token bucket) and requests in flight
+    ATTOM_RATE_PER_SECOND: float = 10.0
+    ATTOM_MAX_CONCURRENCY: int = 8
+    # ATTOM response cache (app.services.attom_cache): matches, "no match" entries, per-process LRU size
+    ATTOM_CACHE_TTL_SECONDS: int = 60 * 24 * 60 * 60
+    ATTOM_CACHE_NEGATIVE_TTL_SECONDS: int = 3 * 24 * 60 * 60
+    ATTOM_CACHE_LRU_SIZE: int = 2048
+    # Plan price of one property/detail call, for the cache's spend-avoided figure
+    ATTOM_COST_PER_CALL: float = 0.0
+
+    # Geocoding (app.services.geocoding): Nominatim allows 1 request/s per application
+    GEOCODER_BASE_URL: str = "https://nominatim.openstreetmap.org"
+    GEOCODER_USER_AGENT: str = "GoAuct/1.0"
+    GEOCODER_RATE_PER_SECOND: float = 1.0
+    # Properties geocoded per batch run, and days before an unmatched address is tried again
+    GEOCODE_BATCH_LIMIT: int = 500
+    GEOCODE_NEGATIVE_RETRY_DAYS: int = 30
+
+    # Widest date window (days) one /auctions/calendar request may span
+    CALENDAR_MAX_DAYS: int = 366
+
+    # Rows per property CSV import chunk (one COPY + merge transaction each)
+    IMPORT_CHUNK_SIZE: int = 5000
+    # Byte size of the CSV partitions an import job fans out to workers
+    IMPORT_PARTITION_BYTES: int = 16 * 1024 * 1024
+    # Running import jobs without a checkpoint for this long are re-dispatched
+    IMPORT_STALL_SECONDS: int = 900
+    # Parcels rescored per batch when draining the dirty-score queue
+    RESCORE_BATCH_SIZE: int = 5000
 
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
 
@@ -6,6 +6,8 @@ from fastapi.encoders import jsonable_encoder
 from app.models.auction_event import AuctionEvent
 from app.models.property import PropertyDetails, PropertyAuctionHistory
 from app.schemas.auction_event import AuctionEventCreate, AuctionEventUpdate
+from app.services.response_cache import auction_change_tags, response_cache
+from app.utils.state_mapper import canonical_state_code, make_county_key
 
 class AuctionRepository:
     def get(self, db: Session, id: Any) -> Optional[AuctionEvent]:
@@ -88,94 +90,165 @@ class AuctionRepository:
             
         return results, total
 
-    def get_calendar_events(
-        self, db: Session,
+    def get_calendar(
+        self, db: Session, *,
+        start_date: date,
+        end_date: date,
+        granularity: str = "day",
         name: Optional[str] = None,
         state: Optional[str] = None,
         county: Optional[str] = None,
         is_presential: Optional[bool] = None,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None,
         q: Optional[str] = None,
-    ) -> List[Any]:
-        # Build dynamic WHERE clause
-        where_clauses = []
-        params = {}
-        
+        tax_status: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Calendar of auctions dated within [start_date, end_date]: per-day or
+        per-month buckets (count, parcels_count, available_count, split by
+        tax_status) plus one page of event detail. The date range leads the
+        (auction_date, state_code, county_key) index; state and county are
+        matched on their canonical keys when they resolve to a known state.
+        """
+        where_clauses = ["auction_date >= :start_date", "auction_date <= :end_date"]
+        params = {"start_date": start_date, "end_date": end_date}
+
         if name:
             where_clauses.append("(name ILIKE :name OR short_name ILIKE :name)")
             params['name'] = f"%{name}%"
-        if state:
+        state_code = canonical_state_code(state) if state else None
+        if state_code:
+            where_clauses.append("state_code = :state_code")
+            params['state_code'] = state_code
+        elif state:
             where_clauses.append("state ILIKE :state")
             params['state'] = f"%{state}%"
         if county:
-            where_clauses.append("county ILIKE :county")
-            params['county'] = f"%{county}%"
+            if state_code:
+                where_clauses.append("county_key = :county_key")
+                params['county_key'] = make_county_key(county)
+            else:
+                where_clauses.append("county ILIKE :county")
+                params['county'] = f"%{county}%"
         if is_presential is not None:
             if is_presential:
                 where_clauses.append("(location IS NOT NULL AND location != '' AND location NOT ILIKE '%online%')")
             else:
                 where_clauses.append("location ILIKE '%online%'")
-        if start_date:
-            where_clauses.append("auction_date >= :start_date")
-            params['start_date'] = start_date
-        if end_date:
-            where_clauses.append("auction_date <= :end_date")
-            params['end_date'] = end_date
-            
         if q:
             where_clauses.append("(name ILIKE :q OR short_name ILIKE :q OR county ILIKE :q OR state ILIKE :q OR location ILIKE :q OR notes ILIKE :q)")
             params['q'] = f"%{q}%"
+        if tax_status:
+            where_clauses.append("tax_status = :tax_status")
+            params['tax_status'] = tax_status
 
-        where_sql = ""
-        if where_clauses:
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-
-        query = text(f"""
-            SELECT 
-                id as auction_id,
-                name as event_title,
-                auction_date as event_date,
-                time as event_time,
-                location as event_location,
-                notes as event_notes,
+        where_sql = "WHERE " + " AND ".join(where_clauses)
+
+        # One row per (day, tax_status); months are folded here so the SQL stays dialect-neutral
+        daily = db.execute(text(f"""
+            SELECT
+                auction_date,
                 tax_status,
-                parcels_count as property_count,
-                '' as linked_properties,
-                '' as statuses,
-                register_link,
-                list_link
+                COUNT(*) AS count,
+                COALESCE(SUM(parcels_count), 0) AS parcels_count,
+                COALESCE(SUM(available_count), 0) AS available_count
             FROM auction_events
             {where_sql}
-            ORDER BY auction_date DESC
-        """)
-        
-        results = db.execute(query, params).fetchall()
-        return [dict(r._mapping) for r in results]
+            GROUP BY auction_date, tax_status
+        """), params).fetchall()
+
+        buckets = {}
+        for row in daily:
+            day = row.auction_date if isinstance(row.auction_date, date) else date.fromisoformat(str(row.auction_date)[:10])
+            period = day.isoformat() if granularity == "day" else day.strftime("%Y-%m")
+            bucket = buckets.setdefault(period, {
+                "period": period, "count": 0, "parcels_count": 0, "available_count": 0, "by_tax_status": {},
+            })
+            status_key = row.tax_status or "Other"
+            by_status = bucket["by_tax_status"].setdefault(status_key, {
+                "tax_status": status_key, "count": 0, "parcels_count": 0, "available_count": 0,
+            })
+            for field in ("count", "parcels_count", "available_count"):
+                bucket[field] += int(getattr(row, field))
+                by_status[field] += int(getattr(row, field))
+
+        bucket_list = []
+        for period in sorted(buckets):
+            bucket = buckets[period]
+            bucket["by_tax_status"] = sorted(bucket["by_tax_status"].values(), key=lambda b: b["tax_status"])
+            bucket_list.append(bucket)
+        total = sum(b["count"] for b in bucket_list)
+
+        events = []
+        if limit > 0 and skip < total:
+            rows = db.execute(text(f"""
+                SELECT
+                    id as auction_id,
+                    name as event_title,
+                    auction_date as event_date,
+                    time as event_time,
+                    location as event_location,
+                    notes as event_notes,
+                    state,
+                    county,
+                    tax_status,
+                    parcels_count as property_count,
+                    available_count,
+                    register_link,
+                    list_link
+                FROM auction_events
+                {where_sql}
+                ORDER BY auction_date, id
+                LIMIT :limit OFFSET :skip
+            """), {**params, "limit": limit, "skip": skip}).fetchall()
+            events = [dict(r._mapping) for r in rows]
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "granularity": granularity,
+            "buckets": bucket_list,
+            "totals": {
+                "count": total,
+                "parcels_count": sum(b["parcels_count"] for b in bucket_list),
+                "available_count": sum(b["available_count"] for b in bucket_list),
+            },
+            "events": events,
+            "total": total,
+        }
 
     def create(self, db: Session, *, obj_in: AuctionEventCreate) -> AuctionEvent:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = AuctionEvent(**obj_in_data)
+        db_obj.state_code = canonical_state_code(db_obj.state)
+        db_obj.county_key = make_county_key(db_obj.county)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        response_cache.invalidate(*auction_change_tags(db_obj.state))
         return db_obj
 
     def update(self, db: Session, *, db_obj: AuctionEvent, obj_in: AuctionEventUpdate) -> AuctionEvent:
         obj_data = jsonable_encoder(db_obj)
+        previous_state = db_obj.state
         update_data = obj_in.dict(exclude_unset=True)
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
+        db_obj.state_code = canonical_state_code(db_obj.state)
+        db_obj.county_key = make_county_key(db_obj.county)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        response_cache.invalidate(*auction_change_tags(previous_state, db_obj.state))
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> AuctionEvent:
         obj = db.query(AuctionEvent).get(id)
         db.delete(obj)
         db.commit()
+        response_cache.invalidate(*auction_change_tags(obj.state))
         return obj
 
 auction_repo = AuctionRepository()
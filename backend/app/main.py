@@ -18,17 +18,6 @@ from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
 from contextlib import asynccontextmanager
 
-import asyncio
-from app.services.status_updater import transition_past_auctions
-
-async def run_daily_task():
-    while True:
-        try:
-            await asyncio.to_thread(transition_past_auctions)
-        except Exception as e:
-            print(f"Error in daily background task: {e}")
-        await asyncio.sleep(3600)  # Run every 1 hour
-
 
 def run_safe_migrations():
     """
@@ -112,12 +101,11 @@ async def lifespan(app: FastAPI):
     redis = aioredis.from_url(settings.REDIS_URL)
     FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
 
-    task = asyncio.create_task(run_daily_task())
+    # Past-auction status transitions are scheduled by Celery beat only
+    # (app.tasks.reconcile_property_statuses_task), not in every API worker.
 
     yield
 
-    task.cancel()
-
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
@@ -1,9 +1,17 @@
 from datetime import date, datetime
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime
+from sqlalchemy import Column, Integer, String, Date, Text, DateTime, Index
 from app.db.base_class import Base
 
 class AuctionEvent(Base):
     __tablename__ = "auction_events"
+    __table_args__ = (
+        Index("ix_auction_events_state_county_date", "state_code", "county_key", "auction_date"),
+        # Date-window calendar scans and the per-chunk date lookup of the auction CSV importer
+        Index(
+            "ix_auction_events_date_state_county", "auction_date", "state_code", "county_key",
+            postgresql_include=["tax_status", "parcels_count", "available_count"],
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -14,6 +22,9 @@ class AuctionEvent(Base):
     county = Column(String(100), nullable=True)
     county_code = Column(String(50), nullable=True)
     state = Column(String(100), nullable=True)
+    # Canonical keys populated from state/county (see app.utils.state_mapper)
+    state_code = Column(String(2), nullable=True)
+    county_key = Column(String(100), nullable=True)
     tax_status = Column(String(100), nullable=True)
     parcels_count = Column(Integer, nullable=True, default=0)
     available_count = Column(Integer, nullable=True, default=0)
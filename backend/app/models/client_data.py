@@ -22,6 +22,9 @@ class ClientList(Base):
     tags = Column(String(500), nullable=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Summary counters maintained by app.services.client_lists
+    property_count = Column(Integer, nullable=False, default=0, server_default="0")
+    upcoming_auctions_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Use backref (one-sided) to avoid conflicts with User model
     user = relationship("User", backref="client_lists_rel", foreign_keys=[user_id])
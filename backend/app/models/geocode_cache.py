@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Text, DateTime
+from app.db.base_class import Base
+
+
+class GeocodeCache(Base):
+    """
+    Persistent Nominatim results keyed by the normalized query string (see
+    app.services.geocoding.normalize_address). status 'not_found' rows are
+    negative entries, retried after GEOCODE_NEGATIVE_RETRY_DAYS.
+    """
+    __tablename__ = "geocode_cache"
+
+    query_key = Column(String(40), primary_key=True)    # sha1 of `query`
+    query = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False)          # found, not_found
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    display_name = Column(Text, nullable=True)
+    state = Column(String(100), nullable=True)
+    county = Column(String(100), nullable=True)
+    city = Column(String(100), nullable=True)
+    zip_code = Column(String(20), nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from app.db.base_class import Base
+
+
+class MeteringFlushBatch(Base):
+    """
+    One row per pending-count batch written to `users` by
+    MeteringService.flush_pending. Inserted in the same transaction as the
+    increments, so a batch retried after its Redis cleanup failed is not
+    applied twice. Rows older than FLUSH_BATCH_RETENTION are pruned.
+    """
+    __tablename__ = "metering_flush_batches"
+
+    batch_id = Column(String(32), primary_key=True)
+    meter = Column(String(50), nullable=False)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
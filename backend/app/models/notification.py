@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # One generated alert per user/property/type/day; NULL dedup_date (ad-hoc notifications) never conflicts
+        Index("uq_notifications_dedup", "user_id", "property_id", "type", "dedup_date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -16,3 +20,4 @@ class Notification(Base):
     auction_id = Column(Integer, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    dedup_date = Column(Date, nullable=True)
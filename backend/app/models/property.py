@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime, date
-from sqlalchemy import Column, String, Integer, Float, Boolean, Text, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, Date, DateTime, ForeignKey, UniqueConstraint, Index, Computed
 from app.db.base_class import Base
 
 class PropertyDetails(Base):
     __tablename__ = "property_details"
+    __table_args__ = (
+        Index("ix_property_details_state_county_availability", "state_code", "county_key", "availability"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     property_id = Column(String(36), unique=True, index=True, nullable=False)
@@ -28,6 +31,8 @@ class PropertyDetails(Base):
     public_photos = Column(Text, nullable=True)
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    # Last batch geocoding attempt (app.services.geocoding); unmatched rows wait before a retry
+    geocode_attempted_at = Column(DateTime, nullable=True)
     
     bedrooms = Column(Integer, nullable=True)
     bathrooms = Column(Float, nullable=True)
@@ -73,6 +78,11 @@ class PropertyDetails(Base):
     property_category = Column(String(255), nullable=True)
     purchase_option_type = Column(String(255), nullable=True)
     availability_status = Column(String(50), nullable=True, default="available", index=True)
+
+    # Canonical, index-friendly location/availability keys (see app.utils.state_mapper)
+    state_code = Column(String(2), nullable=True)
+    county_key = Column(String(100), nullable=True)
+    availability = Column(String(50), Computed("LOWER(TRIM(availability_status))", persisted=True), index=True)
     
     # New Fields for Extended Detail View
     alternate_owner_address = Column(String(255), nullable=True)
@@ -101,6 +111,10 @@ class PropertyDetails(Base):
     owner_occupied = Column(String(20), nullable=True)
     apn_unformatted = Column(String(100), nullable=True)
 
+    # Keyword search (see app.services.property_search); trigram-indexed in PostgreSQL
+    search_document = Column(Text, nullable=True)
+    parcel_key = Column(String(400), nullable=True)
+
 
 
 class PropertyAuctionHistory(Base):
@@ -121,6 +135,25 @@ class PropertyAuctionHistory(Base):
     list_link = Column(String(2048), nullable=True)
     created_at = Column(DateTime, nullable=True)
 
+class PropertyCurrentAuction(Base):
+    """
+    Maintained projection of the latest property_auction_history row per property.
+    Replaces the DISTINCT ON subquery in property search; kept in sync by
+    app.services.current_auction_service.
+    """
+    __tablename__ = "property_current_auction"
+
+    property_id = Column(String(36), primary_key=True)
+    auction_id = Column(Integer, ForeignKey("auction_events.id", ondelete="SET NULL"), nullable=True, index=True)
+    auction_name = Column(String(255), nullable=True)
+    auction_date = Column(Date, nullable=True, index=True)
+    location = Column(String(255), nullable=True)
+    listed_as = Column(String(255), nullable=True)
+    taxes_due = Column(Float, nullable=True)
+    info_link = Column(String(2048), nullable=True)
+    list_link = Column(String(2048), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class PropertyAvailabilityHistory(Base):
     __tablename__ = "property_availability_history"
 
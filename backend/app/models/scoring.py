@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Text, DateTime, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, SmallInteger, UniqueConstraint, Index
 from app.db.base_class import Base
 
 
@@ -27,3 +27,51 @@ class PropertyScore(Base):
     model_version = Column(String(50), nullable=False, default="rule-based-v1")
     computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class PropertyScoreLeaderboard(Base):
+    """
+    Maintained "top deals" projection: one row per scored property that is
+    currently available. `tier` is the rating bucket used by /scores/top
+    (3 = A/A+, 2 = B, 1 = C, 0 = other), so both leaderboards are read in index
+    order. Kept in sync by app.services.score_leaderboard.
+    """
+    __tablename__ = "property_score_leaderboard"
+    __table_args__ = (
+        Index("ix_property_score_leaderboard_state_rank", "state_code", "tier", "deal_score"),
+        Index("ix_property_score_leaderboard_rank", "tier", "deal_score"),
+    )
+
+    parcel_id = Column(String(100), primary_key=True)
+    state_code = Column(String(2), nullable=True)
+    tier = Column(SmallInteger, nullable=False)
+    deal_score = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class PropertyAreaStats(Base):
+    """
+    Per-county rollup of available properties and their scores, summed up per
+    state for the heatmap and read directly for county valuation metrics.
+    Stores sums and counts so state totals stay exact. county_key is '' for
+    properties without a county. Kept in sync by app.services.area_stats.
+    """
+    __tablename__ = "property_area_stats"
+
+    state_code = Column(String(2), primary_key=True)
+    county_key = Column(String(100), primary_key=True)
+    volume = Column(Integer, nullable=False, default=0)           # available properties
+    score_sum = Column(Float, nullable=False, default=0)          # unscored count as 0
+    rating_a = Column(Integer, nullable=False, default=0)         # A and A+
+    rating_b = Column(Integer, nullable=False, default=0)
+    rating_c = Column(Integer, nullable=False, default=0)
+    rating_d = Column(Integer, nullable=False, default=0)
+    rating_f = Column(Integer, nullable=False, default=0)
+    # Valuation comps: available properties with assessed_value > 0
+    sample_size = Column(Integer, nullable=False, default=0)
+    arv_sum = Column(Float, nullable=False, default=0)
+    improvement_sum = Column(Float, nullable=False, default=0)
+    improvement_count = Column(Integer, nullable=False, default=0)
+    tax_due_sum = Column(Float, nullable=False, default=0)
+    tax_due_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel
 
@@ -39,3 +39,46 @@ class AuctionEvent(AuctionEventBase):
 class PaginatedAuctionResponse(BaseModel):
     items: list[AuctionEvent]
     total: int
+
+class CalendarTaxStatusBucket(BaseModel):
+    tax_status: str
+    count: int
+    parcels_count: int
+    available_count: int
+
+class CalendarBucket(BaseModel):
+    # "YYYY-MM-DD" for day buckets, "YYYY-MM" for month buckets
+    period: str
+    count: int
+    parcels_count: int
+    available_count: int
+    by_tax_status: List[CalendarTaxStatusBucket]
+
+class CalendarTotals(BaseModel):
+    count: int
+    parcels_count: int
+    available_count: int
+
+class CalendarEvent(BaseModel):
+    auction_id: int
+    event_title: str
+    event_date: date
+    event_time: Optional[str] = None
+    event_location: Optional[str] = None
+    event_notes: Optional[str] = None
+    state: Optional[str] = None
+    county: Optional[str] = None
+    tax_status: Optional[str] = None
+    property_count: Optional[int] = 0
+    available_count: Optional[int] = 0
+    register_link: Optional[str] = None
+    list_link: Optional[str] = None
+
+class AuctionCalendarResponse(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: str
+    buckets: List[CalendarBucket]
+    totals: CalendarTotals
+    events: List[CalendarEvent]
+    total: int
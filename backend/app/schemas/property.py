@@ -154,4 +154,6 @@ class PropertyDashboardSchema(BaseModel):
 
 class PaginatedPropertyResponse(BaseModel):
     items: List[PropertyDashboardSchema]
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
@@ -0,0 +1,173 @@
+"""
+Maintains property_area_stats, the per-(state_code, county_key) rollup behind
+GET /scores/stats/state and GET /properties/valuation/metrics.
+
+Writers mark the areas they touch (the scoring path marks the areas of every
+scored batch, which covers imports, edits and status transitions since those
+are rescored through the dirty-score queue). refresh_area_stats_task
+re-aggregates only the marked areas, each from the
+(state_code, county_key, availability) index; a nightly rebuild corrects any
+drift (e.g. a property moved to another county).
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text, bindparam
+
+from app.services.import_service import redis
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "area_stats:dirty"
+AREAS_PER_BATCH = 200
+
+STATS_COLUMNS = [
+    "state_code", "county_key", "volume", "score_sum", "rating_a", "rating_b", "rating_c", "rating_d",
+    "rating_f", "sample_size", "arv_sum", "improvement_sum", "improvement_count", "tax_due_sum",
+    "tax_due_count", "updated_at",
+]
+
+_AGGREGATE_SELECT = """
+    SELECT
+        p.state_code,
+        COALESCE(p.county_key, ''),
+        COUNT(*),
+        COALESCE(SUM(s.deal_score), 0),
+        SUM(CASE WHEN s.rating LIKE 'A%' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN s.rating = 'B' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN s.rating = 'C' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN s.rating = 'D' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN s.rating = 'F' THEN 1 ELSE 0 END),
+        SUM(CASE WHEN p.assessed_value > 0 THEN 1 ELSE 0 END),
+        COALESCE(SUM(CASE WHEN p.assessed_value > 0 THEN p.assessed_value END), 0),
+        COALESCE(SUM(CASE WHEN p.assessed_value > 0 AND p.improvement_value <> 0 THEN p.improvement_value END), 0),
+        SUM(CASE WHEN p.assessed_value > 0 AND p.improvement_value <> 0 THEN 1 ELSE 0 END),
+        COALESCE(SUM(CASE WHEN p.assessed_value > 0 AND p.amount_due <> 0 THEN p.amount_due END), 0),
+        SUM(CASE WHEN p.assessed_value > 0 AND p.amount_due <> 0 THEN 1 ELSE 0 END),
+        :now
+    FROM property_details p
+    LEFT JOIN property_scores s ON s.parcel_id = p.parcel_id
+    WHERE p.availability = 'available'
+      AND p.state_code IS NOT NULL
+      {where}
+    GROUP BY p.state_code, COALESCE(p.county_key, '')
+"""
+
+_INSERT = f"INSERT INTO property_area_stats ({', '.join(STATS_COLUMNS)}) {{select}}"
+
+
+def _area_member(state_code: str, county_key: Optional[str]) -> str:
+    return f"{state_code}|{county_key or ''}"
+
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class AreaStatsService:
+    """Methods taking `conn` accept either a Session or a Connection."""
+
+    @staticmethod
+    def mark_areas(areas: Iterable[Tuple[Optional[str], Optional[str]]]) -> int:
+        """Queues (state_code, county_key) areas for re-aggregation. Never raises."""
+        members = list({_area_member(s, c) for s, c in areas if s})
+        if not members:
+            return 0
+        try:
+            redis.sadd(DIRTY_KEY, *members)
+        except Exception as e:
+            logger.error(f"Could not queue {len(members)} areas for stats refresh: {e}")
+            return 0
+        return len(members)
+
+    @staticmethod
+    def mark_parcels(conn, parcel_ids: Iterable[str]) -> int:
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return 0
+        rows = conn.execute(
+            text("SELECT DISTINCT state_code, county_key FROM property_details WHERE parcel_id IN :parcels").bindparams(
+                bindparam("parcels", expanding=True)
+            ),
+            {"parcels": parcels}
+        ).fetchall()
+        return AreaStatsService.mark_areas((r[0], r[1]) for r in rows)
+
+    @staticmethod
+    def refresh_areas(conn, areas: Iterable[Tuple[str, str]]) -> int:
+        """Re-aggregates the given areas; areas without available properties are removed."""
+        now = datetime.utcnow()
+        count = 0
+        for state_code, county_key in set(areas):
+            county_where = "AND p.county_key = :county_key" if county_key else "AND p.county_key IS NULL"
+            params = {"state_code": state_code, "county_key": county_key or "", "now": now}
+            conn.execute(text(
+                "DELETE FROM property_area_stats WHERE state_code = :state_code AND county_key = :county_key"
+            ), params)
+            select_sql = _AGGREGATE_SELECT.format(where=f"AND p.state_code = :state_code {county_where}")
+            count += conn.execute(text(_INSERT.format(select=select_sql)), params).rowcount
+        return count
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        conn.execute(text("DELETE FROM property_area_stats"))
+        return conn.execute(
+            text(_INSERT.format(select=_AGGREGATE_SELECT.format(where=""))), {"now": datetime.utcnow()}
+        ).rowcount
+
+    @staticmethod
+    def drain(engine, batch_size: int = AREAS_PER_BATCH) -> int:
+        """Refreshes every queued area, one transaction per batch; failed batches are requeued."""
+        refreshed = 0
+        while True:
+            members = [_decode(m) for m in redis.spop(DIRTY_KEY, batch_size) or []]
+            if not members:
+                return refreshed
+            areas = [tuple(m.split("|", 1)) for m in members]
+            try:
+                with engine.begin() as conn:
+                    AreaStatsService.refresh_areas(conn, areas)
+            except Exception as e:
+                logger.error(f"Refreshing {len(areas)} area stats failed, requeueing: {e}")
+                AreaStatsService.mark_areas(areas)
+                return refreshed
+            refreshed += len(areas)
+
+    @staticmethod
+    def state_rollup(conn) -> List[Dict]:
+        rows = conn.execute(text("""
+            SELECT state_code, SUM(volume), SUM(score_sum),
+                   SUM(rating_a), SUM(rating_b), SUM(rating_c), SUM(rating_d), SUM(rating_f)
+            FROM property_area_stats
+            GROUP BY state_code
+            ORDER BY SUM(volume) DESC
+        """)).fetchall()
+        return [
+            {
+                "state_code": r[0],
+                "volume": int(r[1]),
+                "average_score": float(r[2]) / r[1] if r[1] else 0.0,
+                "distribution": {"A": int(r[3]), "B": int(r[4]), "C": int(r[5]), "D": int(r[6]), "F": int(r[7])},
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def county_valuation(conn, state_code: str, county_key: Optional[str]) -> Optional[Dict]:
+        row = conn.execute(text("""
+            SELECT sample_size, arv_sum, improvement_sum, improvement_count, tax_due_sum, tax_due_count
+            FROM property_area_stats
+            WHERE state_code = :state_code AND county_key = :county_key
+        """), {"state_code": state_code, "county_key": county_key or ""}).fetchone()
+        if not row or not row[0]:
+            return None
+        return {
+            "avg_arv": row[1] / row[0],
+            "avg_improvement": row[2] / row[3] if row[3] else None,
+            "avg_tax_due": row[4] / row[5] if row[5] else None,
+            "sample_size": int(row[0]),
+        }
+
+
+area_stats_service = AreaStatsService()
@@ -0,0 +1,266 @@
+"""
+Bulk ATTOM enrichment for an auction or a list of parcels.
+
+Lookups run concurrently on one httpx.AsyncClient. Every request takes a token
+from a shared bucket first (ATTOM_RATE_PER_SECOND), so the job stays under the
+plan's rate however many requests are in flight (ATTOM_MAX_CONCURRENCY). A
+circuit breaker opens after consecutive 429/5xx/transport failures (or
+rejected requests, e.g. a bad API key) and fails
+the remaining lookups fast until a half-open probe succeeds. Responses already
+in the ATTOM cache (app.services.attom_cache, shared with enrich_property) are
+resolved up front, "no match" entries included; stale entries are fetched
+again inline. Mapped fields are written with bulk UPDATEs per chunk.
+
+ATTOM_BASE_URL can point at a local stub server for tests and load runs.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.property import PropertyDetails, PropertyAuctionHistory
+from app.services.attom_cache import attom_cache
+from app.services.attom_enrichment import build_lookup, get_missing_fields, is_no_match, map_attom_to_db
+from app.services.property_search import DOCUMENT_COLUMNS, property_search_service
+from app.services.rescore_queue import rescore_queue_service
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 1.0
+WRITE_CHUNK = 500
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    async def acquire(self) -> None:
+        """
+        Reserves the next token and sleeps until it is due. The balance may go
+        negative, so concurrent callers queue behind each other instead of
+        racing for the same refill.
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout` seconds, admitting a single probe whose
+    outcome closes or re-opens the circuit.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError("ATTOM circuit open")
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.state == self.HALF_OPEN:
+            if self.probing:
+                raise CircuitOpenError("ATTOM circuit half-open, probe in flight")
+            self.probing = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"ATTOM circuit opened after {self.failures} consecutive failures.")
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+            self.probing = False
+
+
+class AttomBatchService:
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        rate_per_second: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        backoff_seconds: float = BACKOFF_SECONDS,
+    ):
+        self.base_url = base_url or settings.ATTOM_BASE_URL
+        self.api_key = api_key or settings.ATTOM_API_KEY
+        self.rate_per_second = rate_per_second or settings.ATTOM_RATE_PER_SECOND
+        self.max_concurrency = max_concurrency or settings.ATTOM_MAX_CONCURRENCY
+        self.breaker = breaker or CircuitBreaker()
+        self.backoff_seconds = backoff_seconds
+
+    @staticmethod
+    def load_properties(db: Session, auction_id: Optional[int] = None, parcel_ids: Optional[Iterable[str]] = None) -> List[PropertyDetails]:
+        query = db.query(PropertyDetails)
+        if auction_id is not None:
+            query = query.filter(PropertyDetails.property_id.in_(
+                select(PropertyAuctionHistory.property_id).where(PropertyAuctionHistory.auction_id == auction_id)
+            ))
+        if parcel_ids is not None:
+            query = query.filter(PropertyDetails.parcel_id.in_(list(parcel_ids)))
+        return query.order_by(PropertyDetails.id).all()
+
+    async def _lookup(self, client: httpx.AsyncClient, bucket: TokenBucket, params: Dict[str, Any]) -> Optional[Dict]:
+        """One ATTOM lookup with retries; None when ATTOM has no match."""
+        for attempt in range(MAX_ATTEMPTS):
+            self.breaker.before_call()
+            await bucket.acquire()
+            try:
+                response = await client.get("/property/detail", params=params)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"ATTOM transport error ({e}); retrying.")
+                await asyncio.sleep(self.backoff_seconds * 2 ** attempt)
+                continue
+
+            if response.status_code == 429 or response.status_code >= 500:
+                self.breaker.record_failure()
+                if attempt == MAX_ATTEMPTS - 1:
+                    response.raise_for_status()
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff_seconds * 2 ** attempt
+                await asyncio.sleep(delay)
+                continue
+
+            if is_no_match(response):
+                self.breaker.record_success()
+                return None
+            if response.is_error:
+                # Malformed request or rejected key: an error, never a cached "no match"
+                self.breaker.record_failure()
+                response.raise_for_status()
+            self.breaker.record_success()
+            data = response.json()
+            return data if data.get("property") else None
+
+    async def fetch_all(self, lookups: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fetches every cache_key -> params lookup concurrently. Values are the
+        ATTOM payload, None (no match) or the exception that ended the lookup.
+        """
+        bucket = TokenBucket(self.rate_per_second)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results: Dict[str, Any] = {}
+        headers = {"Accept": "application/json", "apikey": self.api_key or ""}
+
+        async with httpx.AsyncClient(base_url=self.base_url, headers=headers, timeout=10) as client:
+            async def run(cache_key: str, params: Dict[str, Any]):
+                async with semaphore:
+                    try:
+                        results[cache_key] = await self._lookup(client, bucket, params)
+                    except Exception as e:
+                        results[cache_key] = e
+
+            await asyncio.gather(*(run(k, p) for k, p in lookups.items()))
+        return results
+
+    @staticmethod
+    def _cached(keys: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fresh cached payloads (None = cached no match); stale entries count as misses."""
+        return {k: e.payload for k, e in attom_cache.get_many(keys).items() if not e.stale}
+
+    @staticmethod
+    def _store(fetched: Dict[str, Any]) -> None:
+        attom_cache.set_many({k: v for k, v in fetched.items() if not isinstance(v, Exception)})
+
+    def run(self, db: Session, auction_id: Optional[int] = None, parcel_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Enriches the selected properties; returns counts and throughput."""
+        started = time.perf_counter()
+        stats = {
+            "total": 0, "enriched": 0, "no_data": 0, "skipped": 0, "errors": 0,
+            "circuit_open": 0, "cache_hits": 0, "api_calls": 0,
+        }
+
+        targets = []  # (prop, missing_fields, cache_key)
+        lookups: Dict[str, Dict[str, Any]] = {}
+        for prop in self.load_properties(db, auction_id, parcel_ids):
+            stats["total"] += 1
+            missing = get_missing_fields(prop)
+            lookup = build_lookup(prop) if missing else None
+            if lookup is None:
+                stats["skipped"] += 1
+                continue
+            cache_key, params = lookup
+            targets.append((prop, missing, cache_key))
+            lookups[cache_key] = params
+
+        payloads: Dict[str, Any] = self._cached(list(lookups))
+        stats["cache_hits"] = len(payloads)
+        misses = {k: p for k, p in lookups.items() if k not in payloads}
+        if misses:
+            fetched = asyncio.run(self.fetch_all(misses))
+            self._store(fetched)
+            payloads.update(fetched)
+            stats["api_calls"] = len(misses)
+
+        updates = []
+        for prop, missing, cache_key in targets:
+            payload = payloads.get(cache_key)
+            if isinstance(payload, CircuitOpenError):
+                stats["circuit_open"] += 1
+            elif isinstance(payload, Exception):
+                stats["errors"] += 1
+            else:
+                update_data = map_attom_to_db(payload, prop, missing) if payload else {}
+                if update_data:
+                    updates.append((prop.parcel_id, {"id": prop.id, **update_data}))
+                else:
+                    stats["no_data"] += 1
+
+        for i in range(0, len(updates), WRITE_CHUNK):
+            chunk = updates[i:i + WRITE_CHUNK]
+            db.bulk_update_mappings(PropertyDetails, [mapping for _, mapping in chunk])
+            # e.g. legal_description feeds the keyword search document
+            property_search_service.refresh_by_parcel_ids(
+                db, [parcel for parcel, mapping in chunk if any(col in mapping for col in DOCUMENT_COLUMNS)]
+            )
+            db.commit()
+            rescore_queue_service.mark_dirty(parcel for parcel, _ in chunk)
+            stats["enriched"] += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["lookups_per_second"] = round(stats["api_calls"] / elapsed, 2) if elapsed else 0.0
+        logger.info(f"ATTOM batch enrichment (auction_id={auction_id}): {stats}")
+        return stats
+
+
+attom_batch_service = AttomBatchService()
@@ -0,0 +1,291 @@
+"""
+Tiered cache for ATTOM property/detail responses, shared by enrich_property and
+the batch enrichment job (app.services.attom_batch).
+
+L1 is a small per-process LRU of decoded payloads, so repeated reads in one
+worker skip Redis and JSON parsing. L2 is Redis, holding zlib-compressed JSON
+envelopes {"v": payload, "at": stored_at}. A payload of None is a negative
+entry (ATTOM had no match); it lives for ATTOM_CACHE_NEGATIVE_TTL_SECONDS
+instead of the full TTL, so unmatched parcels stop costing a call per click
+without hiding a record ATTOM adds later.
+
+Entries in the last REFRESH_FRACTION of their TTL are returned flagged stale:
+the caller still uses them and queues one background refresh per key
+(refresh_attom_cache_task, guarded by a SET NX marker).
+
+Hit/miss/byte counters accumulate per process and are flushed with HINCRBY to
+STATS_KEY on the next Redis round trip; stats() reports them with the calls
+and spend (ATTOM_COST_PER_CALL) avoided.
+"""
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.services.import_service import redis
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "attom:cache:stats"
+REFRESH_MARKER = "attom:cache:refreshing:{}"
+REFRESH_MARKER_SECONDS = 15 * 60
+REFRESH_FRACTION = 0.1
+# L1-only traffic is flushed to Redis after this many unreported events
+FLUSH_EVERY = 100
+
+COUNTERS = (
+    "l1_hits", "l2_hits", "negative_hits", "stale_hits", "misses",
+    "writes", "negative_writes", "bytes_read", "bytes_written", "refreshes_queued",
+)
+
+
+@dataclass
+class CacheEntry:
+    # ATTOM payload, or None for a cached "no match"
+    payload: Optional[Dict[str, Any]]
+    stored_at: float
+    stale: bool = False
+
+
+class LRUCache:
+    """Thread-safe LRU of key -> (payload, stored_at)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def encode(payload: Optional[Dict[str, Any]], stored_at: float) -> bytes:
+    raw = json.dumps({"v": payload, "at": stored_at}, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, 6)
+
+
+def decode(raw: bytes, now: float):
+    """Returns (payload, stored_at); plain JSON written before compression counts as fresh."""
+    try:
+        envelope = json.loads(zlib.decompress(raw))
+        return envelope["v"], envelope["at"]
+    except zlib.error:
+        return json.loads(raw), now
+
+
+class AttomCache:
+
+    def __init__(
+        self,
+        redis_client=None,
+        ttl_seconds: Optional[int] = None,
+        negative_ttl_seconds: Optional[int] = None,
+        lru_size: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds or settings.ATTOM_CACHE_TTL_SECONDS
+        self.negative_ttl_seconds = negative_ttl_seconds or settings.ATTOM_CACHE_NEGATIVE_TTL_SECONDS
+        self.lru = LRUCache(settings.ATTOM_CACHE_LRU_SIZE if lru_size is None else lru_size)
+        self.clock = clock
+        self._pending = dict.fromkeys(COUNTERS, 0)
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    def _ttl(self, payload: Optional[Dict[str, Any]]) -> int:
+        return self.ttl_seconds if payload is not None else self.negative_ttl_seconds
+
+    def _entry(self, payload, stored_at: float, now: float) -> Optional[CacheEntry]:
+        """None once the entry has outlived its TTL (L1 copies only; Redis expires its own)."""
+        ttl = self._ttl(payload)
+        age = now - stored_at
+        if age >= ttl:
+            return None
+        return CacheEntry(payload, stored_at, stale=age >= ttl * (1 - REFRESH_FRACTION))
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                self._pending[name] += delta
+                self._unflushed += delta
+
+    def _drain(self) -> Dict[str, int]:
+        with self._lock:
+            pending = {k: v for k, v in self._pending.items() if v}
+            self._pending = dict.fromkeys(COUNTERS, 0)
+            self._unflushed = 0
+        return pending
+
+    def _queue_counters(self, pipe) -> None:
+        for name, delta in self._drain().items():
+            pipe.hincrby(STATS_KEY, name, delta)
+
+    def flush_counters(self) -> None:
+        if not self.redis:
+            return
+        pending = self._drain()
+        if not pending:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for name, delta in pending.items():
+                pipe.hincrby(STATS_KEY, name, delta)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Erro ao gravar contadores do cache ATTOM: {e}")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        """Cached entries for `keys`; keys missing from the result are misses."""
+        now = self.clock()
+        found: Dict[str, CacheEntry] = {}
+        remote = []
+        for key in dict.fromkeys(keys):
+            local = self.lru.get(key)
+            entry = self._entry(*local, now) if local else None
+            if entry is not None:
+                found[key] = entry
+            else:
+                remote.append(key)
+        l1_hits = len(found)
+
+        bytes_read = 0
+        if remote and self.redis:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.mget(remote)
+                self._queue_counters(pipe)
+                values = pipe.execute()[0]
+            except Exception as e:
+                logger.error(f"Erro ao ler do Redis: {e}")
+                values = [None] * len(remote)
+            for key, raw in zip(remote, values):
+                if not raw:
+                    continue
+                try:
+                    payload, stored_at = decode(raw, now)
+                except ValueError:
+                    logger.warning(f"Entrada de cache ATTOM ilegível: {key}")
+                    continue
+                bytes_read += len(raw)
+                self.lru.set(key, (payload, stored_at))
+                # Redis owns the expiry; a copy read from it is never expired here
+                found[key] = self._entry(payload, stored_at, now) or CacheEntry(payload, stored_at, stale=True)
+
+        self._count(
+            l1_hits=l1_hits,
+            l2_hits=len(found) - l1_hits,
+            negative_hits=sum(1 for e in found.values() if e.payload is None),
+            stale_hits=sum(1 for e in found.values() if e.stale),
+            misses=len(remote) - (len(found) - l1_hits),
+            bytes_read=bytes_read,
+        )
+        if not remote and self._unflushed >= FLUSH_EVERY:
+            self.flush_counters()
+        return found
+
+    def set(self, key: str, payload: Optional[Dict[str, Any]]) -> None:
+        self.set_many({key: payload})
+
+    def set_many(self, items: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Stores payloads (None = no match) in both tiers with their TTLs."""
+        if not items:
+            return
+        now = self.clock()
+        encoded = {}
+        for key, payload in items.items():
+            self.lru.set(key, (payload, now))
+            encoded[key] = (encode(payload, now), self._ttl(payload))
+        self._count(
+            writes=len(items),
+            negative_writes=sum(1 for p in items.values() if p is None),
+            bytes_written=sum(len(raw) for raw, _ in encoded.values()),
+        )
+        if not self.redis:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, (raw, ttl) in encoded.items():
+                pipe.setex(key, ttl, raw)
+            self._queue_counters(pipe)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Erro ao gravar no Redis: {e}")
+
+    def claim_refresh(self, key: str) -> bool:
+        """True for the one caller that should queue the background refresh of `key`."""
+        if not self.redis:
+            return False
+        try:
+            claimed = bool(self.redis.set(REFRESH_MARKER.format(key), 1, nx=True, ex=REFRESH_MARKER_SECONDS))
+        except Exception as e:
+            logger.error(f"Erro ao marcar refresh no Redis: {e}")
+            return False
+        if claimed:
+            self._count(refreshes_queued=1)
+        return claimed
+
+    def schedule_refresh(self, key: str, params: Dict[str, Any]) -> None:
+        if self.claim_refresh(key):
+            from app.tasks import refresh_attom_cache_task
+            refresh_attom_cache_task.delay(key, params)
+
+    def stats(self) -> Dict[str, Any]:
+        """Fleet-wide counters (Redis) plus this process's L1 size."""
+        self.flush_counters()
+        counters = dict.fromkeys(COUNTERS, 0)
+        if self.redis:
+            try:
+                for name, value in self.redis.hgetall(STATS_KEY).items():
+                    name = name.decode() if isinstance(name, bytes) else name
+                    if name in counters:
+                        counters[name] = int(value)
+            except Exception as e:
+                logger.error(f"Erro ao ler contadores do cache ATTOM: {e}")
+
+        hits = counters["l1_hits"] + counters["l2_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            # Every hit, negative ones included, is an ATTOM call not made
+            "api_calls_avoided": hits,
+            "spend_avoided": round(hits * settings.ATTOM_COST_PER_CALL, 2),
+            "avg_entry_bytes": round(counters["bytes_written"] / counters["writes"]) if counters["writes"] else 0,
+            "l1_entries": len(self.lru),
+        }
+
+
+attom_cache = AttomCache(redis)
@@ -1,11 +1,9 @@
 import os
-import json
 import logging
 import hashlib
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
-import redis
 import requests
 from sqlalchemy.orm import Session
 from sqlalchemy import update
@@ -14,6 +12,9 @@ from fastapi import HTTPException
 
 # Assuming the model is imported from here based on the standard project structure
 from app.models.property import PropertyDetails
+from app.services.attom_cache import attom_cache
+from app.services.property_search import DOCUMENT_COLUMNS, property_search_service
+from app.services.rescore_queue import rescore_queue_service
 
 # Configuração de Logs
 logger = logging.getLogger(__name__)
@@ -31,23 +32,7 @@ from app.core.config import settings
 
 # Constantes ATTOM
 ATTOM_API_KEY = settings.ATTOM_API_KEY
-ATTOM_BASE_URL = "https://api.gateway.attomdata.com/propertyapi/v1.0.0"
-
-# Configuração Redis
-REDIS_URL = settings.REDIS_URL
-try:
-    if REDIS_URL:
-        # Resolve any strange protocols by ensuring safe loading
-        redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-    else:
-        redis_client = None
-except Exception as e:
-    logger.warning(f"Não foi possível conectar ao Redis: {e}")
-    redis_client = None
-
-
-CACHE_TTL_SECONDS = 60 * 24 * 60 * 60  # 60 dias
-
+ATTOM_BASE_URL = settings.ATTOM_BASE_URL
 
 def get_missing_fields(prop: PropertyDetails) -> List[str]:
     """
@@ -172,10 +157,59 @@ def map_attom_to_db(attom_data: Dict[str, Any], existing_prop: PropertyDetails,
     return {k: v for k, v in update_data.items() if v is not None}
 
 
+def build_lookup(prop: PropertyDetails) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Monta a chave de Cache e os parâmetros de busca da propriedade.
+    PRIORIDADE: 1. attomId, 2. APN (Parcel ID) + County, 3. Address.
+    Retorna None quando o endereço é inválido para busca.
+    """
+    if prop.attom_id:
+        return f"attom:property:{prop.attom_id}", {"attomId": prop.attom_id}
+
+    if prop.parcel_id:
+        # Search by APN (parcel_id) which is much more precise
+        return f"attom:property:apn:{prop.parcel_id}:{prop.state}", {
+            "apn": prop.parcel_id,
+            "state": prop.state,
+            "county": prop.county
+        }
+
+    # Fallback to address search
+    addr = prop.address or ""
+    # Check if address is suspiciously short (like just a state code 'AL')
+    if len(addr.strip()) <= 3:
+        return None
+
+    city_state = f"{prop.county or ''} {prop.state or ''}"
+    full_address = f"{addr} {city_state}".strip().lower()
+    addr_hash = hashlib.md5(full_address.encode('utf-8')).hexdigest()
+    return f"attom:property:addr:{addr_hash}", {
+        "address1": prop.address,
+        "address2": city_state
+    }
+
+
 class CircuitBreakerException(Exception):
     pass
 
 
+def is_no_match(response) -> bool:
+    """
+    ATTOM responde 400 com status "SuccessWithoutResult" quando não há correspondência.
+    Outros 400 (parâmetros inválidos, chave recusada) são erros e não podem virar cache negativo.
+    Aceita respostas do requests e do httpx.
+    """
+    if response.status_code == 404:
+        return True
+    if response.status_code != 400:
+        return False
+    try:
+        status = response.json().get("status") or {}
+    except (ValueError, AttributeError):
+        return False
+    return status.get("msg") == "SuccessWithoutResult"
+
+
 @retry(
     wait=wait_exponential(multiplier=1, min=2, max=10),
     stop=stop_after_attempt(3),
@@ -202,7 +236,10 @@ def fetch_attom_data_sync(params: Dict[str, Any]) -> Dict[str, Any]:
     if response.status_code == 429:
         logger.warning("ATTOM API Rate Limit Exceeded (429).")
         raise CircuitBreakerException("Rate limit exceeded")
-    
+
+    if is_no_match(response):
+        return {}
+
     response.raise_for_status()
     
     return response.json()
@@ -251,61 +288,29 @@ def enrich_property(db: Session, property_id: str) -> Dict[str, Any]:
         return {"status": "skipped", "message": "No missing fields", "property_id": property_id}
 
     # 3. Monta a chave de Cache e parâmetros de busca
-    # PRIORIDADE: 1. attomId, 2. APN (Parcel ID) + County, 3. Address
-    query_params = {}
-    cache_key = ""
-
-    if prop.attom_id:
-        cache_key = f"attom:property:{prop.attom_id}"
-        query_params = {"attomId": prop.attom_id}
-    elif prop.parcel_id:
-        # Search by APN (parcel_id) which is much more precise
-        cache_key = f"attom:property:apn:{prop.parcel_id}:{prop.state}"
-        query_params = {
-            "apn": prop.parcel_id,
-            "state": prop.state,
-            "county": prop.county
-        }
-    else:
-        # Fallback to address search
-        addr = prop.address or ""
-        # Check if address is suspiciously short (like just a state code 'AL')
-        if len(addr.strip()) <= 3:
-            logger.warning(f"Endereço '{addr}' parece inválido para busca. Abortando enriquecimento por endereço.")
-            return {"status": "skipped", "message": "Invalid address for search", "property_id": property_id}
-            
-        city_state = f"{prop.county or ''} {prop.state or ''}" 
-        full_address = f"{addr} {city_state}".strip().lower()
-        
-        addr_hash = hashlib.md5(full_address.encode('utf-8')).hexdigest()
-        cache_key = f"attom:property:addr:{addr_hash}"
-        query_params = {
-            "address1": prop.address,
-            "address2": city_state
-        }
-    
-    attom_data = None
+    lookup = build_lookup(prop)
+    if lookup is None:
+        logger.warning(f"Endereço '{prop.address}' parece inválido para busca. Abortando enriquecimento por endereço.")
+        return {"status": "skipped", "message": "Invalid address for search", "property_id": property_id}
+    cache_key, query_params = lookup
     
-    # 4. Verifica Redis (Cache Hit)
-    if redis_client:
-        try:
-            cached_result = redis_client.get(cache_key)
-            if cached_result:
-                logger.info(f"Cache hit para chave: {cache_key}")
-                attom_data = json.loads(cached_result)
-        except Exception as e:
-            logger.error(f"Erro ao ler do Redis: {e}")
+    # 4. Verifica o cache (LRU local -> Redis); entradas negativas valem como "sem dados"
+    cached = attom_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Cache hit para chave: {cache_key}")
+        attom_data = cached.payload
+        if cached.stale:
+            attom_cache.schedule_refresh(cache_key, query_params)
 
     # 5. Se não tem no cache, busca na ATTOM API
-    if not attom_data:
+    else:
         logger.info(f"Cache miss para {cache_key}. Buscando na ATTOM.")
         try:
             attom_data = fetch_attom_data_sync(query_params)
-            
-            # Salva no Redis
-            if redis_client and attom_data:
-                redis_client.setex(cache_key, CACHE_TTL_SECONDS, json.dumps(attom_data))
-                
+            if not attom_data.get("property"):
+                attom_data = None
+            attom_cache.set(cache_key, attom_data)
+
         except requests.exceptions.RequestException as e:
             logger.error(f"ATTOM API erro de requisição: {e}")
             return {"status": "error", "message": "ATTOM API request failed", "error": str(e)}
@@ -327,7 +332,10 @@ def enrich_property(db: Session, property_id: str) -> Dict[str, Any]:
             logger.info(f"Atualizando BD para propriedade {property_id} com {len(update_data)} campos.")
             # Atualiza apenas os campos necessários
             db.query(PropertyDetails).filter(PropertyDetails.id == prop.id).update(update_data)
+            if any(col in update_data for col in DOCUMENT_COLUMNS):
+                property_search_service.refresh_documents(db, [prop.property_id])
             db.commit()
+            rescore_queue_service.mark_dirty([prop.parcel_id])
             
             # Atualiza o objeto da sessão com os novos dados
             db.refresh(prop)
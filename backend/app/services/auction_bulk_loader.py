@@ -0,0 +1,175 @@
+"""
+Set-based ingestion of auction CSV chunks into auction_events.
+
+A chunk is validated row by row (AuctionCSVRow), matched against existing
+auctions with one lookup keyed on auction_date (plus any explicit ids), and
+written with one batched upsert on id plus one batched insert for new auctions.
+Rows match an existing auction when the ids are equal or when any normalized
+name/short_name pair agrees on the same date.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import text, bindparam
+
+from app.schemas.csv_import import AuctionCSVRow
+from app.utils.state_mapper import canonical_state_code, make_county_key
+
+# Columns left untouched when an existing auction is updated
+IMMUTABLE_ON_UPDATE = {"id", "name", "auction_date", "created_at"}
+
+
+def normalize_name(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    key = " ".join(str(value).split()).lower()
+    return key or None
+
+
+def parse_dt(d_str):
+    if not d_str or d_str.strip() == "" or d_str == "N/A": return None
+    try: return datetime.strptime(d_str.strip(), "%Y-%m-%d").date()
+    except: return None
+
+
+def parse_parcels(p_str):
+    if not p_str or str(p_str).strip() == "": return 0
+    try:
+        return int(float(str(p_str).replace(',', '')))
+    except ValueError:
+        return 0
+
+
+def build_auction_record(row_dict: dict) -> Tuple[dict, Optional[int]]:
+    """Validates one CSV row; returns (auction_events values, explicit id or None)."""
+    validated_data = AuctionCSVRow(**row_dict)
+
+    a_date = parse_dt(validated_data.auction_date)
+    if not a_date:
+        raise ValueError(f"Invalid or missing auction date: {validated_data.auction_date}")
+
+    record = {
+        "name": validated_data.name,
+        "short_name": validated_data.short_name,
+        "auction_date": a_date,
+        "time": validated_data.time,
+        "location": validated_data.location,
+        "county": validated_data.county_name,
+        "county_code": validated_data.county_code,
+        "state": validated_data.state,
+        "state_code": canonical_state_code(validated_data.state),
+        "county_key": make_county_key(validated_data.county_name),
+        "tax_status": validated_data.tax_status,
+        "parcels_count": parse_parcels(validated_data.parcels),
+        "notes": validated_data.notes,
+        "search_link": validated_data.search_link,
+        "register_date": parse_dt(validated_data.register_date),
+        "register_link": validated_data.register_link,
+        "list_link": validated_data.list_link,
+        "purchase_info_link": validated_data.purchase_info_link,
+    }
+    return record, int(validated_data.id) if validated_data.id else None
+
+
+def match_keys(name: Optional[str], short_name: Optional[str], auction_date) -> List[tuple]:
+    # Dates compared as ISO strings: drivers without a native DATE type (SQLite) return text
+    day = str(auction_date)
+    return [(k, day) for k in {normalize_name(name), normalize_name(short_name)} if k]
+
+
+class AuctionBulkLoader:
+    """Writes validated auction records for one chunk inside the caller's transaction."""
+
+    @staticmethod
+    def resolve_existing(conn, records: Sequence[dict], explicit_ids: Sequence[Optional[int]]) -> List[Optional[int]]:
+        """
+        Returns, per record, the id of the auction it updates (None for new ones),
+        using a single query over the chunk's dates and explicit ids.
+        """
+        dates = list({r["auction_date"] for r in records})
+        ids = [i for i in explicit_ids if i is not None]
+        if not dates:
+            return [None] * len(records)
+
+        query = "SELECT id, name, short_name, auction_date FROM auction_events WHERE auction_date IN :dates"
+        params = {"dates": dates}
+        bind = [bindparam("dates", expanding=True)]
+        if ids:
+            query += " OR id IN :ids"
+            params["ids"] = ids
+            bind.append(bindparam("ids", expanding=True))
+        rows = conn.execute(text(query).bindparams(*bind), params).fetchall()
+
+        by_id = {r[0] for r in rows}
+        by_key: Dict[tuple, int] = {}
+        for r in sorted(rows, key=lambda r: r[0]):
+            for key in match_keys(r[1], r[2], r[3]):
+                by_key.setdefault(key, r[0])
+
+        matched = []
+        for record, explicit_id in zip(records, explicit_ids):
+            if explicit_id is not None and explicit_id in by_id:
+                matched.append(explicit_id)
+                continue
+            matched.append(next(
+                (by_key[k] for k in match_keys(record["name"], record["short_name"], record["auction_date"]) if k in by_key),
+                None
+            ))
+        return matched
+
+    @staticmethod
+    def load_chunk(conn, records: List[dict], explicit_ids: List[Optional[int]]) -> int:
+        """Inserts new auctions and updates matched ones; returns the number of rows written."""
+        if not records:
+            return 0
+        matched = AuctionBulkLoader.resolve_existing(conn, records, explicit_ids)
+        now = datetime.utcnow()
+
+        # Later rows for the same auction win, as they did when applied one by one
+        keyed: Dict[int, dict] = {}
+        new_rows: Dict[tuple, dict] = {}
+        for record, existing_id, explicit_id in zip(records, matched, explicit_ids):
+            row = {**record, "created_at": now, "updated_at": now}
+            # Matched auctions keep their id; unmatched rows use the original ID if provided
+            target_id = existing_id if existing_id is not None else explicit_id
+            if target_id is not None:
+                keyed[target_id] = {"id": target_id, **row}
+            else:
+                new_rows[(normalize_name(record["name"]), record["auction_date"])] = row
+
+        if keyed:
+            batch = list(keyed.values())
+            cols = list(batch[0].keys())
+            updates = ", ".join(f"{k} = EXCLUDED.{k}" for k in cols if k not in IMMUTABLE_ON_UPDATE)
+            conn.execute(text(f"""
+                INSERT INTO auction_events ({', '.join(cols)}) VALUES ({', '.join(f':{k}' for k in cols)})
+                ON CONFLICT (id) DO UPDATE SET {updates}
+            """), batch)
+
+        if new_rows:
+            batch = list(new_rows.values())
+            cols = list(batch[0].keys())
+            conn.execute(
+                text(f"INSERT INTO auction_events ({', '.join(cols)}) VALUES ({', '.join(f':{k}' for k in cols)})"),
+                batch
+            )
+
+        return len(keyed) + len(new_rows)
+
+
+def transform_auction_chunk(chunk: pd.DataFrame) -> Tuple[List[dict], List[Optional[int]], List[str]]:
+    """Validates a CSV chunk; returns (records, explicit ids, row errors)."""
+    records, explicit_ids, errors = [], [], []
+    for index, row_dict in zip(chunk.index, chunk.astype(object).where(chunk.notna(), None).to_dict("records")):
+        try:
+            record, explicit_id = build_auction_record(row_dict)
+        except Exception as e:
+            errors.append(f"Row {index + 2}: {str(e)}")
+            continue
+        records.append(record)
+        explicit_ids.append(explicit_id)
+    return records, explicit_ids, errors
+
+
+auction_bulk_loader = AuctionBulkLoader()
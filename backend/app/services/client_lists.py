@@ -0,0 +1,195 @@
+"""
+Set-based reads for client lists (watchlists).
+
+list_properties serves GET /client-data/lists/{id}/properties with one
+statement: a lateral join picks each property's nearest auction (the next
+upcoming one, else the most recent past one), another picks the caller's
+latest note, and the upcoming-first ordering and paging are done in SQL.
+
+client_lists.property_count / upcoming_auctions_count are summary counters so
+GET /client-data/lists is a single read. They are recomputed for the affected
+lists whenever membership changes (add/move/remove), whenever a member's
+auction history changes (via current_auction_service), and daily for lists
+whose upcoming auctions may have passed (refresh_list_summaries_task).
+"""
+import logging
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import text, bindparam
+
+logger = logging.getLogger(__name__)
+
+UPCOMING_WINDOW_DAYS = 30
+
+# Output field -> SQL expression, in response order
+PROPERTY_FIELDS = OrderedDict([
+    ("id", "p.id"),
+    ("parcel_id", "p.parcel_id"),
+    ("address", "p.address"),
+    ("owner_address", "p.owner_address"),
+    ("county", "p.county"),
+    ("state", "p.state"),
+    ("state_code", "p.state_code"),
+    ("description", "COALESCE(p.description, p.legal_description)"),
+    ("lot_acres", "p.lot_acres"),
+    ("improvement_value", "p.improvement_value"),
+    ("availability_status", "p.availability_status"),
+    ("property_type", "p.property_type"),
+    ("auction_name", "na.case_number"),
+    ("auction_date", "na.auction_date"),
+    ("auction_info_link", "na.register_link"),
+    ("auction_list_link", "na.auction_url"),
+    ("is_auction_upcoming", f"COALESCE(na.auction_date - CAST(:today AS DATE) BETWEEN 0 AND {UPCOMING_WINDOW_DAYS}, FALSE)"),
+    ("days_until_auction", "na.auction_date - CAST(:today AS DATE)"),
+    ("note_content", "COALESCE(note.note_text, '')"),
+    ("amount_due", "p.amount_due"),
+    ("assessed_value", "p.assessed_value"),
+    ("occupancy", "p.occupancy"),
+    ("latitude", "p.latitude"),
+    ("longitude", "p.longitude"),
+])
+
+# Largest page GET /client-data/lists/{id}/properties serves; without a limit the whole list is returned
+MAX_LIST_PAGE_SIZE = 1000
+
+# A property counts as upcoming when at least one of its auctions has not
+# happened yet (undated history rows are ignored).
+_REFRESH_SUMMARIES = """
+    UPDATE client_lists SET
+        property_count = (
+            SELECT COUNT(*) FROM client_list_property clp
+            WHERE clp.list_id = client_lists.id
+        ),
+        upcoming_auctions_count = (
+            SELECT COUNT(*)
+            FROM client_list_property clp
+            JOIN property_details p ON p.id = clp.property_id
+            WHERE clp.list_id = client_lists.id AND EXISTS (
+                SELECT 1 FROM property_auction_history pah
+                WHERE pah.property_id = p.property_id AND pah.auction_date >= :today
+            )
+        )
+    WHERE {where}
+"""
+
+
+class ClientListService:
+    """Methods taking `conn` accept either a Session or a Connection."""
+
+    @staticmethod
+    def refresh_summaries(conn, list_ids: Iterable[int], today: Optional[date] = None) -> int:
+        """
+        Recomputes the summary counters of the given lists. Session callers must
+        flush pending membership changes first.
+        """
+        ids = list({i for i in list_ids if i is not None})
+        if not ids:
+            return 0
+        return conn.execute(
+            text(_REFRESH_SUMMARIES.format(where="id IN :ids")).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids, "today": today or date.today()}
+        ).rowcount
+
+    @staticmethod
+    def refresh_for_properties(conn, property_ids: Iterable[str], today: Optional[date] = None) -> int:
+        """Refreshes every list containing one of the given property_ids (auction history changed)."""
+        ids = list({pid for pid in property_ids if pid})
+        if not ids:
+            return 0
+        where = """id IN (
+            SELECT clp.list_id FROM client_list_property clp
+            JOIN property_details p ON p.id = clp.property_id
+            WHERE p.property_id IN :ids
+        )"""
+        return conn.execute(
+            text(_REFRESH_SUMMARIES.format(where=where)).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids, "today": today or date.today()}
+        ).rowcount
+
+    @staticmethod
+    def roll_over_upcoming(conn, today: Optional[date] = None) -> int:
+        """
+        Daily pass: upcoming counts only drop by the passage of time, so only
+        lists that currently report upcoming auctions need recomputing.
+        """
+        count = conn.execute(
+            text(_REFRESH_SUMMARIES.format(where="upcoming_auctions_count > 0")),
+            {"today": today or date.today()}
+        ).rowcount
+        logger.info(f"Refreshed upcoming auction counters for {count} lists.")
+        return count
+
+    @staticmethod
+    def rebuild_summaries(conn, today: Optional[date] = None) -> int:
+        return conn.execute(text(_REFRESH_SUMMARIES.format(where="1 = 1")), {"today": today or date.today()}).rowcount
+
+    @staticmethod
+    def list_properties(
+        db,
+        list_id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        today: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Properties of a list, upcoming auctions (within 30 days) first, then by
+        days until auction. `fields` restricts the columns selected (id is
+        always included); unknown names are ignored.
+        """
+        wanted = [f for f in PROPERTY_FIELDS if fields is None or f in set(fields) or f == "id"]
+        select_list = ",\n".join(f"{PROPERTY_FIELDS[f]} AS {f}" for f in wanted)
+        paging = "OFFSET :skip" + (" LIMIT :limit" if limit is not None else "")
+
+        rows = db.execute(text(f"""
+            SELECT {select_list}
+            FROM client_list_property clp
+            JOIN property_details p ON p.id = clp.property_id
+            LEFT JOIN LATERAL (
+                SELECT
+                    pah.auction_date,
+                    COALESCE(pah.list_link, ae.list_link) AS auction_url,
+                    COALESCE(pah.info_link, ae.register_link) AS register_link,
+                    ae.name AS case_number
+                FROM property_auction_history pah
+                LEFT JOIN auction_events ae ON pah.auction_id = ae.id
+                WHERE pah.property_id = p.property_id
+                ORDER BY
+                    CASE WHEN pah.auction_date >= CAST(:today AS DATE) THEN 0 ELSE 1 END,
+                    ABS(pah.auction_date - CAST(:today AS DATE)) NULLS LAST
+                LIMIT 1
+            ) na ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT cn.note_text
+                FROM client_notes cn
+                WHERE cn.property_id = p.id AND cn.user_id = :user_id
+                ORDER BY cn.created_at DESC
+                LIMIT 1
+            ) note ON TRUE
+            WHERE clp.list_id = :list_id
+            ORDER BY
+                CASE WHEN na.auction_date - CAST(:today AS DATE) BETWEEN 0 AND {UPCOMING_WINDOW_DAYS} THEN 0 ELSE 1 END,
+                COALESCE(na.auction_date - CAST(:today AS DATE), 9999),
+                p.id
+            {paging}
+        """), {
+            "list_id": list_id,
+            "user_id": user_id,
+            "today": today or date.today(),
+            "skip": skip,
+            "limit": limit,
+        }).fetchall()
+
+        results = []
+        for r in rows:
+            item = dict(r._mapping)
+            if item.get("auction_date") is not None:
+                item["auction_date"] = str(item["auction_date"])
+            results.append(item)
+        return results
+
+
+client_list_service = ClientListService()
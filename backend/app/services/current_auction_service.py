@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime
+from typing import Iterable
+from sqlalchemy import bindparam, text
+
+from app.services.client_lists import client_list_service
+
+logger = logging.getLogger(__name__)
+
+# Latest auction per property: newest auction_date first, undated rows last, newest row on ties.
+# ROW_NUMBER rather than DISTINCT ON so the same statement runs on Postgres and SQLite.
+_LATEST_AUCTION_SELECT = """
+    SELECT
+        property_id, auction_id, auction_name, auction_date, location,
+        listed_as, taxes_due, info_link, list_link, :now
+    FROM (
+        SELECT
+            pah.property_id, pah.auction_id, pah.auction_name, pah.auction_date, pah.location,
+            pah.listed_as, pah.taxes_due, pah.info_link, pah.list_link,
+            ROW_NUMBER() OVER (
+                PARTITION BY pah.property_id
+                ORDER BY pah.auction_date DESC NULLS LAST, pah.id DESC
+            ) AS rn
+        FROM property_auction_history pah
+        {where}
+    ) latest
+    WHERE rn = 1
+"""
+
+_UPSERT = """
+    INSERT INTO property_current_auction (
+        property_id, auction_id, auction_name, auction_date, location,
+        listed_as, taxes_due, info_link, list_link, updated_at
+    )
+    {select}
+    ON CONFLICT (property_id) DO UPDATE SET
+        auction_id = EXCLUDED.auction_id,
+        auction_name = EXCLUDED.auction_name,
+        auction_date = EXCLUDED.auction_date,
+        location = EXCLUDED.location,
+        listed_as = EXCLUDED.listed_as,
+        taxes_due = EXCLUDED.taxes_due,
+        info_link = EXCLUDED.info_link,
+        list_link = EXCLUDED.list_link,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class CurrentAuctionService:
+    """
+    Maintains property_current_auction, the one-row-per-property projection of
+    property_auction_history used by property search.
+
+    Methods accept either a Session or a Connection so they can run inside the
+    caller's transaction.
+    """
+
+    @staticmethod
+    def refresh_properties(conn, property_ids: Iterable[str]) -> int:
+        """Recomputes the projection for the given property_ids only."""
+        ids = list({pid for pid in property_ids if pid})
+        if not ids:
+            return 0
+
+        select_sql = _LATEST_AUCTION_SELECT.format(where="WHERE pah.property_id IN :ids")
+        result = conn.execute(
+            text(_UPSERT.format(select=select_sql)).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids, "now": datetime.utcnow()}
+        )
+
+        # Properties whose history rows were all removed drop out of the projection
+        conn.execute(text("""
+            DELETE FROM property_current_auction
+            WHERE property_id IN :ids
+              AND NOT EXISTS (
+                  SELECT 1 FROM property_auction_history pah
+                  WHERE pah.property_id = property_current_auction.property_id
+              )
+        """).bindparams(bindparam("ids", expanding=True)), {"ids": ids})
+        # Lists holding these properties may have gained or lost an upcoming auction
+        client_list_service.refresh_for_properties(conn, ids)
+        return result.rowcount
+
+    @staticmethod
+    def refresh_by_parcel_ids(conn, parcel_ids: Iterable[str]) -> int:
+        """Same as refresh_properties, resolving parcel_ids through property_details."""
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return 0
+        rows = conn.execute(
+            text("SELECT property_id FROM property_details WHERE parcel_id IN :parcels")
+            .bindparams(bindparam("parcels", expanding=True)),
+            {"parcels": parcels}
+        ).fetchall()
+        return CurrentAuctionService.refresh_properties(conn, [r[0] for r in rows])
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        """
+        Full rebuild from property_auction_history to repair drift.
+        Runs as one transaction so readers never see an empty projection.
+        """
+        now = datetime.utcnow()
+        conn.execute(text("DELETE FROM property_current_auction"))
+        select_sql = _LATEST_AUCTION_SELECT.format(where="")
+        result = conn.execute(text(_UPSERT.format(select=select_sql)), {"now": now})
+        client_list_service.rebuild_summaries(conn)
+        logger.info(f"property_current_auction rebuilt with {result.rowcount} rows.")
+        return result.rowcount
+
+
+current_auction_service = CurrentAuctionService()
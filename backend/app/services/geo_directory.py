@@ -0,0 +1,262 @@
+"""
+Loaded-once geographic directory: states, counties, county FIPS codes and the
+county/state portal contacts, indexed in memory by canonical state code
+(canonical_state_code) and county key (make_county_key).
+
+Sources are the state table in app.utils.state_mapper, migration/fips_data.csv,
+data/contact_data.csv and the county_contacts / state_contacts tables. County
+contacts follow the old CountyContactService precedence per state: a state with
+rows in county_contacts is served from the table, any other from the CSV.
+
+Each process builds a snapshot on first use and swaps in a new one when the
+directory version in Redis (VERSION_KEY) moves; the version is read at most
+every CHECK_SECONDS, so lookups never touch the database. Writers of
+county_contacts / state_contacts call invalidate(), which bumps the version and
+the response cache tags of the endpoints built on the directory. MAX_AGE_SECONDS
+bounds how long an edit made outside the app (plain SQL) goes unnoticed.
+"""
+import csv
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.db.session import engine as default_engine
+from app.services.import_service import redis
+from app.services.response_cache import STATE_CONTACTS, county_tag, response_cache
+from app.utils.state_mapper import STATE_MAPPING, canonical_state_code, make_county_key
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONTACTS_CSV_PATH = os.path.join(BACKEND_DIR, "data", "contact_data.csv")
+FIPS_CSV_PATH = os.path.join(BACKEND_DIR, "migration", "fips_data.csv")
+EXCLUDED_NAMES = ["NETR Mapping and GIS", "Historic Aerials"]
+
+VERSION_KEY = "geo:directory:version"
+CHECK_SECONDS = 30
+MAX_AGE_SECONDS = 60 * 60
+
+CountyKey = Tuple[str, str]
+
+
+class DirectorySnapshot:
+    """Immutable set of indexes; replaced wholesale on reload."""
+
+    def __init__(self):
+        self.state_names: Dict[str, str] = {}
+        self.fips: Dict[CountyKey, str] = {}
+        self.contacts: Dict[CountyKey, List[Dict[str, str]]] = {}
+        self.counties: Dict[str, List[str]] = {}
+        self.state_contacts: Dict[str, Dict[str, str]] = {}
+
+
+def _load_fips_rows(path: str) -> List[Tuple[str, str, str]]:
+    """(state, county name, fips) rows of the FIPS CSV; state-only rows are skipped."""
+    if not os.path.exists(path):
+        logger.warning(f"FIPS data not found at {path}")
+        return []
+    rows = []
+    try:
+        with open(path, mode="r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                state = (row.get("state") or "").strip().upper()
+                if state and state != "NA":
+                    rows.append((state, (row.get("name") or "").strip(), (row.get("fips") or "").strip()))
+    except Exception as e:
+        logger.error(f"Error loading FIPS data: {e}")
+        return []
+    return rows
+
+
+def _load_contact_rows(path: str) -> List[Tuple[str, str, str, str, str]]:
+    """(state, county, name, phone, url) rows of contact_data.csv, excluded directories dropped."""
+    if not os.path.exists(path):
+        logger.warning(f"Contact data not found at {path}")
+        return []
+    rows = []
+    try:
+        with open(path, mode="r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("Name") or "").strip()
+                if any(excluded in name for excluded in EXCLUDED_NAMES):
+                    continue
+                rows.append((
+                    (row.get("State") or "").strip(),
+                    (row.get("County") or "").strip(),
+                    name,
+                    (row.get("Phone") or "").strip(),
+                    (row.get("Online_URL") or "").strip(),
+                ))
+    except Exception as e:
+        logger.error(f"Error parsing contact_data.csv: {e}")
+        return []
+    return rows
+
+
+def build_snapshot(fips_rows, csv_contacts, db_contacts, db_state_contacts) -> DirectorySnapshot:
+    """Indexes raw rows; contact rows are (state, county, name, phone, url) in any state spelling."""
+    snap = DirectorySnapshot()
+    snap.state_names = {code: name.title() for name, code in STATE_MAPPING.items()}
+
+    for state, county, fips in fips_rows:
+        code, key = canonical_state_code(state), make_county_key(county)
+        if code and key and fips:
+            snap.fips.setdefault((code, key), fips.zfill(5))
+
+    def index(rows):
+        contacts: Dict[CountyKey, List[Dict[str, str]]] = defaultdict(list)
+        names: Dict[CountyKey, str] = {}
+        for state, county, name, phone, url in rows:
+            code, key = canonical_state_code(state), make_county_key(county)
+            if not code or not key:
+                continue
+            contacts[(code, key)].append({"name": name or "", "phone": phone or "", "url": url or ""})
+            names.setdefault((code, key), county.strip().title())
+        return contacts, names
+
+    contacts, names = index(csv_contacts)
+    db_index, db_names = index(db_contacts)
+    db_states = {code for code, _ in db_index}
+    contacts = {k: v for k, v in contacts.items() if k[0] not in db_states}
+    names = {k: v for k, v in names.items() if k[0] not in db_states}
+    contacts.update(db_index)
+    names.update(db_names)
+    snap.contacts = contacts
+
+    counties: Dict[str, set] = defaultdict(set)
+    for (code, _), name in names.items():
+        counties[code].add(name)
+    snap.counties = {code: sorted(values) for code, values in counties.items()}
+
+    for state, url in db_state_contacts:
+        code = canonical_state_code(state) or (state or "").strip().upper()
+        if code:
+            snap.state_contacts.setdefault(code, {"state": state, "url": url or ""})
+    return snap
+
+
+class GeoDirectory:
+
+    def __init__(
+        self,
+        engine=None,
+        redis_client=None,
+        contacts_csv: str = CONTACTS_CSV_PATH,
+        fips_csv: str = FIPS_CSV_PATH,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engine = engine or default_engine
+        self.redis = redis_client
+        self.contacts_csv = contacts_csv
+        self.fips_csv = fips_csv
+        self.clock = clock
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._version: Optional[bytes] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        # Files only change on deploy, so they are parsed once per process
+        self._file_rows = None
+
+    def _remote_version(self) -> Optional[bytes]:
+        if not self.redis:
+            return None
+        try:
+            value = self.redis.get(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Geo directory version check failed: {e}")
+            return self._version
+        return value.encode() if isinstance(value, str) else value
+
+    def _db_rows(self):
+        try:
+            with self.engine.connect() as conn:
+                contacts = conn.execute(text(
+                    "SELECT state, county, name, phone, url FROM county_contacts ORDER BY id"
+                )).fetchall()
+                states = conn.execute(text("SELECT state, url FROM state_contacts ORDER BY id")).fetchall()
+            return [tuple(r) for r in contacts], [tuple(r) for r in states]
+        except Exception as e:
+            logger.error(f"Geo directory could not read contacts from the database: {e}")
+            return [], []
+
+    def reload(self) -> DirectorySnapshot:
+        with self._lock:
+            version = self._remote_version()
+            if self._file_rows is None:
+                self._file_rows = (_load_fips_rows(self.fips_csv), _load_contact_rows(self.contacts_csv))
+            fips_rows, csv_contacts = self._file_rows
+            db_contacts, db_state_contacts = self._db_rows()
+            snapshot = build_snapshot(fips_rows, csv_contacts, db_contacts, db_state_contacts)
+            self._snapshot, self._version = snapshot, version
+            self._loaded_at = self._checked_at = self.clock()
+            logger.info(
+                f"Geo directory loaded: {len(snapshot.contacts)} counties with contacts, "
+                f"{len(snapshot.fips)} FIPS codes, {len(snapshot.state_contacts)} state contacts"
+            )
+            return snapshot
+
+    def snapshot(self) -> DirectorySnapshot:
+        """Current indexes, reloaded first when the version moved or the snapshot is too old."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.reload()
+        now = self.clock()
+        if now - self._loaded_at >= MAX_AGE_SECONDS:
+            return self.reload()
+        if now - self._checked_at >= CHECK_SECONDS:
+            self._checked_at = now
+            if self._remote_version() != self._version:
+                return self.reload()
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Call after writing county_contacts / state_contacts: every process reloads on its next check."""
+        self._snapshot = None
+        if self.redis:
+            try:
+                self.redis.incr(VERSION_KEY)
+            except Exception as e:
+                logger.error(f"Geo directory invalidation failed: {e}")
+        response_cache.invalidate(STATE_CONTACTS, *(county_tag(code) for code in STATE_MAPPING.values()))
+
+    def state_code(self, state: str) -> Optional[str]:
+        return canonical_state_code(state)
+
+    def state_name(self, state: str) -> Optional[str]:
+        """Full state name ("New York") for a code or name."""
+        return self.snapshot().state_names.get(canonical_state_code(state))
+
+    def counties(self, state: str) -> List[str]:
+        return list(self.snapshot().counties.get(canonical_state_code(state), []))
+
+    def county_contacts(self, state: str, county: str) -> List[Dict[str, str]]:
+        key = (canonical_state_code(state), make_county_key(county))
+        return [dict(c) for c in self.snapshot().contacts.get(key, [])]
+
+    def state_contact(self, state: str) -> Optional[Dict[str, str]]:
+        contact = self.snapshot().state_contacts.get(canonical_state_code(state))
+        return dict(contact) if contact else None
+
+    def state_contacts(self) -> List[Dict[str, str]]:
+        return [dict(c) for c in self.snapshot().state_contacts.values()]
+
+    def fips(self, state: str, *counties: str) -> Optional[str]:
+        """5-digit county FIPS for the first county spelling that resolves."""
+        code = canonical_state_code(state)
+        if not code:
+            return None
+        index = self.snapshot().fips
+        for county in counties:
+            fips = index.get((code, make_county_key(county)))
+            if fips:
+                return fips
+        return None
+
+
+geo_directory = GeoDirectory(redis_client=redis)
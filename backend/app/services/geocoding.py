@@ -1,52 +1,376 @@
+"""
+Nominatim geocoding with a persistent cache, one pooled client and a global
+rate limit.
+
+Queries are normalized (normalize_address) and looked up in geocode_cache
+before any request; misses go out through a shared httpx.AsyncClient, spaced
+by a limiter that holds a Redis slot key for 1/GEOCODER_RATE_PER_SECOND
+seconds, so every worker together stays under Nominatim's 1 req/s policy.
+Nothing on the event loop blocks: the limiter uses the asyncio Redis client
+and cache/property reads and writes run in the threadpool.
+Unmatched queries are cached as 'not_found' and retried after
+GEOCODE_NEGATIVE_RETRY_DAYS.
+
+geocode_missing() is the batch worker: it fills latitude/longitude for
+properties without coordinates, upcoming auctions first (soonest first), and
+stamps geocode_attempted_at so unmatched rows do not crowd out the rest.
+GEOCODER_BASE_URL can point at a local fake Nominatim for tests.
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
 import httpx
-from typing import Optional, Tuple, Any
+from fastapi.concurrency import run_in_threadpool
+from redis import asyncio as aioredis
+from sqlalchemy import bindparam, text
+
+from app.core.config import settings
+from app.db.session import engine as default_engine
+from app.services.import_service import get_redis_url
+
+logger = logging.getLogger(__name__)
+
+RATE_KEY = "geocode:rate_slot"
+WRITE_CHUNK = 100
+
+# USPS-style abbreviations so "123 North Main Street" and "123 n main st" share a cache row
+_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "road": "rd", "drive": "dr", "boulevard": "blvd",
+    "lane": "ln", "court": "ct", "place": "pl", "circle": "cir", "highway": "hwy",
+    "parkway": "pkwy", "terrace": "ter", "trail": "trl", "north": "n", "south": "s",
+    "east": "e", "west": "w", "northeast": "ne", "northwest": "nw", "southeast": "se",
+    "southwest": "sw",
+}
+
+_MISSING_COORDINATES = """
+    SELECT pd.id, pd.address, pd.county, pd.state
+    FROM property_details pd
+    LEFT JOIN property_current_auction pca ON pca.property_id = pd.property_id
+    WHERE (pd.latitude IS NULL OR pd.longitude IS NULL)
+      AND pd.address IS NOT NULL AND TRIM(pd.address) != ''
+      AND (pd.geocode_attempted_at IS NULL OR pd.geocode_attempted_at < :retry_before)
+    ORDER BY
+        CASE WHEN pca.auction_date >= :today THEN 0 ELSE 1 END,
+        CASE WHEN pca.auction_date >= :today THEN pca.auction_date END,
+        pd.id
+    LIMIT :limit
+"""
+
+_UPSERT_CACHE = """
+    INSERT INTO geocode_cache (query_key, query, status, latitude, longitude, display_name,
+                               state, county, city, zip_code, updated_at)
+    VALUES (:query_key, :query, :status, :latitude, :longitude, :display_name,
+            :state, :county, :city, :zip_code, :updated_at)
+    ON CONFLICT (query_key) DO UPDATE SET
+        status = excluded.status,
+        latitude = excluded.latitude,
+        longitude = excluded.longitude,
+        display_name = excluded.display_name,
+        state = excluded.state,
+        county = excluded.county,
+        city = excluded.city,
+        zip_code = excluded.zip_code,
+        updated_at = excluded.updated_at
+"""
+
+_RESULT_FIELDS = ("latitude", "longitude", "display_name", "state", "county", "city", "zip_code")
+
+
+def normalize_address(address: str) -> str:
+    """Lowercase, punctuation-free, single-spaced, common street words abbreviated."""
+    words = re.sub(r"[^\w#\s]", " ", (address or "").lower()).split()
+    return " ".join(_ABBREVIATIONS.get(w, w) for w in words)
+
+
+def build_query(address: str, county: Optional[str], state: Optional[str]) -> str:
+    parts = [address.strip()]
+    if county:
+        parts.append(county if "county" in county.lower() else f"{county} County")
+    if state:
+        parts.append(state)
+    parts.append("USA")
+    return ", ".join(parts)
+
+
+def _query_key(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class GeocoderThrottled(Exception):
+    """Nominatim answered 429/403; the batch stops instead of risking a ban."""
+
+
+class RateLimiter:
+    """
+    Spaces calls 1/rate seconds apart across all workers by holding a Redis
+    slot key for that long; within this process only when Redis is unavailable.
+    `redis_client` is an asyncio client (redis.asyncio).
+    """
+
+    def __init__(self, rate: float, redis_client=None, key: str = RATE_KEY, clock: Callable[[], float] = time.monotonic):
+        self.interval = 1.0 / rate
+        self.redis = redis_client
+        self.key = key
+        self.clock = clock
+        self._next = 0.0
+
+    async def acquire(self) -> None:
+        if self.redis is not None:
+            try:
+                ttl_ms = max(1, int(self.interval * 1000))
+                while not await self.redis.set(self.key, 1, nx=True, px=ttl_ms):
+                    wait_ms = await self.redis.pttl(self.key)
+                    await asyncio.sleep(max(wait_ms, 1) / 1000)
+                return
+            except Exception as e:
+                logger.warning(f"Geocoding rate limiter falling back to per-process spacing: {e}")
+        now = self.clock()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def aclose(self) -> None:
+        """Drops pooled Redis connections, which belong to the loop that opened them."""
+        if self.redis is not None:
+            await self.redis.connection_pool.disconnect()
+
 
 class GeocodingService:
-    def __init__(self):
-        self.base_url = "https://nominatim.openstreetmap.org/search"
-        self.user_agent = "GoAuct/1.0"
+    def __init__(self, base_url: Optional[str] = None, limiter: Optional[RateLimiter] = None, engine=None):
+        self.base_url = (base_url or settings.GEOCODER_BASE_URL).rstrip("/")
+        self.user_agent = settings.GEOCODER_USER_AGENT
+        self.limiter = limiter or RateLimiter(settings.GEOCODER_RATE_PER_SECOND, aioredis.from_url(get_redis_url()))
+        self.engine = engine or default_engine
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """One pooled client per event loop (clients cannot cross loops)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"User-Agent": self.user_agent},
+                timeout=10,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        await self.limiter.aclose()
+
+    async def search(self, query: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """One throttled Nominatim search; raises on HTTP errors."""
+        await self.limiter.acquire()
+        response = await self._http().get("/search", params={
+            "q": query,
+            "format": "json",
+            "limit": limit,
+            "addressdetails": 1,
+        })
+        if response.status_code in (403, 429):
+            raise GeocoderThrottled(f"Nominatim answered {response.status_code}")
+        response.raise_for_status()
+
+        results = []
+        for item in response.json() or []:
+            addr = item.get("address", {})
+            results.append({
+                "latitude": float(item["lat"]),
+                "longitude": float(item["lon"]),
+                "display_name": item.get("display_name"),
+                "state": addr.get("state"),
+                "county": addr.get("county"),
+                "city": addr.get("city") or addr.get("town") or addr.get("village"),
+                "zip_code": addr.get("postcode"),
+            })
+        return results
+
+    @staticmethod
+    def cached(conn, queries: List[str], now: Optional[datetime] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Cache rows for normalized `queries`: a result dict, or None for a
+        'not_found' entry still within its retry window. Absent keys are misses.
+        """
+        if not queries:
+            return {}
+        now = now or datetime.utcnow()
+        retry_before = now - timedelta(days=settings.GEOCODE_NEGATIVE_RETRY_DAYS)
+        by_key = {_query_key(q): q for q in queries}
+        rows = conn.execute(
+            text("""
+                SELECT * FROM geocode_cache
+                WHERE query_key IN :keys
+                  AND (status = 'found' OR updated_at >= :retry_before)
+            """).bindparams(bindparam("keys", expanding=True)),
+            {"keys": list(by_key), "retry_before": retry_before}
+        ).mappings().all()
+
+        return {
+            by_key[row["query_key"]]: {f: row[f] for f in _RESULT_FIELDS} if row["status"] == "found" else None
+            for row in rows
+        }
+
+    @staticmethod
+    def store(conn, results: Dict[str, Optional[Dict[str, Any]]], now: Optional[datetime] = None) -> None:
+        """Upserts normalized query -> result (None = not found)."""
+        if not results:
+            return
+        now = now or datetime.utcnow()
+        conn.execute(text(_UPSERT_CACHE), [
+            {
+                "query_key": _query_key(query),
+                "query": query,
+                "status": "found" if result else "not_found",
+                **{f: (result or {}).get(f) for f in _RESULT_FIELDS},
+                "updated_at": now,
+            }
+            for query, result in results.items()
+        ])
 
     async def get_coordinates(self, address: str, multiple: bool = False) -> Any:
         """
         Fetch latitude, longitude, and address details for a given address using Nominatim.
         Returns dict with keys: lat, lon, state, county, zip, city or None if not found.
-        If multiple is True, returns a list of such dicts.
+        If multiple is True, returns a list of such dicts (not cached).
         """
+        if multiple:
+            try:
+                return await self.search(address, limit=5)
+            except Exception as e:
+                logger.error(f"Geocoding error: {e}")
+                return []
+
+        query = normalize_address(address)
         try:
-            params = {
-                "q": address,
-                "format": "json",
-                "limit": 5 if multiple else 1,
-                "addressdetails": 1
-            }
-            headers = {"User-Agent": self.user_agent}
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url, params=params, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = []
-                if data:
-                    for item in data:
-                        addr = item.get("address", {})
-                        res = {
-                            "latitude": float(item["lat"]),
-                            "longitude": float(item["lon"]),
-                            "display_name": item.get("display_name"),
-                            "state": addr.get("state"),
-                            "county": addr.get("county"),
-                            "city": addr.get("city") or addr.get("town") or addr.get("village"),
-                            "zip_code": addr.get("postcode")
-                        }
-                        if not multiple:
-                            return res
-                        results.append(res)
-                
-                return results if multiple else None
+            cached = await run_in_threadpool(self._read_cache, [query])
+            if query in cached:
+                return cached[query]
         except Exception as e:
-            print(f"Geocoding error: {e}")
-            return [] if multiple else None
-        return [] if multiple else None
+            logger.error(f"Geocode cache read failed: {e}")
+
+        try:
+            results = await self.search(address, limit=1)
+        except Exception as e:
+            logger.error(f"Geocoding error: {e}")
+            return None
+
+        result = results[0] if results else None
+        try:
+            await run_in_threadpool(self._write_cache, {query: result})
+        except Exception as e:
+            logger.error(f"Geocode cache write failed: {e}")
+        return result
+
+    def _read_cache(self, queries: List[str], now: Optional[datetime] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        with self.engine.connect() as conn:
+            return self.cached(conn, queries, now)
+
+    def _write_cache(self, results: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        with self.engine.begin() as conn:
+            self.store(conn, results)
+
+    def _select_missing(self, limit: int, today: date, now: datetime) -> list:
+        with self.engine.connect() as conn:
+            return conn.execute(text(_MISSING_COORDINATES), {
+                "today": today,
+                "retry_before": now - timedelta(days=settings.GEOCODE_NEGATIVE_RETRY_DAYS),
+                "limit": limit,
+            }).fetchall()
+
+    async def _geocode_missing(self, limit: int, today: date) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        stats = {"selected": 0, "geocoded": 0, "not_found": 0, "cache_hits": 0, "api_calls": 0, "errors": 0, "throttled": False}
+
+        rows = await run_in_threadpool(self._select_missing, limit, today, now)
+        stats["selected"] = len(rows)
+
+        by_query: Dict[str, List[int]] = {}
+        raw_query: Dict[str, str] = {}
+        for prop_id, address, county, state in rows:
+            full = build_query(address, county, state)
+            query = normalize_address(full)
+            by_query.setdefault(query, []).append(prop_id)
+            raw_query.setdefault(query, full)
+
+        results = await run_in_threadpool(self._read_cache, list(by_query), now)
+        stats["cache_hits"] = len(results)
+
+        # Queries stay in priority order; results are written every WRITE_CHUNK lookups
+        written = set()
+
+        async def flush(fresh):
+            resolved = {q: r for q, r in results.items() if q not in written}
+            written.update(resolved)
+            await run_in_threadpool(self._write, fresh, resolved, by_query, now)
+
+        pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        for query in by_query:
+            if query in results:
+                continue
+            try:
+                stats["api_calls"] += 1
+                found = await self.search(raw_query[query], limit=1)
+            except GeocoderThrottled as e:
+                logger.warning(f"Geocoding batch stopped: {e}")
+                stats["throttled"] = True
+                break
+            except Exception as e:
+                logger.error(f"Geocoding error for '{raw_query[query]}': {e}")
+                stats["errors"] += 1
+                continue
+            results[query] = pending[query] = found[0] if found else None
+            if len(pending) >= WRITE_CHUNK:
+                await flush(pending)
+                pending = {}
+
+        await flush(pending)
+        for query, result in results.items():
+            stats["geocoded" if result else "not_found"] += len(by_query[query])
+        return stats
+
+    def _write(self, fresh, resolved, by_query, now) -> None:
+        """Caches the newly fetched results and stamps every resolved property."""
+        coords = [
+            {"id": prop_id, "lat": r["latitude"], "lon": r["longitude"], "now": now}
+            for q, r in resolved.items() if r for prop_id in by_query[q]
+        ]
+        attempted = [{"id": prop_id, "now": now} for q, r in resolved.items() if not r for prop_id in by_query[q]]
+        with self.engine.begin() as conn:
+            self.store(conn, fresh, now)
+            if coords:
+                conn.execute(text("""
+                    UPDATE property_details
+                    SET latitude = :lat, longitude = :lon, geocode_attempted_at = :now
+                    WHERE id = :id
+                """), coords)
+            if attempted:
+                conn.execute(text("UPDATE property_details SET geocode_attempted_at = :now WHERE id = :id"), attempted)
+
+    def geocode_missing(self, limit: Optional[int] = None, today: Optional[date] = None) -> Dict[str, Any]:
+        """Batch-geocodes up to `limit` properties without coordinates; returns counts."""
+        started = time.perf_counter()
+
+        async def run():
+            try:
+                return await self._geocode_missing(limit or settings.GEOCODE_BATCH_LIMIT, today or date.today())
+            finally:
+                await self.aclose()
+
+        stats = asyncio.run(run())
+        stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Geocoding batch: {stats}")
+        return stats
+
 
 geocoding_service = GeocodingService()
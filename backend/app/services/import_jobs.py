@@ -0,0 +1,308 @@
+"""
+Partitioned, resumable property CSV import jobs.
+
+A job splits the uploaded CSV into byte-range partitions (cut on record
+boundaries, so quoted multi-line fields stay intact). Each partition is read in
+IMPORT_CHUNK_SIZE chunks; every committed chunk is checkpointed in Redis, so a
+partition re-run after a crash or deploy skips the chunks it already wrote.
+
+Redis layout (all keys expire after JOB_TTL):
+    import_job:{id}                  hash  job metadata (file, partitions, status, timestamps)
+    import_job:{id}:chunks           hash  "partition:chunk" -> {"rows", "succeeded", "errors"} of committed chunks
+    import_job:{id}:failed           hash  "partition:chunk" -> last DB error of chunks that did not commit
+    import_job:{id}:partitions_done  set   finished partition indexes
+    import_errors:{id}               list  row/chunk error messages
+    import_status:{id}               str   human readable status, kept for older clients
+"""
+import io
+import json
+import os
+import time
+import logging
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.import_service import redis
+from app.services.current_auction_service import current_auction_service
+from app.services.property_bulk_loader import property_bulk_loader
+from app.services.property_csv_transform import transform_chunk
+from app.services.property_search import property_search_service
+from app.services.rescore_queue import rescore_queue_service
+
+logger = logging.getLogger(__name__)
+
+JOB_TTL = 7 * 24 * 3600
+ACTIVE_JOBS_KEY = "import_jobs:active"
+MAX_STORED_ERRORS = 500
+MAX_RETRIES = 3
+
+
+def plan_partitions(file_path: str, target_bytes: int) -> Tuple[int, List[dict]]:
+    """
+    Splits the CSV body into partitions of roughly `target_bytes`.
+
+    Returns (header_end, partitions); each partition is
+    {"index", "start", "end", "first_row", "rows"} where `first_row` is the
+    0-based index of its first record in the whole file.
+    """
+    partitions: List[dict] = []
+    with open(file_path, "rb") as f:
+        header_end = len(f.readline())
+        start = offset = header_end
+        rows = first_row = 0
+        in_quotes = False
+        for line in f:
+            offset += len(line)
+            # An odd number of quotes toggles whether the record continues on the next line
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes:
+                continue
+            if line.strip():
+                rows += 1
+            if offset - start >= target_bytes:
+                partitions.append({"index": len(partitions), "start": start, "end": offset,
+                                   "first_row": first_row, "rows": rows - first_row})
+                start, first_row = offset, rows
+        if offset > start:
+            partitions.append({"index": len(partitions), "start": start, "end": offset,
+                               "first_row": first_row, "rows": rows - first_row})
+    return header_end, partitions
+
+
+def read_partition(file_path: str, header_end: int, partition: dict, chunk_size: int):
+    """Yields the partition's chunks with the frame index offset to whole-file row positions."""
+    with open(file_path, "rb") as f:
+        header = f.read(header_end)
+        f.seek(partition["start"])
+        body = f.read(partition["end"] - partition["start"])
+    reader = pd.read_csv(io.BytesIO(header + body), dtype=str, chunksize=chunk_size)
+    for chunk in reader:
+        chunk.index = chunk.index + partition["first_row"]
+        yield chunk
+
+
+def compute_progress(meta: dict, chunk_results: List[dict], failed_chunks: int, partitions_done: int, now: float) -> dict:
+    total_rows = int(meta.get("total_rows", 0))
+    rows_done = sum(r["rows"] for r in chunk_results)
+    started_at = float(meta.get("started_at", now))
+    elapsed = max(now - started_at, 0.001)
+    rows_per_sec = rows_done / elapsed if rows_done else 0.0
+    remaining = max(total_rows - rows_done, 0)
+    return {
+        "status": meta.get("status"),
+        "total_rows": total_rows,
+        "rows_done": rows_done,
+        "rows_succeeded": sum(r["succeeded"] for r in chunk_results),
+        "row_errors": sum(r["errors"] for r in chunk_results),
+        "failed_chunks": failed_chunks,
+        "partitions_total": len(json.loads(meta.get("partitions", "[]"))),
+        "partitions_done": partitions_done,
+        "rows_per_sec": round(rows_per_sec, 1),
+        "eta_seconds": round(remaining / rows_per_sec) if rows_per_sec else None,
+        "started_at": started_at,
+        "updated_at": float(meta.get("updated_at", started_at)),
+    }
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _job_key(job_id: str, suffix: str = "") -> str:
+    return f"import_job:{job_id}{':' + suffix if suffix else ''}"
+
+
+class ImportJobService:
+    """Plans, runs, checkpoints and reports partitioned property CSV imports."""
+
+    @staticmethod
+    def start(file_path: str, job_id: str) -> List[dict]:
+        header_end, partitions = plan_partitions(file_path, settings.IMPORT_PARTITION_BYTES)
+        now = time.time()
+        redis.hset(_job_key(job_id), mapping={
+            "file_path": file_path,
+            "header_end": header_end,
+            "chunk_size": settings.IMPORT_CHUNK_SIZE,
+            "partitions": json.dumps(partitions),
+            "total_rows": sum(p["rows"] for p in partitions),
+            "status": "running",
+            "started_at": now,
+            "updated_at": now,
+        })
+        redis.expire(_job_key(job_id), JOB_TTL)
+        redis.sadd(ACTIVE_JOBS_KEY, job_id)
+        redis.set(f"import_status:{job_id}", "Processing 0 rows...", ex=JOB_TTL)
+        logger.info(f"Job {job_id}: {len(partitions)} partitions planned for {file_path}")
+        return partitions
+
+    @staticmethod
+    def get_meta(job_id: str) -> Optional[dict]:
+        raw = redis.hgetall(_job_key(job_id))
+        if not raw:
+            return None
+        return {_decode(k): _decode(v) for k, v in raw.items()}
+
+    @staticmethod
+    def pending_partitions(job_id: str) -> List[int]:
+        meta = ImportJobService.get_meta(job_id)
+        if meta is None:
+            return []
+        done = {int(_decode(i)) for i in redis.smembers(_job_key(job_id, "partitions_done"))}
+        return [p["index"] for p in json.loads(meta["partitions"]) if p["index"] not in done]
+
+    @staticmethod
+    def run_partition(job_id: str, partition_index: int) -> None:
+        meta = ImportJobService.get_meta(job_id)
+        if meta is None:
+            logger.warning(f"Job {job_id}: no metadata, skipping partition {partition_index}")
+            return
+        partition = json.loads(meta["partitions"])[partition_index]
+        chunks_key = _job_key(job_id, "chunks")
+        failed_key = _job_key(job_id, "failed")
+
+        for chunk_no, chunk in enumerate(read_partition(meta["file_path"], int(meta["header_end"]), partition, int(meta["chunk_size"]))):
+            chunk_key = f"{partition_index}:{chunk_no}"
+            if redis.hexists(chunks_key, chunk_key):
+                continue  # Committed before a restart
+
+            details_batch, history_batch, row_errors = transform_chunk(chunk)
+            db_error = ImportJobService._write_chunk(job_id, chunk_key, details_batch, history_batch)
+            if db_error:
+                redis.hset(failed_key, chunk_key, db_error)
+                redis.expire(failed_key, JOB_TTL)
+            else:
+                redis.hset(chunks_key, chunk_key, json.dumps({
+                    "rows": len(chunk), "succeeded": len(details_batch), "errors": len(row_errors)
+                }))
+                redis.expire(chunks_key, JOB_TTL)
+                redis.hdel(failed_key, chunk_key)
+                if row_errors:
+                    redis.rpush(f"import_errors:{job_id}", *row_errors)
+                    redis.ltrim(f"import_errors:{job_id}", 0, MAX_STORED_ERRORS - 1)
+                    redis.expire(f"import_errors:{job_id}", JOB_TTL)
+
+            redis.hset(_job_key(job_id), "updated_at", time.time())
+            progress = ImportJobService.get_progress(job_id)
+            redis.set(f"import_status:{job_id}",
+                      f"Processing {progress['rows_done']}/{progress['total_rows']} rows...", ex=JOB_TTL)
+
+        redis.sadd(_job_key(job_id, "partitions_done"), partition_index)
+        redis.expire(_job_key(job_id, "partitions_done"), JOB_TTL)
+        logger.info(f"Job {job_id}: partition {partition_index} done")
+
+        if not ImportJobService.pending_partitions(job_id):
+            ImportJobService.finalize(job_id)
+
+    @staticmethod
+    def _write_chunk(job_id: str, chunk_key: str, details_batch: List[dict], history_batch: List[dict]) -> Optional[str]:
+        """Commits one chunk; returns the error message when it could not be saved."""
+        for attempt in range(MAX_RETRIES):
+            try:
+                with engine.begin() as conn:
+                    property_ids = property_bulk_loader.load_chunk(conn, details_batch, history_batch)
+                    if history_batch:
+                        current_auction_service.refresh_by_parcel_ids(conn, [h["parcel_id"] for h in history_batch])
+                    property_search_service.refresh_documents(conn, property_ids)
+                rescore_queue_service.mark_dirty(d["parcel_id"] for d in details_batch)
+                return None
+            except OperationalError as oe:
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"Job {job_id}: chunk {chunk_key} failed after {MAX_RETRIES} retries: {oe}")
+                    return f"Chunk {chunk_key} failed after {MAX_RETRIES} retries: {oe}"
+                logger.warning(f"Job {job_id}: DB OperationalError (Drop), retrying {attempt+1}/{MAX_RETRIES} in 3s... ({oe})")
+                time.sleep(3)
+            except Exception as ge:
+                logger.error(f"Job {job_id}: Unhandled error in DB save chunk {chunk_key}: {ge}")
+                return f"Chunk {chunk_key} DB error: {ge}"
+
+    @staticmethod
+    def finalize(job_id: str) -> None:
+        # Only the last partition to finish gets to finalize
+        if not redis.set(_job_key(job_id, "finalized"), 1, nx=True, ex=JOB_TTL):
+            return
+
+        progress = ImportJobService.get_progress(job_id)
+        failed = {_decode(k): _decode(v) for k, v in redis.hgetall(_job_key(job_id, "failed")).items()}
+        if failed:
+            redis.rpush(f"import_errors:{job_id}", *failed.values())
+            redis.ltrim(f"import_errors:{job_id}", 0, MAX_STORED_ERRORS - 1)
+
+        if progress["row_errors"] or failed:
+            status = "completed_with_errors"
+            status_msg = (f"Completed with errors. Success: {progress['rows_succeeded']}/{progress['total_rows']}. "
+                          f"Errors: {progress['row_errors'] + len(failed)}...")
+        else:
+            status = "completed"
+            status_msg = f"Success: {progress['rows_succeeded']} properties processed"
+
+        redis.hset(_job_key(job_id), mapping={"status": status, "updated_at": time.time()})
+        redis.set(f"import_status:{job_id}", status_msg, ex=JOB_TTL)
+        redis.srem(ACTIVE_JOBS_KEY, job_id)
+
+        # TRIGGER EVENT: Link imported properties to their auctions automatically
+        from app.tasks import resolve_property_auction_links_task
+        resolve_property_auction_links_task.delay(job_id)
+
+        # Failed chunks can still be resumed, so keep the file around for them
+        file_path = ImportJobService.get_meta(job_id)["file_path"]
+        if not failed and os.path.exists(file_path) and "temp_imports" in file_path:
+            os.remove(file_path)
+
+    @staticmethod
+    def reopen(job_id: str) -> List[int]:
+        """
+        Marks partitions with failed chunks as pending again and returns every
+        pending partition. Committed chunks are skipped when they are re-run.
+        """
+        meta = ImportJobService.get_meta(job_id)
+        if meta is None:
+            return []
+        if not os.path.exists(meta["file_path"]):
+            raise FileNotFoundError(meta["file_path"])
+
+        failed_partitions = {int(_decode(k).split(":")[0]) for k in redis.hkeys(_job_key(job_id, "failed"))}
+        if failed_partitions:
+            redis.srem(_job_key(job_id, "partitions_done"), *failed_partitions)
+        redis.delete(_job_key(job_id, "finalized"))
+        redis.hset(_job_key(job_id), mapping={"status": "running", "updated_at": time.time()})
+        redis.sadd(ACTIVE_JOBS_KEY, job_id)
+        return ImportJobService.pending_partitions(job_id)
+
+    @staticmethod
+    def stalled_jobs(stall_seconds: int) -> List[str]:
+        now = time.time()
+        stalled = []
+        for raw_id in redis.smembers(ACTIVE_JOBS_KEY):
+            job_id = _decode(raw_id)
+            meta = ImportJobService.get_meta(job_id)
+            if meta is None:
+                redis.srem(ACTIVE_JOBS_KEY, job_id)
+            elif meta["status"] == "running" and now - float(meta["updated_at"]) > stall_seconds:
+                stalled.append(job_id)
+        return stalled
+
+    @staticmethod
+    def get_progress(job_id: str) -> Optional[dict]:
+        meta = ImportJobService.get_meta(job_id)
+        if meta is None:
+            return None
+        chunk_results = [json.loads(v) for v in redis.hvals(_job_key(job_id, "chunks"))]
+        return compute_progress(
+            meta,
+            chunk_results,
+            failed_chunks=redis.hlen(_job_key(job_id, "failed")),
+            partitions_done=redis.scard(_job_key(job_id, "partitions_done")),
+            now=time.time(),
+        )
+
+    @staticmethod
+    def get_errors(job_id: str, limit: int = 100) -> List[str]:
+        return [_decode(e) for e in redis.lrange(f"import_errors:{job_id}", 0, limit - 1)]
+
+
+import_job_service = ImportJobService()
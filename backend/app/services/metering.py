@@ -0,0 +1,172 @@
+"""
+Per-user usage metering with tier limits, kept in Redis off the request path.
+
+A meter's running count lives in Redis (seeded from the users column the first
+time a user is seen) and is checked and incremented atomically by a Lua
+script. Increments are also added to a pending hash that flush_pending writes
+to `users` in one batch (flush_meters_task, every minute), so a metered read no
+longer takes a row lock on `users`. If Redis is unavailable the check falls
+back to a conditional UPDATE on `users`, so limits are still enforced.
+"""
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.services.import_service import redis
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TTL = 30 * 24 * 3600
+FLUSH_BATCH_RETENTION = timedelta(days=7)
+
+
+@dataclass(frozen=True)
+class Meter:
+    name: str
+    # users column the count is persisted to; None keeps the count in Redis only
+    column: Optional[str] = None
+    # Limit per subscription tier; tiers not listed are unlimited
+    limits: Dict[str, int] = field(default_factory=dict)
+
+
+METERS: Dict[str, Meter] = {
+    "property_views": Meter("property_views", column="property_searches_used", limits={"trial": 5, "pro": 5000}),
+    "media_purchases": Meter("media_purchases"),
+}
+
+
+@dataclass
+class MeterResult:
+    allowed: bool
+    used: int
+    limit: Optional[int]
+
+
+# KEYS: counter, pending hash. ARGV: seed, limit (-1 = unlimited), user id, ttl.
+_CONSUME_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[4])
+local used = tonumber(redis.call('GET', KEYS[1]))
+local limit = tonumber(ARGV[2])
+if limit >= 0 and used >= limit then
+    return {0, used}
+end
+used = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('HINCRBY', KEYS[2], ARGV[3], 1)
+return {1, used}
+"""
+_consume_script = redis.register_script(_CONSUME_LUA)
+
+
+def _counter_key(meter: Meter, user_id: int) -> str:
+    return f"meter:{meter.name}:{user_id}"
+
+
+def _pending_key(meter: Meter) -> str:
+    return f"meter:{meter.name}:pending"
+
+
+class MeteringService:
+
+    @staticmethod
+    def consume(db, name: str, user) -> MeterResult:
+        """
+        Counts one use of meter `name` for `user` (a User row) unless the user's
+        tier limit is already reached.
+        """
+        meter = METERS[name]
+        limit = meter.limits.get(user.subscription_tier or "")
+        seed = (getattr(user, meter.column) or 0) if meter.column else 0
+        try:
+            allowed, used = _consume_script(
+                keys=[_counter_key(meter, user.id), _pending_key(meter)],
+                args=[seed, -1 if limit is None else limit, user.id, COUNTER_TTL],
+            )
+            return MeterResult(bool(allowed), int(used), limit)
+        except Exception as e:
+            logger.warning(f"Metering via Redis unavailable ({e}); using the database for {name}")
+            return MeteringService._consume_db(db, meter, user.id, limit)
+
+    @staticmethod
+    def _consume_db(db, meter: Meter, user_id: int, limit: Optional[int]) -> MeterResult:
+        if not meter.column:
+            return MeterResult(True, 0, limit)
+        col = meter.column
+        limit_clause = f"AND COALESCE({col}, 0) < :limit" if limit is not None else ""
+        row = db.execute(text(f"""
+            UPDATE users SET {col} = COALESCE({col}, 0) + 1
+            WHERE id = :uid {limit_clause}
+            RETURNING {col}
+        """), {"uid": user_id, "limit": limit}).fetchone()
+        db.commit()
+        if row:
+            return MeterResult(True, int(row[0]), limit)
+        return MeterResult(False, limit or 0, limit)
+
+    @staticmethod
+    def reset(name: str, user_id: int) -> None:
+        """Drops the cached count, e.g. after the users column was reset on a plan change."""
+        redis.delete(_counter_key(METERS[name], user_id))
+
+    @staticmethod
+    def flush_pending(engine) -> int:
+        """
+        Writes the increments accumulated in Redis to their users columns, one
+        batch per meter. A batch whose write fails stays staged and is retried
+        by the next flush. Each batch carries an id recorded in
+        metering_flush_batches with the increments, so a batch that was written
+        but whose Redis cleanup failed is dropped, not applied again.
+        """
+        flushed = 0
+        for meter in METERS.values():
+            pending = _pending_key(meter)
+            if not meter.column:
+                redis.delete(pending)
+                continue
+            flushing = f"{pending}:flushing"
+            batch_key = f"{flushing}:batch"
+            # Retry a batch left behind by a crashed flush before taking a new one
+            if not redis.exists(flushing):
+                try:
+                    redis.rename(pending, flushing)
+                except Exception:
+                    continue  # nothing pending
+            # Set before anything is written, so a batch without an id was never applied
+            batch_id = redis.get(batch_key)
+            if batch_id is None:
+                batch_id = uuid.uuid4().hex
+                redis.set(batch_key, batch_id)
+            batch_id = batch_id.decode() if isinstance(batch_id, bytes) else batch_id
+            deltas = [
+                {"uid": int(uid), "delta": int(delta)}
+                for uid, delta in redis.hgetall(flushing).items()
+            ]
+            if deltas:
+                try:
+                    with engine.begin() as conn:
+                        now = datetime.utcnow()
+                        conn.execute(text("""
+                            INSERT INTO metering_flush_batches (batch_id, meter, applied_at)
+                            VALUES (:batch_id, :meter, :now)
+                        """), {"batch_id": batch_id, "meter": meter.name, "now": now})
+                        conn.execute(text(f"""
+                            UPDATE users SET {meter.column} = COALESCE({meter.column}, 0) + :delta
+                            WHERE id = :uid
+                        """), deltas)
+                        conn.execute(
+                            text("DELETE FROM metering_flush_batches WHERE applied_at < :cutoff"),
+                            {"cutoff": now - FLUSH_BATCH_RETENTION}
+                        )
+                except IntegrityError:
+                    logger.info(f"Metering batch {batch_id} for {meter.name} was already applied; discarding it")
+                    deltas = []
+            redis.delete(flushing, batch_key)
+            flushed += len(deltas)
+        return flushed
+
+metering_service = MeteringService()
@@ -0,0 +1,213 @@
+"""
+Bulk persistence of parsed property CSV chunks.
+
+On PostgreSQL each chunk is streamed into temp staging tables with COPY and
+merged with set-based statements: one INSERT for the availability-history diff,
+one upsert into property_details and one upsert into property_auction_history.
+Other dialects (SQLite in tests) use executemany.
+"""
+import io
+import csv
+from datetime import date, datetime
+from typing import List, Sequence
+
+from sqlalchemy import text, bindparam
+
+HISTORY_COLUMNS = ["parcel_id", "auction_name", "auction_date", "taxes_due", "info_link", "list_link", "created_at"]
+
+# Derived lookups only overwrite when the new row resolved a value
+KEEP_EXISTING = {"county_fips"}
+
+COPY_NULL = "\\N"
+
+
+def dedupe_last(records: Sequence[dict], *keys: str) -> List[dict]:
+    """Keeps the last record per key so a single upsert never touches a row twice."""
+    latest = {}
+    for r in records:
+        latest[tuple(r[k] for k in keys)] = r
+    return list(latest.values())
+
+
+def _copy_value(v):
+    if v is None:
+        return COPY_NULL
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    if isinstance(v, float) and v != v:
+        return COPY_NULL
+    return v
+
+
+def to_copy_buffer(records: Sequence[dict], columns: Sequence[str]) -> io.StringIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for r in records:
+        writer.writerow([_copy_value(r.get(c)) for c in columns])
+    buf.seek(0)
+    return buf
+
+
+def _update_set(columns: Sequence[str]) -> str:
+    return ", ".join(
+        f"{k} = COALESCE(EXCLUDED.{k}, property_details.{k})" if k in KEEP_EXISTING else f"{k} = EXCLUDED.{k}"
+        for k in columns if k not in ("property_id", "parcel_id")
+    )
+
+
+def _dialect_name(conn) -> str:
+    return conn.get_bind().dialect.name if hasattr(conn, "get_bind") else conn.dialect.name
+
+
+class PropertyBulkLoader:
+    """
+    Writes a chunk of property_details / property_auction_history records and the
+    matching property_availability_history rows. Parcels that already exist keep
+    their property_id. Returns the property_ids written.
+    """
+
+    @staticmethod
+    def load_chunk(conn, details_batch: List[dict], history_batch: List[dict]) -> List[str]:
+        details_batch = dedupe_last(details_batch, "parcel_id")
+        history_batch = dedupe_last(history_batch, "parcel_id", "auction_name")
+
+        if _dialect_name(conn) == "postgresql":
+            return PropertyBulkLoader._load_copy(conn, details_batch, history_batch)
+        return PropertyBulkLoader._load_executemany(conn, details_batch, history_batch)
+
+    @staticmethod
+    def _copy(conn, table: str, columns: Sequence[str], records: Sequence[dict]):
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                to_copy_buffer(records, columns)
+            )
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _load_copy(conn, details_batch: List[dict], history_batch: List[dict]) -> List[str]:
+        property_ids: List[str] = []
+
+        if details_batch:
+            columns = list(details_batch[0].keys())
+            col_list = ", ".join(columns)
+            conn.execute(text(f"""
+                CREATE TEMP TABLE stage_property_details ON COMMIT DROP AS
+                SELECT {col_list} FROM property_details WITH NO DATA
+            """))
+            PropertyBulkLoader._copy(conn, "stage_property_details", columns, details_batch)
+
+            # Existing parcels keep their UUID
+            conn.execute(text("""
+                UPDATE stage_property_details s SET property_id = p.property_id
+                FROM property_details p
+                WHERE p.parcel_id = s.parcel_id AND p.property_id <> s.property_id
+            """))
+
+            # Availability diff against the pre-merge state
+            conn.execute(text("""
+                INSERT INTO property_availability_history (property_id, previous_status, new_status, change_source, changed_at)
+                SELECT s.property_id,
+                       CASE WHEN p.id IS NULL THEN NULL ELSE COALESCE(p.availability_status, 'not available') END,
+                       s.availability_status, 'batch_import', :changed_at
+                FROM stage_property_details s
+                LEFT JOIN property_details p ON p.parcel_id = s.parcel_id
+                WHERE p.id IS NULL
+                   OR COALESCE(p.availability_status, 'not available') IS DISTINCT FROM s.availability_status
+            """), {"changed_at": datetime.utcnow()})
+
+            property_ids = [r[0] for r in conn.execute(text(f"""
+                INSERT INTO property_details ({col_list})
+                SELECT {col_list} FROM stage_property_details
+                ON CONFLICT (parcel_id) DO UPDATE SET {_update_set(columns)}
+                RETURNING property_id
+            """)).fetchall()]
+
+        if history_batch:
+            conn.execute(text("""
+                CREATE TEMP TABLE stage_auction_history (
+                    parcel_id text, auction_name text, auction_date date, taxes_due double precision,
+                    info_link text, list_link text, created_at timestamp
+                ) ON COMMIT DROP
+            """))
+            PropertyBulkLoader._copy(conn, "stage_auction_history", HISTORY_COLUMNS, history_batch)
+            conn.execute(text("""
+                INSERT INTO property_auction_history (property_id, auction_name, auction_date, taxes_due, info_link, list_link, created_at)
+                SELECT p.property_id, s.auction_name, s.auction_date, s.taxes_due, s.info_link, s.list_link, s.created_at
+                FROM stage_auction_history s
+                JOIN property_details p ON p.parcel_id = s.parcel_id
+                ON CONFLICT (property_id, auction_name) DO UPDATE SET
+                    auction_date = EXCLUDED.auction_date,
+                    taxes_due = EXCLUDED.taxes_due,
+                    info_link = EXCLUDED.info_link,
+                    list_link = EXCLUDED.list_link
+            """))
+
+        return property_ids
+
+    @staticmethod
+    def _load_executemany(conn, details_batch: List[dict], history_batch: List[dict]) -> List[str]:
+        if details_batch:
+            parcel_ids = [d["parcel_id"] for d in details_batch]
+            existing_status_map = {
+                r[0]: (r[1], r[2])  # (property_id, availability_status)
+                for r in conn.execute(
+                    text("SELECT parcel_id, property_id, availability_status FROM property_details WHERE parcel_id IN :parcels").bindparams(
+                        bindparam("parcels", expanding=True)
+                    ),
+                    {"parcels": parcel_ids}
+                ).fetchall()
+            }
+
+            changed_at = datetime.utcnow()
+            availability_history_batch = []
+            for d in details_batch:
+                if d["parcel_id"] in existing_status_map:
+                    db_prop_id, old_status = existing_status_map[d["parcel_id"]]
+                    d["property_id"] = db_prop_id  # Keep the same UUID
+                    if (old_status or "not available") == d["availability_status"]:
+                        continue
+                    previous_status = old_status or "not available"
+                else:
+                    previous_status = None
+                availability_history_batch.append({
+                    "property_id": d["property_id"],
+                    "previous_status": previous_status,
+                    "new_status": d["availability_status"],
+                    "change_source": "batch_import",
+                    "changed_at": changed_at
+                })
+
+            columns = list(details_batch[0].keys())
+            conn.execute(text(f"""
+                INSERT INTO property_details ({", ".join(columns)}) VALUES ({", ".join(f":{k}" for k in columns)})
+                ON CONFLICT (parcel_id) DO UPDATE SET {_update_set(columns)}
+            """), details_batch)
+
+            if availability_history_batch:
+                conn.execute(text("""
+                    INSERT INTO property_availability_history (property_id, previous_status, new_status, change_source, changed_at)
+                    VALUES (:property_id, :previous_status, :new_status, :change_source, :changed_at)
+                """), availability_history_batch)
+
+        if history_batch:
+            conn.execute(text("""
+                INSERT INTO property_auction_history (property_id, auction_name, auction_date, taxes_due, info_link, list_link, created_at)
+                SELECT p.property_id, :auction_name, :auction_date, :taxes_due, :info_link, :list_link, :created_at
+                FROM property_details p
+                WHERE p.parcel_id = :parcel_id
+                ON CONFLICT (property_id, auction_name) DO UPDATE SET
+                    auction_date = EXCLUDED.auction_date,
+                    taxes_due = EXCLUDED.taxes_due,
+                    info_link = EXCLUDED.info_link,
+                    list_link = EXCLUDED.list_link
+            """), history_batch)
+
+        return [d["property_id"] for d in details_batch]
+
+
+property_bulk_loader = PropertyBulkLoader()
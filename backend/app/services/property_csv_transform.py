@@ -0,0 +1,380 @@
+"""
+Columnar transformation of property CSV chunks into property_details /
+property_auction_history records.
+
+`transform_chunk` parses a whole pandas chunk with column operations. Rows the
+vectorized path cannot vouch for (missing parcel_id, unparseable tax year) are
+re-run through `build_row_records`, the original per-row PropertyCSVRow path,
+so they keep producing the same records or validation errors as before.
+"""
+import re
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.csv_import import PropertyCSVRow
+from app.services.smart_tag import smart_tag_service
+from app.utils.state_mapper import canonical_state_code, make_county_key
+
+UNAVAILABLE_TERMS = ["unavailable", "not available", "sold", "redeemed"]
+PROCESSED_TRUE = ["true", "1", "yes"]
+
+ZONING_CODE_RE = re.compile(r'Zoning Code:\s*([^\s]+)')
+LAND_SQFT_RE = re.compile(r'Land Sq\. Ft:\s*([\d,]+)')
+ACRES_RE = re.compile(r'Acres:\s*([\d.]+)')
+SUBDIVISION_RE = re.compile(r'Subdivision Name:\s*(.*?)(?=\s+(?:Living|Adjusted|Ground|Building|#\s*of|Stories|Legal\sDescription))')
+LEGAL_DESC_RE = re.compile(r'Legal Description:\s*(.*)')
+FLOAT_RE = r'([-+]?\d*\.?\d+)'
+
+# CSV header -> PropertyCSVRow field name, for headers whose alias differs from the field
+FIELD_ALIASES = {
+    "type": "property_type",
+    "total_value": "assessed_value",
+    "state_code": "state",
+    "acres": "lot_acres",
+    "tax_sale_year": "tax_year",
+    "availability": "availability_status",
+}
+
+FLOAT_FIELDS = [
+    "amount_due", "total_value", "land_value", "improvements", "estimated_arv",
+    "estimated_rent", "taxes_due_auction", "acres", "redfin_estimate", "lot_sqft",
+    "latitude", "longitude",
+]
+
+
+def parse_auction_date(d_str):
+    if not d_str: return None
+    try: return datetime.strptime(d_str.strip(), "%m/%d/%Y").date()
+    except: pass
+    try: return datetime.strptime(d_str.strip(), "%Y-%m-%d").date()
+    except: return None
+
+
+def parse_tax_year(value) -> Optional[int]:
+    """Whole tax year (truncated toward zero); missing or 0 means no year."""
+    if value is None or pd.isna(value):
+        return None
+    year = int(float(value))
+    return year or None
+
+
+def parse_availability(raw_val):
+    if not raw_val or pd.isna(raw_val): return "available"
+    s = str(raw_val).lower().strip()
+    # Standardize all negative terms to 'unavailable'
+    if s in UNAVAILABLE_TERMS:
+        return "unavailable"
+    return "available"
+
+
+def extract_dense_data(z_str, l_str):
+    """Parse dense text blocks from zoning and legal_description."""
+    res = {
+        "zoning": z_str, "subdivision": l_str,
+        "lot_sqft": None, "lot_acres": None,
+        "legal_desc": l_str, "parcel_shape_data": []
+    }
+    if z_str and isinstance(z_str, str):
+        res["parcel_shape_data"].append(f"Zoning Data: {z_str}")
+        m_zone = ZONING_CODE_RE.search(z_str)
+        if m_zone: res["zoning"] = m_zone.group(1).strip()
+
+        m_sq = LAND_SQFT_RE.search(z_str)
+        if m_sq: res["lot_sqft"] = m_sq.group(1).replace(',', '')
+
+        m_ac = ACRES_RE.search(z_str)
+        if m_ac: res["lot_acres"] = m_ac.group(1).strip()
+
+    if l_str and isinstance(l_str, str):
+        res["parcel_shape_data"].append(f"Legal Rules: {l_str}")
+        m_sub = SUBDIVISION_RE.search(l_str)
+        if m_sub: res["subdivision"] = m_sub.group(1).strip()
+
+        m_leg = LEGAL_DESC_RE.search(l_str)
+        if m_leg: res["legal_desc"] = m_leg.group(1).strip()
+
+    # Convert array of shapes to a single text block
+    res["parcel_shape_data"] = "\n\n".join(res["parcel_shape_data"]) if res["parcel_shape_data"] else None
+    return res
+
+
+def build_row_records(row_dict: dict) -> Tuple[dict, Optional[dict]]:
+    """
+    Per-row path: validates one CSV row with PropertyCSVRow and maps it to a
+    property_details record and an optional auction history record.
+    Raises on validation errors.
+    """
+    validated_data = PropertyCSVRow(**row_dict)
+    dense_parsed = extract_dense_data(validated_data.zoning, validated_data.legal_description)
+
+    new_avail_status = parse_availability(validated_data.availability)
+    state_code = canonical_state_code(validated_data.state_code)
+    county_key = make_county_key(validated_data.county)
+
+    d = {
+        "property_id": validated_data.property_id if validated_data.property_id else str(uuid.uuid4()),
+        "parcel_id": str(validated_data.parcel_id).strip() if validated_data.parcel_id else None,
+        "address": validated_data.address,
+        "owner_address": validated_data.owner_address,
+        "county": validated_data.county,
+        "state": validated_data.state_code,
+        "state_code": state_code,
+        "county_key": county_key,
+        "county_fips": smart_tag_service.get_county_fips(state_code, validated_data.county, county_key),
+        "amount_due": validated_data.amount_due,
+        "occupancy": validated_data.vacancy,
+        "tax_year": parse_tax_year(validated_data.tax_sale_year),
+        "cs_number": validated_data.cs_number,
+        "property_type": validated_data.type,
+        "availability_status": new_avail_status,
+        "account_number": validated_data.account,
+        "lot_acres": validated_data.acres or _to_float(dense_parsed["lot_acres"]),
+        "estimated_value": validated_data.estimated_arv,
+        "rental_value": validated_data.estimated_rent,
+        "improvement_value": validated_data.improvements,
+        "land_value": validated_data.land_value,
+        "assessed_value": validated_data.total_value,
+        "property_category": validated_data.property_category,
+        "purchase_option_type": validated_data.purchase_option_type,
+        "latitude": validated_data.latitude,
+        "longitude": validated_data.longitude,
+        "redfin_url": validated_data.redfin_url,
+        "redfin_estimate": validated_data.redfin_estimate,
+        "lot_sqft": validated_data.lot_sqft or _to_float(dense_parsed["lot_sqft"]),
+        "zoning": dense_parsed["zoning"],
+        "subdivision": dense_parsed["subdivision"],
+        "legal_description": dense_parsed["legal_desc"],
+        "parcel_shape_data": dense_parsed["parcel_shape_data"],
+        "sewer_type": validated_data.sewer_type,
+        "water_type": validated_data.water_type,
+        "property_type_detail": validated_data.property_type_detail,
+        "import_error_msg": validated_data.error,
+        "is_processed": str(validated_data.processed).lower() in PROCESSED_TRUE if pd.notna(validated_data.processed) else False,
+        "map_link": validated_data.map_link,
+    }
+
+    # Coordinate Synchronization Logic
+    if not d["latitude"] and not d["longitude"] and pd.notna(validated_data.coordinates):
+        try:
+            clean_coords = str(validated_data.coordinates).replace(',', ' ').strip()
+            parts = clean_coords.split()
+            if len(parts) >= 2:
+                d["latitude"] = float(parts[0])
+                d["longitude"] = float(parts[1])
+        except: pass
+
+    h = None
+    if validated_data.auction_name and validated_data.auction_date:
+        h = {
+            "parcel_id": validated_data.parcel_id,  # Temporary ref to link to property
+            "auction_name": validated_data.auction_name,
+            "auction_date": parse_auction_date(validated_data.auction_date),
+            "taxes_due": validated_data.taxes_due_auction,
+            "info_link": validated_data.auction_info_link,
+            "list_link": validated_data.auction_list_link,
+            "created_at": datetime.utcnow()
+        }
+    return d, h
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _col(chunk: pd.DataFrame, field: str, default=None) -> pd.Series:
+    """Column for a PropertyCSVRow field, honouring its CSV alias (the alias wins, like Pydantic)."""
+    alias = FIELD_ALIASES.get(field)
+    if alias and alias in chunk.columns:
+        return chunk[alias]
+    if field in chunk.columns:
+        return chunk[field]
+    return pd.Series(default, index=chunk.index, dtype=object)
+
+
+def _numeric(s: pd.Series) -> pd.Series:
+    # Plain float64 (NaN for blanks/garbage) rather than pandas' nullable dtypes
+    return pd.to_numeric(s.astype(object), errors="coerce").astype("float64")
+
+
+def _parse_float_col(s: pd.Series) -> pd.Series:
+    # Same rule as schemas.csv_import.parse_float: drop thousands separators, take the first number
+    extracted = s.astype("string").str.replace(",", "", regex=False).str.extract(FLOAT_RE, expand=False)
+    return _numeric(extracted)
+
+
+def _parse_date_col(s: pd.Series) -> pd.Series:
+    stripped = s.astype("string").str.strip()
+    parsed = pd.to_datetime(stripped, format="%m/%d/%Y", errors="coerce")
+    iso = pd.to_datetime(stripped, format="%Y-%m-%d", errors="coerce")
+    return parsed.fillna(iso)
+
+
+def _map_unique(s: pd.Series, fn) -> pd.Series:
+    # Location columns have few distinct values per chunk; map each once
+    uniques = s.dropna().unique()
+    return s.map({u: fn(u) for u in uniques})
+
+
+def _records(frame: pd.DataFrame) -> List[dict]:
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def transform_chunk(chunk: pd.DataFrame) -> Tuple[List[dict], List[dict], List[str]]:
+    """
+    Vectorized equivalent of running build_row_records over every row of `chunk`
+    (read with dtype=str). Returns (details_batch, history_batch, errors).
+    """
+    if len(chunk) == 0:
+        return [], [], []
+
+    parcel_raw = _col(chunk, "parcel_id")
+    tax_raw = _col(chunk, "tax_sale_year")
+    tax_num = _numeric(tax_raw)
+
+    # Rows that would fail (or need Pydantic's exact coercion) go through the per-row path
+    fallback_mask = parcel_raw.isna() | parcel_raw.astype("string").str.strip().eq("") | (tax_raw.notna() & tax_num.isna())
+    fast = chunk.loc[~fallback_mask]
+
+    details_batch: List[dict] = []
+    history_batch: List[dict] = []
+    errors: List[str] = []
+
+    if len(fast):
+        details_batch, history_batch = _transform_valid(fast)
+
+    for idx, row in chunk.loc[fallback_mask].iterrows():
+        try:
+            d, h = build_row_records(row.where(pd.notnull(row), None).to_dict())
+            details_batch.append(d)
+            if h:
+                history_batch.append(h)
+        except Exception as e:
+            errors.append(f"Row {idx + 2}: {str(e)}")
+
+    return details_batch, history_batch, errors
+
+
+def _transform_valid(chunk: pd.DataFrame) -> Tuple[List[dict], List[dict]]:
+    out = pd.DataFrame(index=chunk.index)
+    floats = {f: _parse_float_col(_col(chunk, f)) for f in FLOAT_FIELDS}
+
+    zoning = _col(chunk, "zoning")
+    legal = _col(chunk, "legal_description")
+    z_str = zoning.astype("string")
+    l_str = legal.astype("string")
+
+    property_id = _col(chunk, "property_id")
+    missing_ids = property_id.isna()
+    if missing_ids.any():
+        property_id = property_id.copy()
+        property_id.loc[missing_ids] = [str(uuid.uuid4()) for _ in range(int(missing_ids.sum()))]
+
+    parcel_id = _col(chunk, "parcel_id").astype("string").str.strip()
+    county = _col(chunk, "county")
+    state = _col(chunk, "state_code")
+    state_code = _map_unique(state, canonical_state_code)
+    county_key = _map_unique(county, make_county_key)
+
+    out["property_id"] = property_id
+    out["parcel_id"] = parcel_id
+    out["address"] = _col(chunk, "address")
+    out["owner_address"] = _col(chunk, "owner_address")
+    out["county"] = county
+    out["state"] = state
+    out["state_code"] = state_code
+    out["county_key"] = county_key
+    location = pd.DataFrame({"s": state_code, "c": county, "k": county_key}).astype(object)
+    location = location.where(location.notna(), None)
+    location_keys = list(location.itertuples(index=False, name=None))
+    fips_map = {key: smart_tag_service.get_county_fips(*key) for key in set(location_keys)}
+    out["county_fips"] = [fips_map[key] for key in location_keys]
+    out["amount_due"] = floats["amount_due"]
+    out["occupancy"] = _col(chunk, "vacancy")
+
+    # Same rule as parse_tax_year: truncate toward zero, then 0 means no year
+    tax_num = np.trunc(_numeric(_col(chunk, "tax_sale_year")))
+    out["tax_year"] = tax_num.where(tax_num.notna() & (tax_num != 0)).astype("Int64")
+
+    out["cs_number"] = _col(chunk, "cs_number")
+    out["property_type"] = _col(chunk, "type", default="residential")
+
+    availability = _col(chunk, "availability").astype("string").str.lower().str.strip()
+    out["availability_status"] = np.where(availability.isin(UNAVAILABLE_TERMS).fillna(False), "unavailable", "available")
+
+    out["account_number"] = _col(chunk, "account")
+
+    dense_acres = _numeric(z_str.str.extract(ACRES_RE, expand=False).str.strip())
+    dense_sqft = _numeric(z_str.str.extract(LAND_SQFT_RE, expand=False).str.replace(",", "", regex=False))
+    acres = floats["acres"]
+    sqft = floats["lot_sqft"]
+    out["lot_acres"] = acres.where(acres.notna() & (acres != 0), dense_acres)
+    out["estimated_value"] = floats["estimated_arv"]
+    out["rental_value"] = floats["estimated_rent"]
+    out["improvement_value"] = floats["improvements"]
+    out["land_value"] = floats["land_value"]
+    out["assessed_value"] = floats["total_value"]
+    out["property_category"] = _col(chunk, "property_category")
+    out["purchase_option_type"] = _col(chunk, "purchase_option_type")
+
+    lat = floats["latitude"]
+    lon = floats["longitude"]
+    coords = _col(chunk, "coordinates").astype("string").str.replace(",", " ", regex=False).str.strip()
+    coord_parts = coords.str.extract(r'^(\S+)\s+(\S+)')
+    c_lat = _numeric(coord_parts[0])
+    c_lon = _numeric(coord_parts[1])
+    use_coords = (lat.isna() | (lat == 0)) & (lon.isna() | (lon == 0)) & c_lat.notna() & c_lon.notna()
+    out["latitude"] = lat.where(~use_coords, c_lat)
+    out["longitude"] = lon.where(~use_coords, c_lon)
+
+    out["redfin_url"] = _col(chunk, "redfin_url")
+    out["redfin_estimate"] = floats["redfin_estimate"]
+    out["lot_sqft"] = sqft.where(sqft.notna() & (sqft != 0), dense_sqft)
+
+    zone_code = z_str.str.extract(ZONING_CODE_RE, expand=False).str.strip()
+    out["zoning"] = zone_code.fillna(z_str)
+    subdivision = l_str.str.extract(SUBDIVISION_RE, expand=False).str.strip()
+    out["subdivision"] = subdivision.fillna(l_str)
+    legal_desc = l_str.str.extract(LEGAL_DESC_RE, expand=False).str.strip()
+    out["legal_description"] = legal_desc.fillna(l_str)
+
+    z_part = ("Zoning Data: " + z_str)
+    l_part = ("Legal Rules: " + l_str)
+    out["parcel_shape_data"] = (z_part + "\n\n" + l_part).fillna(z_part).fillna(l_part)
+
+    out["sewer_type"] = _col(chunk, "sewer_type")
+    out["water_type"] = _col(chunk, "water_type")
+    out["property_type_detail"] = _col(chunk, "property_type_detail")
+    out["import_error_msg"] = _col(chunk, "error")
+    processed = _col(chunk, "processed").astype("string").str.lower()
+    out["is_processed"] = processed.isin(PROCESSED_TRUE).fillna(False).astype(bool)
+    out["map_link"] = _col(chunk, "map_link")
+
+    details_batch = _records(out)
+
+    # Auction history for rows carrying both an auction name and date
+    auction_name = _col(chunk, "auction_name")
+    auction_date_raw = _col(chunk, "auction_date")
+    has_auction = auction_name.notna() & auction_date_raw.notna()
+    history_batch: List[dict] = []
+    if has_auction.any():
+        hist = pd.DataFrame(index=chunk.index[has_auction])
+        hist["parcel_id"] = parcel_id[has_auction]
+        hist["auction_name"] = auction_name[has_auction]
+        parsed_dates = _parse_date_col(auction_date_raw[has_auction])
+        hist["auction_date"] = [d.date() if pd.notna(d) else None for d in parsed_dates]
+        hist["taxes_due"] = floats["taxes_due_auction"][has_auction]
+        hist["info_link"] = _col(chunk, "auction_info_link")[has_auction]
+        hist["list_link"] = _col(chunk, "auction_list_link")[has_auction]
+        history_batch = _records(hist)
+        created_at = datetime.utcnow()
+        for record in history_batch:
+            record["created_at"] = created_at
+
+    return details_batch, history_batch
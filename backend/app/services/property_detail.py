@@ -0,0 +1,112 @@
+"""
+Loads everything the property detail view needs in one statement.
+
+The latest auction, the caller's note and the score come from lateral/left joins.
+Auction history and (unlocked) attachments are aggregated to JSON in scalar
+subqueries, and the media paywall check is an EXISTS, so a detail view is a
+single round trip. Lookups go by parcel_id first and only fall back to the
+numeric primary key when the value is all digits and no parcel matched, so
+both paths use their index.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+_DETAIL_QUERY = """
+    SELECT
+        p.*,
+        cur.auction_name AS current_auction_name,
+        cur.auction_date AS current_auction_date,
+        COALESCE(cur.info_link, ae.register_link) AS auction_info_link,
+        COALESCE(cur.list_link, ae.list_link) AS auction_list_link,
+        (
+            SELECT COALESCE(json_agg(row_to_json(h) ORDER BY h.auction_date DESC), '[]'::json)
+            FROM property_auction_history h
+            WHERE h.property_id = p.property_id
+        ) AS _auction_history,
+        note.note_text AS _note,
+        access.unlocked AS _media_unlocked,
+        CASE WHEN access.unlocked THEN (
+            SELECT COALESCE(json_agg(json_build_object('filename', a.filename, 'file_path', a.file_path)), '[]'::json)
+            FROM client_attachments a
+            WHERE a.property_id = p.id
+        ) END AS _attachments,
+        s.deal_score AS _deal_score,
+        s.rating AS _deal_rating,
+        s.score_factors AS _score_factors,
+        s.model_version AS _score_model_version,
+        s.updated_at AS _score_updated_at
+    FROM property_details p
+    LEFT JOIN LATERAL (
+        SELECT pah.auction_id, pah.auction_name, pah.auction_date, pah.info_link, pah.list_link
+        FROM property_auction_history pah
+        WHERE pah.property_id = p.property_id
+        ORDER BY pah.auction_date DESC NULLS LAST, pah.id DESC
+        LIMIT 1
+    ) cur ON TRUE
+    LEFT JOIN auction_events ae ON ae.id = cur.auction_id
+    LEFT JOIN LATERAL (
+        SELECT cn.note_text
+        FROM client_notes cn
+        WHERE cn.user_id = :user_id AND cn.property_id = p.id
+        ORDER BY cn.created_at DESC
+        LIMIT 1
+    ) note ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT (
+            :is_superuser
+            OR EXISTS (
+                SELECT 1 FROM property_media_purchases mp
+                WHERE mp.property_id = p.property_id AND mp.user_id = :user_id
+            )
+            OR EXISTS (
+                SELECT 1 FROM consultant_tasks ct
+                WHERE ct.property_id = p.id AND ct.investor_user_id = :user_id AND ct.status = 'approved'
+            )
+        ) AS unlocked
+    ) access ON TRUE
+    LEFT JOIN property_scores s ON s.parcel_id = p.parcel_id
+    WHERE {lookup}
+"""
+
+
+class PropertyDetailService:
+
+    @staticmethod
+    def load(db, lookup: str, user_id: Optional[int], is_superuser: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Returns the detail payload for a parcel_id (or numeric id), or None.
+        Notes and attachments are only resolved for a known user.
+        """
+        params = {"value": lookup, "user_id": user_id, "is_superuser": bool(is_superuser)}
+        row = db.execute(text(_DETAIL_QUERY.format(lookup="p.parcel_id = :value")), params).fetchone()
+        if row is None and lookup.isdigit():
+            params["value"] = int(lookup)
+            row = db.execute(text(_DETAIL_QUERY.format(lookup="p.id = :value")), params).fetchone()
+        if row is None:
+            return None
+
+        data = dict(row._mapping)
+        data["auction_history"] = data.pop("_auction_history") or []
+        note = data.pop("_note")
+        unlocked = data.pop("_media_unlocked")
+        attachments = data.pop("_attachments")
+        data["notes"] = ""
+        data["attachments"] = []
+        if user_id is not None:
+            data["notes"] = note or ""
+            data["attachments"] = attachments or []
+            data["media_unlocked"] = bool(unlocked)
+
+        factors = data.pop("_score_factors")
+        updated_at = data.pop("_score_updated_at")
+        data["deal_score"] = data.pop("_deal_score")
+        data["deal_rating"] = data.pop("_deal_rating")
+        data["score_factors"] = json.loads(factors) if factors else []
+        data["score_model_version"] = data.pop("_score_model_version")
+        data["score_updated_at"] = updated_at.isoformat() if updated_at else None
+        return data
+
+
+property_detail_service = PropertyDetailService()
@@ -0,0 +1,168 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from sqlalchemy import text, bindparam
+
+logger = logging.getLogger(__name__)
+
+ZIP_PATTERN = re.compile(r'\d{5}')
+PARCEL_PATTERN = re.compile(r'^[\d\-A-Z]+$')
+
+# Columns that make up the searchable document, in the order they are concatenated.
+DOCUMENT_COLUMNS = [
+    "address", "county", "state", "owner_address", "description",
+    "legal_description", "parcel_id", "cs_number",
+]
+PARCEL_KEY_COLUMNS = ["parcel_id", "pin_ppin", "raw_parcel_number"]
+
+
+def normalize_document(*parts: Optional[str]) -> Optional[str]:
+    """Lower-cased, whitespace-collapsed concatenation of the non-empty parts."""
+    text_parts = [" ".join(str(p).split()) for p in parts if p is not None and str(p).strip()]
+    if not text_parts:
+        return None
+    return " ".join(text_parts).lower()
+
+
+def make_parcel_key(*parcel_numbers: Optional[str]) -> Optional[str]:
+    """Dash-stripped, upper-cased parcel identifiers joined by spaces."""
+    keys = [str(p).replace("-", "").strip().upper() for p in parcel_numbers if p is not None and str(p).strip()]
+    if not keys:
+        return None
+    return " ".join(keys)
+
+
+@dataclass
+class KeywordFilter:
+    clause: str
+    params: dict = field(default_factory=dict)
+    # SQL expression for relevance ordering, None when the backend cannot rank
+    rank_expr: Optional[str] = None
+
+
+def build_keyword_filter(keyword: str, dialect: str = "postgresql") -> Optional[KeywordFilter]:
+    """
+    Translates the free-text `keyword` search into a predicate over the indexed
+    search columns of property_details (alias `p`).
+
+    - 5-digit ZIP codes match the address.
+    - Parcel-like tokens match the dash-stripped parcel_key.
+    - Anything else matches the normalized search_document, with spaces acting as wildcards.
+    """
+    k = (keyword or "").strip()
+    if not k:
+        return None
+
+    is_postgres = dialect == "postgresql"
+
+    if ZIP_PATTERN.fullmatch(k):
+        return KeywordFilter(
+            clause="p.address ILIKE :zip_keyword" if is_postgres else "p.address LIKE :zip_keyword",
+            params={"zip_keyword": f"%{k}%"},
+        )
+
+    if PARCEL_PATTERN.match(k.upper()) and len(k) > 4:
+        clean_k = k.replace("-", "").upper()
+        return KeywordFilter(
+            clause="p.parcel_key LIKE :clean_k",
+            params={"clean_k": f"%{clean_k}%", "rank_k": clean_k},
+            rank_expr="similarity(p.parcel_key, :rank_k)" if is_postgres else None,
+        )
+
+    # Replace spaces with wildcards to handle slight typos (e.g., "123 Main" -> "123%main")
+    fuzzy_k = "%".join(k.lower().split())
+    return KeywordFilter(
+        clause="p.search_document LIKE :fuzzy_k",
+        params={"fuzzy_k": f"%{fuzzy_k}%", "rank_k": k.lower()},
+        rank_expr="word_similarity(:rank_k, p.search_document)" if is_postgres else None,
+    )
+
+
+def _dialect_name(conn) -> str:
+    # Accepts a Session or a Connection
+    bind = conn.get_bind() if hasattr(conn, "get_bind") else conn
+    return bind.dialect.name
+
+
+class PropertySearchService:
+    """
+    Keeps property_details.search_document and property_details.parcel_key in sync.
+
+    On PostgreSQL the documents are rebuilt in a single UPDATE; other dialects
+    (SQLite in tests) fall back to building them in Python.
+    """
+
+    @staticmethod
+    def refresh_documents(conn, property_ids: Iterable[str]) -> int:
+        ids = list({pid for pid in property_ids if pid})
+        if not ids:
+            return 0
+
+        if _dialect_name(conn) == "postgresql":
+            return PropertySearchService._refresh_sql(conn, "p.property_id = ANY(:ids)", {"ids": ids})
+        return PropertySearchService._refresh_python(conn, ids)
+
+    @staticmethod
+    def refresh_by_parcel_ids(conn, parcel_ids: Iterable[str]) -> int:
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return 0
+        rows = conn.execute(
+            text("SELECT property_id FROM property_details WHERE parcel_id IN :parcels").bindparams(
+                bindparam("parcels", expanding=True)
+            ),
+            {"parcels": parcels}
+        ).fetchall()
+        return PropertySearchService.refresh_documents(conn, [r[0] for r in rows])
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        """Rebuilds every search document (PostgreSQL)."""
+        return PropertySearchService._refresh_sql(conn, "1=1", {})
+
+    @staticmethod
+    def _refresh_sql(conn, where: str, params: dict) -> int:
+        doc_cols = ", ".join(f"p.{c}" for c in DOCUMENT_COLUMNS)
+        key_cols = ", ".join(f"REPLACE(p.{c}, '-', '')" for c in PARCEL_KEY_COLUMNS)
+        query = text(f"""
+            UPDATE property_details p SET
+                search_document = NULLIF(LOWER(REGEXP_REPLACE(CONCAT_WS(' ', {doc_cols},
+                    (SELECT pca.auction_name FROM property_current_auction pca WHERE pca.property_id = p.property_id)
+                ), '\\s+', ' ', 'g')), ''),
+                parcel_key = NULLIF(UPPER(CONCAT_WS(' ', {key_cols})), '')
+            WHERE {where}
+        """)
+        return conn.execute(query, params).rowcount
+
+    @staticmethod
+    def _refresh_python(conn, ids: list) -> int:
+        cols = ", ".join(f"p.{c}" for c in DOCUMENT_COLUMNS + PARCEL_KEY_COLUMNS)
+        rows = conn.execute(
+            text(f"""
+                SELECT p.property_id, {cols},
+                    (SELECT pca.auction_name FROM property_current_auction pca WHERE pca.property_id = p.property_id)
+                FROM property_details p WHERE p.property_id IN :ids
+            """).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids}
+        ).fetchall()
+
+        n_doc = len(DOCUMENT_COLUMNS)
+        updates = []
+        for r in rows:
+            doc_values = list(r[1:1 + n_doc]) + [r[-1]]
+            key_values = r[1 + n_doc:1 + n_doc + len(PARCEL_KEY_COLUMNS)]
+            updates.append({
+                "pid": r[0],
+                "doc": normalize_document(*doc_values),
+                "key": make_parcel_key(*key_values),
+            })
+        if updates:
+            conn.execute(
+                text("UPDATE property_details SET search_document = :doc, parcel_key = :key WHERE property_id = :pid"),
+                updates
+            )
+        return len(updates)
+
+
+property_search_service = PropertySearchService()
@@ -2,6 +2,8 @@ import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from datetime import datetime
+from app.services.current_auction_service import current_auction_service
+from app.services.property_search import property_search_service
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +64,7 @@ class ReconciliationService:
                     AND pah.auction_name = :auction_name
               )
             ON CONFLICT (property_id, auction_name) DO NOTHING
+            RETURNING property_id
         """)
 
         try:
@@ -72,12 +75,15 @@ class ReconciliationService:
                 "county": county,
                 "state": state
             })
+            linked_property_ids = [r[0] for r in result.fetchall()]
+            current_auction_service.refresh_properties(db, linked_property_ids)
+            property_search_service.refresh_documents(db, linked_property_ids)
             db.commit()
             
-            logger.info(f"Reconciled {result.rowcount} properties for auction {auction_id_val} ({auction_name})")
+            logger.info(f"Reconciled {len(linked_property_ids)} properties for auction {auction_id_val} ({auction_name})")
             return {
                 "status": "success",
-                "linked_count": result.rowcount,
+                "linked_count": len(linked_property_ids),
                 "auction_name": auction_name
             }
         except Exception as e:
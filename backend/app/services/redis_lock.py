@@ -0,0 +1,55 @@
+"""
+Owner-checked Redis locks for jobs that must not run twice at once.
+
+A plain SET NX EX lock is released with DEL, so a run that outlives the TTL
+deletes (or extends) the lock a newer run has since taken. Each RedisLock
+stores a random token and only releases or extends the key while it still
+holds that token, checked atomically in a script.
+"""
+import secrets
+from typing import Optional
+
+from app.services.import_service import redis
+
+# KEYS: lock. ARGV: token.
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+# KEYS: lock. ARGV: token, ttl.
+_EXTEND_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_release_script = redis.register_script(_RELEASE_LUA)
+_extend_script = redis.register_script(_EXTEND_LUA)
+
+
+class RedisLock:
+
+    def __init__(self, key: str, ttl: int):
+        self.key = key
+        self.ttl = ttl
+        self.token: Optional[str] = None
+
+    def acquire(self) -> bool:
+        token = secrets.token_hex(16)
+        if not redis.set(self.key, token, nx=True, ex=self.ttl):
+            return False
+        self.token = token
+        return True
+
+    def extend(self) -> bool:
+        """Resets the TTL; False if the lock expired and someone else took it."""
+        return self.token is not None and bool(_extend_script(keys=[self.key], args=[self.token, self.ttl]))
+
+    def release(self) -> bool:
+        if self.token is None:
+            return False
+        released = bool(_release_script(keys=[self.key], args=[self.token]))
+        self.token = None
+        return released
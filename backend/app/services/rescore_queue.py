@@ -0,0 +1,111 @@
+"""
+Deduplicating queue of parcels whose deal score is stale.
+
+Code paths that change scoring inputs (imports, manual edits, ATTOM enrichment,
+status reconcilers) add parcel_ids to a Redis set after committing; the
+rescore_dirty_properties_task worker pops them in batches and rescores them
+with the vectorized scoring engine. A parcel marked several times before the
+worker gets to it is rescored once.
+"""
+import logging
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text, bindparam
+
+from app.services.import_service import redis
+from app.services.redis_lock import RedisLock
+from app.services.scoring_engine import scoring_service
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "scores:dirty"
+LOCK_KEY = "scores:rescore_lock"
+LOCK_TTL = 600
+SADD_CHUNK = 10000
+
+
+def _decode(value) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RescoreQueueService:
+
+    @staticmethod
+    def mark_dirty(parcel_ids: Iterable[str]) -> int:
+        """
+        Queues parcels for rescoring. Never raises: a Redis outage must not fail
+        the write that triggered it (a forced batch rescore catches up later).
+        """
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return 0
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for i in range(0, len(parcels), SADD_CHUNK):
+                pipe.sadd(DIRTY_KEY, *parcels[i:i + SADD_CHUNK])
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Could not queue {len(parcels)} parcels for rescoring: {e}")
+            return 0
+        return len(parcels)
+
+    @staticmethod
+    def mark_dirty_by_property_ids(conn, property_ids: Iterable[str]) -> int:
+        ids = list({pid for pid in property_ids if pid})
+        if not ids:
+            return 0
+        rows = conn.execute(
+            text("SELECT parcel_id FROM property_details WHERE property_id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": ids}
+        ).fetchall()
+        return RescoreQueueService.mark_dirty(r[0] for r in rows)
+
+    @staticmethod
+    def pending() -> int:
+        return redis.scard(DIRTY_KEY)
+
+    @staticmethod
+    def pop_batch(size: int) -> List[str]:
+        return [_decode(p) for p in redis.spop(DIRTY_KEY, size) or []]
+
+    @staticmethod
+    def drain(engine, batch_size: int, time_budget: Optional[float] = None) -> dict:
+        """
+        Pops and rescores dirty parcels until the set is empty or `time_budget`
+        seconds have passed. A failed batch is put back for the next run. Only one
+        drainer runs at a time, so a late batch cannot overwrite a newer score.
+        """
+        stats = {"batches": 0, "rescored": 0, "requeued": 0}
+        lock = RedisLock(LOCK_KEY, LOCK_TTL)
+        if not lock.acquire():
+            stats["skipped"] = "another rescore run holds the lock"
+            return stats
+
+        started = time.time()
+        try:
+            while time_budget is None or time.time() - started < time_budget:
+                parcels = RescoreQueueService.pop_batch(batch_size)
+                if not parcels:
+                    break
+                try:
+                    with engine.begin() as conn:
+                        scoring_service.score_parcels(conn, parcels)
+                except Exception as e:
+                    logger.error(f"Rescoring {len(parcels)} dirty parcels failed, requeueing: {e}")
+                    RescoreQueueService.mark_dirty(parcels)
+                    stats["requeued"] += len(parcels)
+                    break
+                stats["batches"] += 1
+                stats["rescored"] += len(parcels)
+                if not lock.extend():
+                    stats["skipped"] = "lock expired and was taken by another run"
+                    break
+        finally:
+            lock.release()
+        return stats
+
+
+rescore_queue_service = RescoreQueueService()
@@ -0,0 +1,195 @@
+"""
+Response caching for read-mostly endpoints on the FastAPICache backend
+initialized in main.py, with tag-based invalidation and ETags.
+
+@cached_response(namespace, tags) stores the serialized JSON body of a GET
+under a key built from the request path and query string plus the current
+version of each of the response's tags. Every tag has a version counter in
+Redis (TAG_VERSION_KEY); invalidate() increments it, so every entry carrying
+the tag becomes unreachable at once and the orphans age out by TTL. Tags are
+"auctions" (root), "auctions:all" / "auctions:state:<code>" (list scope),
+"counties:state:<code>", "state_contacts", "announcements" and "area_stats";
+writers invalidate exactly the tags their change can affect.
+
+The ETag is the SHA-1 of the cached body, so it is the same on every worker; a
+matching If-None-Match gets an empty 304. Responses carry Cache-Control:
+no-cache, so clients always revalidate and never serve an invalidated body.
+A request with Cache-Control: no-cache/no-store, a disabled FastAPICache or an
+unreachable Redis falls through to the endpoint.
+"""
+import hashlib
+import inspect
+import json
+import logging
+from functools import wraps
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+import redis
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache import FastAPICache
+from pydantic import TypeAdapter
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.utils.state_mapper import STATE_MAPPING, canonical_state_code
+
+logger = logging.getLogger(__name__)
+
+TAG_VERSION_KEY = "cache:tagver:{}"
+DEFAULT_EXPIRE = 3600
+
+AUCTIONS = "auctions"
+AUCTIONS_ALL = "auctions:all"
+STATE_CONTACTS = "state_contacts"
+ANNOUNCEMENTS = "announcements"
+AREA_STATS = "area_stats"
+
+
+def auction_state_tag(state: Optional[str]) -> str:
+    return f"auctions:state:{canonical_state_code(state) or 'other'}"
+
+
+def auction_list_tags(state: Optional[str] = None, **_) -> List[str]:
+    """
+    Tags of an auction list/calendar response. The state filter is a substring
+    match on auction_events.state, so it is tagged with every state whose name
+    or code contains it, plus the bucket of auctions without a known state.
+    """
+    if not state or not state.strip():
+        return [AUCTIONS, AUCTIONS_ALL]
+    needle = state.strip().lower()
+    codes = {code for name, code in STATE_MAPPING.items() if needle in name or needle in code.lower()}
+    return [AUCTIONS, f"{AUCTIONS}:state:other"] + [f"{AUCTIONS}:state:{code}" for code in codes]
+
+
+def auction_change_tags(*states: Optional[str]) -> List[str]:
+    """Tags to invalidate when auctions in `states` are created, edited or deleted."""
+    return [AUCTIONS_ALL] + [auction_state_tag(s) for s in states]
+
+
+def county_tag(state_code: str) -> str:
+    return f"counties:state:{(state_code or '').strip().upper()}"
+
+
+class ResponseCacheService:
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client
+
+    def versions(self, tags: List[str]) -> List[int]:
+        values = self.redis.mget([TAG_VERSION_KEY.format(t) for t in tags]) if tags else []
+        return [int(v or 0) for v in values]
+
+    def invalidate(self, *tags: str) -> None:
+        """Bumps the version of each tag. Never raises: a failed bump only leaves entries to their TTL."""
+        tags = sorted(set(t for t in tags if t))
+        if not tags or not self.redis:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(TAG_VERSION_KEY.format(tag))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Response cache invalidation failed for {tags}: {e}")
+
+
+try:
+    response_cache = ResponseCacheService(redis.from_url(settings.REDIS_URL))
+except Exception as e:
+    logger.warning(f"Response cache disabled, Redis unavailable: {e}")
+    response_cache = ResponseCacheService(None)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def cached_response(
+    namespace: str,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]]],
+    expire: Optional[int] = None,
+    response_model: Any = None,
+):
+    """
+    Caches a GET endpoint's JSON body. `tags` is a list, or a callable that
+    receives the endpoint's keyword arguments. Pass the route's response_model
+    when the endpoint returns ORM objects, so they are serialized the same way.
+    """
+    adapter = TypeAdapter(response_model) if response_model is not None else None
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        has_request = any(p.annotation is Request for p in signature.parameters.values())
+        if not has_request:
+            params = list(signature.parameters.values())
+            request_param = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+            tail = [p for p in params if p.kind == inspect.Parameter.VAR_KEYWORD]
+            head = [p for p in params if p.kind != inspect.Parameter.VAR_KEYWORD]
+            signature = signature.replace(parameters=head + [request_param] + tail)
+
+        async def call(*args, **kwargs):
+            if inspect.iscoroutinefunction(func):
+                return await func(*args, **kwargs)
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        def serialize(result) -> bytes:
+            if adapter is not None:
+                return adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+            return json.dumps(jsonable_encoder(result), separators=(",", ":")).encode("utf-8")
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"] if has_request else kwargs.pop("request")
+            if not FastAPICache.get_enable() or request.headers.get("Cache-Control") in ("no-cache", "no-store"):
+                return await call(*args, **kwargs)
+
+            tag_list = sorted(set(tags(**kwargs) if callable(tags) else tags))
+            try:
+                versions = response_cache.versions(tag_list)
+                backend = FastAPICache.get_backend()
+            except Exception as e:
+                logger.warning(f"Response cache bypassed for {request.url.path}: {e}")
+                return await call(*args, **kwargs)
+
+            query = sorted(request.query_params.multi_items())
+            stamp = ",".join(f"{t}={v}" for t, v in zip(tag_list, versions))
+            digest = hashlib.md5(f"{request.url.path}?{query}|{stamp}".encode("utf-8")).hexdigest()
+            key = f"{FastAPICache.get_prefix()}:{namespace}:{digest}"
+
+            try:
+                body = await backend.get(key)
+            except Exception as e:
+                logger.warning(f"Response cache read failed for {key}: {e}")
+                body = None
+
+            if body is None:
+                result = await call(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                body = serialize(result)
+                try:
+                    await backend.set(key, body, expire or DEFAULT_EXPIRE)
+                except Exception as e:
+                    logger.warning(f"Response cache write failed for {key}: {e}")
+            elif isinstance(body, str):
+                body = body.encode("utf-8")
+
+            headers = {"ETag": _etag(body), "Cache-Control": "no-cache"}
+            if _matches(request.headers.get("If-None-Match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
@@ -0,0 +1,138 @@
+"""
+Maintains property_score_leaderboard, the per-state "top deals" projection read by
+/scores/top.
+
+A parcel has a row while it is scored and its live property_details.availability
+is 'available'; property_scores.status is a snapshot taken at scoring time and
+can lag a status transition, so it never decides membership. Rows are
+refreshed by the scoring path (every property_scores write) and by status
+transitions, so a top-N read is an index range scan on (state_code, tier,
+deal_score) instead of a filtered sort over every score.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text, bindparam
+
+logger = logging.getLogger(__name__)
+
+# Rating buckets in /scores/top order (higher tier first)
+TIER_SQL = "CASE WHEN s.rating LIKE 'A%' THEN 3 WHEN s.rating = 'B' THEN 2 WHEN s.rating = 'C' THEN 1 ELSE 0 END"
+AVAILABLE_SQL = "p.availability = 'available'"
+
+_ENTRIES_SELECT = f"""
+    SELECT s.parcel_id, p.state_code, {TIER_SQL}, s.deal_score, :now
+    FROM property_scores s
+    JOIN property_details p ON p.parcel_id = s.parcel_id
+    WHERE {AVAILABLE_SQL} {{where}}
+"""
+
+TOP_COLUMNS = """
+    s.parcel_id,
+    s.deal_score,
+    s.rating,
+    s.score_factors,
+    s.model_version,
+    s.updated_at,
+    p.address,
+    COALESCE(s.county, p.county) as county,
+    COALESCE(s.state, p.state) as state,
+    p.amount_due,
+    p.assessed_value,
+    p.availability_status,
+    p.property_type,
+    p.lot_acres,
+    p.improvement_value,
+    p.owner_address
+"""
+
+
+class ScoreLeaderboardService:
+    """Methods accept either a Session or a Connection and run in the caller's transaction."""
+
+    @staticmethod
+    def refresh_parcels(conn, parcel_ids: Iterable[str]) -> int:
+        """Re-derives the leaderboard rows of the given parcels; returns how many are listed."""
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return 0
+        params = {"parcels": parcels, "now": datetime.utcnow()}
+
+        result = conn.execute(text(f"""
+            INSERT INTO property_score_leaderboard (parcel_id, state_code, tier, deal_score, updated_at)
+            {_ENTRIES_SELECT.format(where="AND s.parcel_id IN :parcels")}
+            ON CONFLICT (parcel_id) DO UPDATE SET
+                state_code = EXCLUDED.state_code,
+                tier = EXCLUDED.tier,
+                deal_score = EXCLUDED.deal_score,
+                updated_at = EXCLUDED.updated_at
+        """).bindparams(bindparam("parcels", expanding=True)), params)
+
+        # Parcels that are no longer available (or lost their score) drop out
+        conn.execute(text(f"""
+            DELETE FROM property_score_leaderboard
+            WHERE parcel_id IN :parcels
+              AND parcel_id NOT IN (
+                  SELECT s.parcel_id FROM property_scores s
+                  JOIN property_details p ON p.parcel_id = s.parcel_id
+                  WHERE s.parcel_id IN :parcels AND {AVAILABLE_SQL}
+              )
+        """).bindparams(bindparam("parcels", expanding=True)), {"parcels": parcels})
+        return result.rowcount
+
+    @staticmethod
+    def refresh_properties(conn, property_ids: Iterable[str]) -> int:
+        """Same as refresh_parcels, resolving property_ids through property_details."""
+        ids = list({pid for pid in property_ids if pid})
+        if not ids:
+            return 0
+        rows = conn.execute(
+            text("SELECT parcel_id FROM property_details WHERE property_id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": ids}
+        ).fetchall()
+        return ScoreLeaderboardService.refresh_parcels(conn, [r[0] for r in rows])
+
+    @staticmethod
+    def rebuild(conn) -> int:
+        """Rebuilds the whole leaderboard (after manual SQL repairs or drift)."""
+        conn.execute(text("DELETE FROM property_score_leaderboard"))
+        result = conn.execute(text(f"""
+            INSERT INTO property_score_leaderboard (parcel_id, state_code, tier, deal_score, updated_at)
+            {_ENTRIES_SELECT.format(where="")}
+        """), {"now": datetime.utcnow()})
+        return result.rowcount
+
+    @staticmethod
+    def top(conn, limit: int, state_code: Optional[str] = None, min_score: Optional[float] = None) -> List:
+        """
+        Top-N available deals, best tier first then highest score. Reads
+        property_score_leaderboard in index order and joins the N winners only.
+        """
+        where = ["1=1"]
+        params: dict = {"limit": limit}
+        if state_code:
+            where.append("lb.state_code = :state_code")
+            params["state_code"] = state_code
+        if min_score is not None:
+            where.append("lb.deal_score >= :min_score")
+            params["min_score"] = min_score
+
+        return conn.execute(text(f"""
+            SELECT {TOP_COLUMNS}
+            FROM (
+                SELECT lb.parcel_id, lb.tier, lb.deal_score
+                FROM property_score_leaderboard lb
+                WHERE {" AND ".join(where)}
+                ORDER BY lb.tier DESC, lb.deal_score DESC
+                LIMIT :limit
+            ) top
+            JOIN property_scores s ON s.parcel_id = top.parcel_id
+            JOIN property_details p ON p.parcel_id = top.parcel_id
+            ORDER BY top.tier DESC, top.deal_score DESC
+        """), params).fetchall()
+
+
+score_leaderboard_service = ScoreLeaderboardService()
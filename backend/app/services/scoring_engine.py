@@ -0,0 +1,386 @@
+"""
+Rule-based deal scoring (port of the frontend scoringEngine.ts).
+
+`calculate_deal_score` scores a single property dict. `score_frame` applies the
+same rules to a whole pandas batch with column operations and is what the batch
+script, the Celery task and the /scores endpoints use. Batches are read with
+keyset pagination on parcel_id and written with a COPY-staged merge on
+PostgreSQL (executemany elsewhere).
+"""
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text, bindparam
+from sqlalchemy.orm import Session
+
+from app.services.property_bulk_loader import COPY_NULL
+from app.services.area_stats import area_stats_service
+from app.services.score_leaderboard import score_leaderboard_service
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = "rule-based-v2"
+
+RATINGS = ["A+", "A", "B", "C", "D", "F"]
+
+FETCH_COLUMNS = [
+    "parcel_id", "address", "county", "state", "amount_due", "assessed_value",
+    "improvement_value", "land_value", "lot_acres", "property_type",
+    "property_category", "availability_status", "owner_address", "occupancy",
+]
+
+SCORE_COLUMNS = ["parcel_id", "deal_score", "rating", "state", "county", "score_factors", "model_version", "computed_at", "updated_at"]
+
+CATEGORY_POINTS = {"Lien": 8, "Deed": 6, "Foreclosure": 4, "Cert": 2, "Quit Claim": 2}
+CATEGORY_FACTORS = {
+    "Lien": "+8: Tax Lien — lower risk category",
+    "Deed": "+6: Tax Deed — direct ownership pathway",
+    "Foreclosure": "+4: Foreclosure — potential distressed deal",
+    "Cert": "+2: Cert category",
+    "Quit Claim": "+2: Quit Claim category",
+}
+
+
+def rating_for(score: float) -> str:
+    if score >= 90:
+        return "A+"
+    elif score >= 78:
+        return "A"
+    elif score >= 63:
+        return "B"
+    elif score >= 48:
+        return "C"
+    elif score >= 33:
+        return "D"
+    return "F"
+
+
+def calculate_deal_score(row: dict) -> dict:
+    """
+    Scores one property. Returns { score: int, rating: str, factors: list[str] }.
+    """
+    score = 0
+    factors = []
+
+    # 1. DATA COMPLETENESS (max 30 pts)
+    address = (row.get("address") or "").strip()
+    if address:
+        score += 10
+        factors.append("+10: Verified Address")
+
+    property_type = (row.get("property_type") or "").strip().lower()
+    if property_type and property_type not in ("", "unknown"):
+        score += 10
+        factors.append("+10: Known Property Type")
+
+    owner_address = (row.get("owner_address") or "").strip()
+    if owner_address:
+        score += 10
+        factors.append("+10: Owner Data Available")
+
+    # 2. FINANCIAL VIABILITY (max 50 pts)
+    amount_due  = float(row.get("amount_due")  or 0)
+    assessed    = float(row.get("assessed_value") or 0)
+    improvement = float(row.get("improvement_value") or 0)
+
+    if assessed > 0:
+        tax_ratio = amount_due / assessed
+        if tax_ratio < 0.05:
+            score += 45
+            factors.append("+45: Exceptional Tax-to-Value Ratio (<5%)")
+        elif tax_ratio < 0.10:
+            score += 35
+            factors.append("+35: Excellent Tax-to-Value Ratio (<10%)")
+        elif tax_ratio < 0.25:
+            score += 22
+            factors.append("+22: Good Tax-to-Value Ratio (<25%)")
+        elif tax_ratio < 0.50:
+            score += 10
+            factors.append("+10: Fair Tax-to-Value Ratio (<50%)")
+        else:
+            factors.append("+0: High Tax-to-Value Ratio (>50%) — risk")
+    else:
+        factors.append("+0: Assessed Value Unknown")
+
+    if improvement > 0:
+        score += 5
+        factors.append("+5: Has Improvements (structure present)")
+
+    # 3. PROPERTY CATEGORY BONUS (max 10 pts)
+    category = (row.get("property_category") or "").strip()
+    if category in CATEGORY_POINTS:
+        score += CATEGORY_POINTS[category]
+        factors.append(CATEGORY_FACTORS[category])
+
+    # 4. LOT SIZE BONUS (max 5 pts)
+    lot_acres = float(row.get("lot_acres") or 0)
+    if lot_acres >= 1.0:
+        score += 5
+        factors.append(f"+5: Significant Lot Size ({lot_acres:.2f} acres)")
+    elif lot_acres >= 0.25:
+        score += 2
+        factors.append(f"+2: Moderate Lot Size ({lot_acres:.2f} acres)")
+
+    # 5. AVAILABILITY BONUS
+    availability = (row.get("availability_status") or "").strip().lower()
+    if availability == "available":
+        score += 5
+        factors.append("+5: Confirmed Available")
+    elif availability == "unavailable":
+        score -= 5
+        factors.append("-5: Currently Unavailable")
+
+    score = max(0, min(100, score))
+    return {"score": score, "rating": rating_for(score), "factors": factors}
+
+
+def _text(frame: pd.DataFrame, col: str) -> pd.Series:
+    return frame[col].fillna("").astype(str).str.strip()
+
+
+def _number(frame: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(frame[col], errors="coerce").fillna(0).to_numpy(dtype="float64")
+
+
+def _factor(mask: np.ndarray, label: str) -> np.ndarray:
+    # Each factor as a JSON string followed by a separator, or "" when it does not apply
+    return np.where(mask, json.dumps(label) + ", ", "")
+
+
+def score_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized calculate_deal_score over a batch with FETCH_COLUMNS.
+    Returns a frame with parcel_id, state, county, deal_score, rating and
+    score_factors (JSON list, identical to json.dumps(calculate_deal_score(row)["factors"])).
+    """
+    score = np.zeros(len(frame), dtype="int64")
+    parts: List[np.ndarray] = []
+
+    has_address = (_text(frame, "address") != "").to_numpy()
+    score += np.where(has_address, 10, 0)
+    parts.append(_factor(has_address, "+10: Verified Address"))
+
+    ptype = _text(frame, "property_type").str.lower()
+    known_type = ((ptype != "") & (ptype != "unknown")).to_numpy()
+    score += np.where(known_type, 10, 0)
+    parts.append(_factor(known_type, "+10: Known Property Type"))
+
+    has_owner = (_text(frame, "owner_address") != "").to_numpy()
+    score += np.where(has_owner, 10, 0)
+    parts.append(_factor(has_owner, "+10: Owner Data Available"))
+
+    amount_due = _number(frame, "amount_due")
+    assessed = _number(frame, "assessed_value")
+    improvement = _number(frame, "improvement_value")
+    known_value = assessed > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(known_value, amount_due / np.where(known_value, assessed, 1), np.inf)
+    tiers = [
+        (known_value & (ratio < 0.05), 45, "+45: Exceptional Tax-to-Value Ratio (<5%)"),
+        (known_value & (ratio >= 0.05) & (ratio < 0.10), 35, "+35: Excellent Tax-to-Value Ratio (<10%)"),
+        (known_value & (ratio >= 0.10) & (ratio < 0.25), 22, "+22: Good Tax-to-Value Ratio (<25%)"),
+        (known_value & (ratio >= 0.25) & (ratio < 0.50), 10, "+10: Fair Tax-to-Value Ratio (<50%)"),
+        (known_value & (ratio >= 0.50), 0, "+0: High Tax-to-Value Ratio (>50%) — risk"),
+        (~known_value, 0, "+0: Assessed Value Unknown"),
+    ]
+    score += np.select([m for m, _, _ in tiers], [p for _, p, _ in tiers], 0)
+    parts.append(np.select([m for m, _, _ in tiers], [json.dumps(f) + ", " for _, _, f in tiers], ""))
+
+    has_improvement = improvement > 0
+    score += np.where(has_improvement, 5, 0)
+    parts.append(_factor(has_improvement, "+5: Has Improvements (structure present)"))
+
+    category = _text(frame, "property_category")
+    score += category.map(CATEGORY_POINTS).fillna(0).to_numpy(dtype="int64")
+    parts.append(category.map({k: json.dumps(v) + ", " for k, v in CATEGORY_FACTORS.items()}).fillna("").to_numpy(dtype=object))
+
+    lot_acres = _number(frame, "lot_acres")
+    big_lot = lot_acres >= 1.0
+    mid_lot = (lot_acres >= 0.25) & ~big_lot
+    score += np.select([big_lot, mid_lot], [5, 2], 0)
+    acres_label = np.char.mod("%.2f", lot_acres).astype(object)
+    parts.append(np.where(big_lot, '"+5: Significant Lot Size (' + acres_label + ' acres)", ',
+                          np.where(mid_lot, '"+2: Moderate Lot Size (' + acres_label + ' acres)", ', "")))
+
+    availability = _text(frame, "availability_status").str.lower()
+    available = (availability == "available").to_numpy()
+    unavailable = (availability == "unavailable").to_numpy()
+    score += np.select([available, unavailable], [5, -5], 0)
+    parts.append(np.where(available, json.dumps("+5: Confirmed Available") + ", ",
+                          np.where(unavailable, json.dumps("-5: Currently Unavailable") + ", ", "")))
+
+    score = np.clip(score, 0, 100)
+
+    joined = parts[0].astype(object)
+    for part in parts[1:]:
+        joined = joined + part.astype(object)
+    factors = "[" + pd.Series(joined, index=frame.index).str[:-2] + "]"
+
+    rating = np.select(
+        [score >= 90, score >= 78, score >= 63, score >= 48, score >= 33],
+        RATINGS[:5],
+        "F",
+    )
+
+    return pd.DataFrame({
+        "parcel_id": frame["parcel_id"],
+        "state": frame["state"],
+        "county": frame["county"],
+        "deal_score": score.astype("float64"),
+        "rating": rating,
+        "score_factors": factors,
+    }, index=frame.index)
+
+
+def _dialect_name(conn) -> str:
+    return conn.get_bind().dialect.name if hasattr(conn, "get_bind") else conn.dialect.name
+
+
+class ScoringService:
+    """Reads, scores and persists property deal scores in batches."""
+
+    @staticmethod
+    def iter_batches(conn, batch_size: int, only_missing: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Keyset-paginated reads of FETCH_COLUMNS ordered by parcel_id. Pages are
+        anchored on the last parcel_id seen, so rows scored meanwhile do not
+        shift later pages.
+        """
+        cols = ", ".join(f"p.{c}" for c in FETCH_COLUMNS)
+        missing_join = "LEFT JOIN property_scores ps ON ps.parcel_id = p.parcel_id" if only_missing else ""
+        missing_where = "AND ps.parcel_id IS NULL" if only_missing else ""
+        query = text(f"""
+            SELECT {cols}
+            FROM property_details p
+            {missing_join}
+            WHERE p.parcel_id > :after {missing_where}
+            ORDER BY p.parcel_id
+            LIMIT :limit
+        """)
+        after = ""
+        while True:
+            rows = conn.execute(query, {"after": after, "limit": batch_size}).fetchall()
+            if not rows:
+                return
+            yield pd.DataFrame.from_records(rows, columns=FETCH_COLUMNS)
+            if len(rows) < batch_size:
+                return
+            after = rows[-1][0]
+
+    @staticmethod
+    def fetch_parcels(conn, parcel_ids: Sequence[str]) -> pd.DataFrame:
+        cols = ", ".join(f"p.{c}" for c in FETCH_COLUMNS)
+        rows = conn.execute(
+            text(f"SELECT {cols} FROM property_details p WHERE p.parcel_id IN :parcels").bindparams(
+                bindparam("parcels", expanding=True)
+            ),
+            {"parcels": list(parcel_ids)}
+        ).fetchall()
+        return pd.DataFrame.from_records(rows, columns=FETCH_COLUMNS)
+
+    @staticmethod
+    def upsert_scores(conn, scored: pd.DataFrame, now: Optional[datetime] = None) -> int:
+        """
+        Writes a score_frame result (plus model_version/timestamps) to
+        property_scores, refreshes the parcels' leaderboard rows and queues
+        their areas for a stats refresh.
+        """
+        if scored.empty:
+            return 0
+        if isinstance(conn, Session):
+            conn = conn.connection()
+        now = now or datetime.utcnow()
+        out = scored.assign(model_version=MODEL_VERSION, computed_at=now, updated_at=now)[SCORE_COLUMNS]
+        col_list = ", ".join(SCORE_COLUMNS)
+        # computed_at keeps the first computation time, like the original upsert
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in SCORE_COLUMNS if c not in ("parcel_id", "computed_at"))
+
+        if _dialect_name(conn) == "postgresql":
+            conn.execute(text(f"""
+                CREATE TEMP TABLE IF NOT EXISTS stage_property_scores ON COMMIT DELETE ROWS AS
+                SELECT {col_list} FROM property_scores WITH NO DATA
+            """))
+            buf = io.StringIO()
+            out.to_csv(buf, header=False, index=False, na_rep=COPY_NULL)
+            buf.seek(0)
+            cursor = conn.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY stage_property_scores ({col_list}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buf
+                )
+            finally:
+                cursor.close()
+            result = conn.execute(text(f"""
+                INSERT INTO property_scores ({col_list})
+                SELECT {col_list} FROM stage_property_scores
+                ON CONFLICT (parcel_id) DO UPDATE SET {updates}
+            """))
+            conn.execute(text("DELETE FROM stage_property_scores"))
+            score_leaderboard_service.refresh_parcels(conn, out["parcel_id"])
+            area_stats_service.mark_parcels(conn, out["parcel_id"])
+            return result.rowcount
+
+        base = scored[[c for c in SCORE_COLUMNS if c in scored.columns]]
+        records = [
+            {**r, "model_version": MODEL_VERSION, "computed_at": now, "updated_at": now}
+            for r in base.astype(object).where(base.notna(), None).to_dict("records")
+        ]
+        conn.execute(text(f"""
+            INSERT INTO property_scores ({col_list}) VALUES ({", ".join(f":{c}" for c in SCORE_COLUMNS)})
+            ON CONFLICT (parcel_id) DO UPDATE SET {updates}
+        """), records)
+        score_leaderboard_service.refresh_parcels(conn, out["parcel_id"])
+        area_stats_service.mark_parcels(conn, out["parcel_id"])
+        return len(records)
+
+    @staticmethod
+    def score_parcels(conn, parcel_ids: Sequence[str]) -> pd.DataFrame:
+        """Scores and persists the given parcels; returns their score rows."""
+        parcels = list({p for p in parcel_ids if p})
+        if not parcels:
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        scored = score_frame(ScoringService.fetch_parcels(conn, parcels))
+        ScoringService.upsert_scores(conn, scored)
+        return scored
+
+    @staticmethod
+    def run(engine, batch_size: int = 10000, force: bool = False, min_score: Optional[float] = None,
+            dry_run: bool = False, on_batch: Optional[Callable[[int, dict], None]] = None) -> dict:
+        """
+        Scores every property (or only unscored ones unless `force`). Each batch is
+        committed on its own. Returns counts per rating plus saved/skipped/errors.
+        """
+        stats = {**{r: 0 for r in RATINGS}, "processed": 0, "saved": 0, "skipped": 0, "errors": 0}
+        with engine.connect() as read_conn:
+            for batch in ScoringService.iter_batches(read_conn, batch_size, only_missing=not force):
+                scored = score_frame(batch)
+                for rating, count in scored["rating"].value_counts().items():
+                    stats[rating] += int(count)
+                if min_score is not None:
+                    keep = scored["deal_score"] >= min_score
+                    stats["skipped"] += int((~keep).sum())
+                    scored = scored[keep]
+
+                if not dry_run and not scored.empty:
+                    try:
+                        with engine.begin() as write_conn:
+                            ScoringService.upsert_scores(write_conn, scored)
+                        stats["saved"] += len(scored)
+                    except Exception as e:
+                        logger.error(f"Score batch after parcel {batch['parcel_id'].iloc[0]} failed: {e}")
+                        stats["errors"] += len(scored)
+                elif dry_run:
+                    stats["saved"] += len(scored)
+
+                stats["processed"] += len(batch)
+                if on_batch:
+                    on_batch(len(batch), stats)
+        return stats
+
+
+scoring_service = ScoringService()
@@ -1,12 +1,99 @@
+"""
+Past-auction status transitions, the single engine behind
+reconcile_property_statuses_task (hourly via Celery beat), the admin trigger
+and scripts/reconcile_property_statuses.py.
+
+A run is one transaction: past auction events are marked inactive, one
+UPDATE ... RETURNING moves every eligible property to 'unavailable', and the
+returned rows feed one bulk insert into the availability audit trail. On
+PostgreSQL the transaction first takes a transaction-scoped advisory lock, so
+concurrent triggers (beat, manual runs) never overlap: the loser skips.
+"""
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
 from sqlalchemy import text
-from app.db.session import SessionLocal
+
+from app.db.session import engine
+from app.models.property import PropertyAvailabilityHistory
+from app.services.rescore_queue import rescore_queue_service
+from app.services.score_leaderboard import score_leaderboard_service
 
 logger = logging.getLogger(__name__)
 
+# pg_advisory_xact_lock key reserved for status transitions
+ADVISORY_LOCK_KEY = 7305190001
+CHANGE_SOURCE = "system_auto_past_auction"
+
+# Available properties with at least one past auction and none today or later.
+# The auction event date wins over the history row's own date when linked.
+_TRANSITION = """
+    UPDATE property_details
+    SET availability_status = 'unavailable'
+    WHERE availability = 'available'
+      AND EXISTS (
+          SELECT 1
+          FROM property_auction_history pah
+          LEFT JOIN auction_events ae ON ae.id = pah.auction_id
+          WHERE pah.property_id = property_details.property_id
+            AND COALESCE(ae.auction_date, pah.auction_date) < :today
+      )
+      AND NOT EXISTS (
+          SELECT 1
+          FROM property_auction_history pah
+          LEFT JOIN auction_events ae ON ae.id = pah.auction_id
+          WHERE pah.property_id = property_details.property_id
+            AND COALESCE(ae.auction_date, pah.auction_date) >= :today
+      )
+    RETURNING property_id, parcel_id
+"""
+
+
+class StatusTransitionService:
+
+    @staticmethod
+    def try_lock(conn) -> bool:
+        """Takes the transaction-scoped advisory lock; always granted off PostgreSQL."""
+        if conn.dialect.name != "postgresql":
+            return True
+        return bool(conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar())
 
-def transition_past_auctions():
+    @staticmethod
+    def transition(conn, today: date) -> List[Tuple[str, str]]:
+        """
+        Runs the transition inside the caller's transaction; returns the
+        (property_id, parcel_id) pairs that became unavailable.
+        """
+        auctions = conn.execute(text("""
+            UPDATE auction_events
+            SET status = 'inactive'
+            WHERE auction_date < :today
+              AND (status IS NULL OR status != 'inactive')
+        """), {"today": today}).rowcount
+        logger.info(f"Auto-Transition: {auctions} past auction events marked as 'inactive'.")
+
+        changed = [(r[0], r[1]) for r in conn.execute(text(_TRANSITION), {"today": today}).fetchall()]
+        if changed:
+            now = datetime.utcnow()
+            conn.execute(PropertyAvailabilityHistory.__table__.insert(), [
+                {
+                    "property_id": property_id,
+                    "previous_status": "available",
+                    "new_status": "unavailable",
+                    "change_source": CHANGE_SOURCE,
+                    "changed_at": now,
+                }
+                for property_id, _ in changed
+            ])
+            score_leaderboard_service.refresh_parcels(conn, [parcel_id for _, parcel_id in changed])
+        return changed
+
+
+status_transition_service = StatusTransitionService()
+
+
+def transition_past_auctions(today: Optional[date] = None):
     """
     Transitions properties to 'unavailable' when they are:
     1. Currently 'available'
@@ -16,84 +103,17 @@ def transition_past_auctions():
     This prevents marking properties as unavailable if they have an upcoming auction
     scheduled (e.g., rescheduled or multi-event properties).
     """
-    db = SessionLocal()
+    today = today or datetime.now().date()
     try:
-        today = datetime.now().date()
-
-        # Update past auction events to inactive
-        try:
-            auction_update_result = db.execute(text("""
-                UPDATE auction_events
-                SET status = 'inactive'
-                WHERE auction_date < :today
-                  AND (status IS NULL OR status != 'inactive')
-            """), {"today": today})
-            auctions_updated = auction_update_result.rowcount
-            logger.info(f"Auto-Transition: {auctions_updated} past auction events marked as 'inactive'.")
-        except Exception as e:
-            logger.error(f"Auto-Transition: Error updating auction_events status: {e}")
-
-        # Find properties that:
-        # - are currently 'available' (case-insensitive to be safe)
-        # - have at least one past auction (auction_date < today)
-        # - do NOT have any FUTURE auction scheduled (auction_date >= today)
-        query = text("""
-            SELECT DISTINCT p.property_id
-            FROM property_details p
-            INNER JOIN property_auction_history pah
-                ON pah.property_id = p.property_id
-            LEFT JOIN auction_events ae
-                ON ae.id = pah.auction_id
-            WHERE LOWER(p.availability_status) = 'available'
-              AND COALESCE(ae.auction_date, pah.auction_date) < :today
-              AND NOT EXISTS (
-                  SELECT 1
-                  FROM property_auction_history pah_future
-                  LEFT JOIN auction_events ae_future
-                      ON ae_future.id = pah_future.auction_id
-                  WHERE pah_future.property_id = p.property_id
-                    AND COALESCE(ae_future.auction_date, pah_future.auction_date) >= :today
-              )
-        """)
-
-        try:
-            results = db.execute(query, {"today": today}).fetchall()
-        except Exception as query_err:
-            logger.error(f"Auto-Transition: Query error: {query_err}")
-            return {"status": "error", "message": f"Query Error: {str(query_err)}"}
-
-        if not results:
-            logger.info("Auto-Transition: No past-auction properties to transition today.")
-            return {"status": "success", "processed": 0, "message": "No eligible properties found."}
-
-        count = 0
-        for row in results:
-            prop_id = row[0]
-
-            # Update status to unavailable
-            db.execute(text("""
-                UPDATE property_details
-                SET availability_status = 'unavailable'
-                WHERE property_id = :prop_id
-                  AND LOWER(availability_status) = 'available'
-            """), {"prop_id": prop_id})
-
-            # Audit trail
-            db.execute(text("""
-                INSERT INTO property_availability_history
-                    (property_id, previous_status, new_status, change_source)
-                VALUES (:prop_id, 'available', 'unavailable', 'system_auto_past_auction')
-            """), {"prop_id": prop_id})
-
-            count += 1
-
-        db.commit()
-        logger.info(f"Auto-Transition: {count} properties → 'unavailable' (past auction linkage).")
-        return {"status": "success", "processed": count}
-
+        with engine.begin() as conn:
+            if not status_transition_service.try_lock(conn):
+                logger.info("Auto-Transition: another run holds the lock; skipping.")
+                return {"status": "skipped", "processed": 0, "message": "Another transition run is in progress."}
+            changed = status_transition_service.transition(conn, today)
     except Exception as e:
-        db.rollback()
         logger.error(f"Auto-Transition: Failed — {e}")
         return {"status": "error", "message": str(e)}
-    finally:
-        db.close()
+
+    rescore_queue_service.mark_dirty(parcel_id for _, parcel_id in changed)
+    logger.info(f"Auto-Transition: {len(changed)} properties → 'unavailable' (past auction linkage).")
+    return {"status": "success", "processed": len(changed)}
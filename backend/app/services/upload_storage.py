@@ -0,0 +1,76 @@
+"""
+Streams admin CSV uploads to the shared temp_imports volume.
+
+Uploads are copied in fixed-size chunks (bounded memory) and hashed on the fly;
+the SHA-256 is used to recognise re-uploads of a file that is already imported
+or still being imported.
+"""
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+from app.services.import_service import redis
+
+UPLOAD_DIR = "/app/data/temp_imports"
+READ_CHUNK_BYTES = 1024 * 1024
+DEDUP_TTL = 24 * 3600
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+class UploadStorageService:
+
+    @staticmethod
+    async def save(upload: UploadFile, file_name: str, upload_dir: str = UPLOAD_DIR) -> StoredUpload:
+        os.makedirs(upload_dir, exist_ok=True)
+        path = os.path.join(upload_dir, file_name)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(path, "wb") as out:
+                while True:
+                    chunk = await upload.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await out.write(chunk)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return StoredUpload(path=path, sha256=digest.hexdigest(), size=size)
+
+    @staticmethod
+    def claim(kind: str, sha256: str, job_id: str) -> Optional[str]:
+        """
+        Registers `job_id` as the import of this content. Returns the job id of an
+        earlier upload with the same hash instead, if one is registered.
+        """
+        key = f"import_upload:{kind}:{sha256}"
+        if redis.set(key, job_id, nx=True, ex=DEDUP_TTL):
+            return None
+        existing = redis.get(key)
+        return existing.decode("utf-8") if existing else None
+
+    @staticmethod
+    def reassign(kind: str, sha256: str, job_id: str) -> None:
+        """Points the hash at a new job (forced re-import or the earlier job failed)."""
+        redis.set(f"import_upload:{kind}:{sha256}", job_id, ex=DEDUP_TTL)
+
+    @staticmethod
+    def discard(stored: StoredUpload) -> None:
+        if os.path.exists(stored.path):
+            os.remove(stored.path)
+
+
+upload_storage_service = UploadStorageService()
@@ -0,0 +1,108 @@
+"""
+Generates auction alerts for watchlisted properties in one statement.
+
+Every (user, property) on any of the user's lists with an auction within the
+horizon gets one notification, for its nearest such auction. Alerts are
+deduplicated per day by the unique index on notifications (user_id,
+property_id, type, dedup_date): the insert is a single INSERT ... SELECT ...
+ON CONFLICT DO NOTHING, so re-running the check on the same day is a no-op.
+The per-day alert type and message wording are supplied as a small VALUES
+table, so no date arithmetic happens in SQL.
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+HORIZON_DAYS = 7
+STARTING_SOON_DAYS = 2
+
+_GENERATE = """
+    WITH alert_days (day, type, prefix, suffix) AS (
+        VALUES {values}
+    ),
+    nearest AS (
+        SELECT
+            pah.property_id,
+            pah.auction_id,
+            pah.auction_date,
+            ROW_NUMBER() OVER (
+                PARTITION BY pah.property_id
+                ORDER BY pah.auction_date, pah.auction_id
+            ) AS rn
+        FROM property_auction_history pah
+        WHERE pah.auction_date BETWEEN :first_day AND :last_day
+    ),
+    watched AS (
+        SELECT DISTINCT cl.user_id, clp.property_id
+        FROM client_lists cl
+        JOIN client_list_property clp ON cl.id = clp.list_id
+    )
+    INSERT INTO notifications (user_id, type, message, property_id, auction_id, is_read, created_at, dedup_date)
+    SELECT
+        w.user_id,
+        ad.type,
+        ad.prefix || COALESCE(NULLIF(pd.address, ''), pd.parcel_id) || ad.suffix,
+        pd.parcel_id,
+        n.auction_id,
+        FALSE,
+        :now,
+        :today
+    FROM watched w
+    JOIN property_details pd ON pd.id = w.property_id
+    JOIN nearest n ON n.property_id = pd.property_id AND n.rn = 1
+    JOIN alert_days ad ON ad.day = n.auction_date
+    WHERE pd.availability = 'available'
+    ON CONFLICT (user_id, property_id, type, dedup_date) DO NOTHING
+    RETURNING user_id
+"""
+
+
+def _alert_days(today: date, horizon_days: int) -> List[Dict]:
+    days = []
+    for days_left in range(horizon_days + 1):
+        day = today + timedelta(days=days_left)
+        if days_left <= STARTING_SOON_DAYS:
+            days.append({
+                "day": day, "type": "auction_starting_soon",
+                "prefix": "Auction starting soon! ",
+                "suffix": f" is up for auction in {days_left} day(s).",
+            })
+        else:
+            days.append({
+                "day": day, "type": "auction_approaching",
+                "prefix": "Auction approaching: ",
+                "suffix": f" will be auctioned on {day}.",
+            })
+    return days
+
+
+class WatchlistNotificationService:
+
+    @staticmethod
+    def generate(conn, today: Optional[date] = None, horizon_days: int = HORIZON_DAYS) -> Dict[int, int]:
+        """
+        Inserts today's watchlist auction alerts; returns the number of new
+        notifications per user_id.
+        """
+        today = today or datetime.utcnow().date()
+        days = _alert_days(today, horizon_days)
+        values = ", ".join(f"(:day{i}, :type{i}, :prefix{i}, :suffix{i})" for i in range(len(days)))
+        params = {
+            "now": datetime.utcnow(),
+            "today": today,
+            "first_day": days[0]["day"],
+            "last_day": days[-1]["day"],
+        }
+        for i, d in enumerate(days):
+            params.update({f"{k}{i}": v for k, v in d.items()})
+
+        rows = conn.execute(text(_GENERATE.format(values=values)), params).fetchall()
+        return dict(Counter(r[0] for r in rows))
+
+
+watchlist_notification_service = WatchlistNotificationService()
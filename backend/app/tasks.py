@@ -37,6 +37,7 @@ def resolve_property_auction_links_task(job_id: str):
     try:
         from app.db.session import engine
         from sqlalchemy import text
+        from app.services.current_auction_service import current_auction_service
         with engine.begin() as conn:
             query = text("""
                 UPDATE property_auction_history pah
@@ -44,11 +45,13 @@ def resolve_property_auction_links_task(job_id: str):
                 FROM auction_events ae
                 WHERE pah.auction_id IS NULL 
                   AND (pah.auction_name = ae.name OR pah.auction_name = ae.short_name)
-                  AND pah.auction_date = ae.auction_date;
+                  AND pah.auction_date = ae.auction_date
+                RETURNING pah.property_id;
             """)
-            result = conn.execute(query)
-            logger.info(f"Linkage complete. Rows updated: {result.rowcount}")
-        return {"status": "success", "linked_rows": result.rowcount}
+            linked_property_ids = [r[0] for r in conn.execute(query).fetchall()]
+            current_auction_service.refresh_properties(conn, linked_property_ids)
+            logger.info(f"Linkage complete. Rows updated: {len(linked_property_ids)}")
+        return {"status": "success", "linked_rows": len(linked_property_ids)}
     except Exception as e:
         logger.error(f"Failed to resolve linkages: {e}")
         return {"status": "error", "message": str(e)}
@@ -57,53 +60,11 @@ def resolve_property_auction_links_task(job_id: str):
 def reconcile_property_statuses_task():
     """
     Automatic task to reconcile property statuses based on passed auction dates.
-    Runs daily via Celery Beat.
+    Runs hourly via Celery Beat; concurrent runs are excluded by an advisory lock.
     """
     logger.info("Starting automatic status reconciliation task.")
-    from app.db.session import engine
-    from sqlalchemy import text
-    from datetime import datetime
-    
-    current_date = datetime.utcnow().date()
-    now = datetime.utcnow()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    try:
-        with engine.begin() as conn:
-            # 1. Update status
-            update_query = text("""
-                UPDATE property_details p
-                SET availability_status = 'unavailable'
-                FROM property_auction_history pah
-                WHERE p.property_id = pah.property_id
-                  AND pah.auction_date < :current_date
-                  AND p.availability_status = 'available';
-            """)
-            result = conn.execute(update_query, {"current_date": current_date})
-            
-            # 2. Log History
-            if result.rowcount > 0:
-                history_query = text("""
-                    INSERT INTO property_availability_history (property_id, previous_status, new_status, change_source, changed_at)
-                    SELECT p.property_id, 'available', 'unavailable', 'auto_reconciliation_past_auction', :now
-                    FROM property_details p
-                    JOIN property_auction_history pah ON p.property_id = pah.property_id
-                    WHERE pah.auction_date < :current_date
-                      AND p.availability_status = 'unavailable'
-                      AND NOT EXISTS (
-                          SELECT 1 FROM property_availability_history pah2 
-                          WHERE pah2.property_id = p.property_id 
-                          AND pah2.change_source = 'auto_reconciliation_past_auction'
-                          AND pah2.changed_at > :today_start
-                      );
-                """)
-                conn.execute(history_query, {"current_date": current_date, "now": now, "today_start": today_start})
-                
-            logger.info(f"Auto-reconciliation complete. Updated {result.rowcount} properties.")
-            return {"status": "success", "updated_count": result.rowcount}
-    except Exception as e:
-        logger.error(f"Auto-reconciliation failed: {e}")
-        return {"status": "error", "message": str(e)}
+    from app.services.status_updater import transition_past_auctions
+    return transition_past_auctions()
 
 @celery_app.task(acks_late=True, name="app.tasks.check_watchlists_task")
 def check_watchlists_task():
@@ -113,80 +74,261 @@ def check_watchlists_task():
     """
     logger.info("Starting watchlist check task.")
     from app.db.session import engine
-    from sqlalchemy import text
-    from datetime import datetime, timedelta
-    
-    current_date = datetime.utcnow().date()
-    target_date = current_date + timedelta(days=7)
-    now = datetime.utcnow()
+    from app.services.watchlist_notifications import watchlist_notification_service
     
     try:
         with engine.begin() as conn:
-            query = text("""
-                SELECT 
-                    cl.user_id, 
-                    clp.property_id, 
-                    pd.parcel_id, 
-                    pah.auction_date, 
-                    pah.auction_id,
-                    pd.address
-                FROM client_lists cl
-                JOIN client_list_property clp ON cl.id = clp.list_id
-                JOIN property_details pd ON clp.property_id = pd.id
-                JOIN property_auction_history pah ON pd.property_id = pah.property_id
-                WHERE pah.auction_date BETWEEN :current_date AND :target_date
-                  AND LOWER(TRIM(pd.availability_status)) = 'available'
-            """)
-            results = conn.execute(query, {
-                "current_date": current_date, 
-                "target_date": target_date
-            }).fetchall()
-            
-            notifications = []
-            for row in results:
-                user_id, property_pk, parcel_id, auction_date, auction_id, address = row
-                
-                days_left = (auction_date.date() - current_date).days if hasattr(auction_date, 'date') else (datetime.strptime(str(auction_date), "%Y-%m-%d").date() - current_date).days
-                
-                if days_left <= 2:
-                    msg_type = "auction_starting_soon"
-                    message = f"Auction starting soon! {address or parcel_id} is up for auction in {days_left} day(s)."
-                else:
-                    msg_type = "auction_approaching"
-                    message = f"Auction approaching: {address or parcel_id} will be auctioned on {auction_date}."
-                
-                # Deduplicate: Check if a notification for this user, property, and auction_date already exists
-                check_query = text("""
-                    SELECT id FROM notifications 
-                    WHERE user_id = :user_id 
-                      AND property_id = :property_id 
-                      AND type = :type 
-                      AND DATE(created_at) = :today
-                """)
-                exists = conn.execute(check_query, {
-                    "user_id": user_id, 
-                    "property_id": parcel_id, 
-                    "type": msg_type,
-                    "today": current_date
-                }).fetchone()
-                
-                if not exists:
-                    insert_query = text("""
-                        INSERT INTO notifications (user_id, type, message, property_id, auction_id, created_at)
-                        VALUES (:user_id, :type, :message, :property_id, :auction_id, :now)
-                    """)
-                    conn.execute(insert_query, {
-                        "user_id": user_id,
-                        "type": msg_type,
-                        "message": message,
-                        "property_id": parcel_id,
-                        "auction_id": auction_id,
-                        "now": now
-                    })
-                    notifications.append(row)
-                    
-            logger.info(f"Watchlist check complete. Generated {len(notifications)} notifications.")
-            return {"status": "success", "notifications_generated": len(notifications)}
+            per_user = watchlist_notification_service.generate(conn)
+        total = sum(per_user.values())
+        logger.info(f"Watchlist check complete. Generated {total} notifications for {len(per_user)} users.")
+        return {"status": "success", "notifications_generated": total, "per_user": per_user}
     except Exception as e:
         logger.error(f"Watchlist check failed: {e}")
         return {"status": "error", "message": str(e)}
+
+@celery_app.task(acks_late=True, name="app.tasks.rebuild_current_auctions_task")
+def rebuild_current_auctions_task():
+    """
+    Rebuilds the property_current_auction projection from property_auction_history.
+    Use after manual SQL repairs or whenever the projection is suspected to have drifted.
+    """
+    logger.info("Rebuilding property_current_auction projection.")
+    from app.db.session import engine
+    from app.services.current_auction_service import current_auction_service
+    try:
+        with engine.begin() as conn:
+            rows = current_auction_service.rebuild(conn)
+        return {"status": "success", "rows": rows}
+    except Exception as e:
+        logger.error(f"Current auction rebuild failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+@celery_app.task(acks_late=True, name="app.tasks.rebuild_score_leaderboard_task")
+def rebuild_score_leaderboard_task():
+    """Rebuilds the property_score_leaderboard projection from property_scores."""
+    logger.info("Rebuilding property_score_leaderboard projection.")
+    from app.db.session import engine
+    from app.services.score_leaderboard import score_leaderboard_service
+    try:
+        with engine.begin() as conn:
+            rows = score_leaderboard_service.rebuild(conn)
+        return {"status": "success", "rows": rows}
+    except Exception as e:
+        logger.error(f"Score leaderboard rebuild failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+@celery_app.task(acks_late=True, name="app.tasks.import_properties_celery_task")
+def import_properties_celery_task(file_path: str, job_id: str):
+    """
+    Plans a property CSV import into byte-range partitions and fans them out to
+    import_partition_task. Progress and checkpoints live in app.services.import_jobs.
+    """
+    from app.services.import_jobs import import_job_service
+    try:
+        partitions = import_job_service.start(file_path, job_id)
+        for partition in partitions:
+            import_partition_task.delay(job_id, partition["index"])
+        return {"status": "success", "partitions": len(partitions)}
+    except Exception as e:
+        logger.error(f"Import Job {job_id} failed to start: {e}")
+        from app.services.import_service import redis
+        redis.set(f"import_status:{job_id}", f"Critical Error: {str(e)}", ex=3600)
+        return {"status": "error", "message": str(e)}
+
+@celery_app.task(acks_late=True, name="app.tasks.import_partition_task")
+def import_partition_task(job_id: str, partition_index: int):
+    """
+    Imports one partition of a property CSV job. Chunks already checkpointed are
+    skipped, so redelivery after a worker crash does not redo finished work.
+    """
+    from app.services.import_jobs import import_job_service
+    import_job_service.run_partition(job_id, partition_index)
+    return {"status": "success", "job_id": job_id, "partition": partition_index}
+
+@celery_app.task(acks_late=True, name="app.tasks.resume_import_job_task")
+def resume_import_job_task(job_id: str):
+    """Re-dispatches the unfinished (or failed) partitions of an import job."""
+    from app.services.import_jobs import import_job_service
+    try:
+        pending = import_job_service.reopen(job_id)
+    except FileNotFoundError as e:
+        logger.error(f"Import Job {job_id} cannot resume, file is gone: {e}")
+        return {"status": "error", "message": f"Import file missing: {e}"}
+    for partition_index in pending:
+        import_partition_task.delay(job_id, partition_index)
+    if not pending:
+        import_job_service.finalize(job_id)
+    return {"status": "success", "partitions": pending}
+
+@celery_app.task(acks_late=True, name="app.tasks.resume_stalled_imports_task")
+def resume_stalled_imports_task():
+    """
+    Resumes running import jobs whose last checkpoint is older than
+    IMPORT_STALL_SECONDS, e.g. after a deploy killed the workers mid-job.
+    """
+    from app.core.config import settings
+    from app.services.import_jobs import import_job_service
+    stalled = import_job_service.stalled_jobs(settings.IMPORT_STALL_SECONDS)
+    for job_id in stalled:
+        logger.info(f"Resuming stalled import job {job_id}")
+        resume_import_job_task.delay(job_id)
+    return {"status": "success", "resumed": stalled}
+
+@celery_app.task(acks_late=True, name="app.tasks.import_auctions_celery_task")
+def import_auctions_celery_task(file_path: str, job_id: str):
+    """Imports an uploaded auction CSV off the web worker."""
+    from app.services.import_service import import_service
+    run_async(import_service.process_auctions_csv_file(file_path, job_id))
+    return {"status": "success", "job_id": job_id}
+
+@celery_app.task(acks_late=True, name="app.tasks.import_history_celery_task")
+def import_history_celery_task(file_path: str, job_id: str):
+    """Imports an uploaded property/auction history mapping CSV off the web worker."""
+    from app.services.import_service import import_service
+    run_async(import_service.process_history_mapping_csv_file(file_path, job_id))
+    return {"status": "success", "job_id": job_id}
+
+@celery_app.task(acks_late=True, name="app.tasks.batch_score_properties_task")
+def batch_score_properties_task(force: bool = False):
+    """Scores properties in keyset-paginated, vectorized batches (see app.services.scoring_engine)."""
+    from app.db.session import engine
+    from app.services.scoring_engine import scoring_service
+    try:
+        stats = scoring_service.run(engine, force=force)
+        logger.info(f"Batch scoring complete: {stats}")
+        return {"status": "success", **stats}
+    except Exception as e:
+        logger.error(f"Batch scoring failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.rescore_dirty_properties_task")
+def rescore_dirty_properties_task():
+    """
+    Rescores the parcels queued as dirty by imports, edits, enrichment and status
+    reconcilers. Runs every minute via Celery Beat.
+    """
+    from app.core.config import settings
+    from app.db.session import engine
+    from app.services.rescore_queue import rescore_queue_service
+    try:
+        stats = rescore_queue_service.drain(engine, settings.RESCORE_BATCH_SIZE, time_budget=50)
+        if stats["rescored"] or stats["requeued"]:
+            logger.info(f"Dirty rescoring: {stats}")
+        return {"status": "success", **stats}
+    except Exception as e:
+        logger.error(f"Dirty rescoring failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.refresh_area_stats_task")
+def refresh_area_stats_task():
+    """Re-aggregates the state/county stats rollup for areas marked dirty. Runs every minute."""
+    from app.db.session import engine
+    from app.services.area_stats import area_stats_service
+    from app.services.response_cache import response_cache, AREA_STATS
+    try:
+        refreshed = area_stats_service.drain(engine)
+        if refreshed:
+            response_cache.invalidate(AREA_STATS)
+        return {"status": "success", "areas": refreshed}
+    except Exception as e:
+        logger.error(f"Area stats refresh failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+@celery_app.task(acks_late=True, name="app.tasks.rebuild_area_stats_task")
+def rebuild_area_stats_task():
+    """Rebuilds the whole state/county stats rollup. Runs nightly via Celery Beat."""
+    logger.info("Rebuilding property_area_stats rollup.")
+    from app.db.session import engine
+    from app.services.area_stats import area_stats_service
+    from app.services.response_cache import response_cache, AREA_STATS
+    try:
+        with engine.begin() as conn:
+            rows = area_stats_service.rebuild(conn)
+        response_cache.invalidate(AREA_STATS)
+        return {"status": "success", "rows": rows}
+    except Exception as e:
+        logger.error(f"Area stats rebuild failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.flush_meters_task")
+def flush_meters_task():
+    """Writes metered usage counts (app.services.metering) to the users table. Runs every minute."""
+    from app.db.session import engine
+    from app.services.metering import metering_service
+    try:
+        users = metering_service.flush_pending(engine)
+        return {"status": "success", "users": users}
+    except Exception as e:
+        logger.error(f"Meter flush failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.refresh_list_summaries_task")
+def refresh_list_summaries_task():
+    """
+    Recomputes client list upcoming-auction counters after auctions pass.
+    Runs daily just after midnight via Celery Beat.
+    """
+    from app.db.session import engine
+    from app.services.client_lists import client_list_service
+    try:
+        with engine.begin() as conn:
+            lists = client_list_service.roll_over_upcoming(conn)
+        return {"status": "success", "lists": lists}
+    except Exception as e:
+        logger.error(f"List summary refresh failed: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.enrich_properties_batch_task")
+def enrich_properties_batch_task(auction_id: int = None, parcel_ids: list = None):
+    """Enriches an auction's properties (or the given parcels) from ATTOM in one concurrent, rate-limited job."""
+    from app.db.session import SessionLocal
+    from app.services.attom_batch import attom_batch_service
+    db = SessionLocal()
+    try:
+        stats = attom_batch_service.run(db, auction_id=auction_id, parcel_ids=parcel_ids)
+        return {"status": "success", **stats}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"ATTOM batch enrichment failed: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+
+@celery_app.task(acks_late=True, name="app.tasks.refresh_attom_cache_task")
+def refresh_attom_cache_task(cache_key: str, params: dict):
+    """Re-fetches an ATTOM response that is close to expiry (queued by enrich_property on a stale cache hit)."""
+    from app.services.attom_cache import attom_cache
+    from app.services.attom_enrichment import fetch_attom_data_sync
+    try:
+        data = fetch_attom_data_sync(params)
+        attom_cache.set(cache_key, data if data.get("property") else None)
+        return {"status": "success", "matched": bool(data.get("property"))}
+    except Exception as e:
+        logger.error(f"ATTOM cache refresh failed for {cache_key}: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+@celery_app.task(acks_late=True, name="app.tasks.geocode_missing_properties_task")
+def geocode_missing_properties_task(limit: int = None):
+    """
+    Geocodes properties without coordinates, upcoming auctions first. Runs every
+    15 minutes; a run that finds the previous one still going skips.
+    """
+    from app.services.geocoding import geocoding_service
+    from app.services.redis_lock import RedisLock
+    lock = RedisLock("geocode:batch_lock", 3600)
+    if not lock.acquire():
+        return {"status": "skipped", "message": "Previous geocoding batch still running."}
+    try:
+        return {"status": "success", **geocoding_service.geocode_missing(limit)}
+    except Exception as e:
+        logger.error(f"Geocoding batch failed: {e}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        lock.release()
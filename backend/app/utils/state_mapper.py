@@ -1,3 +1,6 @@
+import re
+from typing import Optional
+
 STATE_MAPPING = {
     "alabama": "AL",
     "alaska": "AK",
@@ -74,3 +77,33 @@ def normalize_state(state_input: str) -> str:
         
     # Fallback
     return state_input.strip().upper()
+
+STATE_CODES = set(STATE_MAPPING.values())
+
+# Trailing designators dropped from county names so "Harris County" and "harris" share a key
+COUNTY_SUFFIXES = (" COUNTY", " PARISH", " BOROUGH", " CENSUS AREA", " MUNICIPALITY")
+
+def canonical_state_code(state_input: str) -> Optional[str]:
+    """
+    Returns the 2-letter USPS code for a state name or code, or None when the
+    input cannot be mapped to a known state. Used for the indexed state_code columns.
+    """
+    if not state_input or not str(state_input).strip():
+        return None
+    code = normalize_state(str(state_input))
+    return code if code in STATE_CODES else None
+
+def make_county_key(county_input: str) -> Optional[str]:
+    """
+    Canonical county key for equality lookups: upper-cased, punctuation and
+    designator suffix removed, whitespace collapsed ("St. Louis County" -> "ST LOUIS").
+    """
+    if not county_input or not str(county_input).strip():
+        return None
+    key = re.sub(r"[.'’]", "", str(county_input).upper())
+    key = " ".join(key.split())
+    for suffix in COUNTY_SUFFIXES:
+        if key.endswith(suffix) and key != suffix.strip():
+            key = key[: -len(suffix)].strip()
+            break
+    return key or None
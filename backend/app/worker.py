@@ -31,13 +31,41 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     beat_schedule={
-        "reconcile-property-statuses-daily": {
+        "reconcile-property-statuses-hourly": {
             "task": "app.tasks.reconcile_property_statuses_task",
-            "schedule": crontab(hour=4, minute=0),
+            "schedule": crontab(minute=0),
         },
         "check-watchlists-daily": {
             "task": "app.tasks.check_watchlists_task",
             "schedule": crontab(hour=5, minute=0),
         },
+        "resume-stalled-imports": {
+            "task": "app.tasks.resume_stalled_imports_task",
+            "schedule": crontab(minute="*/10"),
+        },
+        "rescore-dirty-properties": {
+            "task": "app.tasks.rescore_dirty_properties_task",
+            "schedule": crontab(minute="*"),
+        },
+        "refresh-area-stats": {
+            "task": "app.tasks.refresh_area_stats_task",
+            "schedule": crontab(minute="*"),
+        },
+        "rebuild-area-stats-nightly": {
+            "task": "app.tasks.rebuild_area_stats_task",
+            "schedule": crontab(hour=4, minute=30),
+        },
+        "flush-meters": {
+            "task": "app.tasks.flush_meters_task",
+            "schedule": crontab(minute="*"),
+        },
+        "refresh-list-summaries-daily": {
+            "task": "app.tasks.refresh_list_summaries_task",
+            "schedule": crontab(hour=0, minute=5),
+        },
+        "geocode-missing-properties": {
+            "task": "app.tasks.geocode_missing_properties_task",
+            "schedule": crontab(minute="*/15"),
+        },
     },
 )
@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.db.session import SessionLocal
 from app.models.county_contact import CountyContact
+from app.services.geo_directory import geo_directory
 from app.utils.state_mapper import STATE_MAPPING
 
 REVERSE_MAPPING = {v: k for k, v in STATE_MAPPING.items()}
@@ -62,6 +63,7 @@ def run_migration():
                 exists.url = url
                 
         db.commit()
+    geo_directory.invalidate()
     print(f"Migration complete. Inserted {inserted} new county contacts. Skipped {skipped} rows.")
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""
+Benchmarks the keyword search path on a synthetic property table.
+
+Compares the legacy OR-of-ILIKE predicate against the trigram-indexed
+search_document / parcel_key columns (app.services.property_search).
+Everything runs in a scratch table that is dropped at the end.
+
+Usage:
+    docker compose exec backend python scripts/benchmark_keyword_search.py --rows 1000000
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.services.property_search import build_keyword_filter
+
+TABLE = "bench_property_search"
+
+KEYWORDS = ["maple ave", "smith", "123-45", "0042117", "oak ridge sub"]
+
+LEGACY_FUZZY = """
+    (p.address ILIKE :fuzzy_k OR p.county ILIKE :fuzzy_k OR p.state ILIKE :fuzzy_k OR
+     p.owner_address ILIKE :fuzzy_k OR p.description ILIKE :fuzzy_k OR
+     p.legal_description ILIKE :fuzzy_k OR p.parcel_id ILIKE :keyword OR p.cs_number ILIKE :fuzzy_k)
+"""
+LEGACY_PARCEL = """
+    (REPLACE(p.parcel_id, '-', '') ILIKE :clean_k OR REPLACE(p.pin_ppin, '-', '') ILIKE :clean_k OR
+     REPLACE(p.raw_parcel_number, '-', '') ILIKE :clean_k OR p.parcel_id ILIKE :keyword OR p.pin_ppin ILIKE :keyword)
+"""
+
+
+def build_table(conn, rows: int):
+    print(f"Building {TABLE} with {rows:,} rows...")
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} AS
+        SELECT
+            g AS id,
+            LPAD((g % 1000)::text, 3, '0') || '-' || LPAD((g % 97)::text, 2, '0') || '-' || LPAD(g::text, 7, '0') AS parcel_id,
+            LPAD(g::text, 9, '0') AS pin_ppin,
+            NULL::text AS raw_parcel_number,
+            (g % 9999) || ' ' || (ARRAY['Maple Ave','Oak St','Pine Rd','Cedar Ln','Elm Dr'])[1 + g % 5] AS address,
+            (ARRAY['Harris','Dallas','Travis','Bexar','Tarrant'])[1 + g % 5] AS county,
+            'TX' AS state,
+            (ARRAY['Smith','Johnson','Garcia','Brown','Lee'])[1 + g % 5] || ' ' || (g % 500) || ' Main St' AS owner_address,
+            'Lot ' || (g % 300) || ' Block ' || (g % 40) AS description,
+            (ARRAY['Oak Ridge Sub','Lakeview Estates','Sunset Acres'])[1 + g % 3] || ' Lot ' || (g % 300) AS legal_description,
+            'CS-' || g AS cs_number
+        FROM generate_series(1, :rows) g
+    """), {"rows": rows})
+    conn.execute(text(f"""
+        ALTER TABLE {TABLE} ADD COLUMN search_document text, ADD COLUMN parcel_key text
+    """))
+    conn.execute(text(f"""
+        UPDATE {TABLE} p SET
+            search_document = LOWER(CONCAT_WS(' ', p.address, p.county, p.state, p.owner_address,
+                                              p.description, p.legal_description, p.parcel_id, p.cs_number)),
+            parcel_key = UPPER(CONCAT_WS(' ', REPLACE(p.parcel_id, '-', ''), REPLACE(p.pin_ppin, '-', ''),
+                                         REPLACE(p.raw_parcel_number, '-', '')))
+    """))
+    print("Creating trigram indexes...")
+    conn.execute(text(f"CREATE INDEX ON {TABLE} USING gin (search_document gin_trgm_ops)"))
+    conn.execute(text(f"CREATE INDEX ON {TABLE} USING gin (parcel_key gin_trgm_ops)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int, keep: bool):
+    with engine.begin() as conn:
+        build_table(conn, rows)
+
+    print("-" * 70)
+    print(f"{'keyword':<18}{'legacy ms':>14}{'indexed ms':>14}{'speedup':>12}")
+    print("-" * 70)
+    with engine.connect() as conn:
+        for keyword in KEYWORDS:
+            kf = build_keyword_filter(keyword, "postgresql")
+            k = keyword.strip()
+            if "parcel_key" in kf.clause:
+                legacy_sql = LEGACY_PARCEL
+                legacy_params = {"clean_k": f"%{k.replace('-', '')}%", "keyword": f"%{k}%"}
+            else:
+                legacy_sql = LEGACY_FUZZY
+                legacy_params = {"fuzzy_k": f"%{'%'.join(k.split())}%", "keyword": f"%{k}%"}
+
+            legacy_ms = time_query(conn, f"SELECT p.id FROM {TABLE} p WHERE {legacy_sql} LIMIT 100", legacy_params, repeat)
+            order_by = f"ORDER BY {kf.rank_expr} DESC" if kf.rank_expr else ""
+            indexed_ms = time_query(conn, f"SELECT p.id FROM {TABLE} p WHERE {kf.clause} {order_by} LIMIT 100", kf.params, repeat)
+            print(f"{keyword:<18}{legacy_ms:>14.1f}{indexed_ms:>14.1f}{legacy_ms / max(indexed_ms, 0.001):>11.1f}x")
+
+    if not keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword search benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table after the run")
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.keep)
@@ -0,0 +1,111 @@
+"""
+Benchmarks the property detail read path against the current database.
+
+Compares the legacy sequence of per-section queries (main row with the
+parcel_id-or-id predicate, history, note, media purchase, consultant task,
+attachments, score) against the single-statement
+app.services.property_detail loader, for a random sample of parcels. Reports
+p50/p95 latency in milliseconds. Read-only.
+
+Usage:
+    docker compose exec backend python scripts/benchmark_property_detail.py --samples 500 --user-id 1
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import SessionLocal
+from app.services.property_detail import property_detail_service
+
+
+def legacy_load(db, parcel_id: str, user_id: int):
+    row = db.execute(text("""
+        SELECT p.*, pah.auction_name as current_auction_name, pah.auction_date as current_auction_date,
+               COALESCE(pah.info_link, ae.register_link) as auction_info_link,
+               COALESCE(pah.list_link, ae.list_link) as auction_list_link
+        FROM property_details p
+        LEFT JOIN property_auction_history pah ON pah.property_id = p.property_id
+        LEFT JOIN auction_events ae ON pah.auction_id = ae.id
+        WHERE p.parcel_id = :parcel_id OR p.id::text = :parcel_id
+        ORDER BY pah.auction_date DESC
+        LIMIT 1
+    """), {"parcel_id": parcel_id}).fetchone()
+    data = dict(row._mapping)
+    prop_id_int = data["id"]
+    db.execute(text("SELECT * FROM property_auction_history WHERE property_id = :property_id ORDER BY auction_date DESC"),
+               {"property_id": data["property_id"]}).fetchall()
+    db.execute(text("""
+        SELECT note_text FROM client_notes WHERE user_id = :user_id AND property_id = :prop_id
+        ORDER BY created_at DESC LIMIT 1
+    """), {"user_id": user_id, "prop_id": prop_id_int}).fetchone()
+    db.execute(text("""
+        SELECT 1 FROM property_media_purchases
+        WHERE property_id = (SELECT property_id FROM property_details WHERE parcel_id = :parcel_id) AND user_id = :uid
+    """), {"parcel_id": parcel_id, "uid": user_id}).fetchone()
+    db.execute(text("""
+        SELECT 1 FROM consultant_tasks WHERE property_id = :prop_id AND investor_user_id = :uid AND status = 'approved'
+    """), {"prop_id": prop_id_int, "uid": user_id}).fetchone()
+    db.execute(text("SELECT filename, file_path FROM client_attachments WHERE property_id = :prop_id"),
+               {"prop_id": prop_id_int}).fetchall()
+    db.execute(text("SELECT deal_score, rating, score_factors, model_version, updated_at FROM property_scores WHERE parcel_id = :parcel_id"),
+               {"parcel_id": parcel_id}).fetchone()
+    return data
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def time_path(fn, parcels) -> list:
+    samples = []
+    for parcel_id in parcels:
+        start = time.perf_counter()
+        fn(parcel_id)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(samples: int, user_id: int):
+    db = SessionLocal()
+    try:
+        parcels = [r[0] for r in db.execute(
+            text("SELECT parcel_id FROM property_details TABLESAMPLE SYSTEM (1) LIMIT :n"), {"n": samples}
+        ).fetchall()]
+        if len(parcels) < samples:
+            parcels = [r[0] for r in db.execute(
+                text("SELECT parcel_id FROM property_details ORDER BY random() LIMIT :n"), {"n": samples}
+            ).fetchall()]
+        print(f"Benchmarking {len(parcels)} parcels (user_id={user_id})...")
+
+        # Warm-up so both paths see the same cache state
+        for parcel_id in parcels[:20]:
+            legacy_load(db, parcel_id, user_id)
+            property_detail_service.load(db, parcel_id, user_id)
+
+        results = {
+            "legacy (8 queries)": time_path(lambda p: legacy_load(db, p, user_id), parcels),
+            "single statement": time_path(lambda p: property_detail_service.load(db, p, user_id), parcels),
+        }
+    finally:
+        db.rollback()
+        db.close()
+
+    print("-" * 60)
+    print(f"{'path':<22}{'p50 ms':>12}{'p95 ms':>12}{'mean ms':>12}")
+    print("-" * 60)
+    for name, values in results.items():
+        print(f"{name:<22}{percentile(values, 50):>12.2f}{percentile(values, 95):>12.2f}{statistics.mean(values):>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Property detail latency benchmark")
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--user-id", type=int, default=1, help="User whose notes/paywall state are resolved")
+    args = parser.parse_args()
+    run(args.samples, args.user_id)
@@ -3,6 +3,11 @@ import sys
 import subprocess
 from sqlalchemy import create_engine, text
 
+# Ensure backend directory is in the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.current_auction_service import current_auction_service
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     print("DATABASE_URL not found.")
@@ -76,6 +81,11 @@ def run_bulk_import():
     run_psql_command("SELECT setval('property_details_id_seq', (SELECT max(id) FROM property_details));")
     run_psql_command("SELECT setval('property_auction_history_id_seq', (SELECT max(id) FROM property_auction_history));")
 
+    # 5. REBUILD PROJECTIONS
+    print("Reconstruindo property_current_auction...")
+    with create_engine(DATABASE_URL).begin() as conn:
+        current_auction_service.rebuild(conn)
+
     print("--- SUCESSO: RECARGA COMPLETA ---")
 
 if __name__ == "__main__":
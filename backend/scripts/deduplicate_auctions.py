@@ -3,6 +3,11 @@ import sys
 from sqlalchemy import create_engine, text
 from datetime import datetime
 
+# Ensure backend directory is in the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.current_auction_service import current_auction_service
+
 # Database Connection
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -33,6 +38,7 @@ def deduplicate():
         
         total_merged = 0
         total_properties_moved = 0
+        touched_property_ids = set()
         
         for group in groups:
             auction_date, state, county, ids, names, links = group
@@ -74,7 +80,7 @@ def deduplicate():
             
             for rid in remove_ids:
                 # 1. Remover entradas duplicadas no histórico para evitar erro de Unique Constraint
-                conn.execute(text("""
+                deleted = conn.execute(text("""
                     DELETE FROM property_auction_history h2
                     WHERE h2.auction_id = :remove_id
                     AND EXISTS (
@@ -82,7 +88,9 @@ def deduplicate():
                         WHERE h1.auction_id = :keep_id
                         AND h1.property_id = h2.property_id
                     )
+                    RETURNING h2.property_id
                 """), {"keep_id": keep_id, "remove_id": rid})
+                touched_property_ids.update(r[0] for r in deleted)
 
                 # 2. Mover o restante das propriedades do leilão antigo para o novo
                 res_history = conn.execute(text("""
@@ -90,10 +98,13 @@ def deduplicate():
                     SET auction_id = :keep_id,
                         auction_name = :keep_name
                     WHERE auction_id = :remove_id
+                    RETURNING property_id
                 """), {"keep_id": keep_id, "keep_name": keep_name, "remove_id": rid})
+                moved = [r[0] for r in res_history]
+                touched_property_ids.update(moved)
                 
-                total_properties_moved += res_history.rowcount
-                print(f"  [MOVER ANTIGO] ID {rid}: Propriedades migradas para o novo: {res_history.rowcount}")
+                total_properties_moved += len(moved)
+                print(f"  [MOVER ANTIGO] ID {rid}: Propriedades migradas para o novo: {len(moved)}")
 
                 # 3. Apagar o leilão antigo
                 conn.execute(text("DELETE FROM auction_events WHERE id = :rid"), {"rid": rid})
@@ -101,6 +112,9 @@ def deduplicate():
 
             print("-" * 30)
 
+        # Keep the property_current_auction projection in sync with the rewritten history
+        current_auction_service.refresh_properties(conn, touched_property_ids)
+
         print(f"\n--- SUCESSO ---")
         print(f"Total de leilões removidos/unificados: {total_merged}")
         print(f"Total de vínculos de propriedades atualizados: {total_properties_moved}")
@@ -0,0 +1,43 @@
+"""
+Runs ATTOM batch enrichment for an auction or a list of parcels and prints
+throughput. --base-url points the run at a local stub server for load tests.
+
+Usage:
+    docker compose exec backend python scripts/enrich_attom_batch.py --auction-id 42
+    docker compose exec backend python scripts/enrich_attom_batch.py --parcels 01-234,01-235 --rate 20 --concurrency 16
+"""
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.attom_batch import AttomBatchService
+
+
+def run(auction_id, parcels, base_url, rate, concurrency):
+    service = AttomBatchService(base_url=base_url, rate_per_second=rate, max_concurrency=concurrency)
+    db = SessionLocal()
+    try:
+        stats = service.run(db, auction_id=auction_id, parcel_ids=parcels)
+    finally:
+        db.close()
+
+    print("-" * 40)
+    for key, value in stats.items():
+        print(f"{key:<22}{value:>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk ATTOM enrichment")
+    parser.add_argument("--auction-id", type=int, default=None)
+    parser.add_argument("--parcels", type=str, default=None, help="Comma-separated parcel ids")
+    parser.add_argument("--base-url", type=str, default=None, help="Override ATTOM_BASE_URL (e.g. a local stub)")
+    parser.add_argument("--rate", type=float, default=None, help="ATTOM calls per second")
+    parser.add_argument("--concurrency", type=int, default=None, help="Requests in flight")
+    args = parser.parse_args()
+    if args.auction_id is None and not args.parcels:
+        parser.error("Provide --auction-id or --parcels")
+    parcels = [p.strip() for p in args.parcels.split(",")] if args.parcels else None
+    run(args.auction_id, parcels, args.base_url, args.rate, args.concurrency)
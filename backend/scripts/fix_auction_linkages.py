@@ -3,6 +3,11 @@ import sys
 from sqlalchemy import create_engine, text
 from datetime import datetime
 
+# Ensure backend directory is in the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.current_auction_service import current_auction_service
+
 # Database Connection
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -31,6 +36,7 @@ def fix_linkages():
         
         fixed_count = 0
         batch_size = 500
+        fixed_property_ids = []
         
         for i, orphan in enumerate(orphans):
             o_id, prop_id, o_name, o_date = orphan
@@ -61,8 +67,11 @@ def fix_linkages():
                 """), {"ae_id": ae_id, "ae_name": ae_name, "o_id": o_id})
                 
                 fixed_count += 1
+                fixed_property_ids.append(prop_id)
             
             if (i + 1) % batch_size == 0 or (i + 1) == len(orphans):
+                current_auction_service.refresh_properties(conn, fixed_property_ids)
+                fixed_property_ids = []
                 conn.commit()
                 # Create a new transaction-like state if needed, but in SQLAlchemy 2.0+ with engine.connect(), 
                 # commit() handles the transaction.
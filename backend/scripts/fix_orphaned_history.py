@@ -3,6 +3,11 @@ import os
 import pandas as pd
 from sqlalchemy import create_engine, text
 
+# Ensure backend directory is in the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.current_auction_service import current_auction_service
+
 # Get engine
 db_url = os.environ.get("DATABASE_URL")
 if not db_url:
@@ -83,6 +88,10 @@ if update_mapping:
             WHERE h.property_id = m.csv_id
         """))
         print(f"Updated {res.rowcount} records successfully!")
+
+        # History moved between property ids wholesale; rebuild the projection in the same transaction
+        print("Rebuilding property_current_auction...")
+        current_auction_service.rebuild(conn)
         
         print("Updating is_processed to TRUE for all valid properties...")
         conn.execute(text("""
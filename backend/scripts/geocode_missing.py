@@ -0,0 +1,37 @@
+"""
+Geocodes properties that have no coordinates (upcoming auctions first) and
+prints the run's counts. --base-url points the run at a local fake Nominatim.
+
+Usage:
+    docker compose exec backend python scripts/geocode_missing.py --limit 1000
+    docker compose exec backend python scripts/geocode_missing.py --base-url http://localhost:8088 --rate 50
+"""
+import sys
+import os
+import argparse
+
+from redis import asyncio as aioredis
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.geocoding import GeocodingService, RateLimiter
+from app.services.import_service import get_redis_url
+
+
+def run(limit, base_url, rate):
+    limiter = RateLimiter(rate or settings.GEOCODER_RATE_PER_SECOND, aioredis.from_url(get_redis_url()))
+    stats = GeocodingService(base_url=base_url, limiter=limiter).geocode_missing(limit)
+
+    print("-" * 40)
+    for key, value in stats.items():
+        print(f"{key:<22}{str(value):>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch geocoding of properties without coordinates")
+    parser.add_argument("--limit", type=int, default=None, help="Properties per run (default GEOCODE_BATCH_LIMIT)")
+    parser.add_argument("--base-url", type=str, default=None, help="Override GEOCODER_BASE_URL (e.g. a local fake)")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second (keep 1 for public Nominatim)")
+    args = parser.parse_args()
+    run(args.limit, args.base_url, args.rate)
@@ -0,0 +1,84 @@
+"""
+One-time migration of legacy STANDARD folders named by state acronym
+(e.g. "TX") to the full state name used by /lists/standard/add ("Texas").
+
+Within each (user_id, company_id) scope an acronym folder is renamed, or, when
+a full-name folder already exists there, its properties are merged into that
+folder and the acronym folder is deleted. Summary counters of the touched
+folders are recomputed. This used to run inside GET /client-data/lists.
+
+Usage:
+    docker compose exec backend python scripts/migrate_standard_folders.py --dry-run
+    docker compose exec backend python scripts/migrate_standard_folders.py
+"""
+import sys
+import os
+import argparse
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.session import engine
+from app.api.api_v1.endpoints.client_data import STATE_MAPPING
+from app.services.client_lists import client_list_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate(dry_run: bool = False):
+    renamed = merged = 0
+    touched = set()
+    with engine.begin() as conn:
+        rows = conn.execute(text("""
+            SELECT id, user_id, company_id, name FROM client_lists
+            WHERE tags = 'STANDARD'
+            ORDER BY id
+        """)).fetchall()
+
+        # (user_id, company_id, name) -> id of the folder holding that name
+        by_name = {(r.user_id, r.company_id, r.name): r.id for r in rows}
+
+        for r in rows:
+            full_name = STATE_MAPPING.get(r.name.strip().upper())
+            if not full_name:
+                continue
+            target_id = by_name.get((r.user_id, r.company_id, full_name))
+            if target_id is None:
+                logger.info(f"Renaming folder {r.id} '{r.name}' -> '{full_name}'")
+                if not dry_run:
+                    conn.execute(text("UPDATE client_lists SET name = :name WHERE id = :id"), {"name": full_name, "id": r.id})
+                by_name[(r.user_id, r.company_id, full_name)] = r.id
+                renamed += 1
+                continue
+
+            logger.info(f"Merging folder {r.id} '{r.name}' into {target_id} '{full_name}'")
+            if not dry_run:
+                conn.execute(text("""
+                    INSERT INTO client_list_property (list_id, property_id)
+                    SELECT :target, src.property_id
+                    FROM client_list_property src
+                    WHERE src.list_id = :source
+                      AND NOT EXISTS (
+                          SELECT 1 FROM client_list_property t
+                          WHERE t.list_id = :target AND t.property_id = src.property_id
+                      )
+                """), {"source": r.id, "target": target_id})
+                conn.execute(text("DELETE FROM client_list_property WHERE list_id = :id"), {"id": r.id})
+                conn.execute(text("DELETE FROM client_lists WHERE id = :id"), {"id": r.id})
+            touched.add(target_id)
+            merged += 1
+
+        if not dry_run:
+            client_list_service.refresh_summaries(conn, touched)
+
+    logger.info(f"{'Would rename' if dry_run else 'Renamed'} {renamed} and "
+                f"{'would merge' if dry_run else 'merged'} {merged} legacy standard folders.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate acronym-named standard folders to full state names")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args()
+    migrate(args.dry_run)
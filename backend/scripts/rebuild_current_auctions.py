@@ -0,0 +1,28 @@
+"""
+Rebuilds the property_current_auction projection (latest auction per property)
+from property_auction_history. Run after manual SQL repairs to fix drift.
+
+Usage:
+    docker compose exec backend python scripts/rebuild_current_auctions.py
+"""
+import sys
+import os
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine
+from app.services.current_auction_service import current_auction_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def rebuild():
+    with engine.begin() as conn:
+        rows = current_auction_service.rebuild(conn)
+    logger.info(f"Done. {rows} properties in property_current_auction.")
+
+
+if __name__ == "__main__":
+    rebuild()
@@ -38,10 +38,8 @@ async def run_import(file_path: str, import_type: str = "properties"):
     
     try:
         if import_type == "auctions":
-            with open(file_path, "rb") as f:
-                content = f.read()
             print("Processing as AUCTIONS...")
-            await import_service.process_auctions_csv(content, job_id)
+            await import_service.process_auctions_csv_file(file_path, job_id)
         elif import_type == "history":
             with open(file_path, "rb") as f:
                 content = f.read()
@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.models.county_contact import CountyContact
 from app.db.session import SessionLocal
+from app.services.geo_directory import geo_directory
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +36,7 @@ def remove_historic_aerials(db: Session):
             db.delete(record)
             
         db.commit()
+        geo_directory.invalidate()
         logger.info(f"Successfully deleted {count} 'Historic Aerials' records from the CountyContacts table.")
             
     except Exception as e:
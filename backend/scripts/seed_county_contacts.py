@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.models.county_contact import CountyContact
 from app.db.session import SessionLocal
+from app.services.geo_directory import geo_directory
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -76,6 +77,7 @@ def seed_county_contacts(db: Session):
                 logger.info(f"Inserted remainder. Total inserted: {total_inserted} records.")
 
             logger.info("Successfully completed seeding County Contacts to PostgreSQL.")
+            geo_directory.invalidate()
             
     except Exception as e:
         logger.error(f"Failed during seeding: {e}")
@@ -2,6 +2,11 @@ import os
 import sys
 from sqlalchemy import create_engine, text
 
+# Ensure backend directory is in the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.current_auction_service import current_auction_service
+
 # Database Connection
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -25,10 +30,12 @@ def unlink_mismatches():
                   (ae.state != p.state AND ae.state NOT IN ('US', 'All')) 
                   OR (ae.county != p.county AND ae.county NOT IN ('All'))
               )
+            RETURNING pah.property_id
         """)
         
-        result = conn.execute(unlink_query)
-        print(f"Sucesso: {result.rowcount} vínculos conflitantes foram removidos (set to NULL).")
+        unlinked = [r[0] for r in conn.execute(unlink_query)]
+        current_auction_service.refresh_properties(conn, unlinked)
+        print(f"Sucesso: {len(unlinked)} vínculos conflitantes foram removidos (set to NULL).")
         print("Essas propriedades agora estão prontas para serem re-vinculadas corretamente pelo reparo de nomes.\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.services import redis_lock
+
+
+class FakePipeline:
+    """Queues commands and replays them against the fake on execute(), one round trip."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.queued.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        self.redis.round_trips += 1
+        queued, self.queued = self.queued, []
+        self.redis.batched = True
+        try:
+            return [command(*args, **kwargs) for command, args, kwargs in queued]
+        finally:
+            self.redis.batched = False
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis-py commands the services use.
+
+    Strings and hash fields come back as bytes like the real client; every call
+    outside a pipeline counts as one round trip.
+    """
+
+    def __init__(self):
+        self.store, self.ttls, self.sets, self.hashes, self.lists = {}, {}, {}, {}, {}
+        self.round_trips = 0
+        self.batched = False
+
+    def _trip(self):
+        if not self.batched:
+            self.round_trips += 1
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        self._trip()
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self._trip()
+        return [self.store.get(k) for k in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        self._trip()
+        if nx and key in self.store:
+            return None
+        self.store[key] = self._bytes(value)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    def setex(self, key, ttl, value):
+        self._trip()
+        self.store[key], self.ttls[key] = self._bytes(value), ttl
+        return True
+
+    def incr(self, key):
+        self._trip()
+        value = int(self.store.get(key, 0)) + 1
+        self.store[key] = self._bytes(value)
+        return value
+
+    def expire(self, key, ttl):
+        self._trip()
+        self.ttls[key] = ttl
+        return any(key in space for space in (self.store, self.sets, self.hashes, self.lists))
+
+    def exists(self, key):
+        self._trip()
+        return int(any(key in space for space in (self.store, self.sets, self.hashes, self.lists)))
+
+    def delete(self, *keys):
+        self._trip()
+        removed = 0
+        for key in keys:
+            for space in (self.store, self.sets, self.hashes, self.lists):
+                removed += space.pop(key, None) is not None
+            self.ttls.pop(key, None)
+        return removed
+
+    def rename(self, src, dst):
+        self._trip()
+        for space in (self.store, self.sets, self.hashes, self.lists):
+            if src in space:
+                space[dst] = space.pop(src)
+                return True
+        raise RuntimeError("ERR no such key")
+
+    def sadd(self, key, *members):
+        self._trip()
+        members = {self._bytes(m) for m in members}
+        target = self.sets.setdefault(key, set())
+        added = len(members - target)
+        target.update(members)
+        return added
+
+    def srem(self, key, *members):
+        self._trip()
+        target = self.sets.get(key, set())
+        removed = {self._bytes(m) for m in members} & target
+        target -= removed
+        if not target:
+            self.sets.pop(key, None)
+        return len(removed)
+
+    def scard(self, key):
+        self._trip()
+        return len(self.sets.get(key, ()))
+
+    def smembers(self, key):
+        self._trip()
+        return set(self.sets.get(key, ()))
+
+    def spop(self, key, count):
+        self._trip()
+        members = self.sets.get(key, set())
+        popped = [members.pop() for _ in range(min(count, len(members)))]
+        if not members:
+            self.sets.pop(key, None)
+        return popped
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self._trip()
+        bucket = self.hashes.setdefault(key, {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        added = sum(self._bytes(f) not in bucket for f in items)
+        bucket.update({self._bytes(f): self._bytes(v) for f, v in items.items()})
+        return added
+
+    def hexists(self, key, field):
+        self._trip()
+        return self._bytes(field) in self.hashes.get(key, {})
+
+    def hdel(self, key, *fields):
+        self._trip()
+        bucket = self.hashes.get(key, {})
+        removed = sum(bucket.pop(self._bytes(f), None) is not None for f in fields)
+        if key in self.hashes and not bucket:
+            self.hashes.pop(key)
+        return removed
+
+    def hkeys(self, key):
+        self._trip()
+        return list(self.hashes.get(key, {}))
+
+    def hvals(self, key):
+        self._trip()
+        return [self._bytes(v) for v in self.hashes.get(key, {}).values()]
+
+    def hlen(self, key):
+        self._trip()
+        return len(self.hashes.get(key, {}))
+
+    def hincrby(self, key, field, amount):
+        self._trip()
+        bucket = self.hashes.setdefault(key, {})
+        field = self._bytes(field)
+        bucket[field] = int(bucket.get(field, 0)) + amount
+        return bucket[field]
+
+    def hgetall(self, key):
+        self._trip()
+        return {k: self._bytes(v) for k, v in self.hashes.get(key, {}).items()}
+
+    def rpush(self, key, *values):
+        self._trip()
+        target = self.lists.setdefault(key, [])
+        target.extend(self._bytes(v) for v in values)
+        return len(target)
+
+    def ltrim(self, key, start, end):
+        self._trip()
+        if key in self.lists:
+            self.lists[key] = self.lists[key][start:None if end == -1 else end + 1]
+        return True
+
+    def lrange(self, key, start, end):
+        self._trip()
+        return self.lists.get(key, [])[start:None if end == -1 else end + 1]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def sqlite_engine():
+    """In-memory SQLite with the full schema on one shared connection, so sessions and test-client threads see the same data."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def fake_redis_lock(fake_redis, monkeypatch):
+    """Points RedisLock at fake_redis, emulating its owner-checked release/extend scripts."""
+    def owned(keys, args):
+        return fake_redis.store.get(keys[0]) == FakeRedis._bytes(args[0])
+
+    monkeypatch.setattr(redis_lock, "redis", fake_redis)
+    monkeypatch.setattr(redis_lock, "_release_script", lambda keys, args: owned(keys, args) and fake_redis.delete(keys[0]))
+    monkeypatch.setattr(redis_lock, "_extend_script", lambda keys, args: owned(keys, args) and fake_redis.expire(keys[0], args[1]))
+    return fake_redis
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import text
+
+from app.services import area_stats
+from app.services.area_stats import area_stats_service
+from app.services.scoring_engine import scoring_service
+
+PROPERTIES = [
+    # parcel, state_code, county_key, availability, assessed_value, improvement_value, amount_due
+    ("H-1", "TX", "HARRIS", "available", 100000, 50000, 1000),
+    ("H-2", "TX", "HARRIS", "available", 300000, 0, 3000),
+    ("H-3", "TX", "HARRIS", "sold", 900000, 0, 9000),
+    ("D-1", "TX", "DALLAS", "available", 0, 0, 500),
+    ("M-1", "FL", "MIAMI DADE", "available", 200000, 10000, 0),
+]
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    with sqlite_engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, state_code, county_key, availability_status, "
+                 "assessed_value, improvement_value, amount_due) VALUES (:p, :p, :s, :c, :a, :v, :i, :d)"),
+            [dict(zip("pscavid", row)) for row in PROPERTIES]
+        )
+    return sqlite_engine
+
+
+def _live_valuation(conn, state_code, county_key):
+    return conn.execute(text("""
+        SELECT AVG(NULLIF(assessed_value, 0)), AVG(NULLIF(improvement_value, 0)), AVG(NULLIF(amount_due, 0)), COUNT(id)
+        FROM property_details
+        WHERE state_code = :s AND county_key = :c AND availability = 'available' AND assessed_value > 0
+    """), {"s": state_code, "c": county_key}).fetchone()
+
+
+def test_scoring_marks_areas_and_drain_matches_live_aggregates(engine, fake_redis, monkeypatch):
+    monkeypatch.setattr(area_stats, "redis", fake_redis)
+    with engine.begin() as conn:
+        scoring_service.score_parcels(conn, [p[0] for p in PROPERTIES])
+    assert {m.decode() for m in fake_redis.smembers(area_stats.DIRTY_KEY)} == {"TX|HARRIS", "TX|DALLAS", "FL|MIAMI DADE"}
+
+    assert area_stats_service.drain(engine) == 3
+    assert not fake_redis.sets
+
+    with engine.connect() as conn:
+        live = _live_valuation(conn, "TX", "HARRIS")
+        stats = area_stats_service.county_valuation(conn, "TX", "HARRIS")
+        assert (stats["avg_arv"], stats["avg_improvement"], stats["avg_tax_due"], stats["sample_size"]) == tuple(live)
+        assert area_stats_service.county_valuation(conn, "TX", "DALLAS") is None
+
+        rollup = {r["state_code"]: r for r in area_stats_service.state_rollup(conn)}
+        assert rollup["TX"]["volume"] == 3
+        assert sum(rollup["TX"]["distribution"].values()) == 3
+        assert list(rollup) == ["TX", "FL"]
+
+
+def test_refresh_and_rebuild_drop_areas_without_available_properties(engine):
+    with engine.begin() as conn:
+        assert area_stats_service.rebuild(conn) == 3
+        conn.execute(text("UPDATE property_details SET availability_status = 'sold' WHERE parcel_id = 'D-1'"))
+        area_stats_service.refresh_areas(conn, [("TX", "DALLAS")])
+        areas = conn.execute(text("SELECT state_code, county_key FROM property_area_stats ORDER BY 1, 2")).fetchall()
+    assert [tuple(a) for a in areas] == [("FL", "MIAMI DADE"), ("TX", "HARRIS")]
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.property import PropertyDetails
+from app.services import attom_batch
+from app.services.attom_cache import AttomCache
+from app.services.attom_batch import AttomBatchService, CircuitBreaker, CircuitOpenError, TokenBucket
+
+
+class StubAttomHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the ATTOM property/detail endpoint."""
+    mode = "ok"
+    requests = []
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        StubAttomHandler.requests.append(params)
+        if self.mode == "down":
+            return self._reply(503, {"status": {"msg": "Service Unavailable"}})
+        if params.get("apn", "").startswith("NOMATCH"):
+            return self._reply(400, {"status": {"msg": "SuccessWithoutResult"}})
+        if params.get("apn", "").startswith("BADREQ"):
+            return self._reply(400, {"status": {"msg": "Invalid Parameter Combination"}})
+        return self._reply(200, {"property": [{
+            "identifier": {"attomId": 1000 + len(params.get("apn", ""))},
+            "location": {"latitude": "30.5", "longitude": "-97.25"},
+            "summary": {"yearbuilt": 1985, "legal1": "LOT 7 BLK C"},
+        }]})
+
+    def _reply(self, status, body):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubAttomHandler.mode = "ok"
+    StubAttomHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAttomHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def db(sqlite_engine, fake_redis, monkeypatch):
+    monkeypatch.setattr(attom_batch, "attom_cache", AttomCache(fake_redis, lru_size=0))
+    monkeypatch.setattr(attom_batch.rescore_queue_service, "mark_dirty", lambda parcels: len(list(parcels)))
+    with sqlite_engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, state, county) VALUES (:p, :p, 'TX', 'Travis')"),
+            [{"p": p} for p in ("APN-1", "APN-22", "NOMATCH-1", "BADREQ-1")]
+        )
+        conn.execute(text("INSERT INTO property_auction_history (property_id, auction_id, auction_name) "
+                          "VALUES ('APN-1', 7, 'a'), ('NOMATCH-1', 7, 'a')"))
+    session = sessionmaker(bind=sqlite_engine)()
+    yield session
+    session.close()
+
+
+def _service(base_url, **kwargs):
+    return AttomBatchService(base_url=base_url, api_key="test", rate_per_second=100, max_concurrency=4,
+                             backoff_seconds=0, **kwargs)
+
+
+def test_batch_enriches_matches_then_selects_by_auction(stub_server, db):
+    stats = _service(stub_server).run(db, parcel_ids=["APN-1", "APN-22", "NOMATCH-1"])
+    assert (stats["total"], stats["api_calls"], stats["enriched"], stats["no_data"]) == (3, 3, 2, 1)
+
+    prop = db.query(PropertyDetails).filter(PropertyDetails.parcel_id == "APN-22").one()
+    assert (prop.latitude, prop.year_built, prop.attom_id) == (30.5, 1985, "1006")
+    # legal_description is part of the keyword search document
+    assert "lot 7 blk c" in prop.search_document
+
+    # Enriched rows now carry an attomId; the unmatched parcel is a cached "no match"
+    StubAttomHandler.requests = []
+    stats = _service(stub_server).run(db, auction_id=7)
+    assert stats["total"] == 2
+    assert stats["cache_hits"] == 1 and stats["api_calls"] == 1 and stats["no_data"] == 2
+    assert [r.get("attomId") for r in StubAttomHandler.requests] == ["1005"]
+
+
+def test_rejected_request_is_an_error_not_a_cached_miss(stub_server, db):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60)
+    stats = _service(stub_server, breaker=breaker).run(db, parcel_ids=["BADREQ-1", "NOMATCH-1"])
+    assert (stats["errors"], stats["no_data"]) == (1, 1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    # Only the real "no match" was cached; the rejected lookup goes out again
+    StubAttomHandler.requests = []
+    stats = _service(stub_server).run(db, parcel_ids=["BADREQ-1", "NOMATCH-1"])
+    assert (stats["cache_hits"], stats["api_calls"], stats["errors"]) == (1, 1, 1)
+    assert [r["apn"] for r in StubAttomHandler.requests] == ["BADREQ-1"]
+
+
+def test_circuit_opens_and_fails_fast_when_attom_is_down(stub_server, db):
+    StubAttomHandler.mode = "down"
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    service = AttomBatchService(base_url=stub_server, api_key="test", rate_per_second=100, max_concurrency=1,
+                                breaker=breaker, backoff_seconds=0)
+    stats = service.run(db, parcel_ids=["APN-1", "APN-22", "NOMATCH-1"])
+    assert breaker.state == CircuitBreaker.OPEN
+    assert stats["enriched"] == 0
+    assert stats["errors"] + stats["circuit_open"] == 3 and stats["circuit_open"] >= 2
+    assert len(StubAttomHandler.requests) == 2
+
+
+def test_circuit_half_open_admits_one_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    now[0] = 10.0
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_token_bucket_limits_rate(monkeypatch):
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=5, capacity=2, clock=lambda: now[0])
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    monkeypatch.setattr(attom_batch.asyncio, "sleep", fake_sleep)
+    asyncio.run(take(12))
+    # 2 from the burst, then 10 more at 5/s
+    assert now[0] == pytest.approx(2.0)
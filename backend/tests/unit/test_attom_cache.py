@@ -0,0 +1,94 @@
+import zlib
+import json
+from unittest.mock import patch
+
+from app.services.attom_cache import AttomCache, LRUCache, REFRESH_MARKER, STATS_KEY
+
+PAYLOAD = {"property": [{"identifier": {"attomId": 1}, "summary": {"legal1": "LOT 1 " * 50}}]}
+
+
+def _cache(now, redis, **kwargs):
+    return AttomCache(redis, ttl_seconds=1000, negative_ttl_seconds=100,
+                      lru_size=kwargs.pop("lru_size", 10), clock=lambda: now[0], **kwargs)
+
+
+def test_values_are_compressed_and_negative_entries_get_the_short_ttl(fake_redis):
+    now = [0.0]
+    cache = _cache(now, fake_redis)
+    cache.set_many({"attom:property:1": PAYLOAD, "attom:property:apn:X:TX": None})
+
+    raw = cache.redis.store["attom:property:1"]
+    assert len(raw) < len(json.dumps(PAYLOAD))
+    assert json.loads(zlib.decompress(raw))["v"] == PAYLOAD
+    assert cache.redis.ttls == {"attom:property:1": 1000, "attom:property:apn:X:TX": 100}
+
+    other_worker = _cache(now, fake_redis)
+    found = other_worker.get_many(["attom:property:1", "attom:property:apn:X:TX", "attom:property:2"])
+    assert found["attom:property:1"].payload == PAYLOAD
+    assert found["attom:property:apn:X:TX"].payload is None
+    assert "attom:property:2" not in found
+
+
+def test_lru_serves_repeat_reads_without_redis(fake_redis):
+    now = [0.0]
+    cache = _cache(now, fake_redis)
+    cache.set("k", PAYLOAD)
+    trips = cache.redis.round_trips
+    for _ in range(5):
+        assert cache.get("k").payload == PAYLOAD
+    assert cache.redis.round_trips == trips
+
+    # Negative entries expire from L1 on their own TTL
+    cache.set("neg", None)
+    now[0] = 150.0
+    cache.redis.store.pop("neg")
+    assert cache.get("neg") is None
+
+
+def test_legacy_uncompressed_json_is_still_read(fake_redis):
+    now = [0.0]
+    cache = _cache(now, fake_redis)
+    cache.redis.store["old"] = json.dumps(PAYLOAD).encode()
+    assert cache.get("old").payload == PAYLOAD
+
+
+def test_entries_near_expiry_are_stale_and_refreshed_once(fake_redis):
+    now = [0.0]
+    cache = _cache(now, fake_redis)
+    cache.set("k", PAYLOAD)
+    now[0] = 850.0
+    assert not cache.get("k").stale
+    now[0] = 950.0
+    entry = cache.get("k")
+    assert entry.stale and entry.payload == PAYLOAD
+
+    with patch("app.tasks.refresh_attom_cache_task.delay") as delay:
+        cache.schedule_refresh("k", {"attomId": 1})
+        cache.schedule_refresh("k", {"attomId": 1})
+    delay.assert_called_once_with("k", {"attomId": 1})
+    assert REFRESH_MARKER.format("k") in cache.redis.store
+
+
+def test_stats_report_hits_bytes_and_spend_avoided(fake_redis):
+    now = [0.0]
+    cache = _cache(now, fake_redis, lru_size=0)
+    cache.set_many({"a": PAYLOAD, "b": None})
+    cache.get_many(["a", "b", "c"])
+    cache.get("a")
+
+    with patch("app.services.attom_cache.settings.ATTOM_COST_PER_CALL", 0.25):
+        stats = cache.stats()
+    assert (stats["l2_hits"], stats["negative_hits"], stats["misses"]) == (3, 1, 1)
+    assert stats["api_calls_avoided"] == 3 and stats["spend_avoided"] == 0.75
+    assert stats["bytes_written"] == len(cache.redis.store["a"]) + len(cache.redis.store["b"])
+    assert stats["bytes_read"] == 2 * len(cache.redis.store["a"]) + len(cache.redis.store["b"])
+    assert cache.redis.hashes[STATS_KEY][b"writes"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
@@ -1,10 +1,13 @@
+import json
+
 import pytest
+import requests
 from unittest.mock import MagicMock, patch
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 # Assume attom_enrichment is imported successfully
-from app.services.attom_enrichment import enrich_property, map_attom_to_db, get_missing_fields
+from app.services.attom_enrichment import enrich_property, fetch_attom_data_sync, map_attom_to_db, get_missing_fields
 from app.models.property import PropertyDetails
 
 @pytest.fixture
@@ -70,16 +73,16 @@ def test_map_attom_to_db(mock_property):
     assert update_data["owner_occupied"] == "Y"
 
 
-@patch('app.services.attom_enrichment.redis_client')
+@patch('app.services.attom_enrichment.attom_cache')
 @patch('app.services.attom_enrichment.requests.get')
-def test_enrich_property_cache_miss(mock_get, mock_redis, mock_db, mock_property):
+def test_enrich_property_cache_miss(mock_get, mock_cache, mock_db, mock_property):
     # Setup mock DB query to return our mock property
     mock_query = MagicMock()
     mock_query.filter.return_value.first.return_value = mock_property
     mock_db.query.return_value = mock_query
 
-    # Setup mock Redis to return None (Cache Miss)
-    mock_redis.get.return_value = None
+    # Setup mock cache to return None (Cache Miss)
+    mock_cache.get.return_value = None
 
     # Setup mock Response from requests
     mock_response = MagicMock()
@@ -108,17 +111,17 @@ def test_enrich_property_cache_miss(mock_get, mock_redis, mock_db, mock_property
     # Verify mock calls
     mock_get.assert_called_once()
     mock_db.commit.assert_called_once()
-    mock_redis.setex.assert_called_once()
+    mock_cache.set.assert_called_once()
 
-@patch('app.services.attom_enrichment.redis_client')
-def test_enrich_property_cache_hit(mock_redis, mock_db, mock_property):
+@patch('app.services.attom_enrichment.attom_cache')
+def test_enrich_property_cache_hit(mock_cache, mock_db, mock_property):
     # Setup mock DB query to return our mock property
     mock_query = MagicMock()
     mock_query.filter.return_value.first.return_value = mock_property
     mock_db.query.return_value = mock_query
 
-    # Setup mock Redis to return a cached JSON payload
-    import json
+    # Setup mock cache to return a fresh cached payload
+    from app.services.attom_cache import CacheEntry
     cached_payload = {
         "property": [
             {
@@ -130,7 +133,7 @@ def test_enrich_property_cache_hit(mock_redis, mock_db, mock_property):
             }
         ]
     }
-    mock_redis.get.return_value = json.dumps(cached_payload)
+    mock_cache.get.return_value = CacheEntry(cached_payload, stored_at=0.0)
 
     with patch('app.services.attom_enrichment.fetch_attom_data_sync') as mock_fetch:
         result = enrich_property(mock_db, "test-prop-id-123")
@@ -141,3 +144,25 @@ def test_enrich_property_cache_hit(mock_redis, mock_db, mock_property):
     assert result["status"] == "success"
     assert result["enriched_fields"]["year_built"] == 2000
     mock_db.commit.assert_called_once()
+
+def _attom_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    return response
+
+@pytest.mark.parametrize("status_code, body, is_miss", [
+    (400, {"status": {"code": 1, "msg": "SuccessWithoutResult"}}, True),
+    (404, {}, True),
+    (400, {"status": {"code": 400, "msg": "Invalid Parameter Combination"}}, False),
+    (401, {"status": {"msg": "Invalid API Key"}}, False),
+])
+def test_fetch_treats_only_success_without_result_as_a_miss(status_code, body, is_miss):
+    fetch_once = fetch_attom_data_sync.__wrapped__  # skip the retry/backoff
+    with patch('app.services.attom_enrichment.ATTOM_API_KEY', 'key'), \
+         patch('app.services.attom_enrichment.requests.get', return_value=_attom_response(status_code, body)):
+        if is_miss:
+            assert fetch_once({"address1": "1 Main St"}) == {}
+        else:
+            with pytest.raises(requests.exceptions.HTTPError):
+                fetch_once({"address1": "1 Main St"})
@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+from sqlalchemy import text
+
+from app.services.auction_bulk_loader import auction_bulk_loader, normalize_name, transform_auction_chunk
+
+CSV = '''Name,Short Name,Auction Date,State,County Name,Parcels,id
+harris  county jan,,2024-01-05,Texas,Harris,"1,200",
+New Sale,NS,2024-02-01,FL,Dade,3,
+New Sale,NS,2024-02-01,FL,Dade,4,
+Explicit,,2024-03-01,FL,Dade,1,42
+Bad,,N/A,,,,
+'''
+
+
+def test_normalize_name():
+    assert normalize_name("  Harris   County JAN ") == "harris county jan"
+    assert normalize_name("   ") is None
+    assert normalize_name(None) is None
+
+
+def test_transform_reports_invalid_rows():
+    records, ids, errors = transform_auction_chunk(pd.read_csv(io.StringIO(CSV), dtype=str))
+    assert len(records) == 4
+    assert ids == [None, None, None, 42]
+    assert records[0]["parcels_count"] == 1200
+    assert records[0]["state_code"] == "TX"
+    assert errors == ["Row 6: Invalid or missing auction date: None"]
+
+
+def test_load_chunk_matches_normalized_names_and_is_idempotent(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO auction_events (id, name, short_name, auction_date) "
+            "VALUES (5, 'Harris County Jan', 'HARRIS JAN', '2024-01-05')"
+        ))
+
+    records, ids, _ = transform_auction_chunk(pd.read_csv(io.StringIO(CSV), dtype=str))
+    for _ in range(2):
+        with engine.begin() as conn:
+            assert auction_bulk_loader.load_chunk(conn, records, ids) == 3
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, name, parcels_count FROM auction_events ORDER BY id"
+        )).fetchall()
+    assert [tuple(r) for r in rows] == [
+        (5, "Harris County Jan", 1200),
+        (42, "Explicit", 1),
+        (43, "New Sale", 4),
+    ]
@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.api_v1.endpoints import auctions
+from app.models.auction_event import AuctionEvent
+
+
+def _auction(name, day, state, county, tax_status, parcels, available):
+    return AuctionEvent(
+        name=name, auction_date=day, state=state, state_code=state, county=county, county_key=county.upper(),
+        tax_status=tax_status, parcels_count=parcels, available_count=available,
+    )
+
+
+@pytest.fixture
+def client(sqlite_engine, monkeypatch):
+    Session = sessionmaker(bind=sqlite_engine)
+
+    db = Session()
+    db.add_all([
+        _auction("Harris May", date(2026, 5, 4), "TX", "Harris", "Tax Deed", 10, 4),
+        _auction("Travis May", date(2026, 5, 4), "TX", "Travis", "Tax Lien", 5, 5),
+        _auction("Dallas May", date(2026, 5, 20), "TX", "Dallas", "Tax Deed", 7, 1),
+        _auction("Harris June", date(2026, 6, 1), "TX", "Harris", None, 3, 3),
+        _auction("Fulton May", date(2026, 5, 4), "GA", "Fulton", "Tax Deed", 2, 0),
+        _auction("Harris July", date(2026, 7, 15), "TX", "Harris", "Tax Deed", 100, 100),
+    ])
+    db.commit()
+    db.close()
+
+    def get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(FastAPICache, "_enable", False)
+    app = FastAPI()
+    app.include_router(auctions.router, prefix="/auctions")
+    app.dependency_overrides[deps.get_db] = get_db
+    return TestClient(app)
+
+
+def test_day_buckets_and_paged_events_within_window(client):
+    resp = client.get("/auctions/calendar", params={"start_date": "2026-05-01", "end_date": "2026-06-30", "state": "Texas", "limit": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    assert [b["period"] for b in body["buckets"]] == ["2026-05-04", "2026-05-20", "2026-06-01"]
+    first = body["buckets"][0]
+    assert (first["count"], first["parcels_count"], first["available_count"]) == (2, 15, 9)
+    assert [s["tax_status"] for s in first["by_tax_status"]] == ["Tax Deed", "Tax Lien"]
+    assert body["buckets"][2]["by_tax_status"][0]["tax_status"] == "Other"
+    assert body["totals"] == {"count": 4, "parcels_count": 25, "available_count": 13}
+    assert body["total"] == 4
+    assert [e["event_title"] for e in body["events"]] == ["Harris May", "Travis May"]
+
+    page = client.get("/auctions/calendar", params={"start_date": "2026-05-01", "end_date": "2026-06-30", "state": "TX", "skip": 2, "limit": 2}).json()
+    assert [e["event_title"] for e in page["events"]] == ["Dallas May", "Harris June"]
+
+
+def test_month_buckets_county_filter_and_aggregates_only(client):
+    body = client.get("/auctions/calendar", params={
+        "start_date": "2026-01-01", "end_date": "2026-12-31", "granularity": "month",
+        "state": "tx", "county": "Harris County", "limit": 0,
+    }).json()
+    assert [(b["period"], b["count"], b["parcels_count"]) for b in body["buckets"]] == [
+        ("2026-05", 1, 10), ("2026-06", 1, 3), ("2026-07", 1, 100),
+    ]
+    assert body["events"] == []
+
+
+def test_window_is_required_and_bounded(client):
+    assert client.get("/auctions/calendar").status_code == 422
+    assert client.get("/auctions/calendar", params={"start_date": "2026-06-01", "end_date": "2026-05-01"}).status_code == 400
+    assert client.get("/auctions/calendar", params={"start_date": "2025-01-01", "end_date": "2026-12-31"}).status_code == 400
+    assert client.get("/auctions/calendar", params={"start_date": "2026-05-01", "end_date": "2026-05-31", "granularity": "week"}).status_code == 422
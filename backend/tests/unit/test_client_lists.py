@@ -0,0 +1,138 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.api.api_v1.endpoints import client_data
+from app.services.client_lists import MAX_LIST_PAGE_SIZE, PROPERTY_FIELDS, client_list_service
+from app.utils.state_mapper import make_county_key
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (id, property_id, parcel_id) VALUES (:id, :p, :p)"),
+            [{"id": i, "p": f"P-{i}"} for i in (1, 2, 3)]
+        )
+        conn.execute(
+            text("INSERT INTO property_auction_history (property_id, auction_date) VALUES (:p, :d)"),
+            [
+                {"p": "P-1", "d": date(2026, 3, 20)},   # upcoming
+                {"p": "P-2", "d": date(2026, 3, 1)},    # passed
+                {"p": "P-3", "d": None},                # undated row next to an upcoming one
+                {"p": "P-3", "d": date(2026, 3, 15)},
+            ]
+        )
+        conn.execute(
+            text("INSERT INTO client_lists (id, user_id, name) VALUES (:id, 1, :name)"),
+            [{"id": 10, "name": "Watch"}, {"id": 11, "name": "Other"}]
+        )
+        conn.execute(
+            text("INSERT INTO client_list_property (list_id, property_id) VALUES (:l, :p)"),
+            [{"l": 10, "p": 1}, {"l": 10, "p": 2}, {"l": 10, "p": 3}, {"l": 11, "p": 2}]
+        )
+    return engine
+
+
+def _summaries(conn):
+    rows = conn.execute(text(
+        "SELECT id, property_count, upcoming_auctions_count FROM client_lists ORDER BY id"
+    )).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def test_refresh_summaries_counts_members_and_upcoming_auctions(engine):
+    with engine.begin() as conn:
+        assert _summaries(conn) == [(10, 0, 0), (11, 0, 0)]
+        assert client_list_service.refresh_summaries(conn, [10], today=TODAY) == 1
+        assert _summaries(conn) == [(10, 3, 2), (11, 0, 0)]
+
+
+def test_auction_change_refreshes_only_lists_holding_the_property(engine):
+    with engine.begin() as conn:
+        client_list_service.rebuild_summaries(conn, today=TODAY)
+        conn.execute(text("UPDATE property_auction_history SET auction_date = :d WHERE property_id = 'P-2'"),
+                     {"d": date(2026, 4, 1)})
+        assert client_list_service.refresh_for_properties(conn, ["P-2"], today=TODAY) == 2
+        assert _summaries(conn) == [(10, 3, 3), (11, 1, 1)]
+
+
+def test_roll_over_only_touches_lists_with_upcoming_auctions(engine):
+    with engine.begin() as conn:
+        client_list_service.rebuild_summaries(conn, today=TODAY)
+        assert client_list_service.roll_over_upcoming(conn, today=date(2026, 3, 21)) == 1
+        assert _summaries(conn) == [(10, 3, 0), (11, 1, 0)]
+
+
+class RecordingDB:
+    """Captures the list_properties statement; LATERAL joins need Postgres to execute."""
+
+    def __init__(self, rows=()):
+        self.rows = rows
+        self.calls = []
+
+    def execute(self, statement, params=None):
+        self.calls.append((str(statement), params))
+        return SimpleNamespace(fetchall=lambda: list(self.rows))
+
+
+def test_list_properties_projects_requested_fields_and_pages():
+    db = RecordingDB([SimpleNamespace(_mapping={"id": 1, "state_code": "TX", "auction_date": date(2026, 3, 20)})])
+    items = client_list_service.list_properties(
+        db, 10, 7, skip=20, limit=10, fields=["state_code", "auction_date", "bogus"], today=TODAY
+    )
+
+    sql, params = db.calls[0]
+    assert "p.state_code AS state_code" in sql
+    assert "bogus" not in sql and "p.address" not in sql
+    assert "OFFSET :skip LIMIT :limit" in sql
+    assert (params["list_id"], params["user_id"], params["skip"], params["limit"]) == (10, 7, 20, 10)
+    assert items == [{"id": 1, "state_code": "TX", "auction_date": "2026-03-20"}]
+
+
+def test_list_properties_without_limit_returns_whole_list():
+    db = RecordingDB()
+    client_list_service.list_properties(db, 10, 7, today=TODAY)
+    sql, _ = db.calls[0]
+    assert "LIMIT :limit" not in sql
+    assert all(f" AS {field}" in sql for field in PROPERTY_FIELDS)
+
+
+def test_list_properties_endpoint_validates_paging():
+    app = FastAPI()
+    app.include_router(client_data.router, prefix="/client-data")
+    app.dependency_overrides[deps.get_db] = lambda: None
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SimpleNamespace(id=1, role="client")
+    client = TestClient(app)
+
+    assert client.get("/client-data/lists/10/properties", params={"skip": -1}).status_code == 422
+    assert client.get("/client-data/lists/10/properties", params={"limit": MAX_LIST_PAGE_SIZE + 1}).status_code == 422
+    assert client.get("/client-data/lists/10/properties", params={"limit": 0}).status_code == 422
+
+
+def test_custom_property_is_findable_by_keyword_and_location(sqlite_engine):
+    user = SimpleNamespace(id=7, active_company_id=3, company_id=3, full_name="Ana", email="ana@x.com")
+    with Session(sqlite_engine) as db:
+        created = client_data.create_custom_property(
+            db=db, current_user=user,
+            property_in=client_data.CustomPropertyCreate(
+                parcel_id="12-345-678", address="9 Oak Lane", city="Austin", state="Texas", county="Travis County",
+                legal_description="Lot 4 Block B",
+            ),
+        )
+        row = db.execute(
+            text("SELECT search_document, parcel_key, state_code, county_key FROM property_details WHERE property_id = :p"),
+            {"p": created["property_id"]}
+        ).fetchone()
+    assert "9 oak lane" in row[0] and "lot 4 block b" in row[0]
+    assert row[1] == "12345678"
+    assert (row[2], row[3]) == ("TX", make_county_key("Travis"))
@@ -0,0 +1,66 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.services.current_auction_service import current_auction_service
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (id, property_id, parcel_id) VALUES (:id, :p, :parcel)"),
+            [{"id": i, "p": f"P-{i}", "parcel": f"PARCEL-{i}"} for i in (1, 2, 3)]
+        )
+        conn.execute(
+            text("INSERT INTO property_auction_history (id, property_id, auction_name, auction_date) VALUES (:id, :p, :n, :d)"),
+            [
+                {"id": 1, "p": "P-1", "n": "March", "d": date(2026, 3, 1)},
+                {"id": 2, "p": "P-1", "n": "May", "d": date(2026, 5, 1)},
+                {"id": 3, "p": "P-1", "n": "Undated", "d": None},
+                {"id": 4, "p": "P-2", "n": "Only undated", "d": None},
+                {"id": 5, "p": "P-3", "n": "First", "d": date(2026, 4, 1)},
+                {"id": 6, "p": "P-3", "n": "Re-listed", "d": date(2026, 4, 1)},
+            ]
+        )
+    return engine
+
+
+def _projection(conn):
+    rows = conn.execute(text(
+        "SELECT property_id, auction_name, auction_date FROM property_current_auction ORDER BY property_id"
+    )).fetchall()
+    return [(r[0], r[1], str(r[2]) if r[2] else None) for r in rows]
+
+
+def test_rebuild_picks_latest_dated_row_per_property(engine):
+    with engine.begin() as conn:
+        assert current_auction_service.rebuild(conn) == 3
+        assert _projection(conn) == [
+            ("P-1", "May", "2026-05-01"),
+            ("P-2", "Only undated", None),
+            ("P-3", "Re-listed", "2026-04-01"),
+        ]
+
+
+def test_refresh_properties_touches_only_given_ids_and_drops_emptied_ones(engine):
+    with engine.begin() as conn:
+        current_auction_service.rebuild(conn)
+        conn.execute(text("UPDATE property_auction_history SET auction_date = :d WHERE id = 1"), {"d": date(2026, 6, 1)})
+        conn.execute(text("UPDATE property_auction_history SET auction_date = :d WHERE id = 5"), {"d": date(2026, 7, 1)})
+        conn.execute(text("DELETE FROM property_auction_history WHERE property_id = 'P-2'"))
+
+        current_auction_service.refresh_properties(conn, ["P-1", "P-2", None])
+        assert _projection(conn) == [
+            ("P-1", "March", "2026-06-01"),
+            ("P-3", "Re-listed", "2026-04-01"),
+        ]
+
+
+def test_refresh_by_parcel_ids_resolves_through_property_details(engine):
+    with engine.begin() as conn:
+        assert current_auction_service.refresh_by_parcel_ids(conn, ["PARCEL-3", "UNKNOWN"]) == 1
+        assert _projection(conn) == [("P-3", "Re-listed", "2026-04-01")]
+        assert current_auction_service.refresh_by_parcel_ids(conn, []) == 0
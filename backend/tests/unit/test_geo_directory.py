@@ -0,0 +1,102 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from sqlalchemy import text
+
+from app.api.api_v1.endpoints import counties, states
+from app.services import geo_directory as geo_module
+from app.services import smart_tag
+from app.services.geo_directory import CHECK_SECONDS, GeoDirectory
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _directory(tmp_path, engine, redis, monkeypatch):
+    fips_csv = tmp_path / "fips_data.csv"
+    fips_csv.write_text("fips,name,state\n48201,Harris County,TX\n1001,Autauga County,AL\n1000,Alabama,NA\n")
+    contacts_csv = tmp_path / "contact_data.csv"
+    contacts_csv.write_text(
+        "State,County,Name,Phone,Online_URL\n"
+        "TX,Harris,Harris CAD,111,https://hcad.example\n"
+        "TX,Harris,Historic Aerials,,https://aerials.example\n"
+        "AL,Autauga,Autauga Revenue,222,https://autauga.example\n"
+    )
+    queries = []
+    real_connect = engine.connect
+    monkeypatch.setattr(engine, "connect", lambda: queries.append(1) or real_connect())
+    monkeypatch.setattr(geo_module.response_cache, "redis", None)
+
+    clock = Clock()
+    directory = GeoDirectory(engine, redis, str(contacts_csv), str(fips_csv), clock)
+    return directory, engine, queries, clock
+
+
+def test_indexes_csv_and_lookups_normalize_state_and_county(tmp_path, sqlite_engine, fake_redis, monkeypatch):
+    directory, _, queries, _ = _directory(tmp_path, sqlite_engine, fake_redis, monkeypatch)
+
+    assert directory.counties("texas") == ["Harris"]
+    assert directory.county_contacts("Texas", "HARRIS COUNTY") == [
+        {"name": "Harris CAD", "phone": "111", "url": "https://hcad.example"}
+    ]
+    assert directory.fips("al", "Autauga") == "01001"
+    assert directory.fips("TX", None, "Harris County") == "48201"
+    assert directory.fips("ZZ", "Harris") is None
+    assert directory.state_name("ny") == "New York"
+    # Repeated lookups are served from memory
+    for _ in range(5):
+        directory.counties("TX")
+    assert len(queries) == 1
+
+
+def test_db_contacts_override_csv_per_state_and_reload_on_invalidate(tmp_path, sqlite_engine, fake_redis, monkeypatch):
+    directory, engine, queries, clock = _directory(tmp_path, sqlite_engine, fake_redis, monkeypatch)
+    assert directory.state_contact("TX") is None
+
+    # Seeded rows use lowercase codes or full names; both resolve to the canonical code
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO county_contacts (state, county, name, phone, url) VALUES "
+            "('tx', 'harris', 'Harris Clerk', '333', 'https://clerk.example'), "
+            "('texas', 'travis', 'Travis Clerk', '', '')"
+        ))
+        conn.execute(text("INSERT INTO state_contacts (state, url) VALUES ('TX', 'https://tx.example')"))
+    queries.clear()
+
+    # Not visible until the version moves and the check interval passes
+    assert directory.counties("TX") == ["Harris"]
+    writer = GeoDirectory(engine, directory.redis)
+    writer.invalidate()
+    assert directory.counties("TX") == ["Harris"]
+    clock.now += CHECK_SECONDS
+    assert directory.counties("TX") == ["Harris", "Travis"]
+    assert directory.county_contacts("TX", "Harris") == [
+        {"name": "Harris Clerk", "phone": "333", "url": "https://clerk.example"}
+    ]
+    # States without table rows still come from the CSV
+    assert directory.counties("AL") == ["Autauga"]
+    assert directory.state_contacts() == [{"state": "TX", "url": "https://tx.example"}]
+    assert len(queries) == 1
+
+
+def test_endpoints_and_smart_tags_use_the_directory(tmp_path, sqlite_engine, fake_redis, monkeypatch):
+    directory, _, _, _ = _directory(tmp_path, sqlite_engine, fake_redis, monkeypatch)
+    for module in (counties, states, smart_tag):
+        monkeypatch.setattr(module, "geo_directory", directory)
+    monkeypatch.setattr(FastAPICache, "_enable", False)
+
+    app = FastAPI()
+    app.include_router(counties.router, prefix="/counties")
+    app.include_router(states.router, prefix="/states")
+    client = TestClient(app)
+
+    assert client.get("/counties/Texas/counties").json() == ["Harris"]
+    assert client.get("/counties/tx/harris/contacts").json()[0]["name"] == "Harris CAD"
+    assert client.get("/counties/tx/contact").json() == {"state": "TX", "url": ""}
+    assert client.get("/states/contacts").json() == []
+    assert smart_tag.smart_tag_service.generate_tag("TX", "Harris", "12-34", 7) == "48201-1234-00007"
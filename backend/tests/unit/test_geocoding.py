@@ -0,0 +1,207 @@
+import asyncio
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from sqlalchemy import text
+
+from app.services import geocoding
+from app.services.geocoding import GeocodingService, RateLimiter, normalize_address
+
+TODAY = date(2026, 3, 10)
+
+
+class FakeNominatim(BaseHTTPRequestHandler):
+    """Local stand-in for Nominatim /search."""
+    mode = "ok"
+    queries = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        FakeNominatim.queries.append(query)
+        if self.mode == "throttled":
+            return self._reply(429, [])
+        if "nowhere" in query.lower():
+            return self._reply(200, [])
+        number = int(query.split()[0])
+        return self._reply(200, [{
+            "lat": str(30 + number / 1000), "lon": "-97.5", "display_name": query,
+            "address": {"state": "Texas", "county": "Travis County", "town": "Austin", "postcode": "78701"},
+        }])
+
+    def _reply(self, status, body):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def nominatim():
+    FakeNominatim.mode = "ok"
+    FakeNominatim.queries = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeNominatim)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+PROPERTIES = [
+    # id, address, auction offset (days from TODAY) or None, has coordinates
+    (1, "100 Oak St", None, False),
+    (2, "200 Elm St", 5, False),
+    (3, "300 Pine Rd", 1, False),
+    (4, "400 Nowhere Ln", 2, False),
+    (5, "500 Cedar Ave", -4, False),
+    (6, "600 Birch Dr", 3, True),
+    (7, "300 Pine Road", None, False),   # same place as 3 once normalized
+]
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        for pid, address, offset, has_coords in PROPERTIES:
+            conn.execute(text(
+                "INSERT INTO property_details (id, property_id, address, county, state, latitude, longitude) "
+                "VALUES (:id, :p, :a, 'Travis', 'TX', :lat, :lat)"
+            ), {"id": pid, "p": f"P-{pid}", "a": address, "lat": 1.0 if has_coords else None})
+            if offset is not None:
+                conn.execute(text("INSERT INTO property_current_auction (property_id, auction_date) VALUES (:p, :d)"),
+                             {"p": f"P-{pid}", "d": TODAY + timedelta(days=offset)})
+    return engine
+
+
+def _service(base_url, engine):
+    return GeocodingService(base_url=base_url, limiter=RateLimiter(1000), engine=engine)
+
+
+def _coords(engine):
+    with engine.connect() as conn:
+        return {r[0]: r[1] for r in conn.execute(text("SELECT id, latitude FROM property_details"))}
+
+
+def test_batch_geocodes_upcoming_auctions_first_and_caches_results(nominatim, engine):
+    stats = _service(nominatim, engine).geocode_missing(limit=3, today=TODAY)
+    assert [q.split(",")[0] for q in FakeNominatim.queries] == ["300 Pine Rd", "400 Nowhere Ln", "200 Elm St"]
+    assert (stats["selected"], stats["geocoded"], stats["not_found"], stats["api_calls"]) == (3, 2, 1, 3)
+
+    coords = _coords(engine)
+    assert coords[3] == pytest.approx(30.3) and coords[2] == pytest.approx(30.2)
+    assert coords[4] is None and coords[1] is None
+
+    # The unmatched parcel is not selected again; 7 resolves from 3's cache row
+    FakeNominatim.queries = []
+    stats = _service(nominatim, engine).geocode_missing(limit=10, today=TODAY)
+    assert stats["selected"] == 3 and stats["cache_hits"] == 1 and stats["api_calls"] == 2
+    assert sorted(q.split(",")[0] for q in FakeNominatim.queries) == ["100 Oak St", "500 Cedar Ave"]
+    assert _coords(engine)[7] == pytest.approx(30.3)
+
+    assert _service(nominatim, engine).geocode_missing(limit=10, today=TODAY)["selected"] == 0
+
+
+def test_get_coordinates_serves_normalized_repeats_from_the_cache(nominatim, engine):
+    service = _service(nominatim, engine)
+
+    async def lookups():
+        first = await service.get_coordinates("123 North Main Street, Austin TX")
+        again = await service.get_coordinates("123 n. main st,  austin, tx")
+        missing = await service.get_coordinates("9 Nowhere Way")
+        missing_again = await service.get_coordinates("9 nowhere way")
+        await service.aclose()
+        return first, again, missing, missing_again
+
+    first, again, missing, missing_again = asyncio.run(lookups())
+    assert first == again and first["latitude"] == pytest.approx(30.123) and first["city"] == "Austin"
+    assert missing is None and missing_again is None
+    assert len(FakeNominatim.queries) == 2
+    assert normalize_address("123 North Main Street") == normalize_address("123 n. main st")
+
+
+def test_batch_stops_when_nominatim_throttles(nominatim, engine):
+    FakeNominatim.mode = "throttled"
+    stats = _service(nominatim, engine).geocode_missing(limit=10, today=TODAY)
+    assert stats["throttled"] and stats["api_calls"] == 1 and len(FakeNominatim.queries) == 1
+    # Nothing was stamped, so every property is picked up by the next run
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM property_details WHERE geocode_attempted_at IS NOT NULL")).scalar() == 0
+
+
+def test_rate_limiter_spaces_calls(monkeypatch):
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(geocoding.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(rate=1.0, clock=lambda: now[0])
+
+    async def take(n):
+        for _ in range(n):
+            await limiter.acquire()
+
+    asyncio.run(take(4))
+    assert now[0] == pytest.approx(3.0)
+
+
+class AsyncSlotRedis:
+    """asyncio-client stand-in: SET NX PX holds the slot until the next pttl check."""
+
+    def __init__(self):
+        self.held = False
+        self.waits = 0
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self.held:
+            return None
+        self.held = True
+        return True
+
+    async def pttl(self, key):
+        self.waits += 1
+        self.held = False
+        return 250
+
+
+def test_rate_limiter_awaits_the_shared_redis_slot(monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(geocoding.asyncio, "sleep", fake_sleep)
+    redis = AsyncSlotRedis()
+    limiter = RateLimiter(rate=4.0, redis_client=redis)
+
+    async def take(n):
+        for _ in range(n):
+            await limiter.acquire()
+
+    asyncio.run(take(3))
+    assert redis.waits == 2 and slept == [0.25, 0.25]
+
+
+def test_get_coordinates_keeps_cache_io_off_the_event_loop(nominatim, engine, monkeypatch):
+    service = _service(nominatim, engine)
+    threads = []
+    for name in ("_read_cache", "_write_cache"):
+        original = getattr(service, name)
+        monkeypatch.setattr(service, name, lambda *a, _f=original: threads.append(threading.get_ident()) or _f(*a))
+
+    async def lookup():
+        loop_thread = threading.get_ident()
+        await service.get_coordinates("5 Congress Ave")
+        await service.aclose()
+        return loop_thread
+
+    loop_thread = asyncio.run(lookup())
+    assert len(threads) == 2 and loop_thread not in threads
@@ -0,0 +1,167 @@
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from app.services import import_jobs
+from app.services.import_jobs import ACTIVE_JOBS_KEY, compute_progress, import_job_service, plan_partitions, read_partition
+
+CSV = (
+    'parcel_id,address,zoning\n'
+    '1,1 Main,R1\n'
+    '2,"2 Main\nUnit B",R2\n'
+    '3,3 Main,"line one\nline two\nline three"\n'
+    '4,4 Main,C1\n'
+    '5,5 Main,C2\n'
+)
+
+
+def _write(tmp_path, content=CSV):
+    path = tmp_path / "import.csv"
+    path.write_text(content)
+    return str(path)
+
+
+def test_partitions_cut_on_record_boundaries(tmp_path):
+    path = _write(tmp_path)
+    header_end, partitions = plan_partitions(path, target_bytes=1)
+
+    assert [p["rows"] for p in partitions] == [1, 1, 1, 1, 1]
+    assert [p["first_row"] for p in partitions] == [0, 1, 2, 3, 4]
+    assert partitions[-1]["end"] == len(CSV.encode())
+
+    frames = [next(read_partition(path, header_end, p, chunk_size=10)) for p in partitions]
+    assert [f["parcel_id"].iloc[0] for f in frames] == ["1", "2", "3", "4", "5"]
+    assert frames[2]["zoning"].iloc[0] == "line one\nline two\nline three"
+    assert list(frames[3].index) == [3]
+
+
+def test_partitions_reassemble_the_whole_file(tmp_path):
+    path = _write(tmp_path)
+    header_end, partitions = plan_partitions(path, target_bytes=40)
+
+    chunks = [c for p in partitions for c in read_partition(path, header_end, p, chunk_size=1)]
+    combined = pd.concat(chunks)
+    expected = pd.read_csv(path, dtype=str)
+    assert list(combined.index) == list(expected.index)
+    assert combined.equals(expected)
+    assert sum(p["rows"] for p in partitions) == len(expected)
+
+
+def test_compute_progress_reports_rate_and_eta():
+    meta = {"status": "running", "total_rows": "1000", "started_at": "100.0", "updated_at": "110.0",
+            "partitions": json.dumps([{"index": 0}, {"index": 1}])}
+    chunks = [{"rows": 200, "succeeded": 195, "errors": 5}, {"rows": 300, "succeeded": 300, "errors": 0}]
+
+    progress = compute_progress(meta, chunks, failed_chunks=1, partitions_done=1, now=110.0)
+
+    assert progress["rows_done"] == 500
+    assert progress["rows_succeeded"] == 495
+    assert progress["row_errors"] == 5
+    assert progress["failed_chunks"] == 1
+    assert progress["partitions_total"] == 2
+    assert progress["rows_per_sec"] == 50.0
+    assert progress["eta_seconds"] == 10
+
+
+PROPERTIES_CSV = "parcel_id,address,property_id\n" + "".join(f"P{i},{i} Main St,pid-{i}\n" for i in range(5))
+
+
+class WorkerCrash(BaseException):
+    """Stands in for a killed worker: not caught by the chunk error handling."""
+
+
+class ImportHarness:
+    def __init__(self, path, engine, redis, link_task):
+        self.path, self.engine, self.redis, self.link_task = path, engine, redis, link_task
+        self.writes = []
+        self.fail_once = {}  # parcel_id -> exception raised the first time its chunk is written
+
+
+@pytest.fixture
+def jobs(tmp_path, sqlite_engine, fake_redis, monkeypatch):
+    """Runs import jobs against SQLite and fake Redis, one row per chunk, recording each chunk write."""
+    monkeypatch.setattr(import_jobs, "redis", fake_redis)
+    monkeypatch.setattr(import_jobs, "engine", sqlite_engine)
+    monkeypatch.setattr(import_jobs.settings, "IMPORT_CHUNK_SIZE", 1)
+    monkeypatch.setattr(import_jobs.settings, "IMPORT_PARTITION_BYTES", 1 << 20)
+    monkeypatch.setattr(import_jobs.rescore_queue_service, "mark_dirty", lambda parcels: 0)
+    path = tmp_path / "properties.csv"
+    path.write_text(PROPERTIES_CSV)
+
+    with patch("app.tasks.resolve_property_auction_links_task.delay") as link_task:
+        harness = ImportHarness(str(path), sqlite_engine, fake_redis, link_task)
+        load_chunk = import_jobs.property_bulk_loader.load_chunk
+
+        def recording_load(conn, details, history):
+            parcel = details[0]["parcel_id"]
+            if parcel in harness.fail_once:
+                raise harness.fail_once.pop(parcel)
+            harness.writes.append(parcel)
+            return load_chunk(conn, details, history)
+
+        monkeypatch.setattr(import_jobs.property_bulk_loader, "load_chunk", recording_load)
+        yield harness
+
+
+def _status(job_id):
+    return import_job_service.get_meta(job_id)["status"]
+
+
+def test_resumed_partition_writes_each_chunk_once(jobs):
+    assert len(import_job_service.start(jobs.path, "job-1")) == 1
+    jobs.fail_once["P2"] = WorkerCrash()
+
+    with pytest.raises(WorkerCrash):
+        import_job_service.run_partition("job-1", 0)
+    assert jobs.writes == ["P0", "P1"]
+    assert import_job_service.pending_partitions("job-1") == [0]
+
+    import_job_service.run_partition("job-1", 0)
+
+    assert jobs.writes == ["P0", "P1", "P2", "P3", "P4"]
+    with jobs.engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM property_details")).scalar() == 5
+    progress = import_job_service.get_progress("job-1")
+    assert (progress["status"], progress["rows_done"], progress["rows_succeeded"]) == ("completed", 5, 5)
+    jobs.link_task.assert_called_once_with("job-1")
+
+
+def test_reopen_reruns_only_failed_chunks_and_refinalizes(jobs):
+    import_job_service.start(jobs.path, "job-2")
+    jobs.fail_once["P3"] = RuntimeError("P3 rejected")
+
+    import_job_service.run_partition("job-2", 0)
+    assert _status("job-2") == "completed_with_errors"
+    assert import_job_service.get_progress("job-2")["failed_chunks"] == 1
+    assert import_job_service.pending_partitions("job-2") == []
+
+    assert import_job_service.reopen("job-2") == [0]
+    assert _status("job-2") == "running"
+    assert not jobs.redis.exists("import_job:job-2:finalized")
+
+    import_job_service.run_partition("job-2", 0)
+    assert jobs.writes == ["P0", "P1", "P2", "P4", "P3"]
+    assert _status("job-2") == "completed"
+    assert jobs.link_task.call_count == 2
+
+
+def test_finalize_runs_once_when_partitions_finish_together(jobs):
+    import_job_service.start(jobs.path, "job-3")
+    import_job_service.finalize("job-3")
+    import_job_service.finalize("job-3")
+    jobs.link_task.assert_called_once_with("job-3")
+    assert not jobs.redis.smembers(ACTIVE_JOBS_KEY)
+
+
+def test_stalled_jobs_lists_running_jobs_without_recent_progress(jobs):
+    for job_id in ("quiet", "busy", "done"):
+        import_job_service.start(jobs.path, job_id)
+    jobs.redis.hset("import_job:quiet", "updated_at", 0)
+    jobs.redis.hset("import_job:done", mapping={"status": "completed", "updated_at": 0})
+    jobs.redis.sadd(ACTIVE_JOBS_KEY, "expired")
+
+    assert import_job_service.stalled_jobs(stall_seconds=60) == ["quiet"]
+    assert b"expired" not in jobs.redis.smembers(ACTIVE_JOBS_KEY)
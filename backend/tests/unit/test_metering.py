@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services import metering
+from app.services.metering import metering_service
+
+
+def _consume_script(fake):
+    """Emulates the consume Lua script on top of the fake's strings and hashes."""
+
+    def consume(keys, args):
+        counter, pending = keys
+        seed, limit, user_id, _ = args
+        used = int(fake.store.setdefault(counter, str(seed).encode()))
+        if limit >= 0 and used >= limit:
+            return [0, used]
+        fake.incr(counter)
+        fake.hincrby(pending, str(user_id), 1)
+        return [1, used + 1]
+
+    return consume
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    with sqlite_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, hashed_password, subscription_tier, property_searches_used) "
+            "VALUES (1, 'a@x.com', 'x', 'trial', 3), (2, 'b@x.com', 'x', 'enterprise', NULL)"
+        ))
+    return sqlite_engine
+
+
+def _user(engine, uid):
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT id, subscription_tier, property_searches_used FROM users WHERE id = :id"), {"id": uid}).fetchone()
+    return SimpleNamespace(id=row[0], subscription_tier=row[1], property_searches_used=row[2])
+
+
+def _used(engine, uid):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT property_searches_used FROM users WHERE id = :id"), {"id": uid}).scalar()
+
+
+def test_redis_counts_enforce_limit_and_flush_in_batch(engine, fake_redis, monkeypatch):
+    monkeypatch.setattr(metering, "redis", fake_redis)
+    monkeypatch.setattr(metering, "_consume_script", _consume_script(fake_redis))
+    trial, enterprise = _user(engine, 1), _user(engine, 2)
+
+    with Session(engine) as db:
+        results = [metering_service.consume(db, "property_views", trial) for _ in range(3)]
+        for _ in range(10):
+            assert metering_service.consume(db, "property_views", enterprise).allowed
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert results[1].used == 5 and results[2].limit == 5
+    # Nothing is written to users on the request path
+    assert _used(engine, 1) == 3
+
+    assert metering_service.flush_pending(engine) == 2
+    assert (_used(engine, 1), _used(engine, 2)) == (5, 10)
+    assert metering_service.flush_pending(engine) == 0
+
+
+def test_falls_back_to_database_when_redis_is_down(engine, monkeypatch):
+    def down(keys, args):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(metering, "_consume_script", down)
+    trial = _user(engine, 1)
+
+    with Session(engine) as db:
+        results = [metering_service.consume(db, "property_views", trial) for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert _used(engine, 1) == 5
+
+
+def test_batch_written_before_a_failed_cleanup_is_not_applied_twice(engine, fake_redis, monkeypatch):
+    monkeypatch.setattr(metering, "redis", fake_redis)
+    monkeypatch.setattr(metering, "_consume_script", _consume_script(fake_redis))
+    with Session(engine) as db:
+        metering_service.consume(db, "property_views", _user(engine, 1))
+
+    delete = fake_redis.delete
+
+    def lost_connection(*keys):
+        if any(k.endswith(":flushing") for k in keys):
+            raise ConnectionError("redis went away")
+        return delete(*keys)
+
+    monkeypatch.setattr(fake_redis, "delete", lost_connection)
+    with pytest.raises(ConnectionError):
+        metering_service.flush_pending(engine)
+    assert _used(engine, 1) == 4
+
+    monkeypatch.setattr(fake_redis, "delete", delete)
+    assert metering_service.flush_pending(engine) == 0
+    assert _used(engine, 1) == 4
+    assert not fake_redis.hashes and metering_service.flush_pending(engine) == 0
@@ -0,0 +1,46 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.services.property_bulk_loader import dedupe_last, property_bulk_loader, to_copy_buffer
+
+
+def _detail(parcel_id, property_id, status):
+    return {"property_id": property_id, "parcel_id": parcel_id, "availability_status": status, "county_fips": None}
+
+
+def test_dedupe_last_keeps_final_record_per_key():
+    rows = [_detail("1", "a", "available"), _detail("2", "b", "available"), _detail("1", "c", "sold")]
+    assert dedupe_last(rows, "parcel_id") == [rows[2], rows[1]]
+
+
+def test_copy_buffer_encodes_nulls_bools_and_dates():
+    buf = to_copy_buffer(
+        [{"a": None, "b": True, "c": date(2024, 1, 5), "d": "x, y", "e": float("nan")}],
+        ["a", "b", "c", "d", "e"],
+    )
+    assert buf.getvalue() == '\\N,t,2024-01-05,"x, y",\\N\n'
+
+
+def test_sqlite_fallback_upserts_and_records_availability_changes(sqlite_engine):
+    engine = sqlite_engine
+
+    with engine.begin() as conn:
+        ids = property_bulk_loader.load_chunk(conn, [_detail("1", "a", "available")], [])
+    assert ids == ["a"]
+
+    history = [{
+        "parcel_id": "1", "auction_name": "Jan", "auction_date": date(2024, 1, 5),
+        "taxes_due": 10.0, "info_link": None, "list_link": None, "created_at": None,
+    }]
+    with engine.begin() as conn:
+        # Re-import under a fresh UUID: the existing property_id must be kept
+        ids = property_bulk_loader.load_chunk(conn, [_detail("1", "new", "unavailable")], history)
+        changes = conn.execute(text(
+            "SELECT property_id, previous_status, new_status FROM property_availability_history ORDER BY id"
+        )).fetchall()
+        auctions = conn.execute(text("SELECT property_id, auction_name FROM property_auction_history")).fetchall()
+
+    assert ids == ["a"]
+    assert [tuple(r) for r in changes] == [("a", None, "available"), ("a", "available", "unavailable")]
+    assert [tuple(r) for r in auctions] == [("a", "Jan")]
@@ -0,0 +1,71 @@
+import io
+
+import pandas as pd
+
+from app.services.property_csv_transform import build_row_records, transform_chunk
+
+CSV = '''parcel_id,address,property_type,amount_due,assessed_value,county,state,coordinates,auction_date,auction_name,tax_year,availability_status,zoning,legal_description,processed,lot_acres,latitude,longitude,property_id
+12-34,1 Main,,"1,234.50",$5000,Harris County,Texas,"29.1, -95.2",01/05/2024,Harris Jan,2023,Sold,"Zoning Code: R1 Land Sq. Ft: 5,000 Acres: 0.11",Subdivision Name: Oak Ridge Living Area Legal Description: LOT 5,TRUE,,,,pid-1
+99,,land,,,,fl,,2024-02-01,FL sale,,available,,,no,2.5,10,20,pid-2
+,missing,,,,,,,,,,,,,,,,,
+77,bad tax,,,,,,,,,abc,,,,,,,,
+'''
+
+
+def _read(csv: str) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(csv), dtype=str)
+
+
+def _per_row(chunk: pd.DataFrame):
+    details, history, errors = [], [], []
+    for idx, row in chunk.iterrows():
+        try:
+            d, h = build_row_records(row.where(pd.notnull(row), None).to_dict())
+        except Exception as e:
+            errors.append(f"Row {idx + 2}: {e}")
+            continue
+        details.append(d)
+        if h:
+            history.append(h)
+    return details, history, errors
+
+
+def _strip_volatile(records):
+    return [{k: v for k, v in r.items() if k != "created_at"} for r in records]
+
+
+def test_transform_chunk_matches_per_row_path():
+    chunk = _read(CSV)
+    details, history, errors = transform_chunk(chunk)
+    expected_details, expected_history, expected_errors = _per_row(chunk)
+
+    assert details == expected_details
+    assert _strip_volatile(history) == _strip_volatile(expected_history)
+    assert [e.split(":")[0] for e in errors] == ["Row 4", "Row 5"]
+    assert len(errors) == len(expected_errors)
+
+
+def test_transform_chunk_parses_dense_fields():
+    details, history, _ = transform_chunk(_read(CSV))
+    first = details[0]
+    assert first["amount_due"] == 1234.5
+    assert first["assessed_value"] == 5000.0
+    assert (first["latitude"], first["longitude"]) == (29.1, -95.2)
+    assert first["zoning"] == "R1"
+    assert first["lot_sqft"] == 5000.0
+    assert first["lot_acres"] == 0.11
+    assert first["subdivision"] == "Oak Ridge"
+    assert first["availability_status"] == "unavailable"
+    assert first["is_processed"] is True
+    assert first["tax_year"] == 2023
+    assert details[1]["property_type"] == "land"
+    assert history[0]["auction_date"].isoformat() == "2024-01-05"
+
+
+def test_tax_year_rule_is_shared_by_both_paths():
+    chunk = _read("parcel_id,tax_year,property_id\n1,0,a\n2,0.0,b\n3,0.4,c\n4,-0.5,d\n5,2023.7,e\n6,,f\n")
+    details, _, errors = transform_chunk(chunk)
+    expected, _, _ = _per_row(chunk)
+
+    assert not errors
+    assert [d["tax_year"] for d in details] == [d["tax_year"] for d in expected] == [None, None, None, None, 2023, None]
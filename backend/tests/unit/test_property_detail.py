@@ -0,0 +1,80 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.property_detail import property_detail_service
+
+
+def _row(**overrides):
+    values = {
+        "id": 12, "parcel_id": "R-100", "property_id": "P-12",
+        "_auction_history": [{"auction_name": "May"}], "_note": "call owner",
+        "_media_unlocked": False, "_attachments": None,
+        "_deal_score": None, "_deal_rating": None, "_score_factors": None,
+        "_score_model_version": None, "_score_updated_at": None,
+    }
+    values.update(overrides)
+    return SimpleNamespace(_mapping=values)
+
+
+class FakeDB:
+    """Answers the detail query from `rows` keyed by lookup column, recording every statement."""
+
+    def __init__(self, by_parcel=None, by_id=None):
+        self.rows = {"p.parcel_id": by_parcel, "p.id": by_id}
+        self.statements = []
+
+    def execute(self, statement, params):
+        sql = str(statement)
+        self.statements.append((sql, dict(params)))
+        column = "p.id" if "WHERE p.id = :value" in sql else "p.parcel_id"
+        return SimpleNamespace(fetchone=lambda: self.rows[column])
+
+
+def test_parcel_id_is_tried_first_and_numeric_id_only_for_digits():
+    db = FakeDB(by_parcel=_row())
+    assert property_detail_service.load(db, "12", user_id=1)["parcel_id"] == "R-100"
+    assert len(db.statements) == 1 and "WHERE p.parcel_id = :value" in db.statements[0][0]
+
+    db = FakeDB(by_id=_row())
+    assert property_detail_service.load(db, "12", user_id=1)["id"] == 12
+    assert [params["value"] for _, params in db.statements] == ["12", 12]
+    assert "WHERE p.id = :value" in db.statements[1][0]
+
+    db = FakeDB(by_id=_row())
+    assert property_detail_service.load(db, "R-12", user_id=1) is None
+    assert len(db.statements) == 1
+
+
+def test_attachments_follow_the_media_paywall():
+    locked = property_detail_service.load(FakeDB(by_parcel=_row()), "R-100", user_id=1)
+    assert (locked["media_unlocked"], locked["attachments"]) == (False, [])
+
+    files = [{"filename": "a.jpg", "file_path": "/u/a.jpg"}]
+    db = FakeDB(by_parcel=_row(_media_unlocked=True, _attachments=files))
+    unlocked = property_detail_service.load(db, "R-100", user_id=1, is_superuser=True)
+    assert (unlocked["media_unlocked"], unlocked["attachments"]) == (True, files)
+    sql, params = db.statements[0]
+    assert params["is_superuser"] is True
+    # Attachments are only aggregated when a superuser, a purchase or an approved task unlocks them
+    assert "CASE WHEN access.unlocked THEN" in sql
+    assert "FROM property_media_purchases mp" in sql and "ct.status = 'approved'" in sql
+
+
+def test_anonymous_caller_gets_no_notes_or_attachments():
+    row = _row(_media_unlocked=True, _attachments=[{"filename": "a.jpg", "file_path": "/u/a.jpg"}])
+    data = property_detail_service.load(FakeDB(by_parcel=row), "R-100", user_id=None)
+    assert (data["notes"], data["attachments"]) == ("", [])
+    assert "media_unlocked" not in data
+    assert data["auction_history"] == [{"auction_name": "May"}]
+
+
+def test_score_fields_without_a_score_row():
+    data = property_detail_service.load(FakeDB(by_parcel=_row()), "R-100", user_id=1)
+    assert (data["deal_score"], data["deal_rating"], data["score_factors"]) == (None, None, [])
+    assert (data["score_model_version"], data["score_updated_at"]) == (None, None)
+    assert not any(key.startswith("_") for key in data)
+
+    scored = _row(_deal_score=81.5, _deal_rating="good", _score_factors='["equity"]',
+                  _score_model_version="v2", _score_updated_at=datetime(2026, 3, 1, 12, 0))
+    data = property_detail_service.load(FakeDB(by_parcel=scored), "R-100", user_id=1)
+    assert (data["deal_score"], data["score_factors"], data["score_updated_at"]) == (81.5, ["equity"], "2026-03-01T12:00:00")
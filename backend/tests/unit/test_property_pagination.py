@@ -0,0 +1,115 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.api_v1.endpoints import properties
+from app.api.api_v1.endpoints.properties import _decode_cursor, _encode_cursor, read_properties
+
+
+class FakeRow(tuple):
+    """Positional row with the labelled `_mapping` view of SQLAlchemy's Row."""
+
+    def __new__(cls, row_id, parcel_id, sort_key):
+        values = [None] * 46
+        values[0], values[44], values[45] = parcel_id, sort_key, row_id
+        row = super().__new__(cls, values)
+        row._mapping = {"parcel_id": parcel_id, "sort_key": sort_key, "row_id": row_id}
+        return row
+
+
+class FakeDB:
+    """Answers count(*) with `total` and the page query with `rows`, recording every statement."""
+
+    def __init__(self, rows, total=0):
+        self.rows = rows
+        self.total = total
+        self.statements = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, dict(params or {})))
+        if "count(*)" in sql:
+            return SimpleNamespace(scalar=lambda: self.total)
+        return SimpleNamespace(fetchall=lambda: list(self.rows))
+
+
+SUPERUSER = SimpleNamespace(is_superuser=True)
+
+
+def _read(db, **kwargs):
+    defaults = {name: None for name in (
+        "county", "state", "auction_name", "auction_date", "auction_id", "sort_field",
+        "min_amount_due", "max_amount_due", "property_category", "occupancy", "tax_year",
+        "property_type", "inventory", "min_improvements", "max_improvements", "availability",
+        "min_county_appraisal", "max_county_appraisal", "min_acreage", "max_acreage",
+        "owner_location", "keyword", "added_since", "is_unavailable", "min_score", "cursor",
+    )}
+    defaults.update(skip=0, limit=100, sort_order="asc", total_mode="exact")
+    defaults.update(kwargs)
+    return read_properties(db=db, current_user=SUPERUSER, **defaults)
+
+
+@pytest.mark.parametrize("value", [date(2026, 5, 4), None, 1250.5, "R-100"])
+def test_cursor_round_trip(value):
+    token = _encode_cursor("amount_due", "DESC", value, 9)
+    assert "=" not in token
+    assert _decode_cursor(token) == {"s": "amount_due", "d": "DESC", "k": value, "i": 9}
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_next_cursor_points_at_the_last_returned_row():
+    db = FakeDB([FakeRow(1, "A", 10.0), FakeRow(2, "B", 20.0), FakeRow(3, None, 20.0)], total=3)
+    page = _read(db, limit=2, sort_field="amount_due")
+
+    assert [i["parcel_id"] for i in page["items"]] == ["A", "B"]
+    assert page["total"] == 3
+    assert _decode_cursor(page["next_cursor"]) == {"s": "amount_due", "d": "ASC", "k": 20.0, "i": 2}
+
+    last_page = _read(FakeDB([FakeRow(3, None, 20.0)]), limit=2, sort_field="amount_due", total_mode="none")
+    assert last_page["next_cursor"] is None
+    assert last_page["total"] is None
+
+
+def test_cursor_adds_keyset_predicate_and_ignores_skip():
+    db = FakeDB([])
+    cursor = _encode_cursor("amount_due", "ASC", 20.0, 2)
+    _read(db, sort_field="amount_due", cursor=cursor, skip=500, total_mode="none")
+
+    sql, params = db.statements[-1]
+    assert "p.amount_due > :cursor_value" in sql
+    assert "p.amount_due = :cursor_value AND p.id > :cursor_id" in sql
+    assert "ORDER BY p.amount_due ASC NULLS LAST, p.id ASC" in sql
+    assert (params["cursor_value"], params["cursor_id"], params["skip"]) == (20.0, 2, 0)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = _encode_cursor("amount_due", "ASC", 20.0, 2)
+    with pytest.raises(HTTPException) as exc:
+        _read(FakeDB([]), sort_field="tax_year", cursor=cursor)
+    assert exc.value.status_code == 400
+
+
+def test_estimate_falls_back_to_exact_count_off_postgres():
+    page = _read(FakeDB([], total=7), total_mode="estimate")
+    assert (page["total"], page["total_is_estimate"]) == (7, False)
+
+
+def test_unknown_total_mode_is_rejected():
+    app = FastAPI()
+    app.include_router(properties.router, prefix="/properties")
+    app.dependency_overrides[deps.get_db] = lambda: FakeDB([])
+    app.dependency_overrides[deps.get_current_active_user] = lambda: SUPERUSER
+
+    assert TestClient(app).get("/properties/", params={"total_mode": "approx"}).status_code == 422
@@ -0,0 +1,37 @@
+from app.services.property_search import build_keyword_filter, make_parcel_key, normalize_document
+
+
+def test_normalize_document_collapses_whitespace_and_lowercases():
+    assert normalize_document("123  Main St", None, "", "HARRIS\nCounty") == "123 main st harris county"
+    assert normalize_document(None, "  ") is None
+
+
+def test_make_parcel_key_strips_dashes():
+    assert make_parcel_key("12-34-56", None, "ab-9") == "123456 AB9"
+    assert make_parcel_key(None, "") is None
+
+
+def test_zip_keyword_matches_address():
+    kf = build_keyword_filter("33101")
+    assert kf.clause == "p.address ILIKE :zip_keyword"
+    assert kf.params == {"zip_keyword": "%33101%"}
+    assert kf.rank_expr is None
+
+
+def test_parcel_keyword_uses_parcel_key():
+    kf = build_keyword_filter("12-34-5678")
+    assert "p.parcel_key" in kf.clause
+    assert kf.params["clean_k"] == "%12345678%"
+    assert kf.rank_expr.startswith("similarity(")
+
+
+def test_fuzzy_keyword_uses_search_document():
+    kf = build_keyword_filter("  Oak   Ridge ")
+    assert "p.search_document" in kf.clause
+    assert kf.params["fuzzy_k"] == "%oak%ridge%"
+
+
+def test_sqlite_fallback_has_no_rank():
+    kf = build_keyword_filter("oak ridge", dialect="sqlite")
+    assert kf.rank_expr is None
+    assert "ILIKE" not in kf.clause
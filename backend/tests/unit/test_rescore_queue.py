@@ -0,0 +1,78 @@
+from sqlalchemy import text
+
+from app.services import rescore_queue
+from app.services.rescore_queue import DIRTY_KEY, rescore_queue_service
+
+
+def _seed_parcels(engine, n):
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, address, assessed_value, amount_due) "
+                 "VALUES (:pid, :parcel, '1 Main St', 10000, 100)"),
+            [{"pid": f"id-{i}", "parcel": f"P{i}"} for i in range(n)]
+        )
+    return engine
+
+
+def test_marks_are_deduplicated_and_drained_in_batches(sqlite_engine, fake_redis_lock, monkeypatch):
+    monkeypatch.setattr(rescore_queue, "redis", fake_redis_lock)
+    engine = _seed_parcels(sqlite_engine, 7)
+
+    rescore_queue_service.mark_dirty(["P0", "P1", "P1", None, ""])
+    with engine.connect() as conn:
+        rescore_queue_service.mark_dirty_by_property_ids(conn, [f"id-{i}" for i in range(7)])
+    assert rescore_queue_service.pending() == 7
+
+    stats = rescore_queue_service.drain(engine, batch_size=3)
+
+    assert stats == {"batches": 3, "rescored": 7, "requeued": 0}
+    assert fake_redis_lock.scard(DIRTY_KEY) == 0
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM property_scores")).scalar() == 7
+
+
+def test_failed_batch_is_requeued(sqlite_engine, fake_redis_lock, monkeypatch):
+    monkeypatch.setattr(rescore_queue, "redis", fake_redis_lock)
+    engine = _seed_parcels(sqlite_engine, 2)
+
+    def boom(conn, parcels):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(rescore_queue.scoring_service, "score_parcels", boom)
+    rescore_queue_service.mark_dirty(["P0", "P1"])
+
+    stats = rescore_queue_service.drain(engine, batch_size=10)
+
+    assert stats["requeued"] == 2
+    assert fake_redis_lock.scard(DIRTY_KEY) == 2
+
+
+def test_concurrent_drain_is_skipped(sqlite_engine, fake_redis_lock, monkeypatch):
+    monkeypatch.setattr(rescore_queue, "redis", fake_redis_lock)
+    fake_redis_lock.set(rescore_queue.LOCK_KEY, 1)
+    rescore_queue_service.mark_dirty(["P0"])
+
+    stats = rescore_queue_service.drain(sqlite_engine, batch_size=10)
+
+    assert stats["rescored"] == 0 and "skipped" in stats
+    assert fake_redis_lock.scard(DIRTY_KEY) == 1
+
+
+def test_run_that_lost_its_lock_leaves_the_new_holder_alone(sqlite_engine, fake_redis_lock, monkeypatch):
+    monkeypatch.setattr(rescore_queue, "redis", fake_redis_lock)
+    engine = _seed_parcels(sqlite_engine, 2)
+    score_parcels = rescore_queue.scoring_service.score_parcels
+
+    def slow(conn, parcels):
+        # The TTL ran out mid-batch and another drainer took the lock
+        fake_redis_lock.set(rescore_queue.LOCK_KEY, "other-run")
+        return score_parcels(conn, parcels)
+
+    monkeypatch.setattr(rescore_queue.scoring_service, "score_parcels", slow)
+    rescore_queue_service.mark_dirty(["P0", "P1"])
+
+    stats = rescore_queue_service.drain(engine, batch_size=1)
+
+    assert stats["batches"] == 1 and "skipped" in stats
+    assert fake_redis_lock.get(rescore_queue.LOCK_KEY) == b"other-run"
+    assert fake_redis_lock.scard(DIRTY_KEY) == 1
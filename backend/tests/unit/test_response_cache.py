@@ -0,0 +1,104 @@
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.api_v1.endpoints import auctions
+from app.db.repositories.auction_repository import auction_repo
+from app.schemas.auction_event import AuctionEventCreate
+from app.models.auction_event import AuctionEvent
+from app.services.response_cache import auction_change_tags, auction_list_tags, response_cache
+
+
+@pytest.fixture
+def client(sqlite_engine, fake_redis, monkeypatch):
+    Session = sessionmaker(bind=sqlite_engine)
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(response_cache, "redis", fake_redis)
+    InMemoryBackend._store.clear()
+    FastAPICache.init(InMemoryBackend(), prefix="test-cache")
+
+    calls = []
+    original = auction_repo.get_multi
+    monkeypatch.setattr(auction_repo, "get_multi", lambda db, **kw: calls.append(kw) or original(db, **kw))
+
+    app = FastAPI()
+    app.include_router(auctions.router, prefix="/auctions")
+    app.dependency_overrides[deps.get_db] = get_db
+    test_client = TestClient(app)
+    test_client.calls = calls
+    test_client.db = Session()
+    yield test_client
+    test_client.db.close()
+    FastAPICache.reset()
+
+
+def _create(db, name, state):
+    # auction_repo.create round-trips through jsonable_encoder, whose ISO dates SQLite rejects
+    auction = AuctionEvent(name=name, auction_date=date(2026, 5, 1), state=state)
+    db.add(auction)
+    db.commit()
+    response_cache.invalidate(*auction_change_tags(state))
+    return auction
+
+
+def test_repeat_reads_are_served_from_cache_with_a_stable_etag(client):
+    _create(client.db, "Travis Sale", "TX")
+    first = client.get("/auctions/", params={"state": "TX"})
+    second = client.get("/auctions/", params={"state": "TX"})
+    assert first.status_code == second.status_code == 200
+    assert first.json()["total"] == 1 and first.json()["items"][0]["name"] == "Travis Sale"
+    assert second.content == first.content and second.headers["ETag"] == first.headers["ETag"]
+    assert len(client.calls) == 1
+
+    revalidated = client.get("/auctions/", params={"state": "TX"}, headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert len(client.calls) == 1
+
+    client.get("/auctions/", params={"state": "TX"}, headers={"Cache-Control": "no-cache"})
+    assert len(client.calls) == 2
+
+
+def test_auction_writes_invalidate_only_the_affected_states(client):
+    client.get("/auctions/", params={"state": "TX"})
+    client.get("/auctions/")
+    assert len(client.calls) == 2
+
+    # A Florida auction leaves the Texas list cached but not the unfiltered one
+    _create(client.db, "Miami Sale", "FL")
+    client.get("/auctions/", params={"state": "TX"})
+    assert len(client.calls) == 2
+    assert client.get("/auctions/").json()["total"] == 1
+    assert len(client.calls) == 3
+
+    auction = _create(client.db, "Houston Sale", "TX")
+    assert client.get("/auctions/", params={"state": "TX"}).json()["total"] == 1
+    assert len(client.calls) == 4
+
+    # Moving an auction out of Texas invalidates both states
+    client.get("/auctions/", params={"state": "FL"})
+    calls = len(client.calls)
+    auction = auction_repo.get(client.db, auction.id)
+    auction_repo.update(client.db, db_obj=auction, obj_in=AuctionEventCreate(name="Houston Sale", auction_date=date(2026, 5, 1), state="FL"))
+    assert client.get("/auctions/", params={"state": "TX"}).json()["total"] == 0
+    assert client.get("/auctions/", params={"state": "FL"}).json()["total"] == 2
+    assert len(client.calls) == calls + 2
+
+
+def test_state_filter_tags_cover_substring_matches():
+    tags = auction_list_tags(state="va")
+    # "va" also matches Nevada and Pennsylvania rows
+    assert {"auctions:state:VA", "auctions:state:NV", "auctions:state:PA", "auctions:state:other"} <= set(tags)
+    assert auction_list_tags() == ["auctions", "auctions:all"]
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import text
+
+from app.services.score_leaderboard import score_leaderboard_service
+from app.services.scoring_engine import scoring_service
+
+PARCELS = [
+    # parcel, state_code, availability, assessed_value, amount_due
+    ("TX-1", "TX", "available", 100000, 100),     # exceptional ratio
+    ("TX-2", "TX", "available", 100000, 20000),   # good ratio
+    ("TX-3", "TX", "sold", 100000, 100),          # not available
+    ("FL-1", "FL", "available", 100000, 8000),    # excellent ratio
+]
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, state_code, availability_status, "
+                 "address, assessed_value, amount_due) VALUES (:p, :p, :s, :a, '1 Main St', :v, :d)"),
+            [{"p": p, "s": s, "a": a, "v": v, "d": d} for p, s, a, v, d in PARCELS]
+        )
+        scoring_service.score_parcels(conn, [p[0] for p in PARCELS])
+    return engine
+
+
+def _top(conn, **kwargs):
+    return [r[0] for r in score_leaderboard_service.top(conn, 10, **kwargs)]
+
+
+def test_scoring_path_fills_available_parcels_only(engine):
+    with engine.connect() as conn:
+        assert _top(conn) == ["TX-1", "FL-1", "TX-2"]
+        assert _top(conn, state_code="TX") == ["TX-1", "TX-2"]
+        assert _top(conn, state_code="TX", min_score=60) == ["TX-1"]
+
+
+def test_status_transition_removes_and_restores_entries(engine):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE property_details SET availability_status = 'unavailable' WHERE parcel_id = 'TX-1'"))
+        conn.execute(text("UPDATE property_details SET availability_status = 'available' WHERE parcel_id = 'TX-3'"))
+        score_leaderboard_service.refresh_properties(conn, ["TX-1", "TX-3"])
+
+    with engine.connect() as conn:
+        assert _top(conn, state_code="TX") == ["TX-3", "TX-2"]
+
+    with engine.begin() as conn:
+        assert score_leaderboard_service.rebuild(conn) == 3
+        assert _top(conn) == ["TX-3", "FL-1", "TX-2"]
+
+
+def test_live_availability_wins_over_a_stale_score_status(engine):
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE property_scores SET status = 'available'"))
+        conn.execute(text("UPDATE property_details SET availability_status = 'unavailable' WHERE parcel_id = 'TX-1'"))
+        score_leaderboard_service.refresh_parcels(conn, ["TX-1", "TX-3"])
+
+    with engine.connect() as conn:
+        assert _top(conn, state_code="TX") == ["TX-2"]
+        assert score_leaderboard_service.top(conn, 10, state_code="TX")[0].availability_status == "available"
+
+    with engine.begin() as conn:
+        assert score_leaderboard_service.rebuild(conn) == 2
+        assert _top(conn) == ["FL-1", "TX-2"]
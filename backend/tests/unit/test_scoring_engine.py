@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from app.services.scoring_engine import FETCH_COLUMNS, calculate_deal_score, score_frame, scoring_service
+
+
+def _random_frame(n, seed=7):
+    rng = np.random.default_rng(seed)
+    pick = lambda values: rng.choice(np.array(values, dtype=object), n)
+    return pd.DataFrame({
+        "parcel_id": [f"P{i:06d}" for i in range(n)],
+        "address": pick(["1 Main St", "", None, "  "]),
+        "county": pick(["Harris", "Dade"]),
+        "state": pick(["TX", "FL"]),
+        "amount_due": pick([None, 0, 100.0, 2500.0, 40000.0]),
+        "assessed_value": pick([None, 0, 1000.0, 20000.0, 500000.0]),
+        "improvement_value": pick([None, 0, 5000.0]),
+        "land_value": pick([None, 1000.0]),
+        "lot_acres": pick([None, 0.1, 0.25, 0.5, 1.0, 3.456]),
+        "property_type": pick(["Residential", "unknown", "", None]),
+        "property_category": pick(["Lien", "Deed", "Foreclosure", "Cert", "Quit Claim", "Other", None]),
+        "availability_status": pick(["available", "Unavailable", "sold", None]),
+        "owner_address": pick(["PO Box 1", "", None]),
+        "occupancy": pick([None, "Vacant"]),
+    }, columns=FETCH_COLUMNS)
+
+
+def test_score_frame_matches_row_scoring():
+    frame = _random_frame(2000)
+    scored = score_frame(frame)
+    for row, (_, out) in zip(frame.to_dict("records"), scored.iterrows()):
+        expected = calculate_deal_score(row)
+        assert out["deal_score"] == expected["score"]
+        assert out["rating"] == expected["rating"]
+        assert json.loads(out["score_factors"]) == expected["factors"]
+
+
+def test_run_scores_missing_parcels_in_keyset_batches(sqlite_engine):
+    engine = sqlite_engine
+    frame = _random_frame(25)
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, address, state, county, amount_due, assessed_value, lot_acres) "
+                 "VALUES (:parcel_id, :parcel_id, :address, :state, :county, :amount_due, :assessed_value, :lot_acres)"),
+            frame[["parcel_id", "address", "state", "county", "amount_due", "assessed_value", "lot_acres"]]
+            .astype(object).where(frame.notna(), None).to_dict("records")
+        )
+
+    batches = []
+    stats = scoring_service.run(engine, batch_size=10, on_batch=lambda n, _: batches.append(n))
+    assert batches == [10, 10, 5]
+    assert stats["processed"] == stats["saved"] == 25
+
+    # Everything is scored now, so an incremental run has nothing left to do
+    assert scoring_service.run(engine, batch_size=10)["processed"] == 0
+    assert scoring_service.run(engine, batch_size=10, force=True)["saved"] == 25
+
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM property_scores")).scalar()
+    assert count == 25
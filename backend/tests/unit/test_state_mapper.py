@@ -0,0 +1,16 @@
+from app.utils.state_mapper import canonical_state_code, make_county_key
+
+
+def test_canonical_state_code():
+    assert canonical_state_code("Texas ") == "TX"
+    assert canonical_state_code("fl") == "FL"
+    assert canonical_state_code("Narnia") is None
+    assert canonical_state_code("") is None
+
+
+def test_make_county_key_strips_suffix_and_punctuation():
+    assert make_county_key("St. Louis County") == "ST LOUIS"
+    assert make_county_key("  harris  ") == "HARRIS"
+    assert make_county_key("Orleans Parish") == "ORLEANS"
+    assert make_county_key("Miami-Dade") == "MIAMI-DADE"
+    assert make_county_key(None) is None
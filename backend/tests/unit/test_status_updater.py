@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.services.status_updater import status_transition_service, CHANGE_SOURCE
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        # Added outside the model by app.main.run_safe_migrations
+        conn.execute(text("ALTER TABLE auction_events ADD COLUMN status VARCHAR(50) DEFAULT 'active'"))
+        conn.execute(
+            text("INSERT INTO property_details (property_id, parcel_id, availability_status) VALUES (:p, :p, :s)"),
+            [
+                {"p": "PAST", "s": "Available"},
+                {"p": "RESCHEDULED", "s": "available"},
+                {"p": "FUTURE", "s": "available"},
+                {"p": "SOLD", "s": "sold"},
+                {"p": "NO-AUCTION", "s": "available"},
+                {"p": "EVENT-MOVED", "s": "available"},
+            ]
+        )
+        conn.execute(
+            text("INSERT INTO auction_events (id, name, auction_date) VALUES (1, 'Moved', :d)"),
+            {"d": date(2026, 4, 1)}
+        )
+        conn.execute(
+            text("INSERT INTO property_auction_history (property_id, auction_id, auction_name, auction_date) "
+                 "VALUES (:p, :aid, :n, :d)"),
+            [
+                {"p": "PAST", "aid": None, "n": "a", "d": date(2026, 3, 1)},
+                {"p": "RESCHEDULED", "aid": None, "n": "a", "d": date(2026, 3, 1)},
+                {"p": "RESCHEDULED", "aid": None, "n": "b", "d": date(2026, 3, 10)},
+                {"p": "FUTURE", "aid": None, "n": "a", "d": date(2026, 3, 20)},
+                {"p": "SOLD", "aid": None, "n": "a", "d": date(2026, 3, 1)},
+                # History row still says past, but the linked event was moved to April
+                {"p": "EVENT-MOVED", "aid": 1, "n": "a", "d": date(2026, 3, 1)},
+            ]
+        )
+    return engine
+
+
+def test_transitions_only_properties_with_all_auctions_past(engine):
+    with engine.begin() as conn:
+        changed = status_transition_service.transition(conn, TODAY)
+    assert changed == [("PAST", "PAST")]
+
+    with engine.connect() as conn:
+        statuses = dict(conn.execute(text("SELECT property_id, availability_status FROM property_details")).fetchall())
+        audit = conn.execute(text(
+            "SELECT property_id, previous_status, new_status, change_source FROM property_availability_history"
+        )).fetchall()
+    assert statuses["PAST"] == "unavailable"
+    assert statuses["RESCHEDULED"] == statuses["FUTURE"] == statuses["EVENT-MOVED"] == "available"
+    assert [tuple(r) for r in audit] == [("PAST", "available", "unavailable", CHANGE_SOURCE)]
+
+
+def test_second_run_is_a_no_op(engine):
+    with engine.begin() as conn:
+        status_transition_service.transition(conn, TODAY)
+    with engine.begin() as conn:
+        assert status_transition_service.transition(conn, TODAY) == []
+        assert conn.execute(text("SELECT COUNT(*) FROM property_availability_history")).scalar() == 1
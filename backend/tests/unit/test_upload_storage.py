@@ -0,0 +1,23 @@
+import asyncio
+import hashlib
+import io
+
+from fastapi import UploadFile
+
+from app.services import upload_storage
+from app.services.upload_storage import upload_storage_service
+
+
+def test_save_streams_in_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_storage, "READ_CHUNK_BYTES", 7)
+    payload = b"parcel_id,address\n" + b"".join(f"{i},{i} Main St\n".encode() for i in range(100))
+    upload = UploadFile(file=io.BytesIO(payload), filename="props.csv")
+
+    stored = asyncio.run(upload_storage_service.save(upload, "job.csv", upload_dir=str(tmp_path)))
+
+    assert stored.size == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+    assert (tmp_path / "job.csv").read_bytes() == payload
+
+    upload_storage_service.discard(stored)
+    assert not (tmp_path / "job.csv").exists()
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.services.watchlist_notifications import watchlist_notification_service
+
+TODAY = date(2026, 3, 10)
+USERS = 1000
+PROPERTIES = 5000
+PER_LIST = 100  # USERS * PER_LIST = 100k watchlist entries
+
+
+def _auction_date(pid: int):
+    # Spread over -3..+12 days so the 7-day horizon keeps only part of them
+    return TODAY + timedelta(days=pid % 16 - 3)
+
+
+@pytest.fixture
+def engine(sqlite_engine):
+    engine = sqlite_engine
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO property_details (id, property_id, parcel_id, address, availability_status) "
+                 "VALUES (:id, :p, :p, :addr, :a)"),
+            [
+                {"id": i, "p": f"P-{i}", "addr": f"{i} Main St" if i % 2 else "",
+                 "a": "Sold" if i % 10 == 0 else "Available"}
+                for i in range(PROPERTIES)
+            ]
+        )
+        conn.execute(
+            text("INSERT INTO property_auction_history (property_id, auction_id, auction_name, auction_date) "
+                 "VALUES (:p, :aid, :name, :d)"),
+            [{"p": f"P-{i}", "aid": i, "name": f"A-{i}", "d": _auction_date(i)} for i in range(PROPERTIES)]
+        )
+        conn.execute(
+            text("INSERT INTO client_lists (id, user_id, name) VALUES (:id, :id, 'Watch')"),
+            [{"id": u} for u in range(USERS)]
+        )
+        conn.execute(
+            text("INSERT INTO client_list_property (list_id, property_id) VALUES (:l, :p)"),
+            [{"l": u, "p": (u * 7 + k) % PROPERTIES} for u in range(USERS) for k in range(PER_LIST)]
+        )
+        # The same property on a second list of user 0 must still alert once
+        conn.execute(text("INSERT INTO client_lists (id, user_id, name) VALUES (:id, 0, 'Second')"), {"id": USERS})
+        conn.execute(text("INSERT INTO client_list_property (list_id, property_id) VALUES (:l, 3)"), {"l": USERS})
+    return engine
+
+
+def _expected(user: int) -> int:
+    count = 0
+    for k in range(PER_LIST):
+        pid = (user * 7 + k) % PROPERTIES
+        if pid % 10 != 0 and 0 <= (_auction_date(pid) - TODAY).days <= 7:
+            count += 1
+    return count
+
+
+def test_generates_one_alert_per_user_and_property_over_100k_entries(engine):
+    with engine.begin() as conn:
+        per_user = watchlist_notification_service.generate(conn, today=TODAY)
+
+    assert sum(per_user.values()) == sum(_expected(u) for u in range(USERS))
+    assert per_user[0] == _expected(0) and per_user[999] == _expected(999)
+
+    with engine.connect() as conn:
+        rows = {r[0]: r[1:] for r in conn.execute(text(
+            "SELECT property_id, type, message FROM notifications WHERE user_id = 0"
+        ))}
+    assert rows["P-9"] == ("auction_approaching", "Auction approaching: 9 Main St will be auctioned on 2026-03-16.")
+    assert rows["P-4"] == ("auction_starting_soon", "Auction starting soon! P-4 is up for auction in 1 day(s).")
+    assert rows["P-3"] == ("auction_starting_soon", "Auction starting soon! 3 Main St is up for auction in 0 day(s).")
+
+
+def test_rerun_on_the_same_day_inserts_nothing(engine):
+    with engine.begin() as conn:
+        assert watchlist_notification_service.generate(conn, today=TODAY)
+    with engine.begin() as conn:
+        assert watchlist_notification_service.generate(conn, today=TODAY) == {}
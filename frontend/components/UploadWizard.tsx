@@ -91,7 +91,7 @@ export const UploadWizard: React.FC<UploadWizardProps> = ({ endpoint, onComplete
                     headers: getHeaders()
                 });
 
-                const { status, errors } = res.data;
+                const { status, errors, progress: jobProgress } = res.data;
                 const statusStr = String(status).toLowerCase();
 
                 if (statusStr.includes('success')) {
@@ -111,8 +111,12 @@ export const UploadWizard: React.FC<UploadWizardProps> = ({ endpoint, onComplete
                 } else {
                     // Still processing
                     setStatusMessage(`Processing... (${status})`);
-                    // Fake progress increment
-                    setProgress(prev => Math.min(prev + 5, 90));
+                    if (jobProgress && jobProgress.total_rows) {
+                        setProgress(Math.min(Math.round(jobProgress.rows_done / jobProgress.total_rows * 100), 99));
+                    } else {
+                        // Fake progress increment
+                        setProgress(prev => Math.min(prev + 5, 90));
+                    }
                 }
 
             } catch (e) {
@@ -21,8 +21,16 @@ interface AuctionCalendarProps {
     onDateTypeSelect?: (date: string, type: string) => void;
 }
 
+// Previous calendar day of a YYYY-MM-DD string. Pure UTC arithmetic, so the
+// browser's time zone (and DST) can never move the result to another day.
+const dayBefore = (isoDate: string) => {
+    const [y, m, d] = isoDate.split('-').map(Number);
+    return new Date(Date.UTC(y, m - 1, d - 1)).toISOString().split('T')[0];
+};
+
 const AuctionCalendar: React.FC<AuctionCalendarProps> = ({ filters = { startDate: undefined }, onDateTypeSelect }) => {
-    const [rawEvents, setRawEvents] = useState<any[]>([]);
+    const [buckets, setBuckets] = useState<any[]>([]);
+    const [range, setRange] = useState<{ start: string, end: string } | null>(null);
     const [selectedEvent, setSelectedEvent] = useState<any | null>(null);
     const [groupedDialogOpen, setGroupedDialogOpen] = useState(false);
     const [groupedDateType, setGroupedDateType] = useState<{date: string, type: string} | null>(null);
@@ -31,42 +39,43 @@ const AuctionCalendar: React.FC<AuctionCalendarProps> = ({ filters = { startDate
     // Use a stable string for effect dependency to prevent redundant fetches
     const filterKey = JSON.stringify(filters);
 
+    // Only the visible range is requested; the server returns per-day aggregates
     useEffect(() => {
-        AuctionService.getCalendarEvents(filters)
-            .then(data => setRawEvents(data))
+        if (!range) return;
+        // Date filters narrow the visible range (ISO dates compare as strings)
+        const start = filters.startDate && filters.startDate > range.start ? filters.startDate : range.start;
+        const end = filters.endDate && filters.endDate < range.end ? filters.endDate : range.end;
+        if (start > end) {
+            setBuckets([]);
+            return;
+        }
+        AuctionService.getCalendar(start, end, filters)
+            .then(data => setBuckets(data.buckets || []))
             .catch(err => console.error("Failed to load calendar", err));
-    }, [filterKey]);
-
-    // Memoize the heavy aggregation logic for smoother performance
-    const processedEvents = React.useMemo(() => {
-        const groups: Record<string, { date: string, type: string, auctionCount: number, propertyCount: number }> = {};
-
-        rawEvents.forEach((item: any) => {
-            const taxStatus = item.tax_status || 'Other';
-            const cleanDate = item.event_date ? item.event_date.split('T')[0] : '';
-            if (!cleanDate) return;
+    }, [filterKey, range?.start, range?.end]);
 
-            const groupKey = `${cleanDate}-${taxStatus}`;
-            if (!groups[groupKey]) {
-                groups[groupKey] = { date: cleanDate, type: taxStatus, auctionCount: 0, propertyCount: 0 };
-            }
-            groups[groupKey].auctionCount += 1;
-            groups[groupKey].propertyCount += (item.property_count || 0);
-        });
+    const handleDatesSet = (arg: any) => {
+        // startStr/endStr are already formatted in the calendar's timeZone, unlike
+        // the Date objects; the end is exclusive, so step back one calendar day
+        setRange({ start: arg.startStr.split('T')[0], end: dayBefore(arg.endStr.split('T')[0]) });
+    };
 
-        return Object.values(groups).map(g => ({
-            title: `${g.type} (${g.auctionCount})`,
-            start: g.date,
-            allDay: true,
-            extendedProps: {
-                isGrouped: true,
-                type: g.type,
-                date: g.date,
-                auctionCount: g.auctionCount,
-                propertyCount: g.propertyCount
-            }
-        }));
-    }, [rawEvents]);
+    const processedEvents = React.useMemo(() => {
+        return buckets.flatMap((bucket: any) =>
+            (bucket.by_tax_status || []).map((g: any) => ({
+                title: `${g.tax_status} (${g.count})`,
+                start: bucket.period,
+                allDay: true,
+                extendedProps: {
+                    isGrouped: true,
+                    type: g.tax_status,
+                    date: bucket.period,
+                    auctionCount: g.count,
+                    propertyCount: g.parcels_count
+                }
+            }))
+        );
+    }, [buckets]);
 
     const handleEventClick = (info: any) => {
         const props = info.event.extendedProps;
@@ -118,6 +127,7 @@ const AuctionCalendar: React.FC<AuctionCalendarProps> = ({ filters = { startDate
                     listWeek: 'Week'
                 }}
                 events={processedEvents}
+                datesSet={handleDatesSet}
                 eventClick={handleEventClick}
                 dateClick={handleDateClick}
                 height="100%"
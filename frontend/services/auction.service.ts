@@ -63,14 +63,16 @@ export const AuctionService = {
         return response.json();
     },
 
-    getCalendarEvents: async (filters: any = {}): Promise<any[]> => {
+    getCalendar: async (startDate: string, endDate: string, filters: any = {}, granularity: 'day' | 'month' = 'day', limit = 0): Promise<any> => {
         const queryParams = new URLSearchParams();
+        queryParams.append('start_date', startDate);
+        queryParams.append('end_date', endDate);
+        queryParams.append('granularity', granularity);
+        queryParams.append('limit', String(limit));
         if (filters.name) queryParams.append('name', filters.name);
         if (filters.state) queryParams.append('state', filters.state);
         if (filters.county) queryParams.append('county', filters.county);
         if (filters.isPresencial !== undefined) queryParams.append('is_presential', String(filters.isPresencial));
-        if (filters.startDate) queryParams.append('start_date', filters.startDate);
-        if (filters.endDate) queryParams.append('end_date', filters.endDate);
         if (filters.q) queryParams.append('q', filters.q);
         if (filters.tax_status) queryParams.append('tax_status', filters.tax_status);
 